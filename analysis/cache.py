@@ -0,0 +1,159 @@
+"""
+Persistent cache of the model outputs, keyed by text content and model version
+
+Every analysis run used to classify and score all the articles and comments again,
+while most of them were analyzed by a previous run. The outputs of each model (category
+logits, toxicity scores...) are stored here under
+
+    (hash of the normalized text, model id, model revision)
+
+and looked up before inference: a run only pays for new or edited texts. The revision
+identifies the exact model (its weights and inference settings, see
+analysis/classifier.py), so a model upgrade misses on every entry of the previous
+version and on nothing else; the entries of the old revisions stay usable if the
+model is rolled back.
+
+    cache = InferenceCache(path)
+    outputs = cache.predict(texts, model_id, revision, predict)   # predict: texts -> array
+    cache.hits, cache.misses, cache.saved_seconds
+
+Stored in a separate SQLite file (MODEL_CONFIG['inference_cache']).
+"""
+import hashlib
+import re
+import sqlite3
+import time
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outputs (
+    text_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    outputs BLOB NOT NULL,
+    seconds REAL NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (model, revision, text_hash)
+) WITHOUT ROWID;
+"""
+
+# Hashes looked up per query (SQLite host parameters)
+LOOKUP_BATCH_SIZE = 500
+
+WHITESPACE = re.compile(r'\s+')
+# Zero-width characters (joiners, marks, BOM) pasted with the comments
+INVISIBLE = re.compile('[\u200b-\u200f\u2060\ufeff]')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Unicode NFC, whitespace runs collapsed, zero-width characters removed: texts differing
+    only by their spacing, invisible characters or composed accents share their entry
+    """
+    text = INVISIBLE.sub('', unicodedata.normalize('NFC', text or ''))
+    return WHITESPACE.sub(' ', text).strip()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class InferenceCache:
+    """
+    Model outputs (float32 vectors) by normalized text, model and revision
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(CACHE_SCHEMA)
+
+        # Texts found in the cache / inferred, and inference time they spared (as measured
+        # when their outputs were computed)
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def get_many(self, model: str, revision: str, hashes: Sequence[str]) -> Dict[str, tuple]:
+        """
+        {hash: (outputs, seconds)} of the hashes in the cache
+        """
+        found = {}
+        hashes = list(dict.fromkeys(hashes))
+        for i in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+            chunk = hashes[i:i + LOOKUP_BATCH_SIZE]
+            rows = self.conn.execute(
+                f"SELECT text_hash, outputs, seconds FROM outputs WHERE model = ? AND revision = ? "
+                f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                [model, revision, *chunk]
+            )
+            for key, data, seconds in rows:
+                found[key] = (np.frombuffer(data, dtype=np.float32), seconds)
+        return found
+
+    def put_many(self, model: str, revision: str, outputs: Dict[str, np.ndarray], seconds: float):
+        """
+        Store the outputs of some texts {hash: outputs}, inferred in `seconds` per text
+        """
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO outputs (text_hash, model, revision, outputs, seconds, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(key, model, revision, np.asarray(values, dtype=np.float32).tobytes(), seconds, now)
+                 for key, values in outputs.items()]
+            )
+
+    def predict(self, texts: List[str], model: str, revision: str,
+                predict: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Outputs of the texts (one row per text, in their order): from the cache, or from
+        predict() run once on the normalized texts missing from it
+        """
+        normalized = [normalize_text(text) for text in texts]
+        hashes = [text_hash(text) for text in normalized]
+        found = self.get_many(model, revision, hashes)
+
+        # Each missing text is inferred once, even when it appears several times
+        missing = {key: text for key, text in zip(hashes, normalized) if key not in found}
+        if missing:
+            start = time.perf_counter()
+            outputs = np.asarray(predict(list(missing.values())), dtype=np.float32)
+            seconds = (time.perf_counter() - start) / len(missing)
+            computed = dict(zip(missing, outputs))
+            self.put_many(model, revision, computed, seconds)
+            found.update((key, (values, seconds)) for key, values in computed.items())
+
+        hits = [key for key in hashes if key not in missing]
+        self.hits += len(hits)
+        self.misses += len(hashes) - len(hits)
+        self.saved_seconds += sum(found[key][1] for key in hits)
+
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([found[key][0] for key in hashes])
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
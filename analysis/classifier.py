@@ -0,0 +1,258 @@
+"""
+Batched CPU inference of the news classifier (CamemBERT fine-tuned on our categories)
+
+The analysis notebook classified one article per call: one tokenizer call, one forward
+pass and one tensor copy per article, with the model working on a single sequence. Here
+the texts of a whole run are tokenized at once, sorted by length and cut into batches of
+similar lengths, each padded to its own longest text (dynamic padding): no batch is
+padded to the longest article of the run and the model works on full matrices.
+
+    classifier = NewsClassifier()
+    classifier.classify(texts)            # categories, in the order of the texts
+    classifier.predict_logits(texts)      # numpy array (texts, labels)
+    classifier.classify(texts, cache)     # outputs looked up in an InferenceCache first (analysis/cache.py)
+
+Long documents (MODEL_CONFIG['long_documents']): instead of being truncated to their first
+max_length tokens, the texts are split into windows of max_length tokens overlapping by
+window_overlap tokens (tokenizer overflow); the windows of all the texts are batched
+together and the logits of an article are the mean of those of its windows, weighted by
+their number of tokens (the last window of a text is often short). An article
+uses at most token_budget tokens: beyond, the windows are spread evenly over the text.
+
+Two backends (MODEL_CONFIG['inference_backend']):
+- 'torch': the model of MODEL_CONFIG['news_classifier'] in PyTorch, float32
+- 'onnx': its ONNX export quantized to int8 (analysis/onnx_export.py) in ONNX Runtime
+
+Requires transformers, and torch or onnxruntime. Compare with per-article calls and
+between backends:
+    python scripts/benchmark_classifier.py
+    python scripts/benchmark_onnx.py
+"""
+import contextlib
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from config.settings import MODEL_CONFIG
+
+
+def model_revision(model, max_length: int) -> str:
+    """
+    Fingerprint of the weights and of the truncation: changes with any new version of
+    the model, whatever its name or location (hub, local directory)
+    """
+    import torch
+
+    digest = hashlib.blake2b(digest_size=8)
+    for name, tensor in sorted(model.state_dict().items()):
+        digest.update(name.encode())
+        # Raw bytes, whatever the dtype (numpy has no bfloat16)
+        digest.update(tensor.detach().contiguous().reshape(-1).view(torch.uint8).numpy())
+    return f"{digest.hexdigest()}-{max_length}"
+
+
+def length_batches(lengths: List[int], batch_size: int, max_tokens: int) -> List[np.ndarray]:
+    """
+    Indices of the texts by batch: sorted by length, at most batch_size texts and
+    max_tokens padded tokens (texts x longest text) per batch
+    """
+    order = np.argsort(lengths, kind='stable')
+    batches, current = [], []
+    for index in order:
+        # Sorted by length: the text being added is the longest of its batch
+        if current and (len(current) == batch_size or (len(current) + 1) * lengths[index] > max_tokens):
+            batches.append(np.array(current))
+            current = []
+        current.append(index)
+    if current:
+        batches.append(np.array(current))
+    return batches
+
+
+def file_revision(path: Path, max_length: int) -> str:
+    """
+    Fingerprint of an exported model file and of the truncation
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return f"{digest.hexdigest()}-{max_length}"
+
+
+class NewsClassifier:
+    """
+    News classifier with batched, length-sorted inference (PyTorch or ONNX Runtime)
+    """
+
+    def __init__(self, model_name: str = MODEL_CONFIG['news_classifier'],
+                 max_length: int = MODEL_CONFIG['inference_max_length'],
+                 batch_size: int = MODEL_CONFIG['inference_batch_size'],
+                 max_tokens: int = MODEL_CONFIG['inference_max_tokens'],
+                 threads: Optional[int] = MODEL_CONFIG['inference_threads'],
+                 labels: List[str] = MODEL_CONFIG['news_labels'],
+                 revision: Optional[str] = MODEL_CONFIG['news_classifier_revision'],
+                 backend: str = MODEL_CONFIG['inference_backend'],
+                 onnx_model: Path = MODEL_CONFIG['onnx_model'],
+                 long_documents: bool = MODEL_CONFIG['long_documents'],
+                 window_overlap: int = MODEL_CONFIG['window_overlap'],
+                 token_budget: int = MODEL_CONFIG['token_budget']):
+        self.model_name = model_name
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.labels = list(labels)
+        self.backend = backend
+        self.long_documents = long_documents
+        self.window_overlap = window_overlap
+        # Windows of max_length tokens per article at most
+        self.max_windows = max(1, token_budget // max_length)
+
+        if backend == 'torch':
+            self._load_torch(model_name, revision, threads)
+        elif backend == 'onnx':
+            self._load_onnx(Path(onnx_model), threads)
+        else:
+            raise ValueError(f"Backend d'inférence inconnu: {backend} (torch ou onnx)")
+        if long_documents:
+            # Other outputs than the truncated texts: other entries in the inference cache
+            self.revision += f"-w{window_overlap}x{self.max_windows}"
+
+        # Texts, tokens (windows included) and time of the inferences, for the throughput reports
+        self.texts = 0
+        self.tokens = 0
+        self.seconds = 0.0
+
+    def _load_torch(self, model_name: str, revision: Optional[str], threads: Optional[int]):
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.torch = torch
+        self.threads = torch.get_num_threads()
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name, revision=revision)
+        self.model.eval()
+        if self.model.config.num_labels != len(self.labels):
+            raise ValueError(f"{model_name}: {self.model.config.num_labels} sorties pour {len(self.labels)} labels")
+        # Version of the outputs in the inference cache
+        self.revision = model_revision(self.model, self.max_length)
+
+    def _load_onnx(self, path: Path, threads: Optional[int]):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        from analysis.onnx_export import read_metadata
+
+        if not path.exists():
+            raise FileNotFoundError(f"Modèle ONNX absent: {path} (python -m analysis.onnx_export)")
+        metadata = read_metadata(path.parent)
+        if metadata['labels'] != self.labels:
+            raise ValueError(f"{path}: labels {metadata['labels']} au lieu de {self.labels}")
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads or 0      # 0: one per core
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(str(path), options, providers=['CPUExecutionProvider'])
+        self.threads = threads or os.cpu_count()
+
+        self.tokenizer = AutoTokenizer.from_pretrained(str(path.parent))
+        # Same model id as the PyTorch model it was exported from, another revision
+        self.model_name = metadata['source']
+        self.revision = f"onnx-{file_revision(path, self.max_length)}"
+
+    def _run(self, inputs) -> np.ndarray:
+        """
+        Logits of a padded batch
+        """
+        if self.backend == 'onnx':
+            feed = {name: np.asarray(inputs[name], dtype=np.int64) for name in ('input_ids', 'attention_mask')}
+            return self.session.run(['logits'], feed)[0]
+        return self.model(**inputs).logits.float().numpy()
+
+    def batches(self, lengths: List[int]) -> List[np.ndarray]:
+        return length_batches(lengths, self.batch_size, self.max_tokens)
+
+    def spread(self, windows: List[int]) -> List[int]:
+        """
+        max_windows of the windows of a text at most: its beginning, its end and evenly in between
+        """
+        if len(windows) <= self.max_windows:
+            return windows
+        if self.max_windows == 1:
+            return windows[:1]
+        last = len(windows) - 1
+        return [windows[round(i * last / (self.max_windows - 1))] for i in range(self.max_windows)]
+
+    def _input_ids(self, texts: List[str]) -> tuple:
+        """
+        Token ids of the sequences to infer and index of the text of each sequence
+        """
+        if not self.long_documents:
+            input_ids = self.tokenizer(texts, truncation=True, max_length=self.max_length)['input_ids']
+            return input_ids, np.arange(len(texts))
+
+        # Each text -> windows of max_length tokens (special tokens included), in order
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length,
+                                 stride=self.window_overlap, return_overflowing_tokens=True)
+        windows = [[] for _ in texts]
+        for window, index in enumerate(encoded['overflow_to_sample_mapping']):
+            windows[index].append(window)
+        kept = [(window, index) for index, text_windows in enumerate(windows) for window in self.spread(text_windows)]
+        return [encoded['input_ids'][window] for window, _ in kept], np.array([index for _, index in kept])
+
+    def predict_logits(self, texts: List[str]) -> np.ndarray:
+        """
+        Logits of the texts (one row per text, in the order of the texts)
+        """
+        start = time.perf_counter()
+        logits = np.zeros((len(texts), len(self.labels)), dtype=np.float32)
+        if not texts:
+            return logits
+
+        # One tokenizer call for all the texts, without padding (done per batch)
+        input_ids, owners = self._input_ids(list(texts))
+        outputs = np.zeros((len(input_ids), len(self.labels)), dtype=np.float32)
+        tensors = 'np' if self.backend == 'onnx' else 'pt'
+        with self._inference():
+            for batch in self.batches([len(ids) for ids in input_ids]):
+                inputs = self.tokenizer.pad({'input_ids': [input_ids[i] for i in batch]}, return_tensors=tensors)
+                outputs[batch] = self._run(inputs)
+
+        # Mean of the windows of each text weighted by their tokens (a single window without long_documents)
+        lengths = np.array([len(ids) for ids in input_ids], dtype=np.float32)
+        np.add.at(logits, owners, outputs * lengths[:, None])
+        logits /= np.bincount(owners, weights=lengths, minlength=len(texts))[:, None]
+
+        self.texts += len(texts)
+        self.tokens += int(lengths.sum())
+        self.seconds += time.perf_counter() - start
+        return logits
+
+    def _inference(self):
+        if self.backend == 'onnx':
+            return contextlib.nullcontext()
+        return self.torch.inference_mode()
+
+    def classify(self, texts: List[str], cache=None) -> List[str]:
+        """
+        Category of each text, inferring only the texts missing from the cache when one is given
+        """
+        if cache is None:
+            logits = self.predict_logits(texts)
+        else:
+            logits = cache.predict(texts, self.model_name, self.revision, self.predict_logits)
+        return [self.labels[index] for index in logits.argmax(axis=1)]
+
+    @property
+    def rate(self) -> float:
+        """
+        Texts classified per second since the creation of the classifier
+        """
+        return self.texts / self.seconds if self.seconds else 0.0
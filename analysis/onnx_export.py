@@ -0,0 +1,117 @@
+"""
+Export of the news classifier to ONNX, with int8 dynamic quantization
+
+The PyTorch classifier computes in float32 and its linear layers make most of the time
+of an inference on CPU. The export writes the model as an ONNX graph and a copy whose
+linear weights are quantized to int8 (activations are quantized on the fly, per batch):
+ONNX Runtime then runs the matrix products in int8, with a model four times smaller.
+
+    <dir>/model.onnx          float32 graph (input_ids, attention_mask -> logits)
+    <dir>/model.int8.onnx     int8 dynamic quantization of model.onnx
+    <dir>/tokenizer*          tokenizer of the model
+    <dir>/export.json         source model, its revision, labels, max_length
+
+NewsClassifier(backend='onnx') serves MODEL_CONFIG['onnx_model'] (analysis/classifier.py).
+Requires torch, transformers, onnx and onnxruntime:
+    python -m analysis.onnx_export
+    python scripts/benchmark_onnx.py          # parity with PyTorch and throughput
+"""
+import inspect
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import MODEL_CONFIG
+
+# ONNX operator set of the exported graph (supported by ONNX Runtime >= 1.14)
+OPSET_VERSION = 17
+
+METADATA_FILE = 'export.json'
+
+
+def export_onnx(directory: Path,
+                model_name: str = MODEL_CONFIG['news_classifier'],
+                revision: Optional[str] = MODEL_CONFIG['news_classifier_revision'],
+                labels: List[str] = MODEL_CONFIG['news_labels'],
+                max_length: int = MODEL_CONFIG['inference_max_length'],
+                quantize: bool = True) -> Dict[str, Any]:
+    """
+    Export the classifier to <directory>, returns the metadata of the export
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    from analysis.classifier import model_revision
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name, revision=revision)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name, revision=revision)
+    model.eval()
+    if model.config.num_labels != len(labels):
+        raise ValueError(f"{model_name}: {model.config.num_labels} sorties pour {len(labels)} labels")
+
+    # Batch and sequence axes stay dynamic: batches of any size, padded to their longest text
+    sample = tokenizer(["Exemple", "Exemple de texte plus long"], padding=True, return_tensors='pt')
+    options = {}
+    if 'dynamo' in inspect.signature(torch.onnx.export).parameters:
+        # TorchScript exporter: the graph of the encoder has no data-dependent control flow
+        options['dynamo'] = False
+    with torch.no_grad():
+        torch.onnx.export(
+            model, (sample['input_ids'], sample['attention_mask']), str(directory / "model.onnx"),
+            input_names=['input_ids', 'attention_mask'], output_names=['logits'],
+            dynamic_axes={'input_ids': {0: 'batch', 1: 'sequence'},
+                          'attention_mask': {0: 'batch', 1: 'sequence'},
+                          'logits': {0: 'batch'}},
+            opset_version=OPSET_VERSION, **options
+        )
+    tokenizer.save_pretrained(str(directory))
+
+    files = ['model.onnx']
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(str(directory / "model.onnx"), str(directory / "model.int8.onnx"),
+                         weight_type=QuantType.QInt8)
+        files.append('model.int8.onnx')
+
+    metadata = {
+        'source': model_name,
+        'source_revision': model_revision(model, max_length),
+        'labels': list(labels),
+        'max_length': max_length,
+        'opset': OPSET_VERSION,
+        'files': files,
+        'created_at': datetime.now().isoformat(),
+    }
+    with open(directory / METADATA_FILE, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False, indent=2)
+    return metadata
+
+
+def read_metadata(directory: Path) -> Dict[str, Any]:
+    with open(Path(directory) / METADATA_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Exporter le classifieur d'articles en ONNX (float32 et int8)")
+    parser.add_argument('--model', default=MODEL_CONFIG['news_classifier'],
+                        help='Modèle (Hugging Face ou répertoire local)')
+    parser.add_argument('--dir', default=str(Path(MODEL_CONFIG['onnx_model']).parent),
+                        help="Répertoire de l'export")
+    parser.add_argument('--no-quantize', action='store_true', help='Ne pas écrire le modèle int8')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    metadata = export_onnx(Path(args.dir), model_name=args.model, quantize=not args.no_quantize)
+    print(f"✓ {args.model} exporté dans {args.dir} ({time.perf_counter() - start:.1f}s)")
+    for name in metadata['files']:
+        print(f"  {name}: {(Path(args.dir) / name).stat().st_size / 1e6:.1f} Mo")
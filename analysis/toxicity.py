@@ -0,0 +1,163 @@
+"""
+Batched, deduplicated toxicity scoring of the articles and their comments (Detoxify)
+
+The analysis notebook called Detoxify('multilingual').predict once per article and once
+per comment, walking the replies recursively, while the Facebook pages repeat the same
+comments many times (copy-pasted messages, "Amen", emoji-only replies...). Here the
+bodies, comments and replies of a whole batch of articles are flattened into one list,
+deduplicated on their normalized text (analysis/cache.py), and only the distinct texts
+go through the model: sorted by length, in batches padded to their longest text, under
+torch.inference_mode. The scores are then scattered back to every occurrence:
+
+    scorer = ToxicityScorer()
+    results = score_articles(articles, scorer, cache)   # articles: {id, texte, comments: [{id, texte}]}
+    results[article_id]   # {toxicite_score, sensible, comments_sensibles, comments: {id: (score, sensible)}}
+
+The comments of an article are its comments and replies in thread order, as in the
+comments table (database/comments.py comment_rows flattens the threads of a JSON article).
+
+comments_sensibles has the format of the analysis exports (first 500 characters of the
+text + "...", comment_sensible, toxicite_score). A text is sensitive when one of
+MODEL_CONFIG['toxicity_sensitive_labels'] reaches TOXICITY_THRESHOLD.
+
+Requires torch, transformers and detoxify.
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config.settings import MODEL_CONFIG, TOXICITY_THRESHOLD
+from analysis.cache import normalize_text
+from analysis.classifier import length_batches, model_revision
+from database.comments import ANALYSIS_TEXT_LENGTH
+
+
+class ToxicityScorer:
+    """
+    Detoxify model with batched, length-sorted inference; counts texts, distinct texts and time
+    """
+
+    def __init__(self, model_type: str = MODEL_CONFIG['toxicity_model'],
+                 max_length: int = MODEL_CONFIG['toxicity_max_length'],
+                 batch_size: int = MODEL_CONFIG['inference_batch_size'],
+                 max_tokens: int = MODEL_CONFIG['inference_max_tokens'],
+                 threads: Optional[int] = MODEL_CONFIG['inference_threads'],
+                 sensitive_labels: List[str] = MODEL_CONFIG['toxicity_sensitive_labels'],
+                 threshold: float = TOXICITY_THRESHOLD,
+                 checkpoint: Optional[str] = None, huggingface_config_path: Optional[str] = None):
+        import torch
+        from detoxify import Detoxify
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.torch = torch
+        self.threads = torch.get_num_threads()
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.threshold = threshold
+
+        detoxify = Detoxify(model_type, checkpoint=checkpoint, device='cpu',
+                            huggingface_config_path=huggingface_config_path)
+        self.model, self.tokenizer, self.labels = detoxify.model, detoxify.tokenizer, list(detoxify.class_names)
+        self.model.eval()
+        missing = [label for label in ['toxicity', *sensitive_labels] if label not in self.labels]
+        if missing:
+            raise ValueError(f"Detoxify {model_type}: pas de sortie {', '.join(missing)}")
+        self.toxicity_index = self.labels.index('toxicity')
+        self.sensitive_indices = [self.labels.index(label) for label in sensitive_labels]
+
+        # Key of the scores in the inference cache
+        self.model_name = f"detoxify-{model_type}"
+        self.revision = model_revision(self.model, max_length)
+
+        # Texts scored (occurrences), distinct texts, texts through the model and its time
+        self.texts = 0
+        self.unique = 0
+        self.inferred = 0
+        self.seconds = 0.0
+
+    def predict_scores(self, texts: List[str]) -> np.ndarray:
+        """
+        Probabilities of the Detoxify labels (one row per text, in the order of the texts)
+        """
+        start = time.perf_counter()
+        scores = np.zeros((len(texts), len(self.labels)), dtype=np.float32)
+        if not texts:
+            return scores
+
+        input_ids = self.tokenizer(list(texts), truncation=True, max_length=self.max_length)['input_ids']
+        with self.torch.inference_mode():
+            for batch in length_batches([len(ids) for ids in input_ids], self.batch_size, self.max_tokens):
+                inputs = self.tokenizer.pad({'input_ids': [input_ids[i] for i in batch]}, return_tensors='pt')
+                scores[batch] = self.torch.sigmoid(self.model(**inputs).logits.float()).numpy()
+
+        self.inferred += len(texts)
+        self.seconds += time.perf_counter() - start
+        return scores
+
+    def score(self, texts: List[str], cache=None) -> List[tuple]:
+        """
+        (toxicite_score, sensible) of each text; each distinct normalized text is scored once
+        """
+        normalized = [normalize_text(text) for text in texts]
+        unique = list(dict.fromkeys(text for text in normalized if text))
+        self.texts += len(texts)
+        self.unique += len(unique)
+
+        if cache is None:
+            scores = self.predict_scores(unique)
+        else:
+            scores = cache.predict(unique, self.model_name, self.revision, self.predict_scores)
+        by_text = {
+            text: (float(row[self.toxicity_index]), bool((row[self.sensitive_indices] >= self.threshold).any()))
+            for text, row in zip(unique, scores)
+        }
+        # Empty texts (comments made of an image...) are not toxic
+        return [by_text.get(text, (0.0, False)) for text in normalized]
+
+    @property
+    def dedup_ratio(self) -> float:
+        """
+        Share of the texts spared by deduplication
+        """
+        return 1 - self.unique / self.texts if self.texts else 0.0
+
+    @property
+    def rate(self) -> float:
+        """
+        Texts scored per second of inference
+        """
+        return self.texts / self.seconds if self.seconds else 0.0
+
+
+def score_articles(articles: List[Dict[str, Any]], scorer: ToxicityScorer, cache=None) -> Dict[str, Dict[str, Any]]:
+    """
+    Toxicity of a batch of articles and of their comments and replies, all scored at once
+    """
+    texts, owners = [], []
+    for article in articles:
+        texts.append(article['texte'] or '')
+        owners.append((article['id'], None))
+        for comment in article['comments']:
+            texts.append(comment['texte'] or '')
+            owners.append((article['id'], comment))
+
+    results = {
+        article['id']: {'toxicite_score': 0.0, 'sensible': False, 'comments_sensibles': [], 'comments': {}}
+        for article in articles
+    }
+    for (article_id, comment), (score, sensible) in zip(owners, scorer.score(texts, cache)):
+        result = results[article_id]
+        if comment is None:
+            result['toxicite_score'], result['sensible'] = score, sensible
+            continue
+        result['comments'][comment['id']] = (score, sensible)
+        if sensible:
+            result['comments_sensibles'].append({
+                'text': comment['texte'][:ANALYSIS_TEXT_LENGTH] + "...",
+                'comment_sensible': True,
+                'toxicite_score': score,
+            })
+    return results
@@ -6,7 +6,6 @@ from config.label_mapping import get_label_distribution, STANDARD_LABELS
 
 import sys
 import argparse
-import json
 from pathlib import Path
 from datetime import datetime
 import subprocess
@@ -14,6 +13,8 @@ import subprocess
 # Ajouter le répertoire parent au path
 sys.path.append(str(Path(__file__).parent))
 
+from utils.json_stream import iter_json, write_json_array
+
 
 def run_training_scraper(scraper_name, max_pages=10):
     """
@@ -84,8 +85,7 @@ def analyze_training_data():
         media_name = json_file.stem.replace('_training_data', '')
 
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                articles = json.load(f)
+            articles = list(iter_json(json_file))
 
             if not articles:
                 print(f"⚠️  {media_name}: Aucune donnée")
@@ -163,31 +163,31 @@ def merge_training_data(output_file="train_data/merged_training_data.json"):
     print(f"🔀 FUSION DES DONNÉES D'ENTRAÎNEMENT")
     print(f"{'='*60}\n")
 
-    all_data = []
-
-    # Parcourir tous les fichiers (sauf le merged)
-    for json_file in train_data_dir.glob("*_training_data.json"):
-        if "merged" in json_file.name:
-            continue
+    def iter_articles():
+        """
+        Articles de tous les fichiers (sauf le merged), lus en flux
+        """
+        for json_file in sorted(train_data_dir.glob("*_training_data.json")):
+            if "merged" in json_file.name:
+                continue
 
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                all_data.extend(data)
-                print(f"✅ Chargé {len(data)} articles depuis {json_file.name}")
-        except Exception as e:
-            print(f"❌ Erreur lors du chargement de {json_file}: {e}")
+            count = 0
+            try:
+                for article in iter_json(json_file):
+                    count += 1
+                    yield article
+                print(f"✅ Chargé {count} articles depuis {json_file.name}")
+            except ValueError as e:
+                print(f"❌ Erreur lors du chargement de {json_file} (après {count} articles): {e}")
 
-    # Sauvegarder les données fusionnées
+    # Écriture au fil de la lecture: la mémoire ne dépend pas de la taille des fichiers
     output_path = Path(__file__).parent / output_file
 
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(all_data, f, ensure_ascii=False, indent=2)
+        total = write_json_array(output_path, iter_articles())
+        print(f"\n✅ {total} articles fusionnés dans: {output_file}")
 
-        print(f"\n✅ {len(all_data)} articles fusionnés dans: {output_file}")
-
-    except Exception as e:
+    except OSError as e:
         print(f"❌ Erreur lors de la sauvegarde: {e}")
 
 
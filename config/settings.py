@@ -23,6 +23,93 @@ SCRAPING_CONFIG = {
     "retry_times": 3,
 }
 
+# Scraped items output
+# Items are written as JSON Lines, one directory per media and crawl date:
+# data/raw/<media>/<YYYY-MM-DD>/<spider>-<time>-<batch>.jsonl
+# A file is written as .part and renamed when complete (every "batch_item_count" items)
+# Comment deltas of the comment refresh mode go to their own files under data/comments
+FEED_CONFIG = {
+    "uri": str(RAW_DATA_DIR / "%(source)s" / "%(date)s" / "%(name)s-%(time)s-%(batch_id)03d.jsonl"),
+    "comments_uri": str(DATA_DIR / "comments" / "%(source)s" / "%(date)s" / "%(name)s-%(time)s-%(batch_id)03d.jsonl"),
+    "batch_item_count": 1000,
+}
+
+# Incremental crawl settings
+# Known article ids are skipped and a category stops being paginated
+# as soon as one of its listing pages only contains known articles
+INCREMENTAL_CONFIG = {
+    "enabled": False,                # Enable with: python main.py --scrape --incremental
+    "index_path": DATA_DIR / "state" / "seen_articles.db",
+}
+
+# Comment refresh mode (Lefaso): revisit the articles of the seen index published
+# in the last "max_age_days" days and emit only their new comments
+# Run with: python main.py --refresh-comments
+COMMENT_REFRESH_CONFIG = {
+    "max_age_days": 14,
+}
+
+# HTTP cache settings (conditional GET)
+# Pages are stored compressed with their ETag/Last-Modified validators and
+# revalidated on every crawl: a 304 answer is served from the cache
+HTTP_CACHE_CONFIG = {
+    "enabled": True,
+    "dir": DATA_DIR / "cache" / "http",
+    "gzip": True,
+}
+
+# Adaptive per-domain throttling
+# Concurrency and delay start from these values and are adjusted from the observed
+# latency and error/429 rates, within the bounds below. A media can narrow the
+# bounds with a "throttle" entry in MEDIA_SOURCES.
+THROTTLE_CONFIG = {
+    "enabled": True,
+    "start_delay": SCRAPING_CONFIG["download_delay"],
+    "min_delay": 0.25,               # Politeness floor between two requests (seconds)
+    "max_delay": 30.0,
+    "start_concurrency": 2,
+    "min_concurrency": 1,
+    "max_concurrency": 8,
+    "target_latency": 2.0,           # Above this latency, the domain is slowed down
+    "error_rate": 0.1,               # Max error rate before holding the pace
+    "window": 20,                    # Number of responses used for the error rate
+}
+
+# Article discovery
+# Each media can enumerate its articles from its XML sitemaps or RSS feeds instead of
+# paginating HTML category listings, with "discovery" set in MEDIA_SOURCES to
+# "sitemap", "feed" or "listing" (default). When no sitemap/feed can be read,
+# the spider falls back to the listing crawl.
+DISCOVERY_CONFIG = {
+    "default_mode": "listing",
+    "max_age_days": 30,              # Ignore sitemap/feed entries modified before this window
+    # Entries without <lastmod> (WordPress core wp-sitemap.xml) cannot be checked against
+    # the window: only the newest undated child sitemaps are followed, and the undated
+    # article URLs requested per run are capped
+    "max_undated_sitemaps": 1,
+    "max_undated": 200,
+    # Children of a sitemap index to follow (WordPress core and Yoast/RankMath post sitemaps)
+    "sitemap_follow": r"(wp-sitemap-posts-post-\d+|post-sitemap\d*)\.xml",
+}
+
+# WordPress REST API fast path (media with "wp_api": True in MEDIA_SOURCES)
+# Articles are read from /wp-json/wp/v2/posts, most recently modified first,
+# within DISCOVERY_CONFIG["max_age_days"]
+WP_API_CONFIG = {
+    "per_page": 100,                 # Maximum allowed by WordPress
+    "max_pages": 20,
+}
+
+# Response recording for the offline parsing benchmark (scripts/benchmark_parsing.py)
+# Listing and article pages are written to <dir>/<spider>.jsonl.gz, one JSON record per
+# response, overwritten at every recorded crawl. Enable with: python main.py --scrape --record
+RECORDER_CONFIG = {
+    "enabled": False,
+    "dir": DATA_DIR / "fixtures",
+    "max_per_callback": 50,          # Responses kept per spider and callback
+    "callbacks": ("parse_article_list", "parse_article"),
+}
+
 # Media sources configuration
 MEDIA_SOURCES = {
     "lefaso": {
@@ -43,11 +130,27 @@ MEDIA_SOURCES = {
         "name": "FasoPresse",
         "base_url": "https://fasopresse.net",
         "enabled": True,
+        "throttle": {
+            "min_delay": 1.0,        # Petit serveur Joomla: rester respectueux
+            "max_concurrency": 1,
+        },
+        "discovery": "feed",
+        "feed_urls": [
+            "/politique?format=feed&type=rss",
+            "/economie?format=feed&type=rss",
+            "/societe?format=feed&type=rss",
+            "/sante-et-social?format=feed&type=rss",
+            "/international?format=feed&type=rss",
+            "/sports?format=feed&type=rss",
+        ],
     },
     "sidwaya": {
         "name": "Sidwaya",
         "base_url": "https://www.sidwaya.info",
         "enabled": True,
+        "wp_api": True,
+        "discovery": "sitemap",
+        "sitemap_urls": ["/wp-sitemap.xml", "/sitemap_index.xml"],
     },
     "observateur_paalga": {
         "name": "L'Observateur Paalga",
@@ -58,11 +161,17 @@ MEDIA_SOURCES = {
         "name": "AIB (Agence d'Information du Burkina)",
         "base_url": "https://www.aib.media/",
         "enabled": True,
+        "wp_api": True,
+        "discovery": "sitemap",
+        "sitemap_urls": ["/wp-sitemap.xml", "/sitemap_index.xml"],
     },
     "burkina_24": {
         "name": "Burkina 24",
         "base_url": "https://burkina24.com",
         "enabled": True,
+        "wp_api": True,
+        "discovery": "sitemap",
+        "sitemap_urls": ["/wp-sitemap.xml", "/sitemap_index.xml"],
     }
 
 }
@@ -119,6 +228,67 @@ MODEL_CONFIG = {
     "batch_size": 16,
     "test_size": 0.2,
     "random_state": 42,
+    # Fine-tuned classifier used by python main.py --analyze (analysis/classifier.py),
+    # labels in the order of its outputs
+    "news_classifier": "Minervus00/camembert-news-classifier",
+    "news_classifier_revision": None,  # branch, tag or commit on the hub (None: latest)
+    "news_labels": ["Autres", "Culture", "Politique", "Santé", "Sport", "Sécurité", "Économie"],
+    "inference_max_length": 256,     # tokens kept per article
+    "inference_batch_size": 32,      # articles per batch at most...
+    "inference_max_tokens": 8192,    # ...and padded tokens per batch at most
+    "inference_threads": None,       # torch threads (None: one per core)
+    # Long documents: overlapping windows over the whole text instead of its first tokens,
+    # logits averaged over the windows, token_budget tokens per article at most
+    "long_documents": False,
+    "window_overlap": 64,            # tokens shared by two consecutive windows
+    "token_budget": 1024,            # 4 windows of 256 tokens
+    # "torch": PyTorch float32; "onnx": int8 ONNX export (python -m analysis.onnx_export), faster on CPU
+    "inference_backend": "torch",
+    "onnx_model": BASE_DIR / "models" / "news_classifier_onnx" / "model.int8.onnx",
+    # Toxicity of the articles and comments (analysis/toxicity.py): Detoxify model, labels
+    # making a text sensitive when one of them reaches TOXICITY_THRESHOLD
+    "toxicity_model": "multilingual",
+    "toxicity_max_length": 512,      # tokens kept per text, as Detoxify.predict
+    "toxicity_sensitive_labels": ["toxicity", "sexual_explicit", "obscene"],
+    # Outputs by (normalized text, model, revision), looked up before inference (analysis/cache.py)
+    "inference_cache": BASE_DIR / "database" / "inference_cache.db",
+}
+
+# Columnar article store read by the dashboard (written by the import and the analysis)
+# <dir>/media=<media>/month=<YYYY-MM>/articles.parquet
+# <dir>/snapshot/*.arrow: frames of the dashboard, memory-mapped at startup (database/snapshot.py)
+ARTICLE_STORE_CONFIG = {
+    "dir": PROCESSED_DATA_DIR / "articles",
+    "compression": "zstd",
+    # Imported articles buffered before a write (one rewrite of the partitions they touch),
+    # bounds the import memory whatever the size of the raw files
+    "write_buffer": 5000,
+}
+
+# Typed ingest: malformed records are written here instead of being imported
+# The import skips the records already imported (same id and content): Bloom filter
+# stored next to the database (<database>.bloom), sized for bloom_capacity articles
+INGEST_CONFIG = {
+    "quarantine_dir": DATA_DIR / "quarantine",
+    "dedup": True,
+    "bloom_capacity": 20_000_000,    # ~24 Mo sur disque
+    "bloom_error_rate": 0.01,
+}
+
+# Cold tier of the article texts (python main.py --tier): the bodies and comments of the
+# articles published more than max_age_days ago are moved to zstd-compressed blobs
+# (database/cold_store.py, <database>_cold.db), compressed with a dictionary trained
+# on dictionary_samples texts of the database
+TIERING_CONFIG = {
+    "max_age_days": 180,
+    "zstd_level": 19,
+    "dictionary_size": 112_640,      # 110 Ko
+    "dictionary_samples": 5000,
+}
+
+# Full-text search (main.py --search, dashboard search page)
+SEARCH_CONFIG = {
+    "results_per_page": 10,
 }
 
 # Dashboard settings
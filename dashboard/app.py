@@ -8,11 +8,14 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import pandas as pd
 import sys
+import time
 from pathlib import Path
 
 # Ajouter le répertoire parent au path pour les imports
 sys.path.append(str(Path(__file__).parent.parent))
 
+from config.settings import DATABASE_PATH, SEARCH_CONFIG
+from database.db_manager import DatabaseManager
 from dashboard.data_loader import DataLoader
 from dashboard.report_generator import ReportGenerator
 from dashboard.media_config import (
@@ -106,11 +109,26 @@ if 'data_loaded' not in st.session_state:
     st.session_state.data_loaded = False
     st.session_state.data_loader = None
 
+# Périodes chargées: seules les partitions Parquet de la période sont lues
+PERIODES = {
+    "30 derniers jours": 30,
+    "90 derniers jours": 90,
+    "12 derniers mois": 365,
+    "Tout l'historique": None,
+}
+
 # Fonction pour charger les données
 @st.cache_data
-def load_data():
-    """Charge les données depuis le fichier JSON"""
+def load_data(period_days=None):
+    """Charge l'instantané du dataset Parquet, sinon le dataset, sinon le fichier JSON"""
     loader = DataLoader()
+    for load in (loader.load_snapshot, loader.load_store):
+        try:
+            load(period_days=period_days)
+            return loader
+        except (FileNotFoundError, ImportError):
+            pass
+
     try:
         loader.load_data("final_db1.json")
         return loader
@@ -130,10 +148,17 @@ st.sidebar.markdown("### 🧭 Navigation")
 page = st.sidebar.selectbox(
     "Choisissez une page",
     ["🏠 Accueil", "📊 Analyse des Médias", "📑 Analyse Thématique",
-     "⚠️ Contenus Sensibles", "📈 Engagement", "📥 Exporter les Rapports"],
+     "⚠️ Contenus Sensibles", "📈 Engagement", "🔎 Recherche", "📥 Exporter les Rapports"],
     label_visibility="collapsed"
 )
 
+# Période chargée
+st.sidebar.markdown("---")
+periode = st.sidebar.selectbox("📅 Période", list(PERIODES), index=0)
+if st.session_state.get('periode') != periode:
+    st.session_state.periode = periode
+    st.session_state.data_loaded = False
+
 # Bouton de rechargement des données
 st.sidebar.markdown("---")
 if st.sidebar.button("🔄 Recharger les données"):
@@ -144,7 +169,7 @@ if st.sidebar.button("🔄 Recharger les données"):
 # Chargement des données
 if not st.session_state.data_loaded:
     with st.spinner("Chargement des données..."):
-        data_loader = load_data()
+        data_loader = load_data(PERIODES[periode])
         if data_loader:
             st.session_state.data_loader = data_loader
             st.session_state.data_loaded = True
@@ -548,13 +573,11 @@ elif page == "📊 Analyse des Médias":
                     st.metric("Articles publiés", len(media_articles))
 
                 with col2:
-                    total_eng = media_articles['engagement'].apply(
-                        lambda x: x.get('likes', 0) + x.get('partages', 0) + x.get('commentaires', 0)
-                    ).sum()
+                    total_eng = data_loader.engagement_total(media_articles).sum()
                     st.metric("Engagement total", f"{total_eng:,}")
 
                 with col3:
-                    sensitive_count = len(media_articles[media_articles['sensible'] == True])
+                    sensitive_count = int(media_articles['sensible'].sum())
                     st.metric("Articles sensibles", sensitive_count)
 
                 # Distribution des catégories pour ce média
@@ -654,9 +677,7 @@ elif page == "📑 Analyse Thématique":
                     st.metric("Nombre d'articles", len(cat_articles))
 
                 with col2:
-                    avg_engagement = cat_articles['engagement'].apply(
-                        lambda x: x.get('likes', 0) + x.get('partages', 0) + x.get('commentaires', 0)
-                    ).mean()
+                    avg_engagement = data_loader.engagement_total(cat_articles).mean()
                     st.metric("Engagement moyen", f"{avg_engagement:.0f}")
 
                 with col3:
@@ -975,7 +996,42 @@ elif page == "📈 Engagement":
                     st.metric(metric_label[engagement_type], f"{article['score']:,}")
 
 # ============================================================================
-# PAGE 6: EXPORT DE RAPPORTS
+# PAGE 6: RECHERCHE PLEIN TEXTE
+# ============================================================================
+elif page == "🔎 Recherche":
+    st.title("🔎 Recherche dans les Articles")
+    st.markdown("### Titres, textes et commentaires des articles importés")
+
+    if not DATABASE_PATH.exists():
+        st.warning("Base de données introuvable. Importez d'abord les articles avec `python main.py --import`.")
+        st.stop()
+
+    query = st.text_input("Rechercher", placeholder='ex: sécurité, "forces armées", secur*')
+    st.caption('Tous les mots doivent apparaître; "mots entre guillemets" pour une expression exacte, '
+               'mot* pour un préfixe. Les accents et les majuscules sont ignorés.')
+
+    if query:
+        per_page = SEARCH_CONFIG['results_per_page']
+        with DatabaseManager(DATABASE_PATH) as db:
+            total = db.count_matches(query)
+            nb_pages = max(1, -(-total // per_page))
+            page_num = st.number_input("Page", min_value=1, max_value=nb_pages, value=1, step=1)
+
+            start = time.perf_counter()
+            hits = db.search(query, limit=per_page, offset=(page_num - 1) * per_page)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+        st.write(f"**{total} article(s)** trouvé(s) en {elapsed_ms:.0f} ms - page {page_num}/{nb_pages}")
+
+        for hit in hits:
+            st.markdown(f"**[{hit.titre}]({hit.url})**")
+            st.caption(f"{hit.media} - {(hit.date_publication or 'date inconnue')[:10]}")
+            # Extrait autour des mots trouvés (en gras)
+            st.markdown(hit.extrait)
+            st.markdown("---")
+
+# ============================================================================
+# PAGE 7: EXPORT DE RAPPORTS
 # ============================================================================
 elif page == "📥 Exporter les Rapports":
     st.title("📥 Exporter les Rapports")
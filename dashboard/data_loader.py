@@ -1,26 +1,30 @@
 """
 Module utilitaire pour charger et traiter les données du dashboard
 """
-import json
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
 import pandas as pd
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 class DataLoader:
     """Classe pour charger et traiter les données du dashboard"""
 
-    def __init__(self, data_dir: str = "data/processed"):
+    def __init__(self, data_dir: str = "data/processed", store_dir: Optional[str] = None):
         """
         Initialise le DataLoader
 
         Args:
             data_dir: Chemin vers le répertoire des données traitées
+            store_dir: Répertoire du dataset Parquet (défaut: ARTICLE_STORE_CONFIG)
         """
         self.data_dir = Path(data_dir)
+        self.store_dir = store_dir
         self.articles_df = None
         self.medias_df = None
+        # Agrégats par média, jour et catégorie (database/rollups.py): totaux,
+        # répartitions et courbes des pages sont calculés sur ces lignes
+        self.daily_df = None
 
     def load_data(self, filename: str = "sample_data.json") -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
@@ -37,19 +41,102 @@ class DataLoader:
         if not filepath.exists():
             raise FileNotFoundError(f"Le fichier {filepath} n'existe pas")
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        from database.ingest import ArticleIngest, to_frame
+        from database.rollups import daily_rollup
+        from utils.json_stream import iter_json_members
 
-        # Convertir en DataFrames
-        self.articles_df = pd.DataFrame(data.get('articles', []))
-        self.medias_df = pd.DataFrame(data.get('medias', []))
+        # Lecture en flux: les articles sont typés au fil du fichier (engagement en colonnes
+        # entières, sensible booléen, score float32), les articles invalides sont mis en quarantaine
+        articles, medias = [], []
+        with ArticleIngest(source=filename) as ingest:
+            for name, value in iter_json_members(filepath):
+                if name == 'articles':
+                    articles = ingest.convert(value)
+                elif name == 'medias':
+                    medias = list(value)
 
-        # Convertir les dates
-        if not self.articles_df.empty and 'date' in self.articles_df.columns:
-            self.articles_df['date'] = pd.to_datetime(self.articles_df['date'], format='mixed')
+        self.articles_df = to_frame(articles)
+        self.medias_df = pd.DataFrame(medias)
+        self.daily_df = daily_rollup(self.articles_df)
 
         return self.articles_df, self.medias_df
 
+    def load_snapshot(self, period_days: Optional[int] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Charge l'instantané Arrow du dataset Parquet (database/snapshot.py)
+
+        Les fichiers sont projetés en mémoire et les colonnes sont déjà typées: pas de
+        décompression ni de conversion des dates au démarrage du dashboard. Un instantané
+        absent, d'une autre version ou plus ancien que le dataset lève FileNotFoundError.
+
+        Args:
+            period_days: Nombre de jours à conserver (None = tout l'historique)
+
+        Returns:
+            Tuple de (articles_df, medias_df)
+        """
+        from database.parquet_store import ParquetArticleStore
+        from database.snapshot import read_snapshot
+
+        store = ParquetArticleStore(self.store_dir) if self.store_dir else ParquetArticleStore()
+        articles, daily, medias = read_snapshot(store)
+
+        if period_days:
+            # Même période que load_store, en jours entiers
+            start = pd.Timestamp.now().normalize() - timedelta(days=period_days)
+            articles = articles[articles['date'] >= start].reset_index(drop=True)
+            daily = daily[daily['date'] >= start].reset_index(drop=True)
+
+        self.articles_df, self.medias_df, self.daily_df = articles, medias, daily
+        return self.articles_df, self.medias_df
+
+    def load_store(self, period_days: Optional[int] = None, medias: Optional[List[str]] = None,
+                   columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Charge les articles depuis le dataset Parquet (database/parquet_store.py)
+
+        Seules les partitions (média, mois) de la période et les colonnes utiles aux
+        pages sont lues: le texte des articles et les commentaires bruts ne sont pas chargés.
+        Les agrégats journaliers sont lus dans les fichiers daily.parquet des partitions.
+
+        Args:
+            period_days: Nombre de jours à charger (None = tout l'historique)
+            medias: Médias à charger (None = tous)
+            columns: Colonnes à lire (défaut: colonnes utilisées par le dashboard)
+
+        Returns:
+            Tuple de (articles_df, medias_df)
+        """
+        from database.parquet_store import ParquetArticleStore, DASHBOARD_COLUMNS
+
+        store = ParquetArticleStore(self.store_dir) if self.store_dir else ParquetArticleStore()
+        if not store.exists():
+            raise FileNotFoundError(f"Le dataset {store.directory} n'existe pas")
+
+        # Période en jours entiers: les agrégats journaliers couvrent les mêmes articles
+        start = pd.Timestamp.now().normalize() - timedelta(days=period_days) if period_days else None
+        self.articles_df = store.read(columns or DASHBOARD_COLUMNS, start=start, medias=medias)
+        self.medias_df = store.read_medias()
+        self.daily_df = store.read_daily(start, medias=medias)
+
+        # Mêmes types que load_data
+        self.articles_df['date'] = self.articles_df['date'].astype('datetime64[ns]')
+
+        return self.articles_df, self.medias_df
+
+    def engagement_total(self, df: Optional[pd.DataFrame] = None) -> pd.Series:
+        """
+        Engagement de chaque article (likes + partages + commentaires)
+
+        Args:
+            df: Articles ou agrégats journaliers (défaut: tous les articles chargés)
+
+        Returns:
+            Série d'entiers alignée sur les lignes de df
+        """
+        df = self.articles_df if df is None else df
+        return df['likes'] + df['partages'] + df['commentaires']
+
     def get_global_stats(self) -> Dict:
         """
         Calcule les statistiques globales
@@ -57,23 +144,24 @@ class DataLoader:
         Returns:
             Dictionnaire avec les statistiques
         """
-        if self.articles_df is None or self.articles_df.empty:
+        if self.daily_df is None or self.daily_df.empty:
             return {}
 
-        # Extraire les métriques d'engagement
-        total_likes = self.articles_df['engagement'].apply(lambda x: x.get('likes', 0)).sum()
-        total_partages = self.articles_df['engagement'].apply(lambda x: x.get('partages', 0)).sum()
-        total_commentaires = self.articles_df['engagement'].apply(lambda x: x.get('commentaires', 0)).sum()
+        total_articles = int(self.daily_df['nb_articles'].sum())
+        total_likes = int(self.daily_df['likes'].sum())
+        total_partages = int(self.daily_df['partages'].sum())
+        total_commentaires = int(self.daily_df['commentaires'].sum())
+        articles_sensibles = int(self.daily_df['nb_sensibles'].sum())
 
         stats = {
-            'total_articles': len(self.articles_df),
+            'total_articles': total_articles,
             'total_medias': len(self.medias_df) if self.medias_df is not None else 0,
             'total_engagement': total_likes + total_partages + total_commentaires,
             'total_likes': total_likes,
             'total_partages': total_partages,
             'total_commentaires': total_commentaires,
-            'articles_sensibles': len(self.articles_df[self.articles_df['sensible'] == True]),
-            'taux_sensible': (len(self.articles_df[self.articles_df['sensible'] == True]) / len(self.articles_df) * 100) if len(self.articles_df) > 0 else 0
+            'articles_sensibles': articles_sensibles,
+            'taux_sensible': (articles_sensibles / total_articles * 100) if total_articles > 0 else 0
         }
 
         return stats
@@ -85,12 +173,14 @@ class DataLoader:
         Returns:
             DataFrame avec le nombre d'articles par catégorie
         """
-        if self.articles_df is None or self.articles_df.empty:
+        if self.daily_df is None or self.daily_df.empty:
             return pd.DataFrame()
 
-        category_stats = self.articles_df.groupby('categorie').agg({
-            'id': 'count',
-            'engagement': lambda x: sum(e.get('likes', 0) + e.get('partages', 0) + e.get('commentaires', 0) for e in x)
+        category_stats = self.daily_df.assign(
+            engagement=self.engagement_total(self.daily_df)
+        ).groupby('categorie').agg({
+            'nb_articles': 'sum',
+            'engagement': 'sum'
         }).reset_index()
 
         category_stats.columns = ['Catégorie', 'Nombre d\'articles', 'Engagement total']
@@ -105,12 +195,14 @@ class DataLoader:
         Returns:
             DataFrame avec le nombre d'articles par média
         """
-        if self.articles_df is None or self.articles_df.empty:
+        if self.daily_df is None or self.daily_df.empty:
             return pd.DataFrame()
 
-        media_stats = self.articles_df.groupby('media').agg({
-            'id': 'count',
-            'engagement': lambda x: sum(e.get('likes', 0) + e.get('partages', 0) + e.get('commentaires', 0) for e in x)
+        media_stats = self.daily_df.assign(
+            engagement=self.engagement_total(self.daily_df)
+        ).groupby('media').agg({
+            'nb_articles': 'sum',
+            'engagement': 'sum'
         }).reset_index()
 
         media_stats.columns = ['Média', 'Nombre d\'articles', 'Engagement total']
@@ -128,18 +220,18 @@ class DataLoader:
         Returns:
             DataFrame avec les articles par jour
         """
-        if self.articles_df is None or self.articles_df.empty:
+        if self.daily_df is None or self.daily_df.empty:
             return pd.DataFrame()
 
         # Filtrer les derniers jours
-        end_date = self.articles_df['date'].max()
+        end_date = self.daily_df['date'].max()
         start_date = end_date - timedelta(days=days)
 
-        filtered_df = self.articles_df[self.articles_df['date'] >= start_date].copy()
+        filtered_df = self.daily_df[self.daily_df['date'] >= start_date]
 
         # Grouper par date
         timeline = filtered_df.groupby(filtered_df['date'].dt.date).agg({
-            'id': 'count'
+            'nb_articles': 'sum'
         }).reset_index()
 
         timeline.columns = ['Date', 'Nombre d\'articles']
@@ -157,14 +249,14 @@ class DataLoader:
         Returns:
             DataFrame avec les articles par jour et par média
         """
-        if self.articles_df is None or self.articles_df.empty:
+        if self.daily_df is None or self.daily_df.empty:
             return pd.DataFrame()
 
         # Filtrer les derniers jours
-        end_date = self.articles_df['date'].max()
+        end_date = self.daily_df['date'].max()
         start_date = end_date - timedelta(days=days)
 
-        filtered_df = self.articles_df[self.articles_df['date'] >= start_date].copy()
+        filtered_df = self.daily_df[self.daily_df['date'] >= start_date]
 
         # Filtrer par médias sélectionnés si spécifié
         if selected_medias is not None and len(selected_medias) > 0:
@@ -175,7 +267,7 @@ class DataLoader:
 
         # Grouper par date et média
         timeline = filtered_df.groupby([filtered_df['date'].dt.date, 'media']).agg({
-            'id': 'count'
+            'nb_articles': 'sum'
         }).reset_index()
 
         timeline.columns = ['Date', 'Média', 'Nombre d\'articles']
@@ -196,7 +288,7 @@ class DataLoader:
             return pd.DataFrame()
 
         sensitive = self.articles_df[
-            (self.articles_df['sensible'] == True) |
+            self.articles_df['sensible'] |
             (self.articles_df['toxicite_score'] >= min_toxicity)
         ].copy()
 
@@ -225,11 +317,9 @@ class DataLoader:
 
         # Calculer la métrique
         if metric == 'engagement':
-            df['score'] = df['engagement'].apply(
-                lambda x: x.get('likes', 0) + x.get('partages', 0) + x.get('commentaires', 0)
-            )
+            df['score'] = self.engagement_total(df)
         else:
-            df['score'] = df['engagement'].apply(lambda x: x.get(metric, 0))
+            df['score'] = df[metric]
 
         # Trier et sélectionner le top
         top = df.nlargest(n, 'score')[['id', 'media', 'titre', 'date', 'categorie', 'score', 'url']]
@@ -243,10 +333,11 @@ class DataLoader:
         Returns:
             Dictionnaire {catégorie: nombre d'articles}
         """
-        if self.articles_df is None or self.articles_df.empty:
+        if self.daily_df is None or self.daily_df.empty:
             return {}
 
-        return self.articles_df['categorie'].value_counts().to_dict()
+        distribution = self.daily_df.groupby('categorie')['nb_articles'].sum()
+        return distribution[distribution > 0].sort_values(ascending=False).to_dict()
 
     def get_media_ranking(self) -> pd.DataFrame:
         """
@@ -269,16 +360,12 @@ class DataLoader:
         Returns:
             DataFrame avec l'engagement par catégorie
         """
-        if self.articles_df is None or self.articles_df.empty:
+        if self.daily_df is None or self.daily_df.empty:
             return pd.DataFrame()
 
-        df = self.articles_df.copy()
+        df = self.daily_df.copy()
 
-        # Extraire les métriques d'engagement
-        df['likes'] = df['engagement'].apply(lambda x: x.get('likes', 0))
-        df['partages'] = df['engagement'].apply(lambda x: x.get('partages', 0))
-        df['commentaires'] = df['engagement'].apply(lambda x: x.get('commentaires', 0))
-        df['total_engagement'] = df['likes'] + df['partages'] + df['commentaires']
+        df['total_engagement'] = self.engagement_total(df)
 
         # Grouper par catégorie
         engagement = df.groupby('categorie').agg({
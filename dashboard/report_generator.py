@@ -72,12 +72,8 @@ class ReportGenerator:
 
             # Onglet 8: Tous les articles
             if self.data_loader.articles_df is not None and not self.data_loader.articles_df.empty:
-                # Créer une version aplatie pour Excel
-                articles_export = self.data_loader.articles_df.copy()
-                articles_export['likes'] = articles_export['engagement'].apply(lambda x: x.get('likes', 0))
-                articles_export['partages'] = articles_export['engagement'].apply(lambda x: x.get('partages', 0))
-                articles_export['commentaires'] = articles_export['engagement'].apply(lambda x: x.get('commentaires', 0))
-                articles_export = articles_export.drop('engagement', axis=1)
+                # L'engagement est déjà en colonnes (likes, partages, commentaires)
+                articles_export = self.data_loader.articles_df
                 articles_export.to_excel(writer, sheet_name='Tous les Articles', index=False)
 
         output.seek(0)
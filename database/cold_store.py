@@ -0,0 +1,175 @@
+"""
+Cold tier of the article texts (bodies and comments)
+
+The texts of the old articles are only read when an article is opened or shown in
+the search results, while they make most of the database. DatabaseManager.tier_articles
+moves them here and keeps the metadata, counters and scores in the articles table,
+with a reference to the blobs (body_ref, comments_ref); reads go through
+DatabaseManager.get_article / article_texts, which fetch the blobs transparently.
+
+Blobs are content-addressed (key = hash of the text, identical texts are stored once)
+and compressed with zstd using a dictionary trained on our own articles: short French
+news texts share most of their vocabulary and phrasing, which a per-blob compressor
+cannot learn from a single article. Each blob records its dictionary, so a dictionary
+retrained later does not invalidate the blobs written before.
+
+Stored in a separate SQLite file next to the database (<database>_cold.db), which
+can be moved to cheaper storage. Requires the zstandard package.
+"""
+import hashlib
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import zstandard
+
+
+COLD_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dictionaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data BLOB NOT NULL,
+    samples INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    dictionary_id INTEGER REFERENCES dictionaries (id),
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ColdStore:
+    """
+    zstd-compressed, content-addressed text blobs
+
+        cold = ColdStore(path)
+        refs = cold.put_many(texts)        # hashes, in the order of the texts
+        cold.get_many(refs)                # {hash: text}
+    """
+
+    def __init__(self, path: Path, level: int = 19):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.level = level
+
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(COLD_SCHEMA)
+
+        self._decompressors: Dict[Optional[int], zstandard.ZstdDecompressor] = {}
+        self._compressor = None
+        self.dictionary_id = self.conn.execute("SELECT MAX(id) FROM dictionaries").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Dictionaries
+    # ------------------------------------------------------------------
+
+    def train_dictionary(self, samples: List[str], size: int) -> int:
+        """
+        Train a zstd dictionary on sample texts, it compresses the blobs written from now on
+        """
+        dictionary = zstandard.train_dictionary(size, [sample.encode('utf-8') for sample in samples])
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO dictionaries (data, samples, created_at) VALUES (?, ?, ?)",
+                (dictionary.as_bytes(), len(samples), datetime.now().isoformat())
+            )
+        self.dictionary_id = cursor.lastrowid
+        self._compressor = None
+        return self.dictionary_id
+
+    def _dictionary(self, dictionary_id: int) -> zstandard.ZstdCompressionDict:
+        data = self.conn.execute("SELECT data FROM dictionaries WHERE id = ?", (dictionary_id,)).fetchone()[0]
+        return zstandard.ZstdCompressionDict(data)
+
+    def _compressor_for_writes(self) -> zstandard.ZstdCompressor:
+        if self._compressor is None:
+            if self.dictionary_id is None:
+                self._compressor = zstandard.ZstdCompressor(level=self.level)
+            else:
+                self._compressor = zstandard.ZstdCompressor(
+                    level=self.level, dict_data=self._dictionary(self.dictionary_id)
+                )
+        return self._compressor
+
+    def _decompressor(self, dictionary_id: Optional[int]) -> zstandard.ZstdDecompressor:
+        decompressor = self._decompressors.get(dictionary_id)
+        if decompressor is None:
+            if dictionary_id is None:
+                decompressor = zstandard.ZstdDecompressor()
+            else:
+                decompressor = zstandard.ZstdDecompressor(dict_data=self._dictionary(dictionary_id))
+            self._decompressors[dictionary_id] = decompressor
+        return decompressor
+
+    # ------------------------------------------------------------------
+    # Blobs
+    # ------------------------------------------------------------------
+
+    def put_many(self, texts: Iterable[str]) -> List[str]:
+        """
+        Store texts (one transaction), returns their hashes; texts already stored are not compressed again
+        """
+        texts = list(texts)
+        hashes = [text_hash(text) for text in texts]
+        known = {
+            row[0] for row in self.conn.execute(
+                "SELECT hash FROM blobs WHERE hash IN (SELECT value FROM json_each(?))",
+                (json.dumps(hashes),)
+            )
+        }
+
+        compressor = self._compressor_for_writes()
+        rows = {}
+        for digest, text in zip(hashes, texts):
+            if digest in known or digest in rows:
+                continue
+            data = text.encode('utf-8')
+            rows[digest] = (digest, self.dictionary_id, len(data), compressor.compress(data))
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO blobs (hash, dictionary_id, size, data) VALUES (?, ?, ?, ?)",
+                rows.values()
+            )
+        return hashes
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, str]:
+        """
+        Texts of some blobs {hash: text}, unknown hashes are absent
+        """
+        rows = self.conn.execute(
+            "SELECT hash, dictionary_id, data FROM blobs WHERE hash IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(hashes)),)
+        )
+        return {
+            digest: self._decompressor(dictionary_id).decompress(data).decode('utf-8')
+            for digest, dictionary_id, data in rows
+        }
+
+    def get(self, digest: str) -> Optional[str]:
+        row = self.conn.execute("SELECT dictionary_id, data FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        return self._decompressor(row[0]).decompress(row[1]).decode('utf-8') if row else None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Number of blobs, text size and compressed size (bytes)
+        """
+        count, size, compressed = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(length(data)), 0) FROM blobs"
+        ).fetchone()
+        return {'blobs': count, 'size': size, 'compressed': compressed}
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,144 @@
+"""
+Comments of the articles as rows: one per comment or reply, linked to its parent
+
+The scrapers keep the comments inside each article (comments: [{key, date, text,
+replies: [...]}], see scrapers/comments.py) and the analysis keeps the sensitive ones
+in comments_sensibles ({text: first 500 characters + "...", comment_sensible,
+toxicite_score}). DatabaseManager copies them to the comments table at import, so
+comments can be scored and queried on their own (most toxic comments of the week per
+media, comments of a thread...) without decoding whole articles.
+"""
+import hashlib
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from scrapers.comments import comment_key
+
+FRENCH_MONTHS = {
+    'janvier': 1, 'février': 2, 'fevrier': 2, 'mars': 3, 'avril': 4, 'mai': 5, 'juin': 6,
+    'juillet': 7, 'août': 8, 'aout': 8, 'septembre': 9, 'octobre': 10, 'novembre': 11,
+    'décembre': 12, 'decembre': 12,
+}
+
+# "12 mars 2024 à 10:15", "1er avril 2024 à 9h05", "Samedi 3 février 2024 à 18:40, par X"
+FRENCH_DATE = re.compile(r'(\d{1,2})(?:er)?\s+([^\W\d_]+)\s+(\d{4})(?:\D{1,6}(\d{1,2})\s*[:h]\s*(\d{2}))?')
+NUMERIC_DATE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})(?:\D{1,6}(\d{1,2})\s*[:h]\s*(\d{2}))?')
+
+# Length of the comment texts kept by the analysis in comments_sensibles
+ANALYSIS_TEXT_LENGTH = 500
+
+
+def parse_comment_date(value: Optional[str]) -> Optional[str]:
+    """
+    Date of a comment as written by the site -> 'YYYY-MM-DD HH:MM:SS', None when it cannot be read
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        pass
+
+    match = FRENCH_DATE.search(value)
+    if match and match.group(2).lower() in FRENCH_MONTHS:
+        day, month, year = int(match.group(1)), FRENCH_MONTHS[match.group(2).lower()], int(match.group(3))
+    else:
+        match = NUMERIC_DATE.search(value)
+        if not match:
+            return None
+        day, month, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
+    hour, minute = (int(match.group(4)), int(match.group(5))) if match.group(4) else (0, 0)
+    try:
+        return datetime(year, month, day, hour, minute).strftime('%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        return None
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def analysis_scores(comments_sensibles: Optional[List[Dict[str, Any]]]) -> Dict[str, tuple]:
+    """
+    (toxicite_score, sensible) of the comments kept by the analysis, by text prefix
+    """
+    scores = {}
+    for item in comments_sensibles or []:
+        if isinstance(item, dict) and item.get('text'):
+            prefix = item['text'].removesuffix('...')[:ANALYSIS_TEXT_LENGTH]
+            scores[prefix] = (item.get('toxicite_score'), bool(item.get('comment_sensible', True)))
+    return scores
+
+
+def comment_rows(article_id: str, comments: Iterable[Dict[str, Any]],
+                 comments_sensibles: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    Comments and replies of an article, in thread order, as rows of the comments table
+
+    Comments without a key (files collected before the keys) get the key the scraper
+    would give them. When the article was analyzed (comments_sensibles is not None), the
+    comments it did not keep are not sensitive; otherwise their sensitivity is unknown.
+    """
+    scores = analysis_scores(comments_sensibles)
+    analyzed = comments_sensibles is not None
+    rows = []
+
+    def walk(items, parent_id):
+        for item in items or []:
+            if not isinstance(item, dict):
+                continue
+            text = item.get('text') or ''
+            date = item.get('date')
+            key = item.get('key') or comment_key(article_id, date, text, parent_id)
+            score, sensible = scores.get(text[:ANALYSIS_TEXT_LENGTH], (None, False if analyzed else None))
+            rows.append({
+                'id': key,
+                'article_id': article_id,
+                'parent_id': parent_id,
+                'position': len(rows),
+                'date_texte': date,
+                'date_commentaire': parse_comment_date(date),
+                'texte': text,
+                'text_hash': text_hash(text),
+                'toxicite_score': score,
+                'sensible': sensible,
+            })
+            walk(item.get('replies'), key)
+
+    walk(comments, None)
+    return rows
+
+
+def merge_comments(article_id: str, thread: List[Dict[str, Any]], new_comments: Iterable[Dict[str, Any]]) -> int:
+    """
+    Add flat comments (scrapers/comments.py flatten_comments: key, parent_key, date, text)
+    to the thread of an article, in place: replies go under their parent, a reply whose
+    parent is not in the thread becomes a comment. Comments already in the thread are
+    skipped; returns the number of comments added
+    """
+    def key(item, parent_id=None):
+        return item.get('key') or comment_key(article_id, item.get('date'), item.get('text') or '', parent_id)
+
+    comments = {key(item): item for item in thread if isinstance(item, dict)}
+    known = set(comments)
+    for parent_id, item in list(comments.items()):
+        known.update(key(reply, parent_id) for reply in item.get('replies') or [] if isinstance(reply, dict))
+
+    added = 0
+    for comment in new_comments:
+        if comment['key'] in known:
+            continue
+        known.add(comment['key'])
+        added += 1
+        item = {'key': comment['key'], 'date': comment.get('date'), 'text': comment.get('text') or ''}
+        parent = comments.get(comment.get('parent_key'))
+        if parent is not None:
+            parent['replies'] = parent.get('replies') or []
+            parent['replies'].append(item)
+        else:
+            item['replies'] = []
+            thread.append(item)
+            comments[item['key']] = item
+    return added
@@ -0,0 +1,1138 @@
+"""
+Database manager of media-scan (SQLite)
+
+WAL journal and batched writes: articles are upserted with executemany in one
+transaction per batch, on their id (hash of the URL), so importing the same raw
+file twice leaves the database unchanged. Titles, bodies and comments are
+indexed for full-text search (SQLite FTS5) by triggers on the articles table.
+The content hash stored with each article lets the import skip the records already
+imported (database/dedup.py). The texts of old articles can be moved to a compressed
+cold tier (database/cold_store.py): get_article and the search fetch them back.
+The comments of the articles are also stored one per row (database/comments.py).
+
+Initialize the database with: python -m database.db_manager
+"""
+import json
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import (
+    DATABASE_PATH, INFLUENCE_WEIGHTS, ACTIVITY_CONFIG, CATEGORIES, TIERING_CONFIG,
+)
+from database.comments import ANALYSIS_TEXT_LENGTH, analysis_scores, comment_rows, merge_comments
+from database.dedup import content_hash
+from database.ingest import engagement_total
+from database.models import Article, Comment, Media, SearchHit
+from database.search import comment_texts, excerpt, fts_query, parse_query
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS medias (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nom TEXT NOT NULL UNIQUE,
+    base_url TEXT,
+    domaine TEXT,
+    type_media TEXT NOT NULL DEFAULT 'web',
+    nb_articles INTEGER NOT NULL DEFAULT 0,
+    engagement_total INTEGER NOT NULL DEFAULT 0,
+    derniere_publication TEXT,
+    actif_90j INTEGER NOT NULL DEFAULT 0,
+    score_influence REAL NOT NULL DEFAULT 0,
+    rang INTEGER,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    media_id INTEGER NOT NULL REFERENCES medias (id),
+    titre TEXT NOT NULL,
+    url TEXT NOT NULL,
+    date_publication TEXT,
+    contenu TEXT NOT NULL DEFAULT '',
+    rubrique TEXT,
+    categorie TEXT,
+    sensible INTEGER,
+    toxicite_score REAL,
+    nb_commentaires INTEGER NOT NULL DEFAULT 0,
+    nb_replies INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    partages INTEGER NOT NULL DEFAULT 0,
+    engagement_total INTEGER NOT NULL DEFAULT 0,
+    comments TEXT NOT NULL DEFAULT '[]',
+    scraped_at TEXT,
+    content_hash TEXT,
+    -- Texts moved to the cold tier (hash of the blob), contenu / comments are then empty
+    body_ref TEXT,
+    comments_ref TEXT,
+    imported_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_articles_media_date ON articles (media_id, date_publication);
+
+CREATE TABLE IF NOT EXISTS media_stats (
+    media_id INTEGER NOT NULL REFERENCES medias (id),
+    date TEXT NOT NULL,
+    nb_articles INTEGER NOT NULL,
+    engagement_total INTEGER NOT NULL,
+    articles_90j INTEGER NOT NULL,
+    PRIMARY KEY (media_id, date)
+);
+
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    media_id INTEGER REFERENCES medias (id),
+    type TEXT NOT NULL,
+    message TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    resolved INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Columns added to the articles table after its creation: (name, SQL type)
+ARTICLE_MIGRATIONS = [
+    ('sensible', 'INTEGER'),
+    ('toxicite_score', 'REAL'),
+    ('content_hash', 'TEXT'),
+    ('body_ref', 'TEXT'),
+    ('comments_ref', 'TEXT'),
+]
+
+# One row per comment or reply (database/comments.py), in sync with the comments of the
+# articles. Dates are kept as written by the site (date_texte) and parsed (date_commentaire,
+# NULL when unreadable); toxicite_score / sensible stay NULL until the comment is scored.
+COMMENT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS comments (
+    id TEXT PRIMARY KEY,
+    article_id TEXT NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    media_id INTEGER NOT NULL REFERENCES medias (id),
+    parent_id TEXT,
+    position INTEGER NOT NULL,
+    date_texte TEXT,
+    date_commentaire TEXT,
+    texte TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    toxicite_score REAL,
+    sensible INTEGER,
+    imported_at TEXT NOT NULL
+);
+
+-- Thread of an article, replies of a comment
+CREATE INDEX IF NOT EXISTS idx_comments_article ON comments (article_id, position);
+CREATE INDEX IF NOT EXISTS idx_comments_parent ON comments (parent_id) WHERE parent_id IS NOT NULL;
+-- Comments of a period (per media), scored ones for the toxicity rankings
+CREATE INDEX IF NOT EXISTS idx_comments_media_date ON comments (media_id, date_commentaire);
+CREATE INDEX IF NOT EXISTS idx_comments_toxicity ON comments (date_commentaire, media_id, toxicite_score)
+    WHERE toxicite_score IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_comments_unscored ON comments (id) WHERE toxicite_score IS NULL;
+-- Same text posted many times
+CREATE INDEX IF NOT EXISTS idx_comments_text ON comments (text_hash);
+"""
+
+# Daily counters per media, category and rubric (rubric: the theme of the articles not
+# classified yet), updated by triggers in the transaction that writes the articles, so
+# statistics and rankings read a few rows per media and day instead of every article.
+# Unknown day, category or rubric are stored as '' to stay part of the primary key.
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media_daily (
+    media_id INTEGER NOT NULL REFERENCES medias (id),
+    jour TEXT NOT NULL,
+    categorie TEXT NOT NULL,
+    rubrique TEXT NOT NULL,
+    nb_articles INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    partages INTEGER NOT NULL,
+    nb_commentaires INTEGER NOT NULL,
+    nb_replies INTEGER NOT NULL,
+    engagement_total INTEGER NOT NULL,
+    nb_sensibles INTEGER NOT NULL,
+    toxicite_max REAL,
+    PRIMARY KEY (media_id, jour, categorie, rubrique)
+);
+
+CREATE TRIGGER IF NOT EXISTS media_daily_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO media_daily VALUES (
+        new.media_id, COALESCE(substr(new.date_publication, 1, 10), ''),
+        COALESCE(new.categorie, ''), COALESCE(new.rubrique, ''),
+        1, new.likes, new.partages, new.nb_commentaires, new.nb_replies, new.engagement_total,
+        COALESCE(new.sensible, 0), new.toxicite_score
+    )
+    ON CONFLICT (media_id, jour, categorie, rubrique) DO UPDATE SET
+        nb_articles = nb_articles + 1,
+        likes = likes + excluded.likes,
+        partages = partages + excluded.partages,
+        nb_commentaires = nb_commentaires + excluded.nb_commentaires,
+        nb_replies = nb_replies + excluded.nb_replies,
+        engagement_total = engagement_total + excluded.engagement_total,
+        nb_sensibles = nb_sensibles + excluded.nb_sensibles,
+        toxicite_max = COALESCE(max(toxicite_max, excluded.toxicite_max), toxicite_max, excluded.toxicite_max);
+END;
+
+-- The old version leaves its group, the new one joins its group (a re-import of an
+-- unchanged article does nothing). The maximum toxicity of the old group is read again
+-- from its articles, only when the article had a score.
+CREATE TRIGGER IF NOT EXISTS media_daily_update AFTER UPDATE ON articles
+WHEN old.media_id IS NOT new.media_id OR old.date_publication IS NOT new.date_publication
+    OR old.categorie IS NOT new.categorie OR old.rubrique IS NOT new.rubrique
+    OR old.likes IS NOT new.likes OR old.partages IS NOT new.partages
+    OR old.nb_commentaires IS NOT new.nb_commentaires OR old.nb_replies IS NOT new.nb_replies
+    OR old.sensible IS NOT new.sensible OR old.toxicite_score IS NOT new.toxicite_score
+BEGIN
+    UPDATE media_daily SET
+        nb_articles = nb_articles - 1,
+        likes = likes - old.likes,
+        partages = partages - old.partages,
+        nb_commentaires = nb_commentaires - old.nb_commentaires,
+        nb_replies = nb_replies - old.nb_replies,
+        engagement_total = engagement_total - old.engagement_total,
+        nb_sensibles = nb_sensibles - COALESCE(old.sensible, 0),
+        toxicite_max = CASE WHEN old.toxicite_score IS NULL THEN toxicite_max ELSE (
+            SELECT max(a.toxicite_score) FROM articles a
+            WHERE a.media_id = old.media_id AND a.rowid != old.rowid
+              AND COALESCE(a.categorie, '') = media_daily.categorie
+              AND COALESCE(a.rubrique, '') = media_daily.rubrique
+              AND (a.date_publication >= media_daily.jour AND a.date_publication < date(media_daily.jour, '+1 day')
+                   OR (media_daily.jour = '' AND a.date_publication IS NULL))
+        ) END
+    WHERE media_id = old.media_id AND jour = COALESCE(substr(old.date_publication, 1, 10), '')
+      AND categorie = COALESCE(old.categorie, '') AND rubrique = COALESCE(old.rubrique, '');
+
+    DELETE FROM media_daily WHERE nb_articles = 0
+      AND media_id = old.media_id AND jour = COALESCE(substr(old.date_publication, 1, 10), '')
+      AND categorie = COALESCE(old.categorie, '') AND rubrique = COALESCE(old.rubrique, '');
+
+    INSERT INTO media_daily VALUES (
+        new.media_id, COALESCE(substr(new.date_publication, 1, 10), ''),
+        COALESCE(new.categorie, ''), COALESCE(new.rubrique, ''),
+        1, new.likes, new.partages, new.nb_commentaires, new.nb_replies, new.engagement_total,
+        COALESCE(new.sensible, 0), new.toxicite_score
+    )
+    ON CONFLICT (media_id, jour, categorie, rubrique) DO UPDATE SET
+        nb_articles = nb_articles + 1,
+        likes = likes + excluded.likes,
+        partages = partages + excluded.partages,
+        nb_commentaires = nb_commentaires + excluded.nb_commentaires,
+        nb_replies = nb_replies + excluded.nb_replies,
+        engagement_total = engagement_total + excluded.engagement_total,
+        nb_sensibles = nb_sensibles + excluded.nb_sensibles,
+        toxicite_max = COALESCE(max(toxicite_max, excluded.toxicite_max), toxicite_max, excluded.toxicite_max);
+END;
+
+CREATE TRIGGER IF NOT EXISTS media_daily_delete AFTER DELETE ON articles BEGIN
+    UPDATE media_daily SET
+        nb_articles = nb_articles - 1,
+        likes = likes - old.likes,
+        partages = partages - old.partages,
+        nb_commentaires = nb_commentaires - old.nb_commentaires,
+        nb_replies = nb_replies - old.nb_replies,
+        engagement_total = engagement_total - old.engagement_total,
+        nb_sensibles = nb_sensibles - COALESCE(old.sensible, 0),
+        toxicite_max = CASE WHEN old.toxicite_score IS NULL THEN toxicite_max ELSE (
+            SELECT max(a.toxicite_score) FROM articles a
+            WHERE a.media_id = old.media_id
+              AND COALESCE(a.categorie, '') = media_daily.categorie
+              AND COALESCE(a.rubrique, '') = media_daily.rubrique
+              AND (a.date_publication >= media_daily.jour AND a.date_publication < date(media_daily.jour, '+1 day')
+                   OR (media_daily.jour = '' AND a.date_publication IS NULL))
+        ) END
+    WHERE media_id = old.media_id AND jour = COALESCE(substr(old.date_publication, 1, 10), '')
+      AND categorie = COALESCE(old.categorie, '') AND rubrique = COALESCE(old.rubrique, '');
+
+    DELETE FROM media_daily WHERE nb_articles = 0
+      AND media_id = old.media_id AND jour = COALESCE(substr(old.date_publication, 1, 10), '')
+      AND categorie = COALESCE(old.categorie, '') AND rubrique = COALESCE(old.rubrique, '');
+END;
+"""
+
+# Full recomputation of the rollups (database created before them, consistency checks)
+ROLLUP_SELECT = """
+SELECT media_id, COALESCE(substr(date_publication, 1, 10), '') AS jour,
+       COALESCE(categorie, '') AS categorie, COALESCE(rubrique, '') AS rubrique,
+       COUNT(*), SUM(likes), SUM(partages), SUM(nb_commentaires), SUM(nb_replies),
+       SUM(engagement_total), SUM(COALESCE(sensible, 0)), MAX(toxicite_score)
+FROM articles
+GROUP BY 1, 2, 3, 4
+"""
+
+# Full-text index of the titles, bodies and comment texts (replies included), kept in
+# sync with the articles by triggers. unicode61 + remove_diacritics: "securite" finds
+# "sécurité", "l'armée" is indexed as "l" + "armée". Rows share the rowid of their article.
+# Contentless (content=''): the index keeps only the terms, the texts are read from the
+# articles (and the cold tier) for the excerpts. Removing a row from such an index takes
+# the texts it was indexed with: those of tiered articles are read back with cold_text().
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    titre, contenu, commentaires,
+    content = '',
+    tokenize = 'unicode61 remove_diacritics 2',
+    -- Prefix searches (secur*) read a prefix index instead of merging every matching term
+    prefix = '3 4 5'
+);
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, titre, contenu, commentaires)
+    VALUES (new.rowid, new.titre, new.contenu,
+            (SELECT group_concat(value, ' ') FROM json_tree(new.comments) WHERE key = 'text'));
+END;
+
+-- Re-importing an unchanged article does not touch the index, nor does moving its
+-- texts to the cold tier (they stay indexed). Texts still in the cold tier (the body of
+-- an article whose comments were refreshed) are indexed from there.
+CREATE TRIGGER IF NOT EXISTS articles_fts_update
+AFTER UPDATE OF titre, contenu, comments, body_ref, comments_ref ON articles
+WHEN (old.titre IS NOT new.titre OR old.contenu IS NOT new.contenu OR old.comments IS NOT new.comments
+      OR old.body_ref IS NOT new.body_ref OR old.comments_ref IS NOT new.comments_ref)
+    AND NOT (new.body_ref IS NOT NULL AND new.body_ref IS NOT old.body_ref)
+    AND NOT (new.comments_ref IS NOT NULL AND new.comments_ref IS NOT old.comments_ref)
+BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, titre, contenu, commentaires)
+    VALUES ('delete', old.rowid, old.titre,
+            CASE WHEN old.body_ref IS NULL THEN old.contenu ELSE cold_text(old.body_ref) END,
+            (SELECT group_concat(value, ' ')
+             FROM json_tree(CASE WHEN old.comments_ref IS NULL THEN old.comments ELSE cold_text(old.comments_ref) END)
+             WHERE key = 'text'));
+    INSERT INTO articles_fts (rowid, titre, contenu, commentaires)
+    VALUES (new.rowid, new.titre,
+            CASE WHEN new.body_ref IS NULL THEN new.contenu ELSE cold_text(new.body_ref) END,
+            (SELECT group_concat(value, ' ')
+             FROM json_tree(CASE WHEN new.comments_ref IS NULL THEN new.comments ELSE cold_text(new.comments_ref) END)
+             WHERE key = 'text'));
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, titre, contenu, commentaires)
+    VALUES ('delete', old.rowid, old.titre,
+            CASE WHEN old.body_ref IS NULL THEN old.contenu ELSE cold_text(old.body_ref) END,
+            (SELECT group_concat(value, ' ')
+             FROM json_tree(CASE WHEN old.comments_ref IS NULL THEN old.comments ELSE cold_text(old.comments_ref) END)
+             WHERE key = 'text'));
+END;
+"""
+
+# Ranking: a match in the title weighs 10 times a match in the body, comments half as much
+SEARCH_RANK = "bm25(10.0, 1.0, 0.5)"
+
+# All the matches are ranked with the default rank of the index (SEARCH_RANK)
+SEARCH_RANKED = """
+SELECT rowid, -rank AS score FROM articles_fts WHERE articles_fts MATCH ?
+ORDER BY rank
+LIMIT ? OFFSET ?
+"""
+
+# Articles of a page of results (rowids as a JSON array: one prepared statement for any page size)
+SEARCH_HITS = """
+SELECT a.rowid, a.id, a.titre, a.url, a.date_publication, a.contenu, a.comments,
+       a.body_ref, a.comments_ref, m.nom AS media
+FROM articles a
+JOIN medias m ON m.id = a.media_id
+WHERE a.rowid IN (SELECT value FROM json_each(?))
+"""
+
+# Constant SQL strings: sqlite3 keeps their prepared statements in its statement cache
+UPSERT_ARTICLE = """
+INSERT INTO articles (
+    id, media_id, titre, url, date_publication, contenu, rubrique, categorie, sensible, toxicite_score,
+    nb_commentaires, nb_replies, likes, partages, engagement_total, comments,
+    scraped_at, content_hash, imported_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    media_id = excluded.media_id,
+    titre = excluded.titre,
+    url = excluded.url,
+    date_publication = excluded.date_publication,
+    contenu = excluded.contenu,
+    rubrique = COALESCE(excluded.rubrique, articles.rubrique),
+    -- Raw records have no analysis results: keep those of the stored version
+    categorie = COALESCE(excluded.categorie, articles.categorie),
+    sensible = COALESCE(excluded.sensible, articles.sensible),
+    toxicite_score = COALESCE(excluded.toxicite_score, articles.toxicite_score),
+    nb_commentaires = excluded.nb_commentaires,
+    nb_replies = excluded.nb_replies,
+    likes = excluded.likes,
+    partages = excluded.partages,
+    engagement_total = excluded.engagement_total,
+    comments = excluded.comments,
+    -- A re-imported article is hot again (its blobs stay in the cold store)
+    body_ref = NULL,
+    comments_ref = NULL,
+    scraped_at = excluded.scraped_at,
+    content_hash = excluded.content_hash
+-- An older scrape of the article never overwrites a more recent one
+WHERE excluded.scraped_at IS NULL OR articles.scraped_at IS NULL
+    OR excluded.scraped_at >= articles.scraped_at
+"""
+
+# New comments of an article (add_comment_deltas): its thread leaves the cold tier. The
+# article now holds the comments of the refresh, an older scrape of it does not replace them.
+UPDATE_THREAD = """
+UPDATE articles SET
+    comments = :comments,
+    comments_ref = NULL,
+    nb_commentaires = :nb_commentaires,
+    nb_replies = :nb_replies,
+    engagement_total = likes + partages + :nb_commentaires + :nb_replies,
+    scraped_at = COALESCE(max(scraped_at, :refreshed_at), scraped_at, :refreshed_at)
+WHERE id = :id
+"""
+
+UPSERT_MEDIA = """
+INSERT INTO medias (nom, base_url, domaine, type_media, created_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (nom) DO UPDATE SET
+    base_url = COALESCE(excluded.base_url, medias.base_url),
+    domaine = COALESCE(excluded.domaine, medias.domaine),
+    type_media = excluded.type_media
+"""
+
+UPSERT_COMMENT = """
+INSERT INTO comments (
+    id, article_id, media_id, parent_id, position, date_texte, date_commentaire, texte, text_hash,
+    toxicite_score, sensible, imported_at
+) VALUES (
+    :id, :article_id, :media_id, :parent_id, :position, :date_texte, :date_commentaire, :texte, :text_hash,
+    :toxicite_score, :sensible, :imported_at
+)
+ON CONFLICT (id) DO UPDATE SET
+    media_id = excluded.media_id,
+    parent_id = excluded.parent_id,
+    position = excluded.position,
+    date_texte = excluded.date_texte,
+    date_commentaire = excluded.date_commentaire,
+    -- Raw records have no scores: keep those of the stored comment
+    toxicite_score = COALESCE(excluded.toxicite_score, comments.toxicite_score),
+    sensible = COALESCE(excluded.sensible, comments.sensible)
+WHERE comments.media_id IS NOT excluded.media_id
+    OR comments.position IS NOT excluded.position OR comments.parent_id IS NOT excluded.parent_id
+    OR comments.date_texte IS NOT excluded.date_texte
+    OR excluded.toxicite_score IS NOT NULL OR excluded.sensible IS NOT NULL
+"""
+
+# Most toxic scored comments of a period, ranked per media
+TOXIC_COMMENTS = """
+SELECT * FROM (
+    SELECT c.*, m.nom AS media,
+           ROW_NUMBER() OVER (PARTITION BY c.media_id ORDER BY c.toxicite_score DESC) AS rang
+    FROM comments c
+    JOIN medias m ON m.id = c.media_id
+    WHERE c.toxicite_score IS NOT NULL AND c.date_commentaire >= ?
+)
+WHERE rang <= ?
+ORDER BY media, rang
+"""
+
+
+def url_domain(url: Optional[str]) -> Optional[str]:
+    """
+    Domain of a URL without "www." (https://www.aib.media/x -> aib.media)
+    """
+    if not url:
+        return None
+    netloc = urlparse(url).netloc.lower()
+    return netloc[4:] if netloc.startswith('www.') else netloc or None
+
+
+class DatabaseManager:
+    """
+    Access to the media-scan SQLite database
+    """
+
+    def __init__(self, db_path: Path = DATABASE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # Safe with WAL: a crash can lose the last transactions, never corrupt the file
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        # Cold tier, opened on first use (cold_store)
+        self._cold = None
+        # Texts of tiered articles, for the search index triggers
+        self.conn.create_function('cold_text', 1, self._cold_text, deterministic=True)
+        self.init_db()
+
+        # Media name / domain -> id, to attach articles without a query per record
+        self._media_ids: Dict[str, int] = {}
+        self._media_domains: Dict[str, int] = {}
+        self._load_medias()
+
+    def init_db(self):
+        """
+        Create the tables if they do not exist
+        The search index and the rollups of a database created before them are filled from the articles
+        """
+        with self.conn:
+            existing = {row['name'] for row in self.conn.execute("SELECT name FROM sqlite_master")}
+            self.conn.executescript(SCHEMA)
+
+            columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(articles)")}
+            for name, sql_type in ARTICLE_MIGRATIONS:
+                if name not in columns:
+                    self.conn.execute(f"ALTER TABLE articles ADD COLUMN {name} {sql_type}")
+            fts = self.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'articles_fts'").fetchone()
+            if fts and "content = ''" not in fts['sql']:
+                # Index of a database created before it was contentless (it kept a copy of
+                # the texts): created again below and filled from the articles
+                for trigger in ('insert', 'update', 'delete'):
+                    self.conn.execute(f"DROP TRIGGER IF EXISTS articles_fts_{trigger}")
+                self.conn.execute("DROP TABLE articles_fts")
+                existing.discard('articles_fts')
+
+            # Created again below: the definition of a database opened by an older version may differ
+            self.conn.execute("DROP TRIGGER IF EXISTS articles_fts_update")
+            self.conn.executescript(SEARCH_SCHEMA + ROLLUP_SCHEMA + COMMENT_SCHEMA)
+
+        if 'articles_fts' not in existing:
+            with self.conn:
+                # Default ranking of the index, stored in the database
+                self.conn.execute("INSERT INTO articles_fts (articles_fts, rank) VALUES ('rank', ?)", (SEARCH_RANK,))
+            self.rebuild_search_index()
+        if 'media_daily' not in existing:
+            self.rebuild_rollups()
+        if 'comments' not in existing:
+            self.backfill_comments()
+
+    def close(self):
+        if self._cold is not None:
+            self._cold.close()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Medias
+    # ------------------------------------------------------------------
+
+    def _load_medias(self):
+        for row in self.conn.execute("SELECT id, nom, domaine FROM medias"):
+            self._media_ids[row['nom']] = row['id']
+            if row['domaine']:
+                self._media_domains[row['domaine']] = row['id']
+
+    def add_media(self, nom: str, base_url: Optional[str] = None, type_media: str = "web") -> int:
+        """
+        Add a media (or update its URL), returns its id
+        """
+        domain = url_domain(base_url)
+        with self.conn:
+            self.conn.execute(UPSERT_MEDIA, (nom, base_url, domain, type_media, datetime.now().isoformat()))
+        media_id = self.conn.execute("SELECT id FROM medias WHERE nom = ?", (nom,)).fetchone()['id']
+
+        self._media_ids[nom] = media_id
+        if domain:
+            self._media_domains[domain] = media_id
+        return media_id
+
+    def get_media(self, nom: str) -> Optional[Media]:
+        row = self.conn.execute("SELECT * FROM medias WHERE nom = ?", (nom,)).fetchone()
+        return Media.from_row(row) if row else None
+
+    def get_all_medias(self) -> List[Media]:
+        """
+        All the medias, by influence rank
+        """
+        rows = self.conn.execute("SELECT * FROM medias ORDER BY rang IS NULL, rang, nom")
+        return [Media.from_row(row) for row in rows]
+
+    def _media_id(self, record: Dict[str, Any]) -> int:
+        """
+        Media of an article: by name, else by the domain of its URL
+        (scraper names can differ from MEDIA_SOURCES names), else a new media
+        """
+        name = record.get('media') or 'Inconnu'
+        media_id = self._media_ids.get(name)
+        if media_id is not None:
+            return media_id
+
+        domain = url_domain(record.get('url'))
+        media_id = self._media_domains.get(domain)
+        if media_id is not None:
+            self._media_ids[name] = media_id
+            return media_id
+
+        parsed = urlparse(record.get('url') or '')
+        base_url = f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else None
+        # Several pages of the same platform (e.g. facebook.com) are distinct medias
+        self.conn.execute(UPSERT_MEDIA, (name, base_url, None, "web", datetime.now().isoformat()))
+        media_id = self.conn.execute("SELECT id FROM medias WHERE nom = ?", (name,)).fetchone()['id']
+        self._media_ids[name] = media_id
+        return media_id
+
+    # ------------------------------------------------------------------
+    # Articles
+    # ------------------------------------------------------------------
+
+    def _article_row(self, article: Dict[str, Any], imported_at: str) -> tuple:
+        """
+        Parameters of UPSERT_ARTICLE for a typed article (database/ingest.py)
+        """
+        date = article['date']
+        return (
+            article['id'],
+            self._media_id(article),
+            article['titre'],
+            article['url'],
+            date.strftime('%Y-%m-%d %H:%M:%S') if date else None,
+            article['contenu'],
+            article['rubrique'],
+            article['categorie'],
+            article['sensible'],
+            article['toxicite_score'],
+            article['commentaires'],
+            article['replies'],
+            article['likes'],
+            article['partages'],
+            engagement_total(article),
+            json.dumps(article['comments'] or [], ensure_ascii=False),
+            article['scraped_at'],
+            content_hash(article),
+            imported_at,
+        )
+
+    def bulk_add_articles(self, articles: Iterable[Dict[str, Any]]) -> int:
+        """
+        Upsert a batch of typed articles (ArticleIngest.convert) in a single transaction,
+        returns the number of articles written
+        Re-importing an article replaces it, unless the stored version was scraped more recently
+        """
+        imported_at = datetime.now().isoformat()
+        articles = list(articles)
+        with self.conn:
+            rows = [self._article_row(article, imported_at) for article in articles]
+            self.conn.executemany(UPSERT_ARTICLE, rows)
+            self._sync_comments(articles, rows, imported_at)
+        return len(rows)
+
+    def has_articles(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM articles LIMIT 1").fetchone() is not None
+
+    def content_hashes(self, article_ids: List[str]) -> Dict[str, str]:
+        """
+        Stored content hash of some articles (the unknown ids are absent)
+        """
+        rows = self.conn.execute(
+            "SELECT id, content_hash FROM articles WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(article_ids),)
+        )
+        return {row['id']: row['content_hash'] for row in rows}
+
+    def iter_content_hashes(self) -> Iterable[tuple]:
+        """
+        (id, content hash) of all the hashed articles, streamed
+        """
+        cursor = self.conn.execute("SELECT id, content_hash FROM articles WHERE content_hash IS NOT NULL")
+        for row in cursor:
+            yield row['id'], row['content_hash']
+
+    def get_article(self, article_id: str) -> Optional[Article]:
+        """
+        Article by id, with its texts fetched from the cold tier when they were moved there
+        """
+        row = self.conn.execute("SELECT * FROM articles WHERE id = ?", (article_id,)).fetchone()
+        if row is None:
+            return None
+        article = Article.from_row(row)
+        article.contenu, article.comments = self.article_texts([row])[0]
+        return article
+
+    def _iter_analysis_batches(self, condition: str, batch_size: int) -> Iterable[List[Dict[str, Any]]]:
+        """
+        Batches of the articles matching condition (SQL on articles a): id, media name,
+        publication date and text (body, or title when the body is empty), texts of the
+        cold tier included
+        """
+        last = 0
+        while True:
+            rows = self.conn.execute(
+                "SELECT a.rowid, a.id, a.titre, a.date_publication, a.contenu, a.comments, a.body_ref, "
+                "a.comments_ref, m.nom AS media FROM articles a JOIN medias m ON m.id = a.media_id "
+                f"WHERE ({condition}) AND a.rowid > ? ORDER BY a.rowid LIMIT ?",
+                (last, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            last = rows[-1]['rowid']
+            yield [
+                {'id': row['id'], 'media': row['media'], 'date': row['date_publication'],
+                 'texte': contenu or row['titre']}
+                for row, (contenu, _) in zip(rows, self.article_texts(rows))
+            ]
+
+    def iter_articles_to_classify(self, batch_size: int = 1000,
+                                  reclassify: bool = False) -> Iterable[List[Dict[str, Any]]]:
+        """
+        Batches of the articles without category (all the articles with reclassify)
+        """
+        return self._iter_analysis_batches("1" if reclassify else "a.categorie IS NULL", batch_size)
+
+    def iter_articles_to_score(self, batch_size: int = 1000,
+                               rescore: bool = False) -> Iterable[List[Dict[str, Any]]]:
+        """
+        Batches of the articles without toxicity score or with comments without score (added
+        by --refresh-comments), all the articles with rescore; with their comments and
+        replies in thread order (comments: [{id, texte}])
+        """
+        condition = "1" if rescore else (
+            "a.toxicite_score IS NULL OR a.id IN (SELECT article_id FROM comments WHERE toxicite_score IS NULL)"
+        )
+        for articles in self._iter_analysis_batches(condition, batch_size):
+            comments = {article['id']: [] for article in articles}
+            for row in self.conn.execute(
+                "SELECT id, article_id, texte FROM comments WHERE article_id IN (SELECT value FROM json_each(?)) "
+                "ORDER BY article_id, position",
+                (json.dumps(list(comments)),)
+            ):
+                comments[row['article_id']].append({'id': row['id'], 'texte': row['texte']})
+            yield [{**article, 'comments': comments[article['id']]} for article in articles]
+
+    def set_categories(self, categories: Dict[str, str]):
+        """
+        Store the category of some articles {id: categorie}, in one transaction
+        """
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE articles SET categorie = ? WHERE id = ?",
+                [(categorie, article_id) for article_id, categorie in categories.items()]
+            )
+
+    # ------------------------------------------------------------------
+    # Comments (database/comments.py)
+    # ------------------------------------------------------------------
+
+    def _sync_comments(self, articles: List[Dict[str, Any]], rows: List[tuple], imported_at: str):
+        """
+        Replace the comments of the articles just upserted (in the same transaction)
+        Articles without comments field (analysis exports) only update the scores of their comments
+        """
+        # The upsert keeps a more recent stored version: only the articles written have the new hash
+        stored = self.content_hashes([row[0] for row in rows])
+        comments, threads, scores = [], [], []
+        for article, row in zip(articles, rows):
+            # id, media_id and content_hash parameters of UPSERT_ARTICLE
+            article_id, media_id, digest = row[0], row[1], row[17]
+            if stored.get(article_id) != digest:
+                continue
+            if article['comments'] is None:
+                if article['comments_sensibles'] is not None:
+                    scores.append((article_id, article['comments_sensibles']))
+                continue
+            thread = comment_rows(article_id, article['comments'], article['comments_sensibles'])
+            comments.extend({**comment, 'media_id': media_id, 'imported_at': imported_at} for comment in thread)
+            threads.append((article_id, json.dumps([comment['id'] for comment in thread])))
+
+        # Comments removed from the page since the previous import
+        self.conn.executemany(
+            "DELETE FROM comments WHERE article_id = ? AND id NOT IN (SELECT value FROM json_each(?))", threads
+        )
+        self.conn.executemany(UPSERT_COMMENT, comments)
+        for article_id, comments_sensibles in scores:
+            self.conn.execute(
+                "UPDATE comments SET sensible = 0 WHERE article_id = ? AND sensible IS NULL", (article_id,)
+            )
+            self.conn.executemany(
+                f"UPDATE comments SET toxicite_score = ?, sensible = ? "
+                f"WHERE article_id = ? AND substr(texte, 1, {ANALYSIS_TEXT_LENGTH}) = ?",
+                [(score, sensible, article_id, prefix)
+                 for prefix, (score, sensible) in analysis_scores(comments_sensibles).items()]
+            )
+
+    def backfill_comments(self, batch_size: int = 1000):
+        """
+        Fill the comments table from the comments of the stored articles (database created before it)
+        Scores already stored are kept
+        """
+        imported_at = datetime.now().isoformat()
+        last = 0
+        while True:
+            rows = self.conn.execute(
+                "SELECT rowid, id, media_id, contenu, comments, body_ref, comments_ref FROM articles "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (last, batch_size)
+            ).fetchall()
+            if not rows:
+                break
+            last = rows[-1]['rowid']
+            comments = [
+                {**comment, 'media_id': row['media_id'], 'imported_at': imported_at}
+                for row, (_, thread) in zip(rows, self.article_texts(rows))
+                for comment in comment_rows(row['id'], json.loads(thread or '[]'))
+            ]
+            with self.conn:
+                self.conn.executemany(UPSERT_COMMENT, comments)
+
+    def add_comment_deltas(self, deltas: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add the new comments of the comment refresh mode (scrapers/comments.py, CommentDelta
+        records of data/comments), returns the number of comments added
+        The comments join the thread of their article (replies under their parent) and its
+        counters, in the transaction that adds them to the comments table: the search index
+        and the rollups follow through their triggers. Comments already added are skipped,
+        as are the comments of articles not imported yet: they come with the article.
+        """
+        imported_at = datetime.now().isoformat()
+        count = 0
+        with self.conn:
+            for delta in deltas:
+                row = self.conn.execute(
+                    "SELECT id, media_id, contenu, comments, body_ref, comments_ref FROM articles WHERE id = ?",
+                    (delta.get('article_id'),)
+                ).fetchone()
+                if row is None:
+                    continue
+                thread = json.loads(self.article_texts([row])[0][1] or '[]')
+                added = merge_comments(row['id'], thread, delta.get('new_comments') or [])
+                if not added:
+                    continue
+                count += added
+
+                self.conn.execute(UPDATE_THREAD, {
+                    'id': row['id'],
+                    'comments': json.dumps(thread, ensure_ascii=False),
+                    'nb_commentaires': len(thread),
+                    'nb_replies': sum(len(comment.get('replies') or []) for comment in thread),
+                    'refreshed_at': delta.get('refreshed_at'),
+                })
+                # Positions of the whole thread: a new reply goes after its parent's replies
+                self.conn.executemany(UPSERT_COMMENT, [
+                    {**comment, 'media_id': row['media_id'], 'imported_at': imported_at}
+                    for comment in comment_rows(row['id'], thread)
+                ])
+        return count
+
+    def get_comments(self, article_id: str) -> List[Comment]:
+        """
+        Comments and replies of an article, in thread order
+        """
+        rows = self.conn.execute(
+            "SELECT c.*, m.nom AS media FROM comments c JOIN medias m ON m.id = c.media_id "
+            "WHERE c.article_id = ? ORDER BY c.position",
+            (article_id,)
+        )
+        return [Comment.from_row(row) for row in rows]
+
+    def toxic_comments(self, days: int = 7, per_media: int = 5) -> List[Comment]:
+        """
+        Most toxic scored comments of the last `days` days, `per_media` per media
+        """
+        since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        return [Comment.from_row(row) for row in self.conn.execute(TOXIC_COMMENTS, (since, per_media))]
+
+    def set_toxicity(self, articles: Dict[str, tuple], comments: Dict[str, tuple]):
+        """
+        Store the toxicity of some articles and comments {id: (toxicite_score, sensible)},
+        in one transaction
+        """
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE articles SET toxicite_score = ?, sensible = ? WHERE id = ?",
+                [(score, sensible, article_id) for article_id, (score, sensible) in articles.items()]
+            )
+            self.conn.executemany(
+                "UPDATE comments SET toxicite_score = ?, sensible = ? WHERE id = ?",
+                [(score, sensible, comment_id) for comment_id, (score, sensible) in comments.items()]
+            )
+
+    # ------------------------------------------------------------------
+    # Cold tier (database/cold_store.py)
+    # ------------------------------------------------------------------
+
+    def cold_store(self):
+        """
+        Cold tier of this database (<database>_cold.db), opened on first use
+        """
+        if self._cold is None:
+            from database.cold_store import ColdStore
+            self._cold = ColdStore(self.db_path.with_name(f"{self.db_path.stem}_cold.db"),
+                                   level=TIERING_CONFIG['zstd_level'])
+        return self._cold
+
+    def _cold_text(self, ref: Optional[str]) -> Optional[str]:
+        return self.cold_store().get(ref) if ref else None
+
+    def article_texts(self, rows: List[sqlite3.Row]) -> List[tuple]:
+        """
+        (contenu, comments JSON) of article rows, read from the cold tier for the tiered ones
+        (one query to the cold store for all the rows)
+        """
+        refs = [ref for row in rows for ref in (row['body_ref'], row['comments_ref']) if ref]
+        blobs = self.cold_store().get_many(refs) if refs else {}
+        return [
+            (blobs[row['body_ref']] if row['body_ref'] else row['contenu'],
+             blobs[row['comments_ref']] if row['comments_ref'] else row['comments'])
+            for row in rows
+        ]
+
+    def tier_articles(self, max_age_days: int = TIERING_CONFIG['max_age_days'],
+                      batch_size: int = 1000) -> Dict[str, Any]:
+        """
+        Move the bodies and comments of the articles published (or, undated, imported) more
+        than max_age_days ago to the cold tier; returns the number of articles, the size of
+        their texts and its compressed size (bytes)
+        A dictionary is trained on a sample of the texts the first time.
+        """
+        cold = self.cold_store()
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+        candidates = """
+            FROM articles
+            WHERE body_ref IS NULL AND comments_ref IS NULL
+              AND (contenu != '' OR comments != '[]')
+              AND COALESCE(date_publication, imported_at) < ?
+        """
+
+        if cold.dictionary_id is None:
+            samples = [
+                text
+                for row in self.conn.execute(
+                    f"SELECT contenu, comments {candidates} ORDER BY random() LIMIT ?",
+                    (cutoff, TIERING_CONFIG['dictionary_samples'])
+                )
+                for text in (row['contenu'], row['comments']) if text and text != '[]'
+            ]
+            # zstd needs a few hundred samples to train a useful dictionary
+            if len(samples) >= 100:
+                cold.train_dictionary(samples, TIERING_CONFIG['dictionary_size'])
+
+        before = cold.stats()
+        count = 0
+        last = 0
+        while True:
+            rows = self.conn.execute(
+                f"SELECT rowid, contenu, comments {candidates} AND rowid > ? ORDER BY rowid LIMIT ?",
+                (cutoff, last, batch_size)
+            ).fetchall()
+            if not rows:
+                break
+            last = rows[-1]['rowid']
+
+            # Blobs first: an interruption leaves unreferenced blobs, never a lost text
+            bodies = cold.put_many(row['contenu'] for row in rows)
+            comments = cold.put_many(row['comments'] for row in rows)
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE articles SET contenu = '', comments = '[]', body_ref = ?, comments_ref = ? WHERE rowid = ?",
+                    [(body, comment, row['rowid']) for row, body, comment in zip(rows, bodies, comments)]
+                )
+            count += len(rows)
+
+        after = cold.stats()
+        return {
+            'articles': count,
+            'size': after['size'] - before['size'],
+            'compressed': after['compressed'] - before['compressed'],
+        }
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def rebuild_search_index(self, batch_size: int = 1000):
+        """
+        Rebuild the full-text index from the articles (needed after a VACUUM, which renumbers the rowids)
+        """
+        with self.conn:
+            self.conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('delete-all')")
+            self.conn.execute("""
+                INSERT INTO articles_fts (rowid, titre, contenu, commentaires)
+                SELECT rowid, titre, contenu,
+                       (SELECT group_concat(value, ' ') FROM json_tree(articles.comments) WHERE key = 'text')
+                FROM articles
+                WHERE body_ref IS NULL AND comments_ref IS NULL
+            """)
+            # Articles of the cold tier: texts fetched batch by batch
+            last = 0
+            while True:
+                rows = self.conn.execute(
+                    "SELECT rowid, titre, contenu, comments, body_ref, comments_ref FROM articles "
+                    "WHERE (body_ref IS NOT NULL OR comments_ref IS NOT NULL) AND rowid > ? ORDER BY rowid LIMIT ?",
+                    (last, batch_size)
+                ).fetchall()
+                if not rows:
+                    break
+                last = rows[-1]['rowid']
+                self.conn.executemany(
+                    "INSERT INTO articles_fts (rowid, titre, contenu, commentaires) VALUES (?, ?, ?, "
+                    "(SELECT group_concat(value, ' ') FROM json_tree(?) WHERE key = 'text'))",
+                    [(row['rowid'], row['titre'], contenu, comments)
+                     for row, (contenu, comments) in zip(rows, self.article_texts(rows))]
+                )
+            self.conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')")
+
+    def search(self, text: str, limit: int = 20, offset: int = 0) -> List[SearchHit]:
+        """
+        Articles matching a free-text search (see database/search.py), best matches first
+        """
+        terms = parse_query(text)
+        if not terms:
+            return []
+        ranked = self.conn.execute(SEARCH_RANKED, (fts_query(text), limit, offset)).fetchall()
+        if not ranked:
+            return []
+
+        rows = self.conn.execute(SEARCH_HITS, (json.dumps([rowid for rowid, _ in ranked]),)).fetchall()
+        articles = {row['rowid']: (row, texts) for row, texts in zip(rows, self.article_texts(rows))}
+        hits = []
+        for rowid, score in ranked:
+            # Index rows without their article (rowids renumbered by a VACUUM before the index
+            # was rebuilt): skipped rather than failing the whole search
+            if rowid not in articles:
+                continue
+            row, (contenu, comments) = articles[rowid]
+            texts = [contenu, ' '.join(comment_texts(comments)), row['titre']]
+            hits.append(SearchHit(
+                id=row['id'],
+                titre=row['titre'],
+                url=row['url'],
+                media=row['media'],
+                date_publication=row['date_publication'],
+                extrait=excerpt(texts, terms),
+                score=score,
+            ))
+        return hits
+
+    def count_matches(self, text: str) -> int:
+        """
+        Number of articles matching a search, for the pagination
+        """
+        query = fts_query(text)
+        if not query:
+            return 0
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM articles_fts WHERE articles_fts MATCH ?", (query,)
+        ).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Statistics (read from the media_daily rollups)
+    # ------------------------------------------------------------------
+
+    def rebuild_rollups(self):
+        """
+        Recompute the media_daily rollups from the articles
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM media_daily")
+            self.conn.execute(f"INSERT INTO media_daily {ROLLUP_SELECT}")
+
+    def _activity_since(self) -> str:
+        return (datetime.now() - timedelta(days=ACTIVITY_CONFIG['min_days_active'])).strftime("%Y-%m-%d")
+
+    def update_media_stats(self, nom: str):
+        """
+        Recompute the counters of a media and record them in media_stats for today
+        """
+        media_id = self._media_ids.get(nom)
+        if media_id is None:
+            return
+
+        # Articles imported under another name but attached to this media are counted too
+        row = self.conn.execute("""
+            SELECT COALESCE(SUM(nb_articles), 0) AS nb_articles,
+                   COALESCE(SUM(engagement_total), 0) AS engagement_total,
+                   MAX(NULLIF(jour, '')) AS derniere_publication,
+                   COALESCE(SUM(CASE WHEN jour >= ? THEN nb_articles END), 0) AS articles_90j
+            FROM media_daily WHERE media_id = ?
+        """, (self._activity_since(), media_id)).fetchone()
+
+        # Active: published every month of the window at the expected pace
+        months = ACTIVITY_CONFIG['min_days_active'] / 30
+        actif = row['articles_90j'] >= ACTIVITY_CONFIG['min_articles_per_month'] * months
+
+        with self.conn:
+            self.conn.execute("""
+                UPDATE medias SET nb_articles = ?, engagement_total = ?, derniere_publication = ?, actif_90j = ?
+                WHERE id = ?
+            """, (row['nb_articles'], row['engagement_total'], row['derniere_publication'], int(actif), media_id))
+            self.conn.execute("""
+                INSERT INTO media_stats (media_id, date, nb_articles, engagement_total, articles_90j)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (media_id, date) DO UPDATE SET
+                    nb_articles = excluded.nb_articles,
+                    engagement_total = excluded.engagement_total,
+                    articles_90j = excluded.articles_90j
+            """, (media_id, datetime.now().strftime("%Y-%m-%d"), row['nb_articles'],
+                  row['engagement_total'], row['articles_90j']))
+
+    def calculate_influence_scores(self):
+        """
+        Influence score (0-100) and rank of every media, weighted with INFLUENCE_WEIGHTS
+
+        - volume_publications: number of articles, relative to the largest media
+        - engagement_total: total engagement, relative to the most engaging media
+        - portee_estimee: engagement per article, relative to the best media
+        - regularite: share of the last 90 days with at least one publication
+        - diversite_thematique: number of themes (category, else rubric) out of CATEGORIES
+        """
+        rows = self.conn.execute("""
+            SELECT m.id,
+                   COALESCE(SUM(d.nb_articles), 0) AS nb_articles,
+                   COALESCE(SUM(d.engagement_total), 0) AS engagement,
+                   COUNT(DISTINCT CASE WHEN d.jour >= ? THEN d.jour END) AS jours_actifs,
+                   COUNT(DISTINCT NULLIF(CASE WHEN d.categorie != '' THEN d.categorie ELSE d.rubrique END, '')) AS themes
+            FROM medias m LEFT JOIN media_daily d ON d.media_id = m.id
+            GROUP BY m.id
+        """, (self._activity_since(),)).fetchall()
+        if not rows:
+            return
+
+        reach = {row['id']: row['engagement'] / row['nb_articles'] if row['nb_articles'] else 0.0 for row in rows}
+        max_articles = max(row['nb_articles'] for row in rows) or 1
+        max_engagement = max(row['engagement'] for row in rows) or 1
+        max_reach = max(reach.values()) or 1
+
+        scores = {}
+        for row in rows:
+            components = {
+                'volume_publications': row['nb_articles'] / max_articles,
+                'engagement_total': row['engagement'] / max_engagement,
+                'portee_estimee': reach[row['id']] / max_reach,
+                'regularite': min(row['jours_actifs'] / ACTIVITY_CONFIG['min_days_active'], 1.0),
+                'diversite_thematique': min(row['themes'] / len(CATEGORIES), 1.0),
+            }
+            scores[row['id']] = round(
+                100 * sum(INFLUENCE_WEIGHTS[name] * value for name, value in components.items()), 2
+            )
+
+        ranking = sorted(scores, key=lambda media_id: scores[media_id], reverse=True)
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE medias SET score_influence = ?, rang = ? WHERE id = ?",
+                [(scores[media_id], rank, media_id) for rank, media_id in enumerate(ranking, 1)]
+            )
+
+    def get_stats_summary(self) -> Dict[str, Any]:
+        """
+        Global figures: medias, articles, engagement, recent articles, category distribution
+        """
+        totals = self.conn.execute("""
+            SELECT (SELECT COUNT(*) FROM medias) AS total_medias,
+                   COALESCE(SUM(nb_articles), 0) AS total_articles,
+                   COALESCE(SUM(engagement_total), 0) AS total_engagement,
+                   COALESCE(SUM(CASE WHEN jour >= ? THEN nb_articles END), 0) AS recent_articles_7d
+            FROM media_daily
+        """, ((datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d"),)).fetchone()
+
+        categories = self.conn.execute("""
+            SELECT COALESCE(NULLIF(categorie, ''), 'Non classé') AS categorie, SUM(nb_articles) AS nb
+            FROM media_daily GROUP BY 1
+        """)
+
+        return {
+            'total_medias': totals['total_medias'],
+            'total_articles': totals['total_articles'],
+            'total_engagement': totals['total_engagement'],
+            'recent_articles_7d': totals['recent_articles_7d'],
+            'category_distribution': {row['categorie']: row['nb'] for row in categories},
+        }
+
+
+if __name__ == "__main__":
+    with DatabaseManager() as db:
+        print(f"✓ Base de données initialisée: {db.db_path}")
@@ -0,0 +1,205 @@
+"""
+Deduplication of the article records at ingest
+
+The feeds are appended to (overwrite=False) and the categories of a site overlap (the
+same AIB dispatch is listed under "depeches" and "politique"), so the raw files hold
+the same article many times and every import used to convert and upsert all of them.
+
+A record is a duplicate when an article with the same id and the same content (hash of
+the typed article, see content_hash) was already imported. The check has two levels:
+
+    BloomFilter      on-disk bit array (memory-mapped): "never seen" answered without
+                     any query, which is the case of almost every new article
+    articles table   exact check (id, content_hash) of the records the filter may have
+                     seen, in one query per batch
+
+The filter can only produce false positives, which the exact check corrects: a stale or
+lost filter file costs queries, never an article. Its size is fixed by its capacity
+(INGEST_CONFIG['bloom_capacity'], ~1.2 bytes per article at 1% false positives), so the
+memory used does not grow with the number of ids; the OS pages the file in and out.
+"""
+import hashlib
+import json
+import math
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Fields that do not make a new version of an article: the collection time and the
+# rubric (the same article listed under two rubrics of a site)
+VOLATILE_FIELDS = ('scraped_at', 'rubrique')
+
+
+def content_hash(article: Dict[str, Any]) -> str:
+    """
+    Hash of a typed article (database/ingest.py), volatile fields excluded
+    """
+    content = {key: value for key, value in article.items() if key not in VOLATILE_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def fingerprint(article_id: str, digest: str) -> bytes:
+    """
+    Key of an article version in the Bloom filter (16 bytes)
+    """
+    return hashlib.blake2b(f"{article_id}\0{digest}".encode('utf-8'), digest_size=16).digest()
+
+
+class BloomFilter:
+    """
+    Bloom filter stored in a memory-mapped file
+
+        bloom = BloomFilter(path, capacity=20_000_000, error_rate=0.01)
+        bloom.add_many(keys)               # 16-byte keys (fingerprint)
+        bloom.contains_many(keys)          # numpy array of booleans
+        bloom.close()
+
+    Keys are already uniform hashes: the k bit positions are derived from their two
+    64-bit halves (double hashing), for a whole batch at once with numpy.
+    """
+
+    MAGIC = b'MSBLOOM1'
+    # magic, number of bits, number of hash functions, number of keys added
+    HEADER = struct.Struct('<8sQQQ')
+
+    def __init__(self, path: Path, capacity: int, error_rate: float = 0.01):
+        self.path = Path(path)
+        self.created = not self.path.exists()
+
+        if self.created:
+            bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+            self.bits = (bits + 63) // 64 * 64
+            self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+            self.count = 0
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.bits, self.hashes, 0))
+                # All bits at zero without writing them (sparse file until bits are set)
+                f.truncate(self.HEADER.size + self.bits // 8)
+        else:
+            with open(self.path, 'rb') as f:
+                magic, self.bits, self.hashes, self.count = self.HEADER.unpack(f.read(self.HEADER.size))
+            if magic != self.MAGIC:
+                raise ValueError(f"{self.path} n'est pas un filtre de Bloom")
+
+        self._array = np.memmap(self.path, dtype=np.uint8, mode='r+',
+                                offset=self.HEADER.size, shape=(self.bits // 8,))
+
+    def _positions(self, keys: List[bytes]) -> np.ndarray:
+        """
+        Bit positions of the keys, shape (len(keys), hashes)
+        """
+        halves = np.frombuffer(b''.join(keys), dtype='<u8').reshape(-1, 2)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        # uint64 arithmetic wraps around, which is what double hashing needs
+        return (halves[:, :1] + steps * (halves[:, 1:] | np.uint64(1))) % np.uint64(self.bits)
+
+    def add_many(self, keys: List[bytes]):
+        if not keys:
+            return
+        positions = self._positions(keys).ravel()
+        np.bitwise_or.at(self._array, positions >> np.uint64(3),
+                         np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+        self.count += len(keys)
+
+    def contains_many(self, keys: List[bytes]) -> np.ndarray:
+        if not keys:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(keys)
+        bits = (self._array[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=1)
+
+    def __contains__(self, key: bytes) -> bool:
+        return bool(self.contains_many([key])[0])
+
+    @property
+    def error_rate(self) -> float:
+        """
+        Expected false positive rate at the current number of keys
+        """
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def flush(self):
+        self._array.flush()
+        with open(self.path, 'r+b') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.bits, self.hashes, self.count))
+
+    def close(self):
+        self.flush()
+        del self._array
+
+
+class ArticleDedup:
+    """
+    Drops the records already imported in a database (see the module docstring)
+
+        dedup = ArticleDedup(db, bloom_path, capacity=20_000_000)
+        with ArticleIngest(source=..., dedup=dedup) as ingest:
+            db.bulk_add_articles(ingest.convert(records))     # new or modified articles only
+        dedup.close()
+
+    `db` is a DatabaseManager; a new filter file is filled from its articles.
+    """
+
+    def __init__(self, db, bloom_path: Path, capacity: int, error_rate: float = 0.01):
+        self.db = db
+        self.bloom = BloomFilter(bloom_path, capacity, error_rate)
+        if not self.bloom.created and self.bloom.count and not db.has_articles():
+            # Filter left by a deleted database: start again from an empty one
+            self.bloom.close()
+            Path(bloom_path).unlink()
+            self.bloom = BloomFilter(bloom_path, capacity, error_rate)
+        # Records that reached the exact check, and those it confirmed
+        self.checked = 0
+        self.confirmed = 0
+        if self.bloom.created:
+            self.rebuild()
+
+    def rebuild(self, batch_size: int = 100_000):
+        """
+        Add the versions of all the stored articles to the filter
+        """
+        batch = []
+        for article_id, digest in self.db.iter_content_hashes():
+            batch.append(fingerprint(article_id, digest))
+            if len(batch) == batch_size:
+                self.bloom.add_many(batch)
+                batch = []
+        self.bloom.add_many(batch)
+        self.bloom.flush()
+
+    def split(self, articles: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        (new or modified articles, number of duplicates) of a batch of typed articles
+        Duplicates inside the batch are dropped too (first occurrence kept)
+        """
+        articles = list(articles)
+        hashes = [content_hash(article) for article in articles]
+        keys = [fingerprint(article['id'], digest) for article, digest in zip(articles, hashes)]
+        maybe_seen = self.bloom.contains_many(keys)
+
+        # Exact check of the records the filter may have seen
+        candidates = [article['id'] for article, seen in zip(articles, maybe_seen) if seen]
+        stored = self.db.content_hashes(candidates) if candidates else {}
+        self.checked += len(candidates)
+
+        kept, new_keys, batch_keys = [], [], set()
+        for article, digest, key, seen in zip(articles, hashes, keys, maybe_seen):
+            if key in batch_keys:
+                continue
+            if seen and stored.get(article['id']) == digest:
+                self.confirmed += 1
+                continue
+            batch_keys.add(key)
+            kept.append(article)
+            if not seen:
+                new_keys.append(key)
+
+        self.bloom.add_many(new_keys)
+        return kept, len(articles) - len(kept)
+
+    def close(self):
+        self.bloom.close()
@@ -0,0 +1,349 @@
+"""
+Typed ingest of the article records
+
+Records reach the project in several shapes: the scrapers write native JSON, the
+analysis exports (pandas -> JSON/CSV, e.g. data/processed/database2.json) may hold
+the engagement as a stringified dict ("{'likes': 3, ...}"), the flags as "False",
+the scores as strings and the lists as "[]". They are converted once here, against
+ARTICLE_FIELDS, and everything downstream (database, Parquet store, dashboard)
+reads the typed record:
+
+    id, media, titre, url, contenu                  str
+    date                                            datetime | None (naive, UTC when the source had an offset)
+    categorie, rubrique, scraped_at                 str | None
+    likes, partages, commentaires, replies          int
+    sensible                                        bool | None   (None = not analyzed)
+    toxicite_score                                  float | None  (None = not analyzed)
+    comments, comments_sensibles                    list | None
+
+Malformed records are not imported: they are written to a quarantine JSONL file
+with the reason of the rejection. Given a dedup (database/dedup.py), ArticleIngest also
+drops the records already imported.
+
+Check a file with:
+    python -m database.ingest data/processed/database2.json
+"""
+import ast
+import json
+import math
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import INGEST_CONFIG
+
+
+class InvalidRecord(ValueError):
+    """
+    Record that cannot be converted to the article schema
+    """
+
+
+class Field(NamedTuple):
+    """
+    A field of the typed article
+
+    convert: raw value -> typed value, raises ValueError/TypeError on a malformed value
+    source: key of the raw record (default: the field name)
+    required: the record is rejected when the typed value is empty
+    """
+    convert: Callable[[Any], Any]
+    source: Optional[str] = None
+    required: bool = False
+
+
+ENGAGEMENT_COLUMNS = ('likes', 'partages', 'commentaires', 'replies')
+
+TRUE_VALUES = {'true', '1', 'oui', 'yes'}
+FALSE_VALUES = {'false', '0', 'non', 'no', ''}
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _literal(value):
+    """
+    Python literal or JSON written as a string ("{'likes': 3}", '[]', "None")
+    """
+    if not isinstance(value, str):
+        return value
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return ast.literal_eval(value)
+
+
+def to_str(value) -> str:
+    return '' if _is_missing(value) else str(value).strip()
+
+
+def to_optional_str(value) -> Optional[str]:
+    return to_str(value) or None
+
+
+def to_int(value) -> int:
+    if _is_missing(value) or value == '':
+        return 0
+    if isinstance(value, str):
+        # "1 234" or "1 234" as displayed by the sites
+        value = ''.join(value.split())
+    number = float(value)
+    if number < 0 or not number.is_integer():
+        raise ValueError(f"compteur invalide: {value!r}")
+    return int(number)
+
+
+def to_bool(value) -> Optional[bool]:
+    if _is_missing(value):
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float)) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+    raise ValueError(f"booléen invalide: {value!r}")
+
+
+def to_score(value) -> Optional[float]:
+    """
+    Probability between 0 and 1
+    """
+    if _is_missing(value) or value == '':
+        return None
+    score = float(value)
+    if math.isnan(score):
+        return None
+    if not 0.0 <= score <= 1.0:
+        raise ValueError(f"score hors de [0, 1]: {value!r}")
+    return score
+
+
+def to_date(value) -> Optional[datetime]:
+    """
+    ISO date ("2025-11-16", "2025-11-15 06:34:47", "2025-11-15T06:34:47+00:00"), None when unknown
+    """
+    if _is_missing(value) or value == '':
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    elif isinstance(value, pd.Timestamp):
+        value = value.to_pydatetime()
+    elif not isinstance(value, datetime):
+        raise TypeError(f"date invalide: {value!r}")
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def to_list(value) -> Optional[list]:
+    value = _literal(value)
+    if value is None:
+        return None
+    if not isinstance(value, list):
+        raise TypeError(f"liste attendue: {type(value).__name__}")
+    return value
+
+
+def to_mapping(value) -> dict:
+    value = _literal(value)
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise TypeError(f"dictionnaire attendu: {type(value).__name__}")
+    return value
+
+
+# Schema of the typed article, in column order
+ARTICLE_FIELDS: Dict[str, Field] = {
+    'id': Field(to_str, required=True),
+    'media': Field(to_str),
+    'titre': Field(to_str),
+    'date': Field(to_date),
+    'url': Field(to_str, required=True),
+    'contenu': Field(to_str),
+    'categorie': Field(to_optional_str),
+    'sensible': Field(to_bool),
+    'toxicite_score': Field(to_score),
+    'comments': Field(to_list),
+    'comments_sensibles': Field(to_list),
+}
+
+# Columns of the typed DataFrame (to_frame)
+FRAME_DTYPES = {
+    'likes': 'int64',
+    'partages': 'int64',
+    'commentaires': 'int64',
+    'replies': 'int64',
+    'toxicite_score': 'float32',
+}
+
+
+def convert_article(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Raw record -> typed article, raises InvalidRecord with the faulty fields
+    """
+    if not isinstance(record, dict):
+        raise InvalidRecord(f"objet attendu: {type(record).__name__}")
+
+    article = {}
+    errors = []
+    for name, field in ARTICLE_FIELDS.items():
+        try:
+            value = field.convert(record.get(field.source or name))
+        except (ValueError, TypeError, SyntaxError) as e:
+            errors.append(f"{name}: {e}")
+            continue
+        if field.required and not value:
+            errors.append(f"{name}: champ obligatoire vide")
+        article[name] = value
+
+    # Engagement: nested dict (scrapers), stringified dict (exports) or flat columns
+    try:
+        engagement = to_mapping(record.get('engagement'))
+        for column in ENGAGEMENT_COLUMNS:
+            article[column] = to_int(engagement.get(column, record.get(column)))
+    except (ValueError, TypeError, SyntaxError) as e:
+        errors.append(f"engagement: {e}")
+
+    try:
+        metadata = to_mapping(record.get('article_metadata'))
+        rubrique = metadata.get('rubrique_name') or metadata.get('rubrique_id') or record.get('rubrique')
+        article['rubrique'] = to_optional_str(rubrique)
+        article['scraped_at'] = to_optional_str(metadata.get('scraped_at') or record.get('scraped_at'))
+    except (ValueError, TypeError, SyntaxError) as e:
+        errors.append(f"article_metadata: {e}")
+
+    if errors:
+        raise InvalidRecord('; '.join(errors))
+    return article
+
+
+def engagement_total(article: Dict[str, Any]) -> int:
+    return sum(article[column] for column in ENGAGEMENT_COLUMNS)
+
+
+class ArticleIngest:
+    """
+    Converts batches of raw records, quarantines the malformed ones and measures the throughput
+
+        ingest = ArticleIngest(source="aib_articles.json")
+        articles = ingest.convert(records)
+        ingest.close()
+    """
+
+    def __init__(self, source: str = "articles", quarantine_dir: Optional[Path] = INGEST_CONFIG['quarantine_dir'],
+                 dedup=None):
+        self.source = source
+        self.quarantine_dir = Path(quarantine_dir) if quarantine_dir else None
+        # ArticleDedup (database/dedup.py), None = every valid record is returned
+        self.dedup = dedup
+        self.converted = 0
+        self.rejected = 0
+        self.duplicates = 0
+        self.seconds = 0.0
+        self._quarantine = None
+
+    def convert(self, records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Typed articles of a batch, the malformed records are quarantined
+        and the duplicates dropped (with a dedup)
+        """
+        start = time.perf_counter()
+        articles = []
+        for record in records:
+            try:
+                articles.append(convert_article(record))
+            except InvalidRecord as e:
+                self._reject(record, str(e))
+        self.converted += len(articles)
+        if self.dedup is not None:
+            articles, duplicates = self.dedup.split(articles)
+            self.duplicates += duplicates
+        self.seconds += time.perf_counter() - start
+        return articles
+
+    def _reject(self, record, reason: str):
+        self.rejected += 1
+        if self.quarantine_dir is None:
+            return
+        if self._quarantine is None:
+            self.quarantine_dir.mkdir(parents=True, exist_ok=True)
+            stem = Path(self.source).name.split('.')[0]
+            path = self.quarantine_dir / f"{stem}_{datetime.now():%Y%m%d_%H%M%S}.jsonl"
+            self._quarantine = open(path, 'a', encoding='utf-8')
+        self._quarantine.write(json.dumps(
+            {'source': self.source, 'reason': reason, 'record': record},
+            ensure_ascii=False, default=str,
+        ) + '\n')
+
+    @property
+    def quarantine_path(self) -> Optional[Path]:
+        return Path(self._quarantine.name) if self._quarantine else None
+
+    @property
+    def rate(self) -> float:
+        """
+        Records (converted or rejected) per second
+        """
+        total = self.converted + self.rejected
+        return total / self.seconds if self.seconds else 0.0
+
+    def close(self):
+        if self._quarantine is not None:
+            self._quarantine.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def to_frame(articles: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Typed articles -> DataFrame: integer engagement columns, boolean flag, float32 score
+    Articles not analyzed yet are not sensitive and have a score of 0
+    """
+    columns = list(ARTICLE_FIELDS) + list(ENGAGEMENT_COLUMNS) + ['rubrique', 'scraped_at']
+    df = pd.DataFrame(articles, columns=columns)
+    df['date'] = pd.to_datetime(df['date'])
+    df['sensible'] = df['sensible'].fillna(False).astype(bool)
+    df['toxicite_score'] = df['toxicite_score'].fillna(0.0)
+    return df.astype(FRAME_DTYPES)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from utils.helpers import batched, iter_json_records
+
+    parser = argparse.ArgumentParser(description="Vérifier et typer un fichier d'articles")
+    parser.add_argument('json_file', help='Fichier JSON / JSON Lines, ou {"articles": [...]}')
+    args = parser.parse_args()
+
+    path = Path(args.json_file)
+    with ArticleIngest(source=path.name) as ingest:
+        # Analysis exports: {"articles": [...], "medias": [...]}, streamed article by article
+        for records in batched(iter_json_records(path, key='articles'), 1000):
+            ingest.convert(records)
+
+    print(f"✓ {ingest.converted} articles typés, {ingest.rejected} en quarantaine "
+          f"({ingest.rate:.0f} enregistrements/s)")
+    if ingest.quarantine_path:
+        print(f"  Quarantaine: {ingest.quarantine_path}")
@@ -0,0 +1,95 @@
+"""
+Data models of the media-scan database
+Rows of the SQLite tables returned by DatabaseManager
+"""
+import sqlite3
+from dataclasses import dataclass, fields
+from typing import Optional
+
+
+@dataclass
+class Media:
+    """
+    Media outlet monitored (table medias)
+    """
+    id: int
+    nom: str
+    base_url: str
+    type_media: str = "web"
+    nb_articles: int = 0
+    engagement_total: int = 0
+    derniere_publication: Optional[str] = None
+    actif_90j: bool = False
+    score_influence: float = 0.0
+    rang: Optional[int] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Media":
+        media = cls(**{field.name: row[field.name] for field in fields(cls)})
+        media.actif_90j = bool(media.actif_90j)
+        return media
+
+
+@dataclass
+class Article:
+    """
+    Collected article (table articles), comments are kept as a JSON string
+    """
+    id: str
+    media_id: int
+    titre: str
+    url: str
+    date_publication: Optional[str] = None
+    contenu: str = ""
+    rubrique: Optional[str] = None
+    categorie: Optional[str] = None
+    nb_commentaires: int = 0
+    nb_replies: int = 0
+    likes: int = 0
+    partages: int = 0
+    engagement_total: int = 0
+    comments: str = "[]"
+    scraped_at: Optional[str] = None
+    imported_at: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Article":
+        return cls(**{field.name: row[field.name] for field in fields(cls)})
+
+
+@dataclass
+class Comment:
+    """
+    Comment or reply of an article (table comments), with the name of its media
+    """
+    id: str
+    article_id: str
+    media: str
+    parent_id: Optional[str]
+    position: int
+    date_texte: Optional[str]
+    date_commentaire: Optional[str]
+    texte: str
+    toxicite_score: Optional[float] = None
+    sensible: Optional[bool] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Comment":
+        comment = cls(**{field.name: row[field.name] for field in fields(cls)})
+        if comment.sensible is not None:
+            comment.sensible = bool(comment.sensible)
+        return comment
+
+
+@dataclass
+class SearchHit:
+    """
+    Result of a full-text search, with an excerpt around the matched words (**mot**)
+    """
+    id: str
+    titre: str
+    url: str
+    media: str
+    date_publication: Optional[str]
+    extrait: str
+    score: float
@@ -0,0 +1,419 @@
+"""
+Columnar article store read by the dashboard (Parquet)
+
+One file per media and publication month, with its daily rollup (database/rollups.py):
+    <dir>/media=<slug>/month=<YYYY-MM>/articles.parquet
+    <dir>/media=<slug>/month=<YYYY-MM>/daily.parquet
+    <dir>/medias.parquet
+
+Readers open only the partitions of the requested period/medias and only the
+requested columns; the article text and the raw comments are never read unless asked.
+
+Convert an analysis JSON ({"articles": [...], "medias": [...]}) with:
+    python -m database.parquet_store data/processed/final_db1.json
+(the dashboard snapshot, database/snapshot.py, is rebuilt after it)
+"""
+import json
+import os
+import re
+import sys
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import ARTICLE_STORE_CONFIG
+from database.ingest import ArticleIngest
+from database.rollups import SOURCE_COLUMNS, daily_rollup
+
+
+# Columns of a partition file, the partition keys are not repeated inside the files
+SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('media', pa.string()),
+    ('titre', pa.string()),
+    ('date', pa.timestamp('us')),
+    ('url', pa.string()),
+    ('contenu', pa.string()),
+    ('categorie', pa.string()),
+    ('sensible', pa.bool_()),
+    ('toxicite_score', pa.float32()),
+    ('likes', pa.int64()),
+    ('partages', pa.int64()),
+    ('commentaires', pa.int64()),
+    ('replies', pa.int64()),
+    ('comments', pa.string()),              # JSON
+    ('comments_sensibles', pa.string()),    # JSON
+    ('scraped_at', pa.string()),            # ISO, a row is never replaced by an older scrape
+    ('updated_at', pa.timestamp('us')),
+])
+
+ANALYSIS_COLUMNS = ('categorie', 'sensible', 'toxicite_score', 'comments_sensibles')
+JSON_COLUMNS = ('comments', 'comments_sensibles')
+
+# Columns used by the dashboard pages: everything but the text and the raw comments
+DASHBOARD_COLUMNS = [
+    'id', 'media', 'titre', 'date', 'url', 'categorie', 'sensible', 'toxicite_score',
+    'likes', 'partages', 'commentaires', 'comments_sensibles',
+]
+
+UNDATED_MONTH = 'inconnu'
+
+
+def media_slug(name: str) -> str:
+    """
+    Directory name of a media ("L'Observateur Paalga" -> "l-observateur-paalga")
+    """
+    ascii_name = unicodedata.normalize('NFKD', name or 'inconnu').encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '-', ascii_name.lower()).strip('-') or 'inconnu'
+
+
+def _to_json(value) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _from_json(value):
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def _older(new: pd.Series, stored: pd.Series) -> pd.Series:
+    """
+    Rows whose new scrape is older than the stored one (ISO timestamps, unknown = not older)
+    """
+    both = new.notna() & stored.notna()
+    return both & (new.fillna('') < stored.fillna(''))
+
+
+class ParquetArticleStore:
+    """
+    Parquet dataset of the articles, partitioned by media and publication month
+    """
+
+    def __init__(self, directory: Path = ARTICLE_STORE_CONFIG['dir']):
+        self.directory = Path(directory)
+        self.compression = ARTICLE_STORE_CONFIG['compression']
+        # id -> partition directory ("media=<slug>/month=<YYYY-MM>"), read at the first write
+        self._partition_of: Optional[Dict[str, str]] = None
+
+    def exists(self) -> bool:
+        return any(self.directory.glob('media=*/month=*/articles.parquet'))
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _frame(self, articles: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Typed articles (database/ingest.py) -> DataFrame with the store schema
+        """
+        now = datetime.now()
+        rows = [
+            {
+                **{column: article[column] for column in SCHEMA.names if column in article},
+                **{column: _to_json(article[column]) for column in JSON_COLUMNS},
+                'updated_at': now,
+            }
+            for article in articles
+        ]
+        # sensible / toxicite_score stay None when the article was not analyzed yet (raw import)
+        df = pd.DataFrame(rows, columns=SCHEMA.names)
+        df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def write(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Upsert articles on their id, rewriting only the partitions they belong to
+        Analysis results (categorie, sensible...) are kept when an article is written
+        again without them (raw import). An article whose media or date changed is moved
+        out of its previous partition. As in the database, a stored article is not
+        replaced by an older scrape of it (scraped_at)
+        """
+        df = self._frame(records)
+        if df.empty:
+            return 0
+
+        # Latest scrape of each article of the batch
+        df = df.sort_values('scraped_at', na_position='first', kind='stable').drop_duplicates('id', keep='last')
+        months = df['date'].dt.strftime('%Y-%m').fillna(UNDATED_MONTH)
+        df['partition'] = 'media=' + df['media'].map(media_slug) + '/month=' + months
+        df = df.set_index('id', drop=False)
+
+        partition_of = self._partitions_by_id()
+        previous = df['id'].map(partition_of)
+        moved = previous.notna() & (previous != df['partition'])
+        for old, ids in df.index[moved].groupby(previous[moved].values).items():
+            stale, carried = self._remove_from_partition(old, df.loc[ids])
+            df = df.drop(stale)
+            # Analysis results follow the article to its new partition
+            for column in ANALYSIS_COLUMNS:
+                known = carried.index.intersection(df.index)
+                df.loc[known, column] = df.loc[known, column].where(
+                    df.loc[known, column].notna(), carried.loc[known, column]
+                )
+
+        count = 0
+        for partition, part in df.groupby('partition'):
+            count += self._write_partition(self.directory / partition, part.drop(columns='partition'))
+            partition_of.update(dict.fromkeys(part['id'], partition))
+        return count
+
+    def _partitions_by_id(self) -> Dict[str, str]:
+        """
+        Partition of every stored article, from the id column of the partition files
+        """
+        if self._partition_of is None:
+            self._partition_of = {}
+            for file in self.directory.glob('media=*/month=*/articles.parquet'):
+                partition = f"{file.parent.parent.name}/{file.parent.name}"
+                ids = pq.read_table(file, columns=['id']).column('id').to_pylist()
+                self._partition_of.update(dict.fromkeys(ids, partition))
+        return self._partition_of
+
+    def _read_table(self, file: Path, columns: Optional[List[str]] = None) -> pa.Table:
+        """
+        Columns of a partition file; those missing from files written by an older schema are empty
+        """
+        columns = columns or SCHEMA.names
+        available = set(pq.read_schema(file).names)
+        table = pq.read_table(file, columns=[column for column in columns if column in available])
+        for column in columns:
+            if column not in available:
+                table = table.append_column(SCHEMA.field(column), pa.nulls(len(table), SCHEMA.field(column).type))
+        return table.select(columns)
+
+    def _read_stored(self, file: Path) -> pd.DataFrame:
+        return self._read_table(file).to_pandas().astype({'date': 'datetime64[ns]', 'updated_at': 'datetime64[ns]'})
+
+    def _remove_from_partition(self, partition: str, new: pd.DataFrame):
+        """
+        Remove articles moved to another partition from their previous one
+        Returns the ids whose stored version is more recent than `new` (not moved) and
+        the stored rows of the removed articles
+        """
+        path = self.directory / partition
+        file = path / "articles.parquet"
+        if not file.exists():
+            return [], pd.DataFrame(columns=SCHEMA.names)
+
+        stored = self._read_stored(file).set_index('id', drop=False)
+        known = new.index.intersection(stored.index)
+        stale = known[_older(new.loc[known, 'scraped_at'], stored.loc[known, 'scraped_at'])]
+        removed = known.difference(stale)
+        if removed.empty:
+            return list(stale), stored.iloc[:0]
+
+        kept = stored.drop(removed)
+        if kept.empty:
+            file.unlink()
+            (path / "daily.parquet").unlink(missing_ok=True)
+        else:
+            self._write_rows(path, kept.reset_index(drop=True))
+        return list(stale), stored.loc[removed]
+
+    def _write_partition(self, path: Path, new: pd.DataFrame) -> int:
+        """
+        Upsert articles in a partition, returns the number of articles written
+        """
+        file = path / "articles.parquet"
+        new = new.set_index('id')
+
+        if file.exists():
+            stored = self._read_stored(file).set_index('id')
+            known = new.index.intersection(stored.index)
+            # Older scrapes of stored articles are ignored
+            new = new.drop(known[_older(new.loc[known, 'scraped_at'], stored.loc[known, 'scraped_at'])])
+            if new.empty:
+                return 0
+            known = new.index.intersection(stored.index)
+            # Raw records have no analysis results: keep those of the stored version
+            for column in ANALYSIS_COLUMNS:
+                new.loc[known, column] = new.loc[known, column].where(
+                    new.loc[known, column].notna(), stored.loc[known, column]
+                )
+            count = len(new)
+            new = pd.concat([stored.drop(known), new])
+        else:
+            count = len(new)
+
+        self._write_rows(path, new.reset_index())
+        return count
+
+    def _write_rows(self, path: Path, rows: pd.DataFrame):
+        rows = rows.sort_values('date', na_position='last')
+        rows['sensible'] = rows['sensible'].fillna(False).astype(bool)
+        rows['toxicite_score'] = rows['toxicite_score'].fillna(0.0).astype('float32')
+
+        path.mkdir(parents=True, exist_ok=True)
+        self._replace(path / "articles.parquet", pa.Table.from_pandas(rows[SCHEMA.names], schema=SCHEMA, preserve_index=False))
+        # Rollup of the partition, rewritten with it
+        self._replace(path / "daily.parquet", pa.Table.from_pandas(daily_rollup(rows), preserve_index=False))
+
+    def _replace(self, file: Path, table: pa.Table):
+        """
+        Written next to the final file then renamed: readers never see a partial file
+        """
+        tmp = file.with_suffix('.parquet.part')
+        pq.write_table(table, tmp, compression=self.compression)
+        os.replace(tmp, file)
+
+    def update(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Set some columns of stored articles (e.g. analysis results), returns the number of
+        articles updated; each record has the id, media and date of an article (to find
+        its partition) and the new values of the columns
+        """
+        updates = pd.DataFrame([
+            {**record, **{column: _to_json(record[column]) for column in JSON_COLUMNS if column in record}}
+            for record in records
+        ])
+        if updates.empty:
+            return 0
+        columns = [column for column in updates.columns if column not in ('id', 'media', 'date')]
+        dates = pd.to_datetime(updates['date'])
+        months = dates.dt.strftime('%Y-%m').fillna(UNDATED_MONTH)
+        slugs = updates['media'].map(media_slug)
+
+        count = 0
+        for (slug, month), part in updates.groupby([slugs, months]):
+            path = self.directory / f"media={slug}" / f"month={month}"
+            file = path / "articles.parquet"
+            if not file.exists():
+                continue
+            stored = self._read_stored(file)
+            values = part.drop_duplicates('id', keep='last').set_index('id')[columns]
+            known = stored['id'].isin(values.index)
+            for column in columns:
+                stored.loc[known, column] = stored.loc[known, 'id'].map(values[column])
+            stored['updated_at'] = stored['updated_at'].where(~known, pd.Timestamp.now())
+
+            self._replace(file, pa.Table.from_pandas(stored[SCHEMA.names], schema=SCHEMA, preserve_index=False))
+            self._replace(path / "daily.parquet", pa.Table.from_pandas(daily_rollup(stored), preserve_index=False))
+            count += int(known.sum())
+        return count
+
+    def write_medias(self, medias: List[Dict[str, Any]]):
+        """
+        Replace the media table (ranking, scores)
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._replace(self.directory / "medias.parquet", pa.Table.from_pylist(medias))
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def partitions(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   medias: Optional[Iterable[str]] = None) -> List[Path]:
+        """
+        Partition files overlapping [start, end] for some medias (None = all)
+        Undated articles are only read without a start date
+        """
+        slugs = {media_slug(name) for name in medias} if medias else None
+        first = start.strftime('%Y-%m') if start else None
+        last = end.strftime('%Y-%m') if end else None
+
+        files = []
+        for file in sorted(self.directory.glob('media=*/month=*/articles.parquet')):
+            slug = file.parent.parent.name.split('=', 1)[1]
+            month = file.parent.name.split('=', 1)[1]
+            if slugs is not None and slug not in slugs:
+                continue
+            if month == UNDATED_MONTH:
+                if first is None:
+                    files.append(file)
+                continue
+            if (first and month < first) or (last and month > last):
+                continue
+            files.append(file)
+        return files
+
+    def read(self, columns: Optional[List[str]] = None, start: Optional[datetime] = None,
+             end: Optional[datetime] = None, medias: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Articles of a period as a DataFrame, reading only `columns` (None = all)
+        JSON columns are decoded, dates are exact to the day (not only to the month)
+        """
+        columns = list(columns or SCHEMA.names)
+        read_columns = list(dict.fromkeys(columns + (['date'] if start or end else [])))
+
+        tables = [self._read_table(file, read_columns) for file in self.partitions(start, end, medias)]
+        if not tables:
+            return pd.DataFrame(columns=columns)
+
+        df = pa.concat_tables(tables).to_pandas()
+        if start is not None:
+            df = df[df['date'] >= pd.Timestamp(start)]
+        if end is not None:
+            df = df[df['date'] <= pd.Timestamp(end)]
+
+        for column in JSON_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].map(_from_json)
+        return df[columns].reset_index(drop=True)
+
+    def read_daily(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                   medias: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Daily rollups of a period (to the day), one row per media, day and category
+        Partitions written before the rollups existed are aggregated from their articles
+        """
+        frames = []
+        for file in self.partitions(start, end, medias):
+            daily = file.with_name("daily.parquet")
+            if daily.exists():
+                rollup = pq.read_table(daily).to_pandas()
+            else:
+                rollup = daily_rollup(pq.read_table(file, columns=SOURCE_COLUMNS).to_pandas())
+            frames.append(rollup.astype({'date': 'datetime64[ns]'}))
+        if not frames:
+            return daily_rollup(pd.DataFrame())
+
+        df = pd.concat(frames, ignore_index=True)
+        if start is not None:
+            df = df[df['date'] >= pd.Timestamp(start).normalize()]
+        if end is not None:
+            df = df[df['date'] <= pd.Timestamp(end)]
+        return df.reset_index(drop=True)
+
+    def read_medias(self) -> pd.DataFrame:
+        file = self.directory / "medias.parquet"
+        return pq.read_table(file).to_pandas() if file.exists() else pd.DataFrame()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convertir un JSON d'analyse en dataset Parquet")
+    parser.add_argument('json_file', help='Fichier {"articles": [...], "medias": [...]}')
+    parser.add_argument('--dir', default=str(ARTICLE_STORE_CONFIG['dir']), help='Répertoire du dataset')
+    args = parser.parse_args()
+
+    from utils.json_stream import iter_json_members
+
+    store = ParquetArticleStore(args.dir)
+    count = 0
+    with ArticleIngest(source=Path(args.json_file).name) as ingest:
+        # The articles are typed while the file is read, then the media table
+        for name, value in iter_json_members(args.json_file):
+            if name == 'articles':
+                count = store.write(ingest.convert(value))
+            elif name == 'medias':
+                medias = list(value)
+                if medias:
+                    store.write_medias(medias)
+    print(f"✓ {count} articles écrits dans {store.directory}")
+    if ingest.rejected:
+        print(f"  {ingest.rejected} articles en quarantaine: {ingest.quarantine_path}")
+
+    if store.exists():
+        from database.snapshot import write_snapshot
+        write_snapshot(store)
+        print("✓ Instantané du dashboard mis à jour")
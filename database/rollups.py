@@ -0,0 +1,39 @@
+"""
+Daily rollups of the articles read by the dashboard: one row per media, day and category
+
+The Parquet store writes them next to each partition (daily.parquet) every time the
+partition is rewritten; the dashboard answers its timelines and its per media / per
+category figures from them instead of aggregating every article of the period.
+(The SQLite equivalent, media_daily, is maintained by triggers in database/db_manager.py.)
+"""
+import pandas as pd
+
+
+ROLLUP_KEYS = ['media', 'date', 'categorie']
+ROLLUP_SUMS = ['likes', 'partages', 'commentaires', 'replies']
+
+# Article columns needed to compute a rollup
+SOURCE_COLUMNS = ['id', 'media', 'date', 'categorie', 'sensible', 'toxicite_score'] + ROLLUP_SUMS
+
+
+def daily_rollup(articles: pd.DataFrame) -> pd.DataFrame:
+    """
+    Typed articles (database/ingest.py) -> counters per media, day and category
+    Undated or unclassified articles keep a row (date NaT, categorie NaN) so totals stay exact
+    """
+    columns = ROLLUP_KEYS + ['nb_articles'] + ROLLUP_SUMS + ['nb_sensibles', 'toxicite_max']
+    if articles.empty:
+        return pd.DataFrame(columns=columns)
+
+    df = articles.assign(
+        date=pd.to_datetime(articles['date']).dt.normalize(),
+        nb_sensibles=articles['sensible'].fillna(False).astype('int64'),
+    )
+    sums = [column for column in ROLLUP_SUMS if column in df.columns]
+    rollup = df.groupby(ROLLUP_KEYS, dropna=False).agg(
+        nb_articles=('id', 'size'),
+        **{column: (column, 'sum') for column in sums},
+        nb_sensibles=('nb_sensibles', 'sum'),
+        toxicite_max=('toxicite_score', 'max'),
+    ).reset_index()
+    return rollup.reindex(columns=columns, fill_value=0)
@@ -0,0 +1,142 @@
+"""
+Snapshot of the dashboard frames for a fast start (Arrow IPC files)
+
+The dashboard starts by reading the Parquet store (database/parquet_store.py): every
+partition is decompressed and its columns converted again at each Streamlit restart.
+The snapshot holds the three frames the dashboard loads, already typed, in
+uncompressed Arrow IPC files that are memory-mapped at startup (the columns are not
+copied out of the file, except for the conversion of strings to Python objects):
+
+    <store>/snapshot/articles.arrow    articles, DASHBOARD_COLUMNS (comments_sensibles as JSON)
+    <store>/snapshot/daily.arrow       daily rollups (database/rollups.py)
+    <store>/snapshot/medias.arrow      media table
+
+Each file records the snapshot format version, the build it belongs to and the state
+of the store it was built from: a snapshot of another version, half-written or older
+than the store is refused (FileNotFoundError) and the dashboard reads the store.
+It is rebuilt by `python main.py --import` and with:
+    python -m database.snapshot
+"""
+import json
+import os
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import ARTICLE_STORE_CONFIG
+from database.parquet_store import DASHBOARD_COLUMNS, ParquetArticleStore
+
+# Format of the files: changing the frames or their types needs a new version
+SNAPSHOT_VERSION = 1
+
+FRAMES = ('articles', 'daily', 'medias')
+
+SNAPSHOT_DIR = 'snapshot'
+
+
+def store_state(store: ParquetArticleStore) -> str:
+    """
+    Number and latest modification of the store files: changes with every write
+    """
+    files = list(store.directory.glob('media=*/month=*/*.parquet')) + list(store.directory.glob('medias.parquet'))
+    latest = max((file.stat().st_mtime_ns for file in files), default=0)
+    return f"{len(files)}:{latest}"
+
+
+def _write(file: Path, df: pd.DataFrame, metadata: dict):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+    tmp = file.with_suffix('.arrow.part')
+    # Uncompressed: compressed buffers could not be memory-mapped
+    with pa.OSFile(str(tmp), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, file)
+
+
+def write_snapshot(store: Optional[ParquetArticleStore] = None) -> int:
+    """
+    Build the snapshot of the store, returns the number of articles
+    """
+    store = store or ParquetArticleStore()
+    directory = store.directory / SNAPSHOT_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+
+    # State read before the frames: a write during the build makes the snapshot stale, not wrong
+    state = store_state(store)
+    articles = store.read(DASHBOARD_COLUMNS)
+    articles['date'] = articles['date'].astype('datetime64[ns]')
+    articles['comments_sensibles'] = [
+        json.dumps(value, ensure_ascii=False) if value is not None else None
+        for value in articles['comments_sensibles']
+    ]
+    frames = {'articles': articles, 'daily': store.read_daily(), 'medias': store.read_medias()}
+
+    metadata = {
+        b'media_scan.version': str(SNAPSHOT_VERSION).encode(),
+        b'media_scan.build': uuid.uuid4().hex.encode(),
+        b'media_scan.store': state.encode(),
+        b'media_scan.created_at': datetime.now().isoformat().encode(),
+    }
+    for name, df in frames.items():
+        _write(directory / f"{name}.arrow", df, metadata)
+    return len(articles)
+
+
+def _read(file: Path) -> pa.Table:
+    # The table references the pages of the file: nothing is read before the columns are used
+    return pa.ipc.open_file(pa.memory_map(str(file), 'r')).read_all()
+
+
+def read_snapshot(store: Optional[ParquetArticleStore] = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    (articles, daily, medias) frames of the up-to-date snapshot of the store, FileNotFoundError otherwise
+    """
+    store = store or ParquetArticleStore()
+    directory = store.directory / SNAPSHOT_DIR
+    files = [directory / f"{name}.arrow" for name in FRAMES]
+    if not all(file.exists() for file in files):
+        raise FileNotFoundError(f"Pas d'instantané dans {directory}")
+
+    tables = [_read(file) for file in files]
+    metadata = [table.schema.metadata or {} for table in tables]
+    if any(meta.get(b'media_scan.version') != str(SNAPSHOT_VERSION).encode() for meta in metadata):
+        raise FileNotFoundError(f"Instantané {directory} d'une autre version")
+    if len({meta.get(b'media_scan.build') for meta in metadata}) != 1:
+        raise FileNotFoundError(f"Instantané {directory} incomplet")
+    if metadata[0].get(b'media_scan.store') != store_state(store).encode():
+        raise FileNotFoundError(f"Instantané {directory} plus ancien que le dataset")
+
+    # split_blocks: numeric columns stay views on the mapped file instead of being consolidated
+    articles, daily, medias = (table.to_pandas(split_blocks=True) for table in tables)
+    # Only the articles with sensitive comments are decoded
+    articles['comments_sensibles'] = [
+        None if value is None else [] if value == '[]' else json.loads(value)
+        for value in articles['comments_sensibles']
+    ]
+    return articles, daily, medias
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Construire l'instantané Arrow du dashboard depuis le dataset Parquet")
+    parser.add_argument('--dir', default=str(ARTICLE_STORE_CONFIG['dir']), help='Répertoire du dataset')
+    args = parser.parse_args()
+
+    store = ParquetArticleStore(args.dir)
+    if not store.exists():
+        print(f"✗ Le dataset {store.directory} n'existe pas")
+        sys.exit(1)
+    start = time.perf_counter()
+    count = write_snapshot(store)
+    print(f"✓ Instantané de {count} articles écrit dans {store.directory / SNAPSHOT_DIR} "
+          f"({time.perf_counter() - start:.1f}s)")
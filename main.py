@@ -3,17 +3,32 @@ MÉDIA-SCAN - Main Entry Point
 Système Intelligent d'Observation et d'Analyse des Médias au Burkina Faso
 """
 import argparse
-import json
+import time
+from dataclasses import asdict
 from pathlib import Path
 from datetime import datetime
 
-from config.settings import RAW_DATA_DIR, PROCESSED_DATA_DIR, MEDIA_SOURCES
+from config.settings import (
+    DATA_DIR, RAW_DATA_DIR, PROCESSED_DATA_DIR, MEDIA_SOURCES, RECORDER_CONFIG, COMMENT_REFRESH_CONFIG,
+    SEARCH_CONFIG, INGEST_CONFIG, TIERING_CONFIG, MODEL_CONFIG, ARTICLE_STORE_CONFIG,
+)
 from database.db_manager import DatabaseManager
+from database.dedup import ArticleDedup
+from database.ingest import ArticleIngest
+from utils.helpers import iter_raw_files, iter_json_records, batched
 
+# Number of articles sent to the database at once during import
+IMPORT_BATCH_SIZE = 500
 
-def scrape_all_medias(max_pages=10):
+# Number of articles read, classified and written back at once by the analysis
+ANALYSIS_BATCH_SIZE = 1000
+
+
+def scrape_all_medias(max_pages=10, incremental=False, record=False):
     """
     Run scrapers for all enabled media sources
+    In incremental mode, articles already collected by a previous run are skipped
+    With record, listing and article pages are archived for the parsing benchmark
     """
     print("="*60)
     print("MÉDIA-SCAN - Collecte de données")
@@ -30,40 +45,47 @@ def scrape_all_medias(max_pages=10):
     from scrapers.aib_scraper import AIBScraper
     from scrapers.burkina_24_scraper import Burkina24Scraper
 
-    process = CrawlerProcess(get_project_settings())
+    settings = get_project_settings()
+    if record:
+        settings.set('RECORD_RESPONSES', True)
+    process = CrawlerProcess(settings)
 
     # Add all enabled scrapers
     enabled_scrapers = []
 
     if MEDIA_SOURCES['lefaso']['enabled']:
         enabled_scrapers.append((LefasoScraper, 'Lefaso.net'))
-        process.crawl(LefasoScraper, max_pages=max_pages)
+        process.crawl(LefasoScraper, max_pages=max_pages, incremental=incremental)
 
     if MEDIA_SOURCES['fasopresse']['enabled']:
         enabled_scrapers.append((FasoPresseScraper, 'FasoPresse'))
-        process.crawl(FasoPresseScraper, max_pages=max_pages)
+        process.crawl(FasoPresseScraper, max_pages=max_pages, incremental=incremental)
 
     if MEDIA_SOURCES['sidwaya']['enabled']:
         enabled_scrapers.append((SidwayaScraper, 'Sidwaya'))
-        process.crawl(SidwayaScraper, max_pages=max_pages)
+        process.crawl(SidwayaScraper, max_pages=max_pages, incremental=incremental)
 
     if MEDIA_SOURCES['observateur_paalga']['enabled']:
         enabled_scrapers.append((LObservateurScraper, "L'Observateur Paalga"))
-        process.crawl(LObservateurScraper, max_pages=max_pages)
+        process.crawl(LObservateurScraper, max_pages=max_pages, incremental=incremental)
     
     if MEDIA_SOURCES['aib']['enabled']:
         enabled_scrapers.append((AIBScraper, "AIB (Agence d'Information du Burkina)"))
-        process.crawl(AIBScraper, max_pages=max_pages)
+        process.crawl(AIBScraper, max_pages=max_pages, incremental=incremental)
 
     if MEDIA_SOURCES['burkina_24']['enabled']:
         enabled_scrapers.append((Burkina24Scraper, "Burkina 24"))
-        process.crawl(Burkina24Scraper, max_pages=max_pages)
+        process.crawl(Burkina24Scraper, max_pages=max_pages, incremental=incremental)
 
     print(f"\nLancement du scraping pour {len(enabled_scrapers)} médias:")
     for _, name in enabled_scrapers:
         print(f"  - {name}")
 
     print(f"\nPages maximum par rubrique/catégorie: {max_pages}")
+    if incremental:
+        print("Mode incrémental: les articles déjà collectés sont ignorés")
+    if record:
+        print(f"Enregistrement des pages dans {RECORDER_CONFIG['dir']}")
     print("\nDémarrage du scraping...\n")
 
     try:
@@ -73,9 +95,36 @@ def scrape_all_medias(max_pages=10):
         print(f"\n✗ Erreur lors du scraping: {e}")
 
 
-def import_to_database():
+def refresh_comments():
+    """
+    Fetch only the new comments of the recently collected Lefaso articles
+    """
+    print("="*60)
+    print("MÉDIA-SCAN - Mise à jour des commentaires")
+    print("="*60)
+
+    from scrapy.crawler import CrawlerProcess
+    from scrapy.utils.project import get_project_settings
+    from scrapers.lefaso_scraper import LefasoScraper
+
+    process = CrawlerProcess(get_project_settings())
+    process.crawl(LefasoScraper, refresh_comments=True)
+
+    print(f"\nArticles publiés depuis {COMMENT_REFRESH_CONFIG['max_age_days']} jours, "
+          f"nouveaux commentaires dans {DATA_DIR / 'comments'}")
+    print("\nDémarrage...\n")
+
+    try:
+        process.start()
+        print("\n✓ Commentaires mis à jour!")
+    except Exception as e:
+        print(f"\n✗ Erreur lors de la mise à jour des commentaires: {e}")
+
+
+def import_to_database(dedup=True):
     """
     Import scraped data from JSON files to database
+    With dedup, the records already imported (same id and content) are skipped
     """
     print("="*60)
     print("MÉDIA-SCAN - Import des données vers la base de données")
@@ -84,6 +133,14 @@ def import_to_database():
     db = DatabaseManager()
     db.init_db()
 
+    # Columnar copy of the articles read by the dashboard (requires pyarrow)
+    try:
+        from database.parquet_store import ParquetArticleStore
+        store = ParquetArticleStore()
+    except ImportError:
+        store = None
+        print("[INFO] pyarrow non installé: le dataset Parquet du dashboard ne sera pas mis à jour")
+
     # Initialize media outlets in database
     for key, media_info in MEDIA_SOURCES.items():
         if media_info['enabled']:
@@ -94,40 +151,95 @@ def import_to_database():
             )
             print(f"✓ Média ajouté: {media_info['name']}")
 
-    # Import articles from JSON files
-    json_files = list(RAW_DATA_DIR.glob("*.json"))
+    # Records already imported: Bloom filter next to the database, exact check in the articles table
+    article_dedup = None
+    if dedup and INGEST_CONFIG['dedup']:
+        article_dedup = ArticleDedup(
+            db, db.db_path.with_suffix('.bloom'),
+            capacity=INGEST_CONFIG['bloom_capacity'], error_rate=INGEST_CONFIG['bloom_error_rate'],
+        )
+
+    # Import articles from JSON Lines shards (and legacy JSON files), batch by batch
+    json_files = iter_raw_files(RAW_DATA_DIR)
     total_imported = 0
+    total_rejected = 0
+    total_duplicates = 0
+    conversion_seconds = 0.0
+    store_pending = []
+    start = time.perf_counter()
 
     for json_file in json_files:
-        print(f"\nImport de: {json_file.name}")
+        print(f"\nImport de: {json_file.relative_to(RAW_DATA_DIR)}")
 
+        # Records are typed once here, malformed ones go to INGEST_CONFIG['quarantine_dir']
+        ingest = ArticleIngest(source=str(json_file.relative_to(RAW_DATA_DIR)), dedup=article_dedup)
         try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                articles = json.load(f)
+            count = 0
+            for records in batched(iter_json_records(json_file), IMPORT_BATCH_SIZE):
+                articles = ingest.convert(records)
+                count += db.bulk_add_articles(articles)
+
+                # Partitions rewritten once per write_buffer articles, across small shards
+                if store is not None:
+                    store_pending.extend(articles)
+                    if len(store_pending) >= ARTICLE_STORE_CONFIG['write_buffer']:
+                        store.write(store_pending)
+                        store_pending = []
 
-            if isinstance(articles, dict):
-                articles = [articles]
-
-            count = db.bulk_add_articles(articles)
             total_imported += count
             print(f"  ✓ {count} articles importés")
+            if ingest.duplicates:
+                print(f"  = {ingest.duplicates} doublons ignorés (déjà importés)")
+            if ingest.rejected:
+                print(f"  ✗ {ingest.rejected} articles invalides mis en quarantaine: {ingest.quarantine_path}")
 
         except Exception as e:
             print(f"  ✗ Erreur lors de l'import: {e}")
+        finally:
+            ingest.close()
+            total_rejected += ingest.rejected
+            total_duplicates += ingest.duplicates
+            conversion_seconds += ingest.seconds
+
+    if store is not None and store_pending:
+        store.write(store_pending)
+
+    if article_dedup is not None:
+        article_dedup.close()
+
+    # New comments of the comment refresh mode (--refresh-comments), after their articles
+    comments_added = 0
+    for delta_file in iter_raw_files(DATA_DIR / "comments"):
+        comments_added += db.add_comment_deltas(iter_json_records(delta_file))
+    if comments_added:
+        print(f"\n✓ {comments_added} nouveaux commentaires importés depuis {DATA_DIR / 'comments'}")
 
     print(f"\n{'='*60}")
-    print(f"TOTAL: {total_imported} articles importés dans la base de données")
+    elapsed = time.perf_counter() - start
+    print(f"TOTAL: {total_imported} articles importés dans la base de données "
+          f"({total_imported / elapsed if elapsed else 0:.0f} articles/s)")
+    converted = total_imported + total_duplicates + total_rejected
+    print(f"Typage: {converted} enregistrements ({converted / conversion_seconds if conversion_seconds else 0:.0f}/s), "
+          f"{total_duplicates} doublons ignorés, {total_rejected} en quarantaine")
     print(f"{'='*60}")
 
     # Update statistics
     print("\nMise à jour des statistiques...")
-    for media_info in MEDIA_SOURCES.values():
-        if media_info['enabled']:
-            db.update_media_stats(media_info['name'])
+    # Including the medias created from the imported files (pages without scraper)
+    for media in db.get_all_medias():
+        db.update_media_stats(media.nom)
 
     db.calculate_influence_scores()
+    if store is not None:
+        store.write_medias([asdict(media) for media in db.get_all_medias()])
     print("✓ Statistiques mises à jour")
 
+    if store is not None and store.exists():
+        # Frames of the dashboard, memory-mapped at its startup
+        from database.snapshot import write_snapshot
+        write_snapshot(store)
+        print("✓ Instantané du dashboard mis à jour")
+
 
 def show_stats():
     """
@@ -162,18 +274,210 @@ def show_stats():
         print()
 
 
-def run_analysis():
+def search_articles(text, page=1):
     """
-    Run thematic classification and content analysis
+    Full-text search in the imported articles (titles, bodies, comments)
+    """
+    print("="*60)
+    print("MÉDIA-SCAN - Recherche")
+    print("="*60)
+
+    per_page = SEARCH_CONFIG['results_per_page']
+    with DatabaseManager() as db:
+        start = time.perf_counter()
+        total = db.count_matches(text)
+        hits = db.search(text, limit=per_page, offset=(page - 1) * per_page)
+        elapsed = time.perf_counter() - start
+
+    pages = max(1, -(-total // per_page))
+    print(f"\n{total} article(s) pour « {text} » ({elapsed * 1000:.0f} ms) - page {page}/{pages}\n")
+
+    for rank, hit in enumerate(hits, (page - 1) * per_page + 1):
+        print(f"  {rank}. {hit.titre}")
+        print(f"     {hit.media} - {(hit.date_publication or 'date inconnue')[:10]}")
+        print(f"     {hit.extrait}")
+        print(f"     {hit.url}")
+        print()
+
+
+def show_toxic_comments(days=7):
+    """
+    Most toxic comments of the last days, per media
+    """
+    print("="*60)
+    print("MÉDIA-SCAN - Commentaires les plus toxiques")
+    print("="*60)
+
+    with DatabaseManager() as db:
+        comments = db.toxic_comments(days=days)
+
+    if not comments:
+        print(f"\nAucun commentaire évalué sur les {days} derniers jours")
+        return
+
+    media = None
+    for comment in comments:
+        if comment.media != media:
+            media = comment.media
+            print(f"\n{media}:")
+        text = comment.texte if len(comment.texte) <= 120 else comment.texte[:117] + "..."
+        print(f"  {comment.toxicite_score:.2f}  {(comment.date_commentaire or '')[:16]}  {text}")
+
+
+def tier_articles(max_age_days=None):
+    """
+    Move the texts of the old articles to the compressed cold tier (database/cold_store.py)
+    """
+    print("="*60)
+    print("MÉDIA-SCAN - Archivage des anciens articles")
+    print("="*60)
+
+    max_age_days = max_age_days or TIERING_CONFIG['max_age_days']
+    with DatabaseManager() as db:
+        start = time.perf_counter()
+        report = db.tier_articles(max_age_days)
+        elapsed = time.perf_counter() - start
+        stats = db.cold_store().stats()
+
+    print(f"\n✓ {report['articles']} articles de plus de {max_age_days} jours archivés ({elapsed:.1f}s)")
+    if report['compressed']:
+        print(f"  Textes: {report['size'] / 1e6:.1f} Mo -> {report['compressed'] / 1e6:.1f} Mo "
+              f"(ratio {report['size'] / report['compressed']:.1f})")
+    if stats['compressed']:
+        print(f"  Stockage froid: {stats['blobs']} textes, {stats['size'] / 1e6:.1f} Mo -> "
+              f"{stats['compressed'] / 1e6:.1f} Mo (ratio {stats['size'] / stats['compressed']:.1f})")
+
+
+def classify_articles(db, store, threads=None, reclassify=False, long_documents=None):
+    """
+    Thematic classification of the articles not classified yet (all of them with
+    reclassify) (analysis/classifier.py), returns the number of articles classified
+    long_documents: whole texts in sliding windows instead of their first tokens
+    """
+    from analysis.cache import InferenceCache
+    from analysis.classifier import NewsClassifier
+
+    model = MODEL_CONFIG['onnx_model'] if MODEL_CONFIG['inference_backend'] == 'onnx' else MODEL_CONFIG['news_classifier']
+    print(f"\nClassification thématique - chargement du modèle {model}...")
+    if long_documents is None:
+        long_documents = MODEL_CONFIG['long_documents']
+    classifier = NewsClassifier(threads=threads, long_documents=long_documents)
+    print(f"✓ Modèle chargé ({classifier.backend}, {classifier.threads} threads, révision {classifier.revision})")
+    if long_documents:
+        print(f"  Textes longs: fenêtres de {classifier.max_length} tokens, "
+              f"{classifier.max_windows * classifier.max_length} tokens par article au plus")
+
+    total = 0
+    start = time.perf_counter()
+    with InferenceCache(MODEL_CONFIG['inference_cache']) as cache:
+        for articles in db.iter_articles_to_classify(ANALYSIS_BATCH_SIZE, reclassify=reclassify):
+            categories = classifier.classify([article['texte'] for article in articles], cache)
+            db.set_categories({article['id']: categorie for article, categorie in zip(articles, categories)})
+            if store is not None:
+                store.update(
+                    {'id': article['id'], 'media': article['media'], 'date': article['date'], 'categorie': categorie}
+                    for article, categorie in zip(articles, categories)
+                )
+            total += len(articles)
+            print(f"  {total} articles classés ({total / (time.perf_counter() - start):.1f} articles/s)")
+
+    if not total:
+        print("  Aucun article à classer")
+        return 0
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ {total} articles classés en {elapsed:.1f}s ({total / elapsed:.1f} articles/s)")
+    print(f"  Cache: {cache.hits}/{total} textes déjà analysés ({cache.hit_ratio:.0%}), "
+          f"~{cache.saved_seconds:.1f}s d'inférence évitées")
+    if classifier.texts:
+        print(f"  Modèle: {classifier.texts} textes en {classifier.seconds:.1f}s ({classifier.rate:.1f} textes/s, "
+              f"{classifier.tokens / classifier.texts:.0f} tokens par texte)")
+    return total
+
+
+def score_toxicity(db, store, threads=None, rescore=False):
+    """
+    Toxicity of the articles and comments not scored yet (all of them with rescore)
+    (analysis/toxicity.py), returns the number of articles scored
+    """
+    from analysis.cache import InferenceCache
+    from analysis.toxicity import ToxicityScorer, score_articles
+
+    print(f"\nDétection de contenus toxiques - chargement du modèle Detoxify {MODEL_CONFIG['toxicity_model']}...")
+    scorer = ToxicityScorer(threads=threads)
+    print(f"✓ Modèle chargé ({scorer.threads} threads, révision {scorer.revision})")
+
+    total = comments = 0
+    start = time.perf_counter()
+    with InferenceCache(MODEL_CONFIG['inference_cache']) as cache:
+        for articles in db.iter_articles_to_score(ANALYSIS_BATCH_SIZE, rescore=rescore):
+            results = score_articles(articles, scorer, cache)
+            db.set_toxicity(
+                {article_id: (result['toxicite_score'], result['sensible']) for article_id, result in results.items()},
+                {comment_id: scores for result in results.values() for comment_id, scores in result['comments'].items()}
+            )
+            if store is not None:
+                store.update(
+                    {'id': article['id'], 'media': article['media'], 'date': article['date'],
+                     **{key: results[article['id']][key] for key in ('sensible', 'toxicite_score', 'comments_sensibles')}}
+                    for article in articles
+                )
+            total += len(articles)
+            comments += sum(len(article['comments']) for article in articles)
+            print(f"  {total} articles et {comments} commentaires évalués "
+                  f"({scorer.texts / (time.perf_counter() - start):.1f} textes/s)")
+
+    if not total:
+        print("  Aucun article à évaluer")
+        return 0
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ {total} articles et {comments} commentaires évalués en {elapsed:.1f}s "
+          f"({scorer.texts / elapsed:.1f} textes/s)")
+    print(f"  Dédoublonnage: {scorer.unique}/{scorer.texts} textes distincts "
+          f"({scorer.dedup_ratio:.0%} d'inférences évitées)")
+    print(f"  Cache: {cache.hits}/{scorer.unique} textes distincts déjà évalués ({cache.hit_ratio:.0%}), "
+          f"~{cache.saved_seconds:.1f}s d'inférence évitées")
+    if scorer.inferred:
+        print(f"  Modèle: {scorer.inferred} textes en {scorer.seconds:.1f}s "
+              f"({scorer.inferred / scorer.seconds:.1f} textes/s)")
+    return total
+
+
+def run_analysis(threads=None, reanalyze=False, long_documents=None):
+    """
+    Run thematic classification and toxicity detection of the articles not analyzed yet
+    (all of them with reanalyze); outputs already computed by the same model for the same
+    texts are taken from the inference cache (analysis/cache.py)
     """
     print("="*60)
     print("MÉDIA-SCAN - Analyse des contenus")
     print("="*60)
 
-    print("\n[INFO] Module d'analyse à implémenter")
-    print("  - Classification thématique (MODULE 2)")
-    print("  - Détection de contenus sensibles (MODULE 5)")
-    print("\nCe module sera développé dans l'étape suivante.")
+    try:
+        from database.parquet_store import ParquetArticleStore
+        store = ParquetArticleStore()
+        store = store if store.exists() else None
+    except ImportError:
+        store = None
+
+    threads = threads or MODEL_CONFIG['inference_threads']
+    analyzed = 0
+    with DatabaseManager() as db:
+        stages = (
+            (classify_articles, {'reclassify': reanalyze, 'long_documents': long_documents}),
+            (score_toxicity, {'rescore': reanalyze}),
+        )
+        for stage, options in stages:
+            try:
+                analyzed += stage(db, store, threads=threads, **options)
+            except ImportError as e:
+                print(f"\n✗ Module manquant pour l'analyse ({e.name}): pip install -r requirements.txt")
+
+    if analyzed and store is not None:
+        from database.snapshot import write_snapshot
+        write_snapshot(store)
+        print("\n✓ Instantané du dashboard mis à jour")
 
 
 def launch_dashboard():
@@ -216,9 +520,19 @@ def main():
         epilog="""
 Exemples d'utilisation:
   python main.py --scrape --max-pages 20     # Scraper les médias (20 pages/rubrique)
+  python main.py --scrape --incremental       # Ne collecter que les nouveaux articles
+  python main.py --scrape --record            # Archiver les pages pour le benchmark de parsing
+  python main.py --refresh-comments           # Nouveaux commentaires des articles récents
   python main.py --import                     # Importer les données scrapées
+  python main.py --import --no-dedup          # Tout réimporter, même les articles inchangés
   python main.py --stats                      # Afficher les statistiques
-  python main.py --analyze                    # Analyser les contenus
+  python main.py --search "forces armées"     # Rechercher dans les articles importés
+  python main.py --toxic-comments 7           # Commentaires les plus toxiques des 7 derniers jours
+  python main.py --tier --max-age 365         # Archiver les textes des articles de plus d'un an
+  python main.py --analyze                    # Classer et évaluer la toxicité des nouveaux articles
+  python main.py --analyze --threads 4        # ... sur 4 cœurs
+  python main.py --analyze --reanalyze        # Réanalyser tous les articles (textes modifiés, nouveaux modèles)
+  python main.py --analyze --long-documents   # Classer les textes entiers (fenêtres glissantes)
   python main.py --dashboard                  # Lancer le dashboard
 
 Workflow complet:
@@ -233,12 +547,37 @@ Workflow complet:
                         help='Lancer le scraping de tous les médias')
     parser.add_argument('--max-pages', type=int, default=10,
                         help='Nombre maximum de pages à scraper par rubrique (défaut: 10)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Mode incrémental: ignorer les articles déjà collectés')
+    parser.add_argument('--record', action='store_true',
+                        help='Archiver les pages de listing et d\'articles (data/fixtures) pour le benchmark de parsing')
+    parser.add_argument('--refresh-comments', action='store_true',
+                        help='Ne récupérer que les nouveaux commentaires des articles récents (Lefaso)')
     parser.add_argument('--import', dest='import_data', action='store_true',
                         help='Importer les données JSON vers la base de données')
+    parser.add_argument('--no-dedup', action='store_true',
+                        help='Avec --import: ne pas ignorer les articles déjà importés (reconstruire le dataset Parquet)')
     parser.add_argument('--stats', action='store_true',
                         help='Afficher les statistiques')
+    parser.add_argument('--search', metavar='TEXTE',
+                        help='Rechercher dans les titres, textes et commentaires des articles importés')
+    parser.add_argument('--page', type=int, default=1,
+                        help='Page de résultats de --search (défaut: 1)')
+    parser.add_argument('--toxic-comments', type=int, nargs='?', const=7, metavar='JOURS',
+                        help='Commentaires les plus toxiques par média sur les derniers jours (défaut: 7)')
+    parser.add_argument('--tier', action='store_true',
+                        help='Archiver les textes des anciens articles dans le stockage froid compressé')
+    parser.add_argument('--max-age', type=int, metavar='JOURS',
+                        help=f"Âge des articles archivés par --tier (défaut: {TIERING_CONFIG['max_age_days']} jours)")
     parser.add_argument('--analyze', action='store_true',
                         help='Analyser les contenus (classification, détection)')
+    parser.add_argument('--threads', type=int,
+                        help="Avec --analyze: threads de calcul de l'inférence (défaut: tous les cœurs)")
+    parser.add_argument('--long-documents', action='store_true',
+                        help="Avec --analyze: classer les textes entiers par fenêtres glissantes au lieu de leurs "
+                             f"{MODEL_CONFIG['inference_max_length']} premiers tokens")
+    parser.add_argument('--reanalyze', action='store_true',
+                        help="Avec --analyze: réanalyser tous les articles (seuls les textes absents du cache sont inférés)")
     parser.add_argument('--dashboard', action='store_true',
                         help='Lancer le dashboard interactif')
     parser.add_argument('--all', action='store_true',
@@ -260,17 +599,30 @@ Workflow complet:
 
     # Execute requested operations
     if args.all or args.scrape:
-        scrape_all_medias(max_pages=args.max_pages)
+        scrape_all_medias(max_pages=args.max_pages, incremental=args.incremental, record=args.record)
+
+    if args.refresh_comments:
+        refresh_comments()
 
     if args.all or args.import_data:
-        import_to_database()
+        import_to_database(dedup=not args.no_dedup)
 
     if args.all or args.analyze:
-        run_analysis()
+        run_analysis(threads=args.threads, reanalyze=args.reanalyze,
+                     long_documents=True if args.long_documents else None)
 
     if args.stats:
         show_stats()
 
+    if args.search:
+        search_articles(args.search, page=max(args.page, 1))
+
+    if args.toxic_comments:
+        show_toxic_comments(args.toxic_comments)
+
+    if args.tier:
+        tier_articles(args.max_age)
+
     if args.dashboard:
         launch_dashboard()
 
@@ -12,10 +12,12 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 
 from scrapers.base_scraper import BaseMediaScraper
-from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG, RAW_DATA_DIR
+from scrapers.specs import AIB_LISTING, AIB_ARTICLE
+from scrapers.wp_api import WordPressApiMixin
+from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG
 
 
-class AIBScraper(BaseMediaScraper):
+class AIBScraper(WordPressApiMixin, BaseMediaScraper):
     """
     Scraper pour AIB Media (Agence d'Information du Burkina)
     Site WordPress moderne avec thème Newspaper
@@ -23,38 +25,26 @@ class AIBScraper(BaseMediaScraper):
 
     name = 'aib_scraper'
     media_name = "AIB Media"
+    source_key = 'aib'
 
     def __init__(self, max_pages=10, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.max_pages = int(max_pages)
-        self.config = MEDIA_SOURCES.get('aib', {})
+        self.config = MEDIA_SOURCES.get(self.source_key, {})
         self.base_url = self.config.get('base_url', 'https://www.aib.media')
 
     custom_settings = {
         "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
-        "FEEDS": {
-            str(RAW_DATA_DIR / "aib_articles.json"): {
-                "format": "json",
-                "encoding": "utf8",
-                "overwrite": False,
-            },
-        },
         "USER_AGENT": SCRAPING_CONFIG.get('user_agent', 'Mozilla/5.0'),
-        "DOWNLOAD_DELAY": SCRAPING_CONFIG.get('download_delay', 2),
         "ROBOTSTXT_OBEY": SCRAPING_CONFIG.get('robotstxt_obey', True),
         "LOG_LEVEL": "INFO",
-        "CONCURRENT_REQUESTS": 2,
     }
 
-    def start_requests(self):
+    def listing_categories(self):
         """
-        Génère les requêtes pour les pages d'AIB Media
-        Structure: https://www.aib.media/category/[categorie]/page/X/
+        Catégories parcourues pour AIB Media
+        Note: AIB a des sous-domaines (regions.aib.media) mais on se concentre sur le principal
         """
-        self.logger.info(f"Démarrage du scraper pour {self.media_name}")
-
-        # Catégories principales du site
-        # Note: AIB a des sous-domaines (regions.aib.media) mais on se concentre sur le principal
         categories = [
             'depeches',
             'evenements',
@@ -68,22 +58,16 @@ class AIBScraper(BaseMediaScraper):
         ]
 
         for category in categories:
-            # Page 1 (sans /page/)
-            yield scrapy.Request(
-                url=f"{self.base_url}/category/{category}/",
-                callback=self.parse_article_list,
-                meta={'category': category, 'page_num': 1},
-                errback=self.handle_error
-            )
-            
-            # Pages suivantes
-            for page in range(2, self.max_pages + 1):
-                yield scrapy.Request(
-                    url=f"{self.base_url}/category/{category}/page/{page}/",
-                    callback=self.parse_article_list,
-                    meta={'category': category, 'page_num': page},
-                    errback=self.handle_error
-                )
+            yield category, {}
+
+    def listing_url(self, category, page_num, extra_meta):
+        """
+        Structure: https://www.aib.media/category/[categorie]/page/X/
+        """
+        # Page 1 (sans /page/)
+        if page_num == 1:
+            return f"{self.base_url}/category/{category}/"
+        return f"{self.base_url}/category/{category}/page/{page_num}/"
 
     def parse_article_list(self, response):
         """
@@ -97,22 +81,20 @@ class AIBScraper(BaseMediaScraper):
 
         # Extraire les liens d'articles
         # Structure AIB: <h3 class="entry-title td-module-title"><a href="URL">
-        article_links = response.xpath(
-            '//h3[contains(@class, "entry-title") and contains(@class, "td-module-title")]//a/@href'
-        ).getall()
-
-        # Aussi depuis les modules td_module_mx4 (sidebar)
-        if not article_links:
-            article_links = response.xpath(
-                '//div[contains(@class, "td_module")]//h3[@class="entry-title td-module-title"]//a/@href'
-            ).getall()
+        article_links = AIB_LISTING.extract_field(response, 'links')
 
         self.logger.info(f"Trouvé {len(article_links)} articles sur la page {page_num}")
 
         # Dédupliquer les liens (éviter les doublons)
         unique_links = list(dict.fromkeys(article_links))
 
-        for link in unique_links:
+        # Mode incrémental: ignorer les articles déjà collectés
+        new_links = self.filter_new_links(unique_links, category)
+
+        # Page suivante seulement si celle-ci a produit des articles
+        yield from self.follow_pagination(response, unique_links, new_links)
+
+        for link in new_links:
             yield scrapy.Request(
                 url=link,
                 callback=self.parse_article,
@@ -127,93 +109,24 @@ class AIBScraper(BaseMediaScraper):
         """
         self.logger.info(f"Extraction de l'article: {response.url}")
 
-        # Extraire le titre
-        title = (
-            response.xpath('//h1[@class="entry-title"]//text()').get() or
-            response.xpath('//h1[contains(@class, "tdb-title-text")]//text()').get() or
-            response.xpath('//meta[@property="og:title"]/@content').get() or
-            response.xpath('//title/text()').get()
-        )
+        # Extraction déclarative (scrapers/specs.py), XPath compilées une seule fois
+        fields = AIB_ARTICLE.extract(response, self)
+        title = fields['title']
+        content = fields['content']
 
-        # Extraire l'auteur
-        # Structure: <div class="td-post-author-name"><a>Nom</a>
-        author = response.xpath(
-            '//div[@class="td-post-author-name"]//a/text() | '
-            '//a[@rel="author"]/text() | '
-            '//span[@class="td-post-author-name"]//text()'
-        ).get()
-        
-        if not author:
-            # Meta author
-            author = response.xpath('//meta[@name="author"]/@content').get()
-
-        # Extraire la date de publication
-        # Structure: <time class="entry-date" datetime="2025-11-15T15:47:51+01:00">
-        date_raw = response.xpath(
-            '//time[@class="entry-date updated td-module-date"]/@datetime | '
-            '//time[@class="entry-date"]/@datetime | '
-            '//span[@class="td-post-date"]//time/@datetime'
-        ).get()
-        
-        if not date_raw:
-            # Texte de la date
-            date_raw = response.xpath(
-                '//time[@class="entry-date"]/text() | '
-                '//span[@class="td-post-date"]//time/text()'
-            ).get()
-        
-        publication_date = self.parse_iso_date(date_raw) if date_raw else ""
-
-        # Extraire le contenu principal
-        # AIB utilise différentes structures selon le type d'article
-        content_paragraphs = response.xpath(
-            '//div[contains(@class, "td-post-content")]//p//text() | '
-            '//div[contains(@class, "td-post-content")]//p/strong//text() | '
-            '//div[contains(@class, "td-post-content")]//p/em//text() | '
-            '//div[@class="td-post-content"]//div[@class="td-paragraph"]//text()'
-        ).getall()
-
-        if not content_paragraphs:
-            # Fallback: structure alternative
-            content_paragraphs = response.xpath(
-                '//article//div[contains(@class, "entry-content")]//p//text() | '
-                '//div[contains(@class, "tdb-block-inner")]//p//text()'
-            ).getall()
-
-        # Nettoyer le contenu
-        content = self.clean_article_content(content_paragraphs)
-
-        # Extraire l'image principale
-        image_url = (
-            response.xpath('//meta[@property="og:image"]/@content').get() or
-            response.xpath('//div[@class="td-post-featured-image"]//img/@src').get() or
-            response.xpath('//article//img[@class="entry-thumb"]/@src').get() or
-            response.xpath('//div[contains(@class, "td-module-image")]//img/@src').get()
-        )
-
-        # Extraire la catégorie depuis le badge
-        category_badge = response.xpath(
-            '//a[@class="td-post-category"]/text()'
-        ).get()
-        
-        category = category_badge if category_badge else response.meta.get('category', '')
-
-        # Extraire les tags
-        tags = response.xpath(
-            '//ul[@class="td-tags"]//a/text() | '
-            '//div[@class="td-post-source-via"]//a/text()'
-        ).getall()
+        # Catégorie depuis le badge, sinon celle de la liste
+        category = fields['category'] or response.meta.get('category', '')
 
         # Préparer les données de l'article
         article_data = {
-            'title': title.strip() if title else "",
-            'author': author.strip() if author else "AIB",
-            'date_publication': publication_date,
+            'title': title,
+            'author': fields['author'],
+            'date_publication': fields['date'],
             'post': content,
             'url': response.url,
-            'image_url': image_url if image_url else "",
+            'image_url': fields['image'],
             'category': category,
-            'tags': tags,
+            'tags': fields['tags'],
             'comments': [],
             'likes': 0,
             'partages': 0,
@@ -320,12 +233,12 @@ class AIBScraper(BaseMediaScraper):
         self.logger.error(f"Raison: {failure.value}")
 
 
-def run_scraper(max_pages=10):
+def run_scraper(max_pages=10, incremental=False):
     """
     Exécute le scraper AIB Media
     """
     process = CrawlerProcess()
-    process.crawl(AIBScraper, max_pages=max_pages)
+    process.crawl(AIBScraper, max_pages=max_pages, incremental=incremental)
     process.start()
 
 
@@ -341,6 +254,11 @@ if __name__ == "__main__":
         default=10,
         help='Nombre maximum de pages à scraper par catégorie (défaut: 10)'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Mode incrémental: ignorer les articles déjà collectés'
+    )
 
     args = parser.parse_args()
 
@@ -350,6 +268,6 @@ if __name__ == "__main__":
     print(f"Catégories: Dépêches, Événements, Médias, Politique, Économie, etc.")
     print(f"Note: Le site a aussi un sous-domaine regions.aib.media")
 
-    run_scraper(max_pages=args.max_pages)
+    run_scraper(max_pages=args.max_pages, incremental=args.incremental)
 
     print("Scraping terminé!")
\ No newline at end of file
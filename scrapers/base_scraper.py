@@ -2,9 +2,18 @@
 Base scraper class for all media sources
 """
 import scrapy
-from datetime import datetime
+from scrapy.spidermiddlewares.httperror import HttpError
+from scrapy.utils.gz import gunzip, gzip_magic_number
+from datetime import datetime, timedelta
 import hashlib
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
+from urllib.parse import urljoin
+
+from config.settings import (
+    FEED_CONFIG, INCREMENTAL_CONFIG, HTTP_CACHE_CONFIG, THROTTLE_CONFIG, DISCOVERY_CONFIG, MEDIA_SOURCES
+)
+from scrapers.discovery import DiscoveredUrl, is_sitemap, newest_undated, parse_sitemap, parse_feed
+from scrapers.seen_index import SeenArticleIndex
 
 
 class BaseMediaScraper(scrapy.Spider):
@@ -16,21 +25,173 @@ class BaseMediaScraper(scrapy.Spider):
     # To be overridden by child classes
     media_name = "Base Media"
     base_url = ""
+    source_key = None  # Key of the media in MEDIA_SOURCES
+    max_pages = 10
 
     custom_settings = {
         "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7"
     }
 
+    @classmethod
+    def update_settings(cls, settings):
+        """
+        Apply the settings shared by all media scrapers, then the spider's custom_settings
+        """
+        middlewares = {}
+
+        # Date-sharded JSON Lines output, spiders can still set their own FEEDS
+        feed_options = {
+            "format": "jsonlines",
+            "encoding": "utf8",
+            "overwrite": True,
+            "store_empty": False,
+            "batch_item_count": FEED_CONFIG['batch_item_count'],
+        }
+        settings.setdict({
+            "FEEDS": {
+                FEED_CONFIG['uri']: {**feed_options, "item_filter": "scrapers.feeds.ArticleItemFilter"},
+                FEED_CONFIG['comments_uri']: {**feed_options, "item_classes": ["scrapers.comments.CommentDelta"]},
+            },
+            "FEED_URI_PARAMS": "scrapers.feeds.feed_uri_params",
+            "FEED_STORAGES": {
+                "": "scrapers.feeds.AtomicFileFeedStorage",
+                "file": "scrapers.feeds.AtomicFileFeedStorage",
+            },
+        }, priority="spider")
+
+        if HTTP_CACHE_CONFIG['enabled']:
+            settings.setdict({
+                "HTTPCACHE_ENABLED": True,
+                "HTTPCACHE_DIR": str(HTTP_CACHE_CONFIG['dir']),
+                "HTTPCACHE_GZIP": HTTP_CACHE_CONFIG['gzip'],
+                "HTTPCACHE_EXPIRATION_SECS": 0,
+                "HTTPCACHE_POLICY": "scrapers.middlewares.ConditionalGetPolicy",
+                "HTTPCACHE_STORAGE": "scrapy.extensions.httpcache.FilesystemCacheStorage",
+                # Keep pages sent with no-cache: they are revalidated anyway
+                "HTTPCACHE_IGNORE_RESPONSE_CACHE_CONTROLS": ["no-cache"],
+            }, priority="spider")
+            middlewares.update({
+                "scrapy.downloadermiddlewares.httpcache.HttpCacheMiddleware": None,
+                "scrapers.middlewares.ConditionalHttpCacheMiddleware": 900,
+            })
+
+        if THROTTLE_CONFIG['enabled']:
+            throttle = cls.throttle_bounds()
+            settings.setdict({
+                "DOWNLOAD_DELAY": throttle['start_delay'],
+                "CONCURRENT_REQUESTS_PER_DOMAIN": throttle['start_concurrency'],
+                "CONCURRENT_REQUESTS": throttle['max_concurrency'],
+                "AUTOTHROTTLE_ENABLED": False,
+                "ADAPTIVE_THROTTLE_ENABLED": True,
+                "ADAPTIVE_THROTTLE_MIN_DELAY": throttle['min_delay'],
+                "ADAPTIVE_THROTTLE_MAX_DELAY": throttle['max_delay'],
+                "ADAPTIVE_THROTTLE_MIN_CONCURRENCY": throttle['min_concurrency'],
+                "ADAPTIVE_THROTTLE_MAX_CONCURRENCY": throttle['max_concurrency'],
+                "ADAPTIVE_THROTTLE_TARGET_LATENCY": throttle['target_latency'],
+                "ADAPTIVE_THROTTLE_ERROR_RATE": throttle['error_rate'],
+                "ADAPTIVE_THROTTLE_WINDOW": throttle['window'],
+            }, priority="spider")
+            middlewares["scrapers.middlewares.AdaptiveThrottleMiddleware"] = 950
+
+        if middlewares:
+            settings.set("DOWNLOADER_MIDDLEWARES", {
+                **settings.getdict("DOWNLOADER_MIDDLEWARES"), **middlewares
+            }, priority="spider")
+
+        # Response recording, inactive unless RECORD_RESPONSES is set (main.py --record)
+        settings.set("SPIDER_MIDDLEWARES", {
+            **settings.getdict("SPIDER_MIDDLEWARES"),
+            "scrapers.recorder.ResponseRecorderMiddleware": 960,
+        }, priority="spider")
+
+        super().update_settings(settings)
+
+    @classmethod
+    def throttle_bounds(cls) -> Dict[str, Any]:
+        """
+        Throttling bounds of the media: global THROTTLE_CONFIG overridden by its MEDIA_SOURCES entry
+        """
+        bounds = dict(THROTTLE_CONFIG)
+        bounds.update(MEDIA_SOURCES.get(cls.source_key, {}).get('throttle', {}))
+
+        # Keep the starting point inside the bounds
+        bounds['start_delay'] = min(max(bounds['start_delay'], bounds['min_delay']), bounds['max_delay'])
+        bounds['start_concurrency'] = min(
+            max(bounds['start_concurrency'], bounds['min_concurrency']), bounds['max_concurrency']
+        )
+        return bounds
+
     def __init__(self, *args, **kwargs):
+        incremental = kwargs.pop('incremental', INCREMENTAL_CONFIG['enabled'])
+        discovery = kwargs.pop('discovery', None)
         super().__init__(*args, **kwargs)
         self.article_count = 0
 
+        # Discovery mode: "listing" (HTML categories), "sitemap" or "feed"
+        source = MEDIA_SOURCES.get(self.source_key, {})
+        self.discovery = discovery or source.get('discovery', DISCOVERY_CONFIG['default_mode'])
+        self.discovered_lastmod = {}
+        self._discovered_urls = set()
+        self._discovery_pending = 0
+        self._discovery_found = 0
+        # Article URLs requested without lastmod, capped by DISCOVERY_CONFIG['max_undated']
+        self._undated_requested = 0
+
+        # Every run records the articles it collects in the seen index,
+        # incremental mode also skips the ones already collected by a previous run
+        self.incremental = str(incremental).lower() in ('1', 'true', 'yes', 'oui')
+        self.exhausted_categories = set()
+        self.pagination_stats = {}
+        self.seen_index = SeenArticleIndex(INCREMENTAL_CONFIG['index_path'])
+        if self.incremental:
+            known = self.seen_index.load(self.media_name)
+            self.logger.info(f"Incremental mode: {known} articles already known for {self.media_name}")
+
     def generate_article_id(self, url: str) -> str:
         """
         Generate a unique ID for an article based on its URL
         """
         return hashlib.md5(url.encode()).hexdigest()
 
+    def filter_new_links(self, links: Iterable[str], category=None) -> List[str]:
+        """
+        Keep only the article links not already in the seen index
+        In incremental mode, a listing page without any new link marks its category as exhausted
+        """
+        links = list(links)
+        if not self.incremental:
+            return links
+
+        new_links = []
+        known_ids = []
+        for link in links:
+            article_id = self.generate_article_id(link)
+            if self.seen_index.contains(article_id):
+                known_ids.append(article_id)
+            else:
+                new_links.append(link)
+
+        self.seen_index.refresh(known_ids)
+        self._inc_stat('incremental/skipped_articles', len(known_ids))
+
+        if links and not new_links and category is not None:
+            self.logger.info(f"Only known articles in '{category}', stopping pagination")
+            self.exhausted_categories.add(category)
+            self._inc_stat('incremental/exhausted_categories')
+
+        return new_links
+
+    def is_category_exhausted(self, category) -> bool:
+        """
+        Check if pagination of a category must stop (incremental mode)
+        """
+        return category in self.exhausted_categories
+
+    def _inc_stat(self, key: str, count: int = 1):
+        crawler = getattr(self, 'crawler', None)
+        if crawler is not None and count:
+            crawler.stats.inc_value(key, count, spider=self)
+
     def parse_date(self, date_string: str) -> str:
         """
         Parse date string to standardized format (YYYY-MM-DD)
@@ -112,16 +273,297 @@ class BaseMediaScraper(scrapy.Spider):
             "comments": data.get('comments', [])
         }
 
+        lastmod = self.discovered_lastmod.pop(data['url'], None)
+        self.seen_index.add(article_id, self.media_name, data['url'], formatted['date'], lastmod)
+
         return formatted
 
     def start_requests(self):
         """
+        Start with the sitemaps/feeds of the media in sitemap or feed discovery mode,
+        else with the first listing page of every category
+        """
+        if self.discovery in ('sitemap', 'feed'):
+            requests = list(self.discovery_requests())
+            if requests:
+                self.logger.info(f"Starting scraper for {self.media_name} ({self.discovery} discovery)")
+                yield from requests
+                return
+            self.logger.warning(f"No {self.discovery} configured for {self.media_name}, using listing pages")
+
+        self.logger.info(f"Starting scraper for {self.media_name} (max {self.max_pages} pages per category)")
+        yield from self.listing_requests()
+
+    def listing_requests(self):
+        """
+        Request the first listing page of every category
+        Next pages are requested one at a time by follow_pagination
+        """
+        for category, extra_meta in self.listing_categories():
+            yield self.listing_request(category, 1, extra_meta)
+
+    def listing_categories(self):
+        """
+        Yield (category, extra_meta) tuples for the categories to paginate
+        To be implemented by child classes
+        """
+        raise NotImplementedError("listing_categories must be implemented by child class")
+
+    def listing_url(self, category, page_num: int, extra_meta: Dict[str, Any]) -> str:
+        """
+        Build the URL of a listing page
         To be implemented by child classes
         """
-        raise NotImplementedError("start_requests must be implemented by child class")
+        raise NotImplementedError("listing_url must be implemented by child class")
+
+    def listing_request(self, category, page_num: int, extra_meta: Optional[Dict[str, Any]] = None) -> scrapy.Request:
+        """
+        Build the request for a listing page of a category
+        """
+        extra_meta = extra_meta or {}
+        return scrapy.Request(
+            url=self.listing_url(category, page_num, extra_meta),
+            callback=self.parse_article_list,
+            meta={
+                **extra_meta,
+                'category': category,
+                'page_num': page_num,
+                'listing_meta': extra_meta,
+            },
+            errback=self.handle_listing_error
+        )
+
+    def follow_pagination(self, response, links: List[str], new_links: Optional[List[str]] = None):
+        """
+        Yield the request for the next listing page only if the current one was productive:
+        it returned article links and, in incremental mode, some of them were new
+        """
+        category = response.meta.get('category')
+        page_num = response.meta.get('page_num', 1)
+
+        stats = self._category_stats(category)
+        stats['pages'] = max(stats['pages'], page_num)
+        stats['links'] += len(links)
+        stats['new_links'] += len(links if new_links is None else new_links)
+
+        if not links:
+            self._stop_pagination(category, 'empty_page')
+        elif self.is_category_exhausted(category):
+            self._stop_pagination(category, 'only_known_articles')
+        elif page_num >= self.max_pages:
+            self._stop_pagination(category, 'max_pages')
+        else:
+            yield self.listing_request(category, page_num + 1, response.meta.get('listing_meta'))
+
+    def handle_listing_error(self, failure):
+        """
+        A listing page failed (404, timeout...): stop paginating its category
+        """
+        request = failure.request
+        if failure.check(HttpError):
+            reason = f"http_{failure.value.response.status}"
+        else:
+            reason = 'error'
+
+        category = request.meta.get('category')
+        stats = self._category_stats(category)
+        stats['pages'] = max(stats['pages'], request.meta.get('page_num', 1) - 1)
+        self._stop_pagination(category, reason)
+        return self.handle_error(failure)
+
+    def discovery_requests(self):
+        """
+        Yield the requests for the sitemap or the feeds configured in MEDIA_SOURCES
+        The sitemap URLs are alternatives (first one readable wins), all the feeds are read
+        """
+        source = MEDIA_SOURCES.get(self.source_key, {})
+        if self.discovery == 'sitemap':
+            sitemap_urls = source.get('sitemap_urls', [])
+            if sitemap_urls:
+                yield self.discovery_request(sitemap_urls[0], self.parse_sitemap, sitemap_urls[1:])
+        else:
+            for feed_url in source.get('feed_urls', []):
+                yield self.discovery_request(feed_url, self.parse_feed)
+
+    def discovery_request(self, url: str, callback, alternatives: Iterable[str] = ()) -> scrapy.Request:
+        """
+        Build the request for a sitemap or a feed, relative URLs are resolved against base_url
+        """
+        self._discovery_pending += 1
+        return scrapy.Request(
+            url=urljoin(self.base_url, url),
+            callback=callback,
+            meta={'alternatives': list(alternatives)},
+            errback=self.handle_discovery_error,
+            dont_filter=True
+        )
+
+    def parse_sitemap(self, response):
+        """
+        Parse a sitemap index (follow the post sitemaps) or a sitemap of articles
+        """
+        body = gunzip(response.body) if gzip_magic_number(response) else response.body
+        if not is_sitemap(body):
+            self.logger.warning(f"Not a sitemap: {response.url}")
+            yield from self._discovery_failed(response.request)
+            return
+
+        children, urls = parse_sitemap(body, DISCOVERY_CONFIG['sitemap_follow'])
+        cutoff = self._discovery_cutoff()
+        # Child sitemaps not modified within the window only list old articles,
+        # undated ones are limited to the newest
+        followed = [child for child in children if child.lastmod is not None and child.lastmod >= cutoff]
+        followed += newest_undated(children, DISCOVERY_CONFIG['max_undated_sitemaps'])
+        self._inc_stat('discovery/skipped_sitemaps', len(children) - len(followed))
+        for child in followed:
+            yield self.discovery_request(child.url, self.parse_sitemap)
+
+        # Undated article URLs newest first, so that the max_undated budget keeps the recent ones
+        urls = [entry for entry in urls if entry.lastmod is not None] + newest_undated(urls, len(urls))
+        yield from self.discovered_requests(urls)
+        yield from self._discovery_done(len(children) + len(urls))
+
+    def parse_feed(self, response):
+        """
+        Parse a RSS/Atom feed
+        """
+        urls = parse_feed(response)
+        if not urls:
+            self.logger.warning(f"Empty or unreadable feed: {response.url}")
+
+        yield from self.discovered_requests(urls)
+        yield from self._discovery_done(len(urls))
+
+    def discovered_requests(self, urls: Iterable[DiscoveredUrl]):
+        """
+        Request the articles found in a sitemap or feed that are recent enough and,
+        in incremental mode, new or modified since their last collection
+        Entries without lastmod are requested within the DISCOVERY_CONFIG['max_undated'] budget
+        """
+        cutoff = self._discovery_cutoff()
+        known_ids = []
+
+        for entry in urls:
+            if entry.url in self._discovered_urls:
+                continue
+            self._discovered_urls.add(entry.url)
+
+            if entry.lastmod is not None and entry.lastmod < cutoff:
+                self._inc_stat('discovery/too_old')
+                continue
+            if entry.lastmod is None and self._undated_requested >= DISCOVERY_CONFIG['max_undated']:
+                self._inc_stat('discovery/undated_skipped')
+                continue
+
+            article_id = self.generate_article_id(entry.url)
+            if self.incremental and self.seen_index.contains(article_id):
+                if not self.seen_index.is_modified(article_id, entry.lastmod):
+                    known_ids.append(article_id)
+                    continue
+                self._inc_stat('discovery/modified')
+            else:
+                self._inc_stat('discovery/new')
+
+            if entry.lastmod is not None:
+                self.discovered_lastmod[entry.url] = entry.lastmod
+            else:
+                self._undated_requested += 1
+            yield scrapy.Request(
+                url=entry.url,
+                callback=self.parse_article,
+                meta={'category': entry.category, 'discovery': self.discovery},
+                errback=self.handle_error
+            )
+
+        if self.incremental:
+            self.seen_index.refresh(known_ids)
+            self._inc_stat('incremental/skipped_articles', len(known_ids))
+
+    def handle_discovery_error(self, failure):
+        """
+        A sitemap or feed failed: try the next alternative URL, or the listing pages
+        """
+        self.logger.warning(f"Discovery request failed: {failure.request.url} ({failure.value})")
+        yield from self._discovery_failed(failure.request)
+
+    def _discovery_failed(self, request):
+        alternatives = request.meta.get('alternatives', [])
+        if alternatives:
+            yield self.discovery_request(alternatives[0], request.callback, alternatives[1:])
+        yield from self._discovery_done(0)
+
+    def _discovery_done(self, found: int):
+        """
+        Account for a finished sitemap/feed request and fall back to the listing
+        crawl once all of them are done without any URL found
+        """
+        self._discovery_pending -= 1
+        self._discovery_found += found
+        if self._discovery_pending == 0 and self._discovery_found == 0:
+            self.logger.warning(
+                f"No sitemap/feed readable for {self.media_name}, falling back to listing pages"
+            )
+            self._inc_stat('discovery/fallback')
+            self.discovery = 'listing'
+            yield from self.listing_requests()
+
+    def _discovery_cutoff(self) -> datetime:
+        return datetime.now() - timedelta(days=DISCOVERY_CONFIG['max_age_days'])
+
+    def handle_error(self, failure):
+        """
+        Log request errors, can be overridden by child classes
+        """
+        self.logger.error(f"Request failed: {failure.request.url}")
+        self.logger.error(f"Error: {failure.value}")
+
+    def _category_stats(self, category) -> Dict[str, Any]:
+        return self.pagination_stats.setdefault(
+            category, {'pages': 0, 'links': 0, 'new_links': 0, 'stop_reason': None}
+        )
+
+    def _stop_pagination(self, category, reason: str):
+        stats = self._category_stats(category)
+        stats['stop_reason'] = reason
+        self.logger.info(f"Pagination of '{category}' stopped after {stats['pages']} page(s): {reason}")
+
+        crawler = getattr(self, 'crawler', None)
+        if crawler is not None:
+            crawler.stats.set_value(f"pagination/depth/{category}", stats['pages'], spider=self)
+            crawler.stats.inc_value(f"pagination/stop_reason/{reason}", spider=self)
+            crawler.stats.max_value("pagination/max_depth", stats['pages'], spider=self)
 
     def parse(self, response):
         """
         To be implemented by child classes
         """
-        raise NotImplementedError("parse must be implemented by child class")
\ No newline at end of file
+        raise NotImplementedError("parse must be implemented by child class")
+
+    def closed(self, reason):
+        """
+        Called when the spider closes: persist the seen index and log pagination depths
+        """
+        self.seen_index.close()
+
+        for category, stats in self.pagination_stats.items():
+            self.logger.info(
+                f"Category '{category}': {stats['pages']} page(s), {stats['links']} links "
+                f"({stats['new_links']} new), stop: {stats['stop_reason']}"
+            )
+
+        crawler = getattr(self, 'crawler', None)
+        if crawler is not None and crawler.settings.getbool("HTTPCACHE_ENABLED"):
+            stats = crawler.stats
+            hits = stats.get_value("httpcache/not_modified", 0, spider=self)
+            stale = stats.get_value("httpcache/stale_on_error", 0, spider=self)
+            misses = (
+                stats.get_value("httpcache/miss", 0, spider=self)
+                + stats.get_value("httpcache/invalidate", 0, spider=self)
+            )
+            saved = stats.get_value("httpcache/bytes_saved", 0, spider=self)
+            downloaded = stats.get_value("httpcache/bytes_downloaded", 0, spider=self)
+            self.logger.info(
+                f"HTTP cache for {self.media_name}: {hits} hit(s) (304), {misses} miss(es), "
+                f"{stale} stale copy(ies) served on server error, "
+                f"{saved / 1024:.1f} KB saved, {downloaded / 1024:.1f} KB downloaded"
+            )
\ No newline at end of file
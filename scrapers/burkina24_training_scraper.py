@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 sys.path.append(str(Path(__file__).parent.parent))
 
 from scrapers.base_scraper import BaseMediaScraper
+from scrapers.specs import BURKINA24_LISTING, BURKINA24_ARTICLE
 from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG
 from config.label_mapping import normalize_label
 
@@ -116,9 +117,7 @@ class Burkina24Scraper(BaseMediaScraper):
 
         # Extraire les liens d'articles depuis les éléments post-item
         # Structure: <h2 class="post-title"><a href="URL">
-        article_links = response.xpath(
-            '//li[contains(@class, "post-item")]//h2[@class="post-title"]/a/@href'
-        ).getall()
+        article_links = BURKINA24_LISTING.extract_field(response, 'links')
 
         self.logger.info(f"Trouvé {len(article_links)} articles sur la page {page_num}")
 
@@ -140,72 +139,15 @@ class Burkina24Scraper(BaseMediaScraper):
         label = response.meta.get('label')
 
 
-        # Extraire le titre
-        title = (
-            response.xpath('//h1[@class="post-title entry-title"]//text()').get() or
-            response.xpath('//h1[contains(@class, "entry-title")]//text()').get() or
-            response.xpath('//meta[@property="og:title"]/@content').get() or
-            response.xpath('//title/text()').get()
-        )
-
-        # Extraire l'auteur
-        # Structure Jannah: <span class="meta-author"><a>Nom</a>
-        author = response.xpath(
-            '//span[@class="meta-author"]//a[@class="author-name tie-icon"]/@title | '
-            '//span[@class="meta-author"]//a[@class="author-name tie-icon"]/text() | '
-            '//a[@rel="author"]/text()'
-        ).get()
-        
-        if not author:
-            author = response.xpath('//meta[@name="author"]/@content').get()
-
-        # Extraire la date de publication
-        # Burkina24 utilise des dates relatives: "il y a X heures/jours"
-        date_raw = response.xpath(
-            '//span[contains(@class, "date")][@class="meta-item tie-icon"]/text() | '
-            '//time[@class="entry-date published"]/@datetime | '
-            '//meta[@property="article:published_time"]/@content'
-        ).get()
-        
-        publication_date = self.parse_relative_date(date_raw) if date_raw else ""
-
-        # Extraire le contenu principal
-        # Jannah structure: <div class="entry-content entry-content-single">
-        content_paragraphs = response.xpath(
-            '//div[contains(@class, "entry-content")]//p//text() | '
-            '//div[contains(@class, "entry-content")]//p/strong//text() | '
-            '//div[contains(@class, "entry-content")]//p/em//text() | '
-            '//div[contains(@class, "entry-content")]//p/span//text()'
-        ).getall()
-
-        if not content_paragraphs:
-            # Fallback
-            content_paragraphs = response.xpath(
-                '//article//div[@class="entry-content"]//p//text()'
-            ).getall()
-
-        # Nettoyer le contenu
-        content = self.clean_article_content(content_paragraphs)
-
-        # Extraire l'image principale
-        image_url = (
-            response.xpath('//meta[@property="og:image"]/@content').get() or
-            response.xpath('//div[@class="featured-image-area"]//img/@src').get() or
-            response.xpath('//article//img[@class="attachment-jannah-image-post size-jannah-image-post wp-post-image"]/@src').get()
-        )
+        # Extraction déclarative partagée avec Burkina24Scraper (scrapers/specs.py)
+        fields = BURKINA24_ARTICLE.extract(response, self)
+        title = fields['title']
+        content = fields['content']
 
-        # Extraire les catégories depuis les meta ou breadcrumb
-        categories = response.xpath(
-            '//span[@class="post-cat-wrap"]//a/text() | '
-            '//div[@class="post-categories"]//a/text()'
-        ).getall()
-        
         # Utiliser la première catégorie ou celle du meta
+        categories = fields['categories']
         category = categories[0] if categories else response.meta.get('category', '')
 
-
-    
-
         if category:
             # Si on a un badge de catégorie, on le normalise aussi
             detected_label = normalize_label(category)
@@ -217,24 +159,18 @@ class Burkina24Scraper(BaseMediaScraper):
         if not label:
             label = normalize_label(category)
 
-        # Extraire les tags
-        tags = response.xpath(
-            '//div[@class="post-tags"]//a/text() | '
-            '//span[@class="tags-links"]//a/text()'
-        ).getall()
-
         # Préparer les données d'entraînement (format similaire à lefaso)
         training_data = {
             'text': content,
             'label': label,
-            'title': title.strip() if title else "",
-            'author': author.strip() if author else "Burkina24",
-            'date': publication_date,
+            'title': title,
+            'author': fields['author'],
+            'date': fields['date'],
             'url': response.url,
             'category_raw': category,
             'media': self.media_name,
-            'image_url': image_url if image_url else "",
-            'tags': tags,
+            'image_url': fields['image'],
+            'tags': fields['tags'],
             'scraped_at': datetime.now().isoformat(),
         }
 
@@ -12,10 +12,12 @@ from datetime import datetime, timedelta
 sys.path.append(str(Path(__file__).parent.parent))
 
 from scrapers.base_scraper import BaseMediaScraper
-from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG, RAW_DATA_DIR
+from scrapers.specs import BURKINA24_LISTING, BURKINA24_ARTICLE
+from scrapers.wp_api import WordPressApiMixin
+from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG
 
 
-class Burkina24Scraper(BaseMediaScraper):
+class Burkina24Scraper(WordPressApiMixin, BaseMediaScraper):
     """
     Scraper pour Burkina24
     Site WordPress moderne avec thème Jannah
@@ -23,37 +25,25 @@ class Burkina24Scraper(BaseMediaScraper):
 
     name = 'burkina24_scraper'
     media_name = "Burkina24"
+    source_key = 'burkina_24'
 
     def __init__(self, max_pages=10, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.max_pages = int(max_pages)
-        self.config = MEDIA_SOURCES.get('burkina24', {})
+        self.config = MEDIA_SOURCES.get(self.source_key, {})
         self.base_url = self.config.get('base_url', 'https://burkina24.com')
 
     custom_settings = {
         "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
-        "FEEDS": {
-            str(RAW_DATA_DIR / "burkina24_articles.json"): {
-                "format": "json",
-                "encoding": "utf8",
-                "overwrite": False,
-            },
-        },
         "USER_AGENT": SCRAPING_CONFIG.get('user_agent', 'Mozilla/5.0'),
-        "DOWNLOAD_DELAY": SCRAPING_CONFIG.get('download_delay', 2),
         "ROBOTSTXT_OBEY": SCRAPING_CONFIG.get('robotstxt_obey', True),
         "LOG_LEVEL": "INFO",
-        "CONCURRENT_REQUESTS": 2,
     }
 
-    def start_requests(self):
+    def listing_categories(self):
         """
-        Génère les requêtes pour les pages de Burkina24
-        Structure: https://burkina24.com/category/[categorie]/page/X/
+        Catégories principales de Burkina24 (structure hiérarchique)
         """
-        self.logger.info(f"Démarrage du scraper pour {self.media_name}")
-
-        # Catégories principales du site (structure hiérarchique)
         categories = [
             'actualite/societe/sante',
             'actualite/societe/societe-societe',
@@ -66,22 +56,16 @@ class Burkina24Scraper(BaseMediaScraper):
         ]
 
         for category in categories:
-            # Page 1 (sans /page/)
-            yield scrapy.Request(
-                url=f"{self.base_url}/category/{category}/",
-                callback=self.parse_article_list,
-                meta={'category': category, 'page_num': 1},
-                errback=self.handle_error
-            )
-            
-            # Pages suivantes
-            for page in range(2, self.max_pages + 1):
-                yield scrapy.Request(
-                    url=f"{self.base_url}/category/{category}/page/{page}/",
-                    callback=self.parse_article_list,
-                    meta={'category': category, 'page_num': page},
-                    errback=self.handle_error
-                )
+            yield category, {}
+
+    def listing_url(self, category, page_num, extra_meta):
+        """
+        Structure: https://burkina24.com/category/[categorie]/page/X/
+        """
+        # Page 1 (sans /page/)
+        if page_num == 1:
+            return f"{self.base_url}/category/{category}/"
+        return f"{self.base_url}/category/{category}/page/{page_num}/"
 
     def parse_article_list(self, response):
         """
@@ -95,13 +79,17 @@ class Burkina24Scraper(BaseMediaScraper):
 
         # Extraire les liens d'articles depuis les éléments post-item
         # Structure: <h2 class="post-title"><a href="URL">
-        article_links = response.xpath(
-            '//li[contains(@class, "post-item")]//h2[@class="post-title"]/a/@href'
-        ).getall()
+        article_links = BURKINA24_LISTING.extract_field(response, 'links')
 
         self.logger.info(f"Trouvé {len(article_links)} articles sur la page {page_num}")
 
-        for link in article_links:
+        # Mode incrémental: ignorer les articles déjà collectés
+        new_links = self.filter_new_links(article_links, category)
+
+        # Page suivante seulement si celle-ci a produit des articles
+        yield from self.follow_pagination(response, article_links, new_links)
+
+        for link in new_links:
             yield scrapy.Request(
                 url=link,
                 callback=self.parse_article,
@@ -116,85 +104,25 @@ class Burkina24Scraper(BaseMediaScraper):
         """
         self.logger.info(f"Extraction de l'article: {response.url}")
 
-        # Extraire le titre
-        title = (
-            response.xpath('//h1[@class="post-title entry-title"]//text()').get() or
-            response.xpath('//h1[contains(@class, "entry-title")]//text()').get() or
-            response.xpath('//meta[@property="og:title"]/@content').get() or
-            response.xpath('//title/text()').get()
-        )
-
-        # Extraire l'auteur
-        # Structure Jannah: <span class="meta-author"><a>Nom</a>
-        author = response.xpath(
-            '//span[@class="meta-author"]//a[@class="author-name tie-icon"]/@title | '
-            '//span[@class="meta-author"]//a[@class="author-name tie-icon"]/text() | '
-            '//a[@rel="author"]/text()'
-        ).get()
-        
-        if not author:
-            author = response.xpath('//meta[@name="author"]/@content').get()
-
-        # Extraire la date de publication
-        # Burkina24 utilise des dates relatives: "il y a X heures/jours"
-        date_raw = response.xpath(
-            '//span[contains(@class, "date")][@class="meta-item tie-icon"]/text() | '
-            '//time[@class="entry-date published"]/@datetime | '
-            '//meta[@property="article:published_time"]/@content'
-        ).get()
-        
-        publication_date = self.parse_relative_date(date_raw) if date_raw else ""
-
-        # Extraire le contenu principal
-        # Jannah structure: <div class="entry-content entry-content-single">
-        content_paragraphs = response.xpath(
-            '//div[contains(@class, "entry-content")]//p//text() | '
-            '//div[contains(@class, "entry-content")]//p/strong//text() | '
-            '//div[contains(@class, "entry-content")]//p/em//text() | '
-            '//div[contains(@class, "entry-content")]//p/span//text()'
-        ).getall()
-
-        if not content_paragraphs:
-            # Fallback
-            content_paragraphs = response.xpath(
-                '//article//div[@class="entry-content"]//p//text()'
-            ).getall()
-
-        # Nettoyer le contenu
-        content = self.clean_article_content(content_paragraphs)
-
-        # Extraire l'image principale
-        image_url = (
-            response.xpath('//meta[@property="og:image"]/@content').get() or
-            response.xpath('//div[@class="featured-image-area"]//img/@src').get() or
-            response.xpath('//article//img[@class="attachment-jannah-image-post size-jannah-image-post wp-post-image"]/@src').get()
-        )
+        # Extraction déclarative (scrapers/specs.py), XPath compilées une seule fois
+        fields = BURKINA24_ARTICLE.extract(response, self)
+        title = fields['title']
+        content = fields['content']
 
-        # Extraire les catégories depuis les meta ou breadcrumb
-        categories = response.xpath(
-            '//span[@class="post-cat-wrap"]//a/text() | '
-            '//div[@class="post-categories"]//a/text()'
-        ).getall()
-        
-        # Utiliser la première catégorie ou celle du meta
+        # Utiliser la première catégorie ou celle de la liste
+        categories = fields['categories']
         category = categories[0] if categories else response.meta.get('category', '')
 
-        # Extraire les tags
-        tags = response.xpath(
-            '//div[@class="post-tags"]//a/text() | '
-            '//span[@class="tags-links"]//a/text()'
-        ).getall()
-
         # Préparer les données de l'article
         article_data = {
-            'title': title.strip() if title else "",
-            'author': author.strip() if author else "Burkina24",
-            'date_publication': publication_date,
+            'title': title,
+            'author': fields['author'],
+            'date_publication': fields['date'],
             'post': content,
             'url': response.url,
-            'image_url': image_url if image_url else "",
+            'image_url': fields['image'],
             'category': category,
-            'tags': tags,
+            'tags': fields['tags'],
             'comments': [],
             'likes': 0,
             'partages': 0,
@@ -327,12 +255,12 @@ class Burkina24Scraper(BaseMediaScraper):
         self.logger.error(f"Raison: {failure.value}")
 
 
-def run_scraper(max_pages=10):
+def run_scraper(max_pages=10, incremental=False):
     """
     Exécute le scraper Burkina24
     """
     process = CrawlerProcess()
-    process.crawl(Burkina24Scraper, max_pages=max_pages)
+    process.crawl(Burkina24Scraper, max_pages=max_pages, incremental=incremental)
     process.start()
 
 
@@ -348,6 +276,11 @@ if __name__ == "__main__":
         default=10,
         help='Nombre maximum de pages à scraper par catégorie (défaut: 10)'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Mode incrémental: ignorer les articles déjà collectés'
+    )
 
     args = parser.parse_args()
 
@@ -360,6 +293,6 @@ if __name__ == "__main__":
     print(f"  - Dates relatives ('il y a X heures')")
     print(f"  - Structure hiérarchique des catégories")
 
-    run_scraper(max_pages=args.max_pages)
+    run_scraper(max_pages=args.max_pages, incremental=args.incremental)
 
     print("Scraping terminé!")
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Comment threads: single-pass extraction of the SPIP forum tree and stable comment keys
+"""
+import hashlib
+from typing import Callable, Dict, Iterator, List, Optional
+
+from lxml import etree
+
+
+# <ul class="forum"> blocks of the page, the rest of the tree is walked by hand
+FORUM_XPATH = etree.XPath('//ul[@class="forum"]')
+
+
+class CommentDelta(dict):
+    """
+    Item emitted by the comment refresh mode: new comments of an already collected article
+    Written to its own feed (FEED_CONFIG["comments_uri"]), never mixed with the article records
+    """
+
+
+def comment_key(article_id: str, date: Optional[str], text: str, parent_key: Optional[str] = None) -> str:
+    """
+    Stable key of a comment: same article, parent, date and text give the same key on every crawl
+    """
+    raw = f"{article_id}|{parent_key or ''}|{date or ''}|{text}"
+    return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def extract_comment_tree(root, article_id: str, clean: Callable) -> List[Dict]:
+    """
+    Build the comments and their replies in one traversal of the forum lists
+
+    <ul class="forum">
+      <li><div class="forum-message">... <font>date</font> <div class="ugccmt-commenttext">text</div></div>
+          <ul><li>(reply, same structure)</li></ul></li>
+    </ul>
+    """
+    comments = []
+    for forum in FORUM_XPATH(root):
+        for item in _children(forum, 'li'):
+            date, text, replies = _read_item(item, clean, with_replies=True)
+            key = comment_key(article_id, date, text)
+            comments.append({
+                'key': key,
+                'date': date,
+                'text': text,
+                'replies': [
+                    {'key': comment_key(article_id, reply_date, reply_text, key),
+                     'date': reply_date, 'text': reply_text}
+                    for reply_date, reply_text in replies
+                ],
+            })
+    return comments
+
+
+def flatten_comments(comments: List[Dict]) -> Iterator[Dict]:
+    """
+    Yield the comments then their replies as flat records with a parent_key
+    """
+    for comment in comments:
+        yield {'key': comment['key'], 'parent_key': None, 'date': comment['date'], 'text': comment['text']}
+        for reply in comment.get('replies', []):
+            yield {'key': reply['key'], 'parent_key': comment['key'], 'date': reply['date'], 'text': reply['text']}
+
+
+def _children(element, tag: str):
+    return [child for child in element if child.tag == tag]
+
+
+def _read_item(item, clean: Callable, with_replies: bool):
+    """
+    Date, cleaned text (and replies) of a forum <li>
+    Same values as './div[forum-message]//font/text()' and '...//div[@class="ugccmt-commenttext"]//text()'
+    """
+    date = None
+    parts = []
+    replies = []
+
+    for child in item:
+        if child.tag == 'div' and 'forum-message' in (child.get('class') or ''):
+            for element in child.iter('font', 'div'):
+                if element.tag == 'font':
+                    if date is None:
+                        date = next(_own_text(element), None)
+                elif element.get('class') == 'ugccmt-commenttext':
+                    parts.extend(_text_nodes(element))
+        elif with_replies and child.tag == 'ul':
+            for reply in _children(child, 'li'):
+                reply_date, reply_text, _ = _read_item(reply, clean, with_replies=False)
+                replies.append((reply_date, reply_text))
+
+    return date, clean(parts), replies
+
+
+def _own_text(element) -> Iterator[str]:
+    """
+    Text nodes directly under an element (element/text())
+    """
+    if element.text:
+        yield element.text
+    for child in element:
+        if child.tail:
+            yield child.tail
+
+
+def _text_nodes(element) -> Iterator[str]:
+    """
+    All the text nodes under an element (element//text()), comments excluded
+    """
+    if element.text and isinstance(element.tag, str):
+        yield element.text
+    for child in element:
+        yield from _text_nodes(child)
+        if child.tail:
+            yield child.tail
@@ -0,0 +1,125 @@
+"""
+Declarative extraction specs: field -> ordered selector fallbacks -> post-processor
+XPath expressions are compiled once with lxml and evaluated on the parsed document
+of the response, stopping at the first selector that returns something
+"""
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+from lxml import etree
+
+
+class Field(NamedTuple):
+    """
+    A field to extract
+
+    selectors: XPath expressions tried in order (a union "a | b" counts as one selector)
+    many: keep all the results (getall) instead of the first one (get)
+    post: post-processor applied to a non-empty value, a callable or the name of a spider method
+    default: value returned when nothing is found
+    """
+    selectors: Tuple[str, ...]
+    many: bool = False
+    post: Optional[Union[str, Callable]] = None
+    default: Any = ""
+
+
+def first(*selectors: str, post=None, default: Any = "") -> Field:
+    """
+    Field keeping the first result of the first selector that matches
+    """
+    return Field(selectors, False, post, default)
+
+
+def every(*selectors: str, post=None, default: Any = "") -> Field:
+    """
+    Field keeping all the results of the first selector that matches
+    """
+    return Field(selectors, True, post, default)
+
+
+def strip(value: str) -> str:
+    return value.strip()
+
+
+class ExtractionSpec:
+    """
+    Set of fields extracted from a page, compiled once when the spec is created
+    """
+
+    def __init__(self, name: str, **fields: Field):
+        self.name = name
+        self.fields = fields
+        # smart_strings=False: plain str results, no back-reference to the parent element
+        self._compiled = {
+            field_name: tuple(etree.XPath(selector, smart_strings=False) for selector in field.selectors)
+            for field_name, field in fields.items()
+        }
+
+    def override(self, name: str, **fields: Field) -> "ExtractionSpec":
+        """
+        New spec with some fields replaced or added (variants of a site, e.g. training scrapers)
+        """
+        return ExtractionSpec(name, **{**self.fields, **fields})
+
+    def extract(self, response, spider=None, fields=None) -> Dict[str, Any]:
+        """
+        Extract all the fields (or only `fields`) from a response or an lxml element
+        String post-processors are looked up on `spider`
+        """
+        root = getattr(response, 'selector', None)
+        root = root.root if root is not None else response
+
+        data = {}
+        for field_name in fields or self.fields:
+            data[field_name] = self._extract_field(root, field_name, spider)
+        return data
+
+    def extract_field(self, response, field_name: str, spider=None) -> Any:
+        """
+        Extract a single field
+        """
+        root = getattr(response, 'selector', None)
+        root = root.root if root is not None else response
+        return self._extract_field(root, field_name, spider)
+
+    def _extract_field(self, root, field_name: str, spider) -> Any:
+        field = self.fields[field_name]
+        value = None
+
+        for xpath in self._compiled[field_name]:
+            results = xpath(root)
+            if not isinstance(results, list):
+                # Scalar XPath (string(), count()...)
+                results = [results] if results not in (None, "") else []
+
+            if field.many:
+                if results:
+                    value = [_to_text(result) for result in results]
+                    break
+            else:
+                # Same as `sel.get() or next_sel.get()`: an empty first result falls through
+                if results:
+                    text = _to_text(results[0])
+                    if text:
+                        value = text
+                        break
+
+        if not value:
+            return field.default
+
+        if field.post is not None:
+            post = getattr(spider, field.post) if isinstance(field.post, str) else field.post
+            value = post(value)
+            if not value and not field.many:
+                return field.default
+
+        return value
+
+
+def _to_text(result) -> str:
+    if isinstance(result, str):
+        return result
+    if isinstance(result, etree._Element):
+        # Element selected without /text(): serialize it like Selector.get()
+        return etree.tostring(result, encoding='unicode', method='html', with_tail=False)
+    return str(result)
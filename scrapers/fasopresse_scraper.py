@@ -12,7 +12,8 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 
 from scrapers.base_scraper import BaseMediaScraper
-from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG, RAW_DATA_DIR
+from scrapers.specs import FASOPRESSE_LISTING, FASOPRESSE_ARTICLE
+from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG
 
 
 class FasoPresseScraper(BaseMediaScraper):
@@ -23,37 +24,25 @@ class FasoPresseScraper(BaseMediaScraper):
 
     name = 'fasopresse_scraper'
     media_name = "FasoPresse"
+    source_key = 'fasopresse'
 
     def __init__(self, max_pages=10, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.max_pages = int(max_pages)
-        self.config = MEDIA_SOURCES.get('fasopresse', {})
+        self.config = MEDIA_SOURCES.get(self.source_key, {})
         self.base_url = self.config.get('base_url', 'https://fasopresse.net')
 
     custom_settings = {
         "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
-        "FEEDS": {
-            str(RAW_DATA_DIR / "fasopresse_articles.json"): {
-                "format": "json",
-                "encoding": "utf8",
-                "overwrite": False,
-            },
-        },
         "USER_AGENT": SCRAPING_CONFIG.get('user_agent', 'Mozilla/5.0'),
-        "DOWNLOAD_DELAY": SCRAPING_CONFIG.get('download_delay', 2),
         "ROBOTSTXT_OBEY": SCRAPING_CONFIG.get('robotstxt_obey', True),
         "LOG_LEVEL": "INFO",
-        "CONCURRENT_REQUESTS": 1,  # Être respectueux avec le serveur
     }
 
-    def start_requests(self):
+    def listing_categories(self):
         """
-        Génère les requêtes pour les pages de FasoPresse
-        Structure: http://fasopresse.net/[categorie]?start=X
+        Catégories principales de FasoPresse
         """
-        self.logger.info(f"Démarrage du scraper pour {self.media_name}")
-
-        # Catégories principales du site
         categories = [
             'accueil',
             'politique',
@@ -65,24 +54,17 @@ class FasoPresseScraper(BaseMediaScraper):
         ]
 
         for category in categories:
-            # Page 1 (pas de paramètre start)
-            yield scrapy.Request(
-                url=f"{self.base_url}/{category}",
-                callback=self.parse_article_list,
-                meta={'category': category, 'page_num': 1},
-                errback=self.handle_error
-            )
-            
-            # Pages suivantes (avec start=5, 10, 15, etc.)
-            # Chaque page affiche 5 articles
-            for page in range(2, self.max_pages + 1):
-                start_value = (page - 1) * 5
-                yield scrapy.Request(
-                    url=f"{self.base_url}/{category}?start={start_value}",
-                    callback=self.parse_article_list,
-                    meta={'category': category, 'page_num': page},
-                    errback=self.handle_error
-                )
+            yield category, {}
+
+    def listing_url(self, category, page_num, extra_meta):
+        """
+        Structure: http://fasopresse.net/[categorie]?start=X
+        Chaque page affiche 5 articles (start=5, 10, 15, etc.)
+        """
+        # Page 1 (pas de paramètre start)
+        if page_num == 1:
+            return f"{self.base_url}/{category}"
+        return f"{self.base_url}/{category}?start={(page_num - 1) * 5}"
 
     def parse_article_list(self, response):
         """
@@ -96,30 +78,22 @@ class FasoPresseScraper(BaseMediaScraper):
 
         # Extraire les liens d'articles depuis les titres
         # Structure: <td class="contentheading"><a href="/politique/6151-...">Titre</a>
-        article_links = response.xpath(
-            '//td[@class="contentheading"]//a[@class="contentpagetitle"]/@href'
-        ).getall()
+        # et ceux de la section "Plus d'articles..."
+        listing = FASOPRESSE_LISTING.extract(response)
+        article_links = listing['links']
+        more_articles = listing['more_links']
 
         self.logger.info(f"Trouvé {len(article_links)} articles sur la page {page_num}")
 
-        for link in article_links:
-            # Construire l'URL complète
-            full_url = response.urljoin(link)
-            
-            yield scrapy.Request(
-                url=full_url,
-                callback=self.parse_article,
-                meta={'category': category},
-                errback=self.handle_error
-            )
+        # Mode incrémental: ignorer les articles déjà collectés
+        all_urls = [response.urljoin(link) for link in article_links + more_articles]
+        all_urls = list(dict.fromkeys(all_urls))
+        new_urls = self.filter_new_links(all_urls, category)
 
-        # Extraire aussi les liens de la section "Plus d'articles..."
-        more_articles = response.xpath(
-            '//div[@class="blog_more"]//a[@class="blogsection"]/@href'
-        ).getall()
-        
-        for link in more_articles:
-            full_url = response.urljoin(link)
+        # Page suivante seulement si celle-ci a produit des articles
+        yield from self.follow_pagination(response, all_urls, new_urls)
+
+        for full_url in new_urls:
             yield scrapy.Request(
                 url=full_url,
                 callback=self.parse_article,
@@ -134,60 +108,22 @@ class FasoPresseScraper(BaseMediaScraper):
         """
         self.logger.info(f"Extraction de l'article: {response.url}")
 
-        # Extraire le titre
-        # Structure: <td class="contentheading"><a class="contentpagetitle">Titre</a>
-        title = response.xpath(
-            '//td[@class="contentheading"]//a[@class="contentpagetitle"]/text()'
-        ).get()
-        
-        if not title:
-            title = response.xpath('//h1/text()').get()
-
-        # Extraire l'auteur depuis les métadonnées
-        # Structure: <span class="small">Écrit par Sidwaya</span>
-        author_meta = response.xpath(
-            '//span[@class="small"]/text()'
-        ).get()
-        if author_meta:
-            author_meta = author_meta.replace('Écrit par', '').strip()
-
-        # Extraire la date de publication
-        # Structure: <td class="createdate">Vendredi, 29 Juin 2018 09:55</td>
-        date_raw = response.xpath(
-            '//td[@class="createdate"]/text()'
-        ).get()
-        
-        publication_date = self.parse_french_date(date_raw) if date_raw else ""
+        # Extraction déclarative (scrapers/specs.py), XPath compilées une seule fois
+        fields = FASOPRESSE_ARTICLE.extract(response, self)
+        title = fields['title']
+        author_meta = fields['author']
+        publication_date = fields['date']
 
-        # Extraire la date de mise à jour
-        update_date_raw = response.xpath(
-            '//td[@class="modifydate"]/text()'
-        ).get()
-        
+        # Date de mise à jour: "Mise à jour le ..."
         update_date = ""
-        if update_date_raw:
+        if fields['update_date']:
             update_date = self.parse_french_date(
-                update_date_raw.replace('Mise à jour le', '').strip()
+                fields['update_date'].replace('Mise à jour le', '').strip()
             )
 
-        # Extraire le contenu complet
-        # Le contenu principal est dans les <p> de la cellule <td valign="top">
-        # qui n'est PAS dans une ligne avec createdate ou modifydate
-        
-        # Méthode 1: Extraire directement tous les <p> de la zone de contenu
-        content_section = response.xpath(
-            '//table[@class="contentpaneopen"]//tr[position()>2]//td[@valign="top"]'
-        )
-        
-        if content_section:
-            # Extraire tous les textes des paragraphes
-            all_text_nodes = content_section.xpath('.//p/text() | .//p/span/text()').getall()
-        else:
-            # Fallback
-            all_text_nodes = response.xpath(
-                '//table[@class="contentpaneopen"]//td[@valign="top"]//p/text() | //table[@class="contentpaneopen"]//td[@valign="top"]//p/span/text()'
-            ).getall()
-        
+        # Paragraphes de la cellule de contenu, signature de l'auteur comprise
+        all_text_nodes = fields['text_nodes']
+
         # Nettoyer et filtrer le contenu
         content_parts = []
         author_signature = None
@@ -228,16 +164,14 @@ class FasoPresseScraper(BaseMediaScraper):
         final_author = author_signature if author_signature else (author_meta if author_meta else "")
 
         # Extraire l'image si présente
-        image_url = response.xpath(
-            '//table[@class="contentpaneopen"]//td[@valign="top"]//img/@src'
-        ).get()
+        image_url = fields['image']
         
         if image_url:
             image_url = response.urljoin(image_url)
 
         # Préparer les données de l'article
         article_data = {
-            'title': title.strip() if title else "",
+            'title': title,
             'author': final_author,
             'date_publication': publication_date,
             'date_mise_a_jour': update_date,
@@ -314,12 +248,12 @@ class FasoPresseScraper(BaseMediaScraper):
         self.logger.error(f"Raison: {failure.value}")
 
 
-def run_scraper(max_pages=10):
+def run_scraper(max_pages=10, incremental=False):
     """
     Exécute le scraper FasoPresse
     """
     process = CrawlerProcess()
-    process.crawl(FasoPresseScraper, max_pages=max_pages)
+    process.crawl(FasoPresseScraper, max_pages=max_pages, incremental=incremental)
     process.start()
 
 
@@ -335,6 +269,11 @@ if __name__ == "__main__":
         default=10,
         help='Nombre maximum de pages à scraper par catégorie (défaut: 10)'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Mode incrémental: ignorer les articles déjà collectés'
+    )
 
     args = parser.parse_args()
 
@@ -342,6 +281,6 @@ if __name__ == "__main__":
     print(f"Pages max par catégorie: {args.max_pages}")
     print(f"Catégories: accueil, politique, economie, societe, sante-et-social, international, sports")
 
-    run_scraper(max_pages=args.max_pages)
+    run_scraper(max_pages=args.max_pages, incremental=args.incremental)
 
     print("Scraping terminé!")
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Feed export helpers: date-sharded JSON Lines files written atomically
+"""
+import os
+from pathlib import Path
+
+from scrapy.extensions.feedexport import FileFeedStorage, ItemFilter
+
+from scrapers.comments import CommentDelta
+
+
+# Suffix of the files being written, never read by the importers
+PARTIAL_SUFFIX = ".part"
+
+
+def feed_uri_params(params, spider):
+    """
+    FEED_URI_PARAMS function adding %(source)s (MEDIA_SOURCES key) and %(date)s (crawl date)
+    """
+    return {
+        **params,
+        "source": getattr(spider, "source_key", None) or spider.name,
+        "date": params["time"][:10],
+    }
+
+
+class ArticleItemFilter(ItemFilter):
+    """
+    Item filter of the article feed: comment deltas have their own feed
+    """
+
+    def accepts(self, item):
+        return not isinstance(item, CommentDelta) and super().accepts(item)
+
+
+class AtomicFileFeedStorage(FileFeedStorage):
+    """
+    Local feed storage writing to a temporary .part file, renamed once the batch is complete
+    A file with the final name is always complete: a crash leaves only a .part file behind
+    Feeds appended to an existing file (overwrite=False) are written in place as before
+    """
+
+    def __init__(self, uri, *, feed_options=None):
+        super().__init__(uri, feed_options=feed_options)
+        self.final_path = self.path
+        if self.write_mode == "wb":
+            self.path = f"{self.final_path}{PARTIAL_SUFFIX}"
+
+    def store(self, file):
+        file.close()
+        if self.path != self.final_path and Path(self.path).exists():
+            os.replace(self.path, self.final_path)
@@ -5,13 +5,16 @@ Enhanced version with proper structure and data handling
 import scrapy
 from scrapy.crawler import CrawlerProcess
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Add parent directory to path to import config
 sys.path.append(str(Path(__file__).parent.parent))
 
 from scrapers.base_scraper import BaseMediaScraper
-from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG, RAW_DATA_DIR
+from scrapers.comments import CommentDelta, extract_comment_tree, flatten_comments
+from scrapers.specs import LEFASO_LISTING, LEFASO_ARTICLE
+from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG, COMMENT_REFRESH_CONFIG
 
 
 class LefasoScraper(BaseMediaScraper):
@@ -22,24 +25,23 @@ class LefasoScraper(BaseMediaScraper):
 
     name = 'lefaso_scraper'
     media_name = "Lefaso.net"
+    source_key = 'lefaso'
 
     def __init__(self, max_pages=20, *args, **kwargs):
+        refresh_comments = kwargs.pop('refresh_comments', False)
+        comments_max_age = kwargs.pop('comments_max_age', COMMENT_REFRESH_CONFIG['max_age_days'])
         super().__init__(*args, **kwargs)
         self.max_pages = int(max_pages)
-        self.config = MEDIA_SOURCES['lefaso']
+        self.config = MEDIA_SOURCES[self.source_key]
         self.base_url = self.config['base_url']
 
+        # Comment refresh mode: revisit recent known articles and emit only their new comments
+        self.refresh_comments = str(refresh_comments).lower() in ('1', 'true', 'yes', 'oui')
+        self.comments_max_age = int(comments_max_age)
+
     custom_settings = {
         "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
-        "FEEDS": {
-            str(RAW_DATA_DIR / "lefaso_articles.json"): {
-                "format": "json",
-                "encoding": "utf8",
-                "overwrite": False,
-            },
-        },
         "USER_AGENT": SCRAPING_CONFIG['user_agent'],
-        "DOWNLOAD_DELAY": SCRAPING_CONFIG['download_delay'],
         "ROBOTSTXT_OBEY": SCRAPING_CONFIG['robotstxt_obey'],
         "LOG_LEVEL": "INFO",
         "DOWNLOADER_CLIENT_TLS_CIPHERS": "DEFAULT:!DH"
@@ -47,37 +49,33 @@ class LefasoScraper(BaseMediaScraper):
 
     def start_requests(self):
         """
-        Generate requests for all rubrics and pages
+        In comment refresh mode, only revisit recent articles, else crawl the rubrics
         """
-        rubrics = self.config['rubrics']
-
-        self.logger.info(f"Starting scraper for {self.media_name}")
-        self.logger.info(f"Scraping {len(rubrics)} rubrics, {self.max_pages} pages each")
+        if self.refresh_comments:
+            yield from self.comment_refresh_requests()
+        else:
+            yield from super().start_requests()
 
-        for rubric_name, base_url in rubrics.items():
+    def listing_categories(self):
+        """
+        Yield the configured rubrics with their SPIP rubric ID
+        """
+        for rubric_name, base_url in self.config['rubrics'].items():
             # Extract rubric ID from URL
             rubrique_id = base_url.split('rubrique')[1].split('&')[0] if 'rubrique' in base_url else rubric_name
 
-            # Scrape multiple pages for each rubric
-            for page in range(1, self.max_pages + 1):
-                if page == 1:
-                    url = base_url
-                else:
-                    offset = (page - 1) * 20
-                    url = f"{base_url}&debut_articles={offset}#pagination_articles"
-
-                self.logger.info(f"Requesting rubric '{rubric_name}' (ID: {rubrique_id}), page {page}")
-
-                yield scrapy.Request(
-                    url=url,
-                    callback=self.parse_article_list,
-                    meta={
-                        'rubrique_id': rubrique_id,
-                        'rubrique_name': rubric_name,
-                        'page_num': page
-                    },
-                    errback=self.handle_error
-                )
+            yield rubric_name, {'rubrique_id': rubrique_id, 'rubrique_name': rubric_name}
+
+    def listing_url(self, category, page_num, extra_meta):
+        """
+        Rubric pages are paginated 20 articles at a time with debut_articles
+        """
+        base_url = self.config['rubrics'][category]
+        if page_num == 1:
+            return base_url
+
+        offset = (page_num - 1) * 20
+        return f"{base_url}&debut_articles={offset}#pagination_articles"
 
     def parse_article_list(self, response):
         """
@@ -89,18 +87,20 @@ class LefasoScraper(BaseMediaScraper):
 
         self.logger.info(f"Parsing rubric '{rubrique_name}' (ID: {rubrique_id}), page {page_num}")
 
-        # Find article blocks
-        post_blocks = response.xpath('//div[@class="col-xs-12 col-sm-12 col-md-8 col-lg-8"]')
-
-        # Extract article links
-        post_links = post_blocks.xpath('.//a[contains(@href, "spip.php?article")]')
-        post_urls = post_links.xpath('@href').getall()
+        # Article links of the listing blocks
+        post_urls = LEFASO_LISTING.extract_field(response, 'links')
 
         self.logger.info(f"Found {len(post_urls)} articles on page {page_num} of '{rubrique_name}'")
 
+        # Incremental mode: skip articles already collected
+        absolute_urls = list(dict.fromkeys(response.urljoin(url) for url in post_urls))
+        new_urls = self.filter_new_links(absolute_urls, rubrique_name)
+
+        # Request the next page only if this one listed articles
+        yield from self.follow_pagination(response, absolute_urls, new_urls)
+
         # Visit each article
-        for url in post_urls:
-            absolute_url = response.urljoin(url)
+        for absolute_url in new_urls:
             yield scrapy.Request(
                 url=absolute_url,
                 callback=self.parse_article,
@@ -122,32 +122,17 @@ class LefasoScraper(BaseMediaScraper):
         rubrique_name = response.meta.get('rubrique_name')
         page_num = response.meta.get('page_num')
 
-        # Extract title
-        #title = response.xpath('//h1[@class="entry-title"]/text()').get()
-        title = response.xpath('//title/text()').get()
-        if not title:
-            title = response.xpath('//h1//text()').get()
-
-        # Extract content
-        content_paragraphs = response.xpath('//div[contains(@class, "col-md-8")]//p/text()').getall()
-        content = self.clean_text(content_paragraphs)
-
-        # Extract publication date
-        date_raw = response.xpath('//div[contains(@class, "article-meta")]//text()').get()
-        if not date_raw:
-            date_raw = response.xpath('//div[contains(@class, "container")]//p[contains(text(), "Publié")]/text()').get()
-
-        # Parse and format date
-        publication_date = self.parse_date(date_raw) if date_raw else ""
+        # Declarative extraction (scrapers/specs.py), XPath compiled once
+        fields = LEFASO_ARTICLE.extract(response, self)
 
         # Extract comments
         comments = self.extract_comments(response)
 
         # Prepare article data
         article_data = {
-            'title': title,
-            'date_publication': publication_date,
-            'post': content,
+            'title': fields['title'],
+            'date_publication': fields['date'],
+            'post': fields['content'],
             'url': response.url,
             'rubrique_id': rubrique_id,
             'rubrique_name': rubrique_name,
@@ -157,6 +142,9 @@ class LefasoScraper(BaseMediaScraper):
 
         # Format and yield article
         formatted_article = self.format_article(article_data)
+        self.seen_index.add_comments(
+            formatted_article['id'], [comment['key'] for comment in flatten_comments(comments)]
+        )
 
         self.article_count += 1
         self.logger.info(f"Article extracted successfully. Total articles: {self.article_count}")
@@ -165,48 +153,53 @@ class LefasoScraper(BaseMediaScraper):
 
     def extract_comments(self, response):
         """
-        Extract comments and replies from article
+        Extract comments and replies from article, in a single walk of the forum tree
+        Each comment and reply gets a stable key (article, parent, date, text)
         """
-        all_comments = []
-
-        # Find comment blocks
-        comments_blocks = response.xpath('//ul[@class="forum"]/li')
-
-        for comment_block in comments_blocks:
-            # Main comment
-            comment_div = comment_block.xpath('./div[contains(@class, "forum-message")]')
-
-            # Extract comment metadata
-            comment_date = comment_div.xpath('.//font/text()').get()
+        article_id = self.generate_article_id(response.url)
+        return extract_comment_tree(response.selector.root, article_id, self.clean_text)
 
-            # Extract comment text
-            comment_text_parts = comment_div.xpath('.//div[@class="ugccmt-commenttext"]//text()').getall()
-            comment_text = self.clean_text(comment_text_parts)
-
-            # Extract replies
-            replies_list = []
-            replies = comment_block.xpath('./ul/li')
+    def comment_refresh_requests(self):
+        """
+        Request the known articles published in the last comments_max_age days
+        """
+        since = datetime.now() - timedelta(days=self.comments_max_age)
+        articles = self.seen_index.recent_articles(self.media_name, since)
+        self.logger.info(f"Comment refresh: {len(articles)} article(s) published since {since:%Y-%m-%d}")
 
-            for reply in replies:
-                reply_div = reply.xpath('./div[contains(@class, "forum-message")]')
+        for article_id, url in articles:
+            yield scrapy.Request(
+                url=url,
+                callback=self.parse_comments,
+                meta={'article_id': article_id},
+                errback=self.handle_error
+            )
 
-                reply_date = reply_div.xpath('.//font/text()').get()
-                reply_text_parts = reply_div.xpath('.//div[@class="ugccmt-commenttext"]//text()').getall()
-                reply_text = self.clean_text(reply_text_parts)
+    def parse_comments(self, response):
+        """
+        Emit the comments of an article not seen by a previous crawl (comment refresh mode)
+        """
+        article_id = response.meta['article_id']
+        known = self.seen_index.comment_keys(article_id)
+        comments = self.extract_comments(response)
+        new_comments = [comment for comment in flatten_comments(comments) if comment['key'] not in known]
 
-                replies_list.append({
-                    'date': reply_date,
-                    'text': reply_text
-                })
+        self._inc_stat('comments/refreshed_articles')
+        if not new_comments:
+            return
 
-            # Add comment with replies
-            all_comments.append({
-                'date': comment_date,
-                'text': comment_text,
-                'replies': replies_list
-            })
+        self.seen_index.add_comments(article_id, [comment['key'] for comment in new_comments])
+        self._inc_stat('comments/new', len(new_comments))
+        self.logger.info(f"{len(new_comments)} new comment(s) on {response.url}")
 
-        return all_comments
+        yield CommentDelta(
+            article_id=article_id,
+            media=self.media_name,
+            url=response.url,
+            engagement=self.calculate_engagement(comments),
+            new_comments=new_comments,
+            refreshed_at=datetime.now().isoformat(),
+        )
 
     def handle_error(self, failure):
         """
@@ -216,7 +209,7 @@ class LefasoScraper(BaseMediaScraper):
         self.logger.error(f"Error: {failure.value}")
 
 
-def run_scraper(max_pages=20):
+def run_scraper(max_pages=20, incremental=False, refresh_comments=False):
     """
     Run the Lefaso scraper
     """
@@ -224,7 +217,8 @@ def run_scraper(max_pages=20):
         "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7"
     })
 
-    process.crawl(LefasoScraper, max_pages=max_pages)
+    process.crawl(LefasoScraper, max_pages=max_pages, incremental=incremental,
+                  refresh_comments=refresh_comments)
     process.start()
 
 
@@ -234,12 +228,16 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Scrape articles from Lefaso.net')
     parser.add_argument('--max-pages', type=int, default=20,
                         help='Maximum number of pages to scrape per rubric (default: 20)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Incremental mode: skip articles already collected')
+    parser.add_argument('--refresh-comments', action='store_true',
+                        help='Only fetch the new comments of recently collected articles')
 
     args = parser.parse_args()
 
     print(f"Starting Lefaso.net scraper...")
     print(f"Max pages per rubric: {args.max_pages}")
 
-    run_scraper(max_pages=args.max_pages)
+    run_scraper(max_pages=args.max_pages, incremental=args.incremental, refresh_comments=args.refresh_comments)
 
     print("Scraping completed!")
\ No newline at end of file
@@ -12,6 +12,7 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 
 from scrapers.base_scraper import BaseMediaScraper
+from scrapers.specs import LEFASO_LISTING, LEFASO_TRAINING_ARTICLE
 from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG
 from config.label_mapping import normalize_label
 
@@ -100,12 +101,8 @@ class LefasoTrainingScraper(BaseMediaScraper):
 
         self.logger.info(f"Analyse rubrique '{rubrique_name}' (Label: {label}), page {page_num}")
 
-        # Trouver les blocs d'articles
-        post_blocks = response.xpath('//div[@class="col-xs-12 col-sm-12 col-md-8 col-lg-8"]')
-
-        # Extraire les liens
-        post_links = post_blocks.xpath('.//a[contains(@href, "spip.php?article")]')
-        post_urls = post_links.xpath('@href').getall()
+        # Liens des blocs d'articles
+        post_urls = LEFASO_LISTING.extract_field(response, 'links')
 
         self.logger.info(f"Trouvé {len(post_urls)} articles")
 
@@ -137,51 +134,32 @@ class LefasoTrainingScraper(BaseMediaScraper):
         rubrique_name = response.meta.get('rubrique_name')
         label = response.meta.get('label')
 
-        # Extraire le titre
-        title = response.xpath('//h1[@class="spip"]/text()').get()
-        if not title:
-            title = response.xpath('//title/text()').get()
-
-        # Extraire l'auteur
-        author = response.xpath('//span[@class="auteur"]/text()').get()
-        if not author:
-            author = response.xpath('//div[@class="auteur"]//text()').get()
-
-        # Extraire la date
-        date_raw = response.xpath('//p[@class="info-publi"]//text()').getall()
-        date_text = ' '.join([d.strip() for d in date_raw if d.strip()])
+        # Extraction déclarative (scrapers/specs.py), XPath compilées une seule fois
+        fields = LEFASO_TRAINING_ARTICLE.extract(response, self)
+        title = fields['title']
+        content = fields['content']
 
-        # Parser la date
+        # Date: "publié le lundi 15 novembre 2025"
+        date_text = ' '.join([d.strip() for d in fields['date_parts'] if d.strip()])
         publication_date = self.parse_date_text(date_text)
 
-        # Extraire le contenu
-        #content_paras = response.xpath('//div[@class="texte"]//p//text()').getall()
-        content_paras = response.xpath('//div[contains(@class, "col-md-8")]//p/text()').getall()
-        if not content_paras:
-            content_paras = response.xpath('//div[@class="chapo"]//text() | //div[@class="texte"]//text()').getall()
-
-        content = self.clean_content(content_paras)
-
-        # Extraire l'image
-        image_url = response.xpath('//div[@class="spip_documents"]//img/@src').get()
+        # Image (URL relative)
+        image_url = fields['image']
         if image_url:
             image_url = response.urljoin(image_url)
 
-        # Extraire les tags/mots-clés
-        tags = response.xpath('//div[@class="tags"]//a/text()').getall()
-
         # Préparer les données d'entraînement
         training_data = {
             'text': content,
             'label': label,
-            'title': title.strip() if title else "",
-            'author': author.strip() if author else "Lefaso",
+            'title': title,
+            'author': fields['author'],
             'date': publication_date,
             'url': response.url,
             'category_raw': rubrique_name,
             'media': self.media_name,
             'image_url': image_url if image_url else "",
-            'tags': tags,
+            'tags': fields['tags'],
             'scraped_at': datetime.now().isoformat(),
         }
 
@@ -13,7 +13,8 @@ from urllib.parse import urljoin, parse_qs, urlparse
 sys.path.append(str(Path(__file__).parent.parent))
 
 from scrapers.base_scraper import BaseMediaScraper
-from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG, RAW_DATA_DIR
+from scrapers.specs import LOBSERVATEUR_LISTING, LOBSERVATEUR_ARTICLE
+from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG
 
 
 class LObservateurScraper(BaseMediaScraper):
@@ -24,38 +25,26 @@ class LObservateurScraper(BaseMediaScraper):
 
     name = 'lobservateur_scraper'
     media_name = "L'Observateur Paalga"
+    source_key = 'observateur_paalga'
 
     def __init__(self, max_pages=10, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.max_pages = int(max_pages)
-        self.config = MEDIA_SOURCES.get('lobservateur', {})
+        self.config = MEDIA_SOURCES.get(self.source_key, {})
         self.base_url = self.config.get('base_url', 'https://www.lobservateur.bf')
 
     custom_settings = {
         "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
-        "FEEDS": {
-            str(RAW_DATA_DIR / "lobservateur_articles.json"): {
-                "format": "json",
-                "encoding": "utf8",
-                "overwrite": False,
-            },
-        },
         "USER_AGENT": SCRAPING_CONFIG.get('user_agent', 'Mozilla/5.0'),
-        "DOWNLOAD_DELAY": SCRAPING_CONFIG.get('download_delay', 2),
         "ROBOTSTXT_OBEY": SCRAPING_CONFIG.get('robotstxt_obey', True),
         "LOG_LEVEL": "INFO",
-        "CONCURRENT_REQUESTS": 2,
     }
 
-    def start_requests(self):
+    def listing_categories(self):
         """
-        Génère les requêtes pour les pages de L'Observateur
-        Structure K2: /index.php?option=com_k2&view=itemlist&task=category&id=X&Itemid=Y
+        Catégories principales avec leurs IDs K2
+        Format: (nom, category_id, itemid)
         """
-        self.logger.info(f"Démarrage du scraper pour {self.media_name}")
-
-        # Catégories principales avec leurs IDs K2
-        # Format: (nom, category_id, itemid)
         categories = [
             ('politique', 43, 102),
             ('societe', 23, 112),
@@ -65,35 +54,21 @@ class LObservateurScraper(BaseMediaScraper):
         ]
 
         for cat_name, cat_id, item_id in categories:
-            # Page 1 (sans limitstart)
-            yield scrapy.Request(
-                url=f"{self.base_url}/index.php?option=com_k2&view=itemlist&layout=category&task=category&id={cat_id}&Itemid={item_id}",
-                callback=self.parse_article_list,
-                meta={
-                    'category': cat_name,
-                    'category_id': cat_id,
-                    'itemid': item_id,
-                    'page_num': 1
-                },
-                errback=self.handle_error
-            )
-            
-            # Pages suivantes (K2 utilise limitstart)
-            # La page affiche 14 articles (2 leading + 6 primary + 6 secondary)
-            for page in range(2, self.max_pages + 1):
-                limitstart = (page - 1) * 14
-                
-                yield scrapy.Request(
-                    url=f"{self.base_url}/index.php?option=com_k2&view=itemlist&layout=category&task=category&id={cat_id}&Itemid={item_id}&limitstart={limitstart}",
-                    callback=self.parse_article_list,
-                    meta={
-                        'category': cat_name,
-                        'category_id': cat_id,
-                        'itemid': item_id,
-                        'page_num': page
-                    },
-                    errback=self.handle_error
-                )
+            yield cat_name, {'category_id': cat_id, 'itemid': item_id}
+
+    def listing_url(self, category, page_num, extra_meta):
+        """
+        Structure K2: /index.php?option=com_k2&view=itemlist&task=category&id=X&Itemid=Y
+        La page affiche 14 articles (2 leading + 6 primary + 6 secondary), K2 utilise limitstart
+        """
+        url = (
+            f"{self.base_url}/index.php?option=com_k2&view=itemlist&layout=category&task=category"
+            f"&id={extra_meta['category_id']}&Itemid={extra_meta['itemid']}"
+        )
+        # Page 1 (sans limitstart)
+        if page_num == 1:
+            return url
+        return f"{url}&limitstart={(page_num - 1) * 14}"
 
     def parse_article_list(self, response):
         """
@@ -105,26 +80,14 @@ class LObservateurScraper(BaseMediaScraper):
 
         self.logger.info(f"Analyse de {category} - page {page_num}")
 
-        # Extraire les liens depuis toutes les sections K2
-        # Section Leading (grands articles en haut)
-        leading_links = response.xpath(
-            '//div[@id="itemListLeading"]//article//h1/a/@href'
-        ).getall()
-
-        # Section Primary (articles moyens)
-        primary_links = response.xpath(
-            '//div[@id="itemListPrimary"]//article//h1/a/@href'
-        ).getall()
-
-        # Section Secondary (petits articles)
-        secondary_links = response.xpath(
-            '//div[@id="itemListSecondary"]//article//h1/a/@href'
-        ).getall()
-
-        # Section Links (liens supplémentaires)
-        links_section = response.xpath(
-            '//div[@id="itemListLinks"]//li/a/@href'
-        ).getall()
+        # Extraire les liens depuis toutes les sections K2:
+        # Leading (grands articles en haut), Primary (moyens), Secondary (petits)
+        # et Links (liens supplémentaires)
+        listing = LOBSERVATEUR_LISTING.extract(response)
+        leading_links = listing['leading']
+        primary_links = listing['primary']
+        secondary_links = listing['secondary']
+        links_section = listing['links']
 
         # Combiner tous les liens
         all_links = leading_links + primary_links + secondary_links + links_section
@@ -132,10 +95,14 @@ class LObservateurScraper(BaseMediaScraper):
         self.logger.info(f"Trouvé {len(all_links)} articles sur la page {page_num}")
         self.logger.info(f"  Leading: {len(leading_links)}, Primary: {len(primary_links)}, Secondary: {len(secondary_links)}, Links: {len(links_section)}")
 
-        for link in all_links:
-            # Construire l'URL complète
-            full_url = urljoin(response.url, link)
-            
+        # Mode incrémental: ignorer les articles déjà collectés
+        full_urls = [urljoin(response.url, link) for link in all_links]
+        new_urls = self.filter_new_links(full_urls, category)
+
+        # Page suivante seulement si celle-ci a produit des articles
+        yield from self.follow_pagination(response, full_urls, new_urls)
+
+        for full_url in new_urls:
             yield scrapy.Request(
                 url=full_url,
                 callback=self.parse_article,
@@ -150,104 +117,29 @@ class LObservateurScraper(BaseMediaScraper):
         """
         self.logger.info(f"Extraction de l'article: {response.url}")
 
-        # Extraire le titre
-        # Structure K2: <h2 class="itemTitle"> dans l'article
-        title = (
-            response.xpath('//h2[@class="itemTitle"]/text()').get() or
-            response.xpath('//div[@class="itemHeader"]//h2/text()').get() or
-            response.xpath('//meta[@property="og:title"]/@content').get() or
-            response.xpath('//title/text()').get()
-        )
-
-        # Extraire l'auteur
-        # Structure: <li class="itemAuthor"> Écrit par <a>Nom</a>
-        author = response.xpath(
-            '//li[@class="itemAuthor"]//a[@rel="author"]/text()'
-        ).get()
-        
-        if not author:
-            # Fallback: texte brut
-            author_text = response.xpath(
-                '//li[@class="itemAuthor"]/text()'
-            ).get()
-            if author_text:
-                author = author_text.replace('Écrit par', '').strip()
-
-        # Extraire la date de publication
-        # Structure K2: <li class="itemDate"><time datetime="...">texte date</time>
-        date_raw = response.xpath(
-            '//li[@class="itemDate"]//time/@datetime'
-        ).get()
-        
-        if not date_raw:
-            # Fallback: texte de la date
-            date_raw = response.xpath(
-                '//li[@class="itemDate"]//time/text()'
-            ).get()
-        
-        publication_date = self.parse_date(date_raw) if date_raw else ""
+        # Extraction déclarative (scrapers/specs.py), XPath compilées une seule fois
+        fields = LOBSERVATEUR_ARTICLE.extract(response, self)
+        title = fields['title']
+        content = fields['content']
 
-        # Extraire le contenu principal
-        # K2 structure: <div class="itemFullText"> pour le texte complet
-        # ou <div class="itemIntroText"> pour l'intro
-        
-        # D'abord essayer le texte complet
-        content_html = response.xpath(
-            '//div[@class="itemFullText"]'
-        ).get()
-        
-        if content_html:
-            # Extraire le texte des paragraphes du texte complet
-            content_paragraphs = response.xpath(
-                '//div[@class="itemFullText"]//p//text() | '
-                '//div[@class="itemFullText"]//p/span//text() | '
-                '//div[@class="itemFullText"]//p/b//text() | '
-                '//div[@class="itemFullText"]//p/strong//text()'
-            ).getall()
-        else:
-            # Fallback: texte d'introduction
-            content_paragraphs = response.xpath(
-                '//div[@class="itemIntroText"]//p//text() | '
-                '//div[@class="itemIntroText"]//p/span//text() | '
-                '//div[@class="itemIntroText"]//p/b//text()'
-            ).getall()
-
-        # Nettoyer le contenu
-        content = self.clean_article_content(content_paragraphs)
-
-        # Extraire l'image principale
-        image_url = (
-            response.xpath('//div[@class="itemImageBlock"]//a[@class="itemImage"]/img/@src').get() or
-            response.xpath('//div[@class="itemImageBlock"]//img/@src').get() or
-            response.xpath('//meta[@property="og:image"]/@content').get()
-        )
-        
+        # Image principale (URL relative sur le site)
+        image_url = fields['image']
         if image_url:
             image_url = urljoin(response.url, image_url)
 
-        # Extraire la catégorie depuis le breadcrumb K2
-        category_from_page = response.xpath(
-            '//li[@class="itemCategory"]/a/text()'
-        ).get()
-        
-        category = category_from_page if category_from_page else response.meta.get('category', '')
-
-        # Extraire les tags K2
-        tags = response.xpath(
-            '//div[@class="itemTagsBlock"]//a/text() | '
-            '//ul[@class="itemTags"]//a/text()'
-        ).getall()
+        # Catégorie depuis le breadcrumb K2, sinon celle de la liste
+        category = fields['category'] or response.meta.get('category', '')
 
         # Préparer les données de l'article
         article_data = {
-            'title': title.strip() if title else "",
-            'author': author.strip() if author else "L'Observateur",
-            'date_publication': publication_date,
+            'title': title,
+            'author': fields['author'],
+            'date_publication': fields['date'],
             'post': content,
             'url': response.url,
             'image_url': image_url if image_url else "",
             'category': category,
-            'tags': tags,
+            'tags': fields['tags'],
             'comments': [],
             'likes': 0,
             'partages': 0,
@@ -362,12 +254,12 @@ class LObservateurScraper(BaseMediaScraper):
         self.logger.error(f"Raison: {failure.value}")
 
 
-def run_scraper(max_pages=10):
+def run_scraper(max_pages=10, incremental=False):
     """
     Exécute le scraper L'Observateur
     """
     process = CrawlerProcess()
-    process.crawl(LObservateurScraper, max_pages=max_pages)
+    process.crawl(LObservateurScraper, max_pages=max_pages, incremental=incremental)
     process.start()
 
 
@@ -383,6 +275,11 @@ if __name__ == "__main__":
         default=10,
         help='Nombre maximum de pages à scraper par catégorie (défaut: 10)'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Mode incrémental: ignorer les articles déjà collectés'
+    )
 
     args = parser.parse_args()
 
@@ -396,6 +293,6 @@ if __name__ == "__main__":
     print(f"  - Secondary articles (petits): 6 par page")
     print(f"  - Total: ~14 articles par page")
 
-    run_scraper(max_pages=args.max_pages)
+    run_scraper(max_pages=args.max_pages, incremental=args.incremental)
 
     print("Scraping terminé!")
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Downloader middlewares shared by all media scrapers
+"""
+from collections import deque
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.downloadermiddlewares.httpcache import HttpCacheMiddleware
+from scrapy.extensions.httpcache import RFC2616Policy
+
+
+class ConditionalGetPolicy(RFC2616Policy):
+    """
+    HTTP cache policy that always revalidates cached pages with the origin server
+    A stored page is never served blindly: the request is re-sent with
+    If-None-Match / If-Modified-Since and the cached body is reused on a 304
+    """
+
+    def is_cached_response_fresh(self, cachedresponse, request):
+        self._set_conditional_validators(request, cachedresponse)
+        return False
+
+
+class ConditionalHttpCacheMiddleware(HttpCacheMiddleware):
+    """
+    HttpCacheMiddleware that also counts the bytes saved by 304 revalidations
+    Scrapy's httpcache/revalidate also counts the cached pages served because the origin
+    answered 5xx; they are told apart here: httpcache/not_modified (304 only) and
+    httpcache/stale_on_error. Other stats (per spider, so per media): httpcache/miss,
+    httpcache/invalidate, httpcache/bytes_saved, httpcache/bytes_downloaded
+    """
+
+    def process_response(self, request, response, spider):
+        cachedresponse = request.meta.get("cached_response")
+        result = super().process_response(request, response, spider)
+
+        if "cached" not in response.flags:
+            self.stats.inc_value("httpcache/bytes_downloaded", len(response.body), spider=spider)
+        if cachedresponse is not None and result is cachedresponse:
+            if response.status == 304:
+                saved = max(0, len(cachedresponse.body) - len(response.body))
+                self.stats.inc_value("httpcache/not_modified", spider=spider)
+                self.stats.inc_value("httpcache/bytes_saved", saved, spider=spider)
+            else:
+                # Origin error (5xx): the stale copy is served, nothing was saved
+                self.stats.inc_value("httpcache/stale_on_error", spider=spider)
+
+        return result
+
+
+class AdaptiveThrottleMiddleware:
+    """
+    Per-domain concurrency and delay controller driven by response latency and errors
+    Additive increase while the domain answers fast and without errors,
+    multiplicative decrease on 429/503, server errors, timeouts or slow answers.
+    Bounds come from THROTTLE_CONFIG and the "throttle" entry of each MEDIA_SOURCES item.
+    """
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        if not settings.getbool("ADAPTIVE_THROTTLE_ENABLED"):
+            raise NotConfigured
+
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.min_delay = settings.getfloat("ADAPTIVE_THROTTLE_MIN_DELAY")
+        self.max_delay = settings.getfloat("ADAPTIVE_THROTTLE_MAX_DELAY")
+        self.min_concurrency = settings.getint("ADAPTIVE_THROTTLE_MIN_CONCURRENCY")
+        self.max_concurrency = settings.getint("ADAPTIVE_THROTTLE_MAX_CONCURRENCY")
+        self.target_latency = settings.getfloat("ADAPTIVE_THROTTLE_TARGET_LATENCY")
+        self.error_threshold = settings.getfloat("ADAPTIVE_THROTTLE_ERROR_RATE")
+        self.window = settings.getint("ADAPTIVE_THROTTLE_WINDOW")
+
+        # slot key -> recent outcomes (True = error) and consecutive fast answers
+        self.outcomes = {}
+        self.fast_streak = {}
+
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def process_response(self, request, response, spider):
+        slot_key, slot = self._get_slot(request)
+        if slot is None:
+            return response
+
+        latency = request.meta.get("download_latency", 0.0)
+        if response.status in self.THROTTLE_STATUSES:
+            retry_after = self._retry_after(response)
+            self._record(slot_key, error=True)
+            self._decrease(slot_key, slot, spider, min_delay=retry_after)
+        elif response.status >= 500:
+            self._record(slot_key, error=True)
+            self._decrease(slot_key, slot, spider)
+        else:
+            self._record(slot_key, error=False)
+            self._adjust(slot_key, slot, latency, spider)
+
+        return response
+
+    def process_exception(self, request, exception, spider):
+        # Only network failures (timeouts, refused connections...) slow the domain down
+        if not isinstance(exception, HttpCacheMiddleware.DOWNLOAD_EXCEPTIONS):
+            return None
+
+        slot_key, slot = self._get_slot(request)
+        if slot is not None:
+            self._record(slot_key, error=True)
+            self._decrease(slot_key, slot, spider)
+
+    def _get_slot(self, request):
+        key = request.meta.get("download_slot")
+        engine = self.crawler.engine
+        if key is None or engine is None:
+            return key, None
+        return key, engine.downloader.slots.get(key)
+
+    def _record(self, slot_key, error):
+        outcomes = self.outcomes.setdefault(slot_key, deque(maxlen=self.window))
+        outcomes.append(error)
+
+    def _error_rate(self, slot_key):
+        outcomes = self.outcomes.get(slot_key)
+        if not outcomes:
+            return 0.0
+        return sum(outcomes) / len(outcomes)
+
+    def _adjust(self, slot_key, slot, latency, spider):
+        if self._error_rate(slot_key) > self.error_threshold:
+            # Recent errors: keep the current pace until they leave the window
+            self.fast_streak[slot_key] = 0
+            return
+
+        if latency > self.target_latency:
+            # Slow answers: one request less in flight, space them by the observed latency
+            self.fast_streak[slot_key] = 0
+            slot.concurrency = max(self.min_concurrency, slot.concurrency - 1)
+            target_delay = latency / slot.concurrency
+            slot.delay = min(self.max_delay, max(slot.delay, target_delay))
+            self.stats.inc_value("adaptive_throttle/slowdowns", spider=spider)
+            return
+
+        # Fast answers: one more request in flight every `concurrency` successes
+        streak = self.fast_streak.get(slot_key, 0) + 1
+        if streak >= slot.concurrency and slot.concurrency < self.max_concurrency:
+            slot.concurrency += 1
+            streak = 0
+            self.stats.inc_value("adaptive_throttle/speedups", spider=spider)
+        self.fast_streak[slot_key] = streak
+
+        target_delay = latency / slot.concurrency
+        new_delay = (slot.delay + target_delay) / 2.0
+        slot.delay = min(self.max_delay, max(self.min_delay, new_delay))
+
+    def _decrease(self, slot_key, slot, spider, min_delay=0.0):
+        self.fast_streak[slot_key] = 0
+        slot.concurrency = max(self.min_concurrency, slot.concurrency // 2)
+        new_delay = max(slot.delay * 2, self.min_delay, min_delay)
+        slot.delay = min(self.max_delay, new_delay)
+        self.stats.inc_value("adaptive_throttle/backoffs", spider=spider)
+
+    def _retry_after(self, response):
+        value = response.headers.get(b"Retry-After")
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def spider_closed(self, spider):
+        engine = self.crawler.engine
+        if engine is None:
+            return
+
+        for key, slot in engine.downloader.slots.items():
+            self.stats.set_value(f"adaptive_throttle/{key}/concurrency", slot.concurrency, spider=spider)
+            self.stats.set_value(f"adaptive_throttle/{key}/delay", round(slot.delay, 3), spider=spider)
+            spider.logger.info(
+                f"Adaptive throttle for {key}: concurrency={slot.concurrency}, "
+                f"delay={slot.delay:.2f}s, error rate={self._error_rate(key):.0%}"
+            )
@@ -0,0 +1,113 @@
+"""
+Recording of listing and article responses into compressed local archives
+Used to build an offline corpus for the parsing benchmark (scripts/benchmark_parsing.py)
+"""
+import gzip
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from scrapy.http import HtmlResponse, Request
+
+from config.settings import RECORDER_CONFIG
+
+
+# Request meta copied into the archive (what the callbacks read from response.meta)
+RECORDED_META = (
+    'category', 'page_num', 'listing_meta', 'rubrique_id', 'rubrique_name',
+    'category_id', 'itemid', 'label', 'discovery',
+)
+
+
+def archive_path(spider_name: str, directory: Path = None) -> Path:
+    """
+    Archive file of a spider: <dir>/<spider name>.jsonl.gz
+    """
+    return Path(directory or RECORDER_CONFIG['dir']) / f"{spider_name}.jsonl.gz"
+
+
+def iter_recorded(path: Path) -> Iterator[Dict]:
+    """
+    Iterate over the records of an archive
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def record_to_response(record: Dict) -> HtmlResponse:
+    """
+    Rebuild the response (and its request meta) of a record
+    """
+    request = Request(record['url'], meta=record.get('meta', {}))
+    return HtmlResponse(
+        url=record['url'],
+        status=record.get('status', 200),
+        body=record['body'].encode('utf-8'),
+        encoding='utf-8',
+        request=request,
+    )
+
+
+class ResponseRecorderMiddleware:
+    """
+    Spider middleware writing the responses of the parsing callbacks to <dir>/<spider>.jsonl.gz
+    Enabled with the RECORD_RESPONSES setting (python main.py --scrape --record)
+    """
+
+    def __init__(self, crawler):
+        if not crawler.settings.getbool("RECORD_RESPONSES", RECORDER_CONFIG['enabled']):
+            raise NotConfigured
+
+        self.directory = Path(crawler.settings.get("RECORD_DIR", RECORDER_CONFIG['dir']))
+        self.max_per_callback = crawler.settings.getint(
+            "RECORD_MAX_PER_CALLBACK", RECORDER_CONFIG['max_per_callback']
+        )
+        self.callbacks = set(RECORDER_CONFIG['callbacks'])
+        self.counts = Counter()
+        self.file = None
+
+        crawler.signals.connect(self.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def spider_opened(self, spider):
+        path = archive_path(spider.name, self.directory)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+        spider.logger.info(f"Recording responses to {path}")
+
+    def spider_closed(self, spider):
+        if self.file is not None:
+            self.file.close()
+        for callback, count in sorted(self.counts.items()):
+            spider.logger.info(f"Recorded {count} response(s) for {callback}")
+
+    def process_spider_input(self, response, spider):
+        callback = getattr(response.request.callback, '__name__', None)
+        if (
+            self.file is None
+            or callback not in self.callbacks
+            or not hasattr(response, 'text')
+            or self.counts[callback] >= self.max_per_callback
+        ):
+            return None
+
+        record = {
+            'spider': spider.name,
+            'callback': callback,
+            'url': response.url,
+            'status': response.status,
+            'meta': {key: response.meta[key] for key in RECORDED_META if key in response.meta},
+            'body': response.text,
+        }
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.counts[callback] += 1
+        return None
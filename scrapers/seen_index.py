@@ -0,0 +1,183 @@
+"""
+Persistent index of already collected articles (incremental crawl mode)
+"""
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class SeenArticleIndex:
+    """
+    On-disk index of the article ids already collected, with last-seen timestamps
+    Backed by SQLite so that all the spiders of a CrawlerProcess can share the same file
+    """
+
+    # Number of pending writes before an automatic flush
+    FLUSH_EVERY = 100
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_articles (
+                article_id TEXT PRIMARY KEY,
+                media TEXT NOT NULL,
+                url TEXT NOT NULL,
+                date_publication TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                lastmod TEXT
+            )
+        """)
+        # Indexes created before the sitemap discovery mode have no lastmod column
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(seen_articles)")}
+        if 'lastmod' not in columns:
+            self.conn.execute("ALTER TABLE seen_articles ADD COLUMN lastmod TEXT")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_seen_media ON seen_articles (media, last_seen)"
+        )
+        # Keys of the comments already emitted (comment refresh mode)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_comments (
+                comment_key TEXT PRIMARY KEY,
+                article_id TEXT NOT NULL,
+                first_seen TEXT NOT NULL
+            )
+        """)
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_seen_comments_article ON seen_comments (article_id)"
+        )
+        self.conn.commit()
+
+        self._known: Set[str] = set()
+        # article id -> last known modification date (sitemap lastmod, else first collection)
+        self._versions: Dict[str, str] = {}
+        self._pending_articles = []
+        self._pending_refresh = []
+        self._pending_comments = []
+
+    def load(self, media: str) -> int:
+        """
+        Load the ids known for a media in memory, returns the number of ids loaded
+        """
+        rows = self.conn.execute(
+            "SELECT article_id, COALESCE(lastmod, first_seen) FROM seen_articles WHERE media = ?",
+            (media,)
+        )
+        for article_id, version in rows:
+            self._known.add(article_id)
+            self._versions[article_id] = version
+        return len(self._known)
+
+    def contains(self, article_id: str) -> bool:
+        """
+        Check if an article id is already known
+        """
+        return article_id in self._known
+
+    def is_modified(self, article_id: str, lastmod: Optional[datetime]) -> bool:
+        """
+        Check if a known article was modified since it was collected
+        An article without lastmod (or unknown) is never considered modified
+        """
+        version = self._versions.get(article_id)
+        if lastmod is None or version is None:
+            return False
+        return lastmod.isoformat(timespec='seconds') > version
+
+    def add(self, article_id: str, media: str, url: str, date_publication: Optional[str] = None,
+            lastmod: Optional[datetime] = None):
+        """
+        Record a freshly collected (or re-collected) article
+        """
+        now = datetime.now().isoformat()
+        version = lastmod.isoformat(timespec='seconds') if lastmod else None
+        self._known.add(article_id)
+        self._versions[article_id] = version or self._versions.get(article_id) or now
+        self._pending_articles.append(
+            (article_id, media, url, date_publication or None, now, now, version)
+        )
+        self._maybe_flush()
+
+    def refresh(self, article_ids: Iterable[str]):
+        """
+        Update the last-seen timestamp of articles met again on a listing page
+        """
+        now = datetime.now().isoformat()
+        self._pending_refresh.extend((now, article_id) for article_id in article_ids)
+        self._maybe_flush()
+
+    def recent_articles(self, media: str, since: datetime) -> List[Tuple[str, str]]:
+        """
+        (article_id, url) of the articles of a media published (else collected) since a date
+        """
+        rows = self.conn.execute("""
+            SELECT article_id, url FROM seen_articles
+            WHERE media = ? AND COALESCE(date_publication, first_seen) >= ?
+            ORDER BY COALESCE(date_publication, first_seen) DESC
+        """, (media, since.strftime("%Y-%m-%d")))
+        return rows.fetchall()
+
+    def comment_keys(self, article_id: str) -> Set[str]:
+        """
+        Keys of the comments already known for an article
+        """
+        self.flush()
+        rows = self.conn.execute(
+            "SELECT comment_key FROM seen_comments WHERE article_id = ?", (article_id,)
+        )
+        return {key for key, in rows}
+
+    def add_comments(self, article_id: str, keys: Iterable[str]):
+        """
+        Record the keys of the comments of an article
+        """
+        now = datetime.now().isoformat()
+        self._pending_comments.extend((key, article_id, now) for key in keys)
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        pending = len(self._pending_articles) + len(self._pending_refresh) + len(self._pending_comments)
+        if pending >= self.FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        """
+        Write pending changes to disk in a single transaction
+        """
+        if not self._pending_articles and not self._pending_refresh and not self._pending_comments:
+            return
+
+        with self.conn:
+            self.conn.executemany("""
+                INSERT INTO seen_articles
+                    (article_id, media, url, date_publication, first_seen, last_seen, lastmod)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(article_id) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    date_publication = COALESCE(excluded.date_publication, date_publication),
+                    lastmod = COALESCE(excluded.lastmod, lastmod)
+            """, self._pending_articles)
+            self.conn.executemany(
+                "UPDATE seen_articles SET last_seen = ? WHERE article_id = ?",
+                self._pending_refresh
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_comments (comment_key, article_id, first_seen) VALUES (?, ?, ?)",
+                self._pending_comments
+            )
+
+        self._pending_articles = []
+        self._pending_refresh = []
+        self._pending_comments = []
+
+    def close(self):
+        """
+        Flush and close the index
+        """
+        self.flush()
+        self.conn.close()
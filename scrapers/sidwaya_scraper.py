@@ -12,10 +12,12 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 
 from scrapers.base_scraper import BaseMediaScraper
-from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG, RAW_DATA_DIR
+from scrapers.specs import SIDWAYA_LISTING, SIDWAYA_ARTICLE
+from scrapers.wp_api import WordPressApiMixin
+from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG
 
 
-class SidwayaScraper(BaseMediaScraper):
+class SidwayaScraper(WordPressApiMixin, BaseMediaScraper):
     """
     Scraper pour Sidwaya.info
     Site WordPress moderne avec structure tagDiv
@@ -23,37 +25,25 @@ class SidwayaScraper(BaseMediaScraper):
 
     name = 'sidwaya_scraper'
     media_name = "Sidwaya"
+    source_key = 'sidwaya'
 
     def __init__(self, max_pages=10, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.max_pages = int(max_pages)
-        self.config = MEDIA_SOURCES.get('sidwaya', {})
+        self.config = MEDIA_SOURCES.get(self.source_key, {})
         self.base_url = self.config.get('base_url', 'https://www.sidwaya.info')
 
     custom_settings = {
         "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
-        "FEEDS": {
-            str(RAW_DATA_DIR / "sidwaya_articles.json"): {
-                "format": "json",
-                "encoding": "utf8",
-                "overwrite": False,
-            },
-        },
         "USER_AGENT": SCRAPING_CONFIG.get('user_agent', 'Mozilla/5.0'),
-        "DOWNLOAD_DELAY": SCRAPING_CONFIG.get('download_delay', 2),
         "ROBOTSTXT_OBEY": SCRAPING_CONFIG.get('robotstxt_obey', True),
         "LOG_LEVEL": "INFO",
-        "CONCURRENT_REQUESTS": 2,
     }
 
-    def start_requests(self):
+    def listing_categories(self):
         """
-        Génère les requêtes pour les pages de Sidwaya
-        Structure: https://www.sidwaya.info/bfcategories/[categorie]/page/X/
+        Catégories principales de Sidwaya
         """
-        self.logger.info(f"Démarrage du scraper pour {self.media_name}")
-
-        # Catégories principales du site
         categories = [
             'politique',
             'economie',
@@ -69,22 +59,16 @@ class SidwayaScraper(BaseMediaScraper):
         ]
 
         for category in categories:
-            # Page 1 (sans /page/)
-            yield scrapy.Request(
-                url=f"{self.base_url}/bfcategories/{category}/",
-                callback=self.parse_article_list,
-                meta={'category': category, 'page_num': 1},
-                errback=self.handle_error
-            )
-            
-            # Pages suivantes
-            for page in range(2, self.max_pages + 1):
-                yield scrapy.Request(
-                    url=f"{self.base_url}/bfcategories/{category}/page/{page}/",
-                    callback=self.parse_article_list,
-                    meta={'category': category, 'page_num': page},
-                    errback=self.handle_error
-                )
+            yield category, {}
+
+    def listing_url(self, category, page_num, extra_meta):
+        """
+        Structure: https://www.sidwaya.info/bfcategories/[categorie]/page/X/
+        """
+        # Page 1 (sans /page/)
+        if page_num == 1:
+            return f"{self.base_url}/bfcategories/{category}/"
+        return f"{self.base_url}/bfcategories/{category}/page/{page_num}/"
 
     def parse_article_list(self, response):
         """
@@ -98,13 +82,17 @@ class SidwayaScraper(BaseMediaScraper):
 
         # Extraire les liens d'articles
         # Structure: <h3 class="entry-title td-module-title"><a href="URL">
-        article_links = response.xpath(
-            '//h3[contains(@class, "entry-title") and contains(@class, "td-module-title")]//a/@href'
-        ).getall()
+        article_links = SIDWAYA_LISTING.extract_field(response, 'links')
 
         self.logger.info(f"Trouvé {len(article_links)} articles sur la page {page_num}")
 
-        for link in article_links:
+        # Mode incrémental: ignorer les articles déjà collectés
+        new_links = self.filter_new_links(article_links, category)
+
+        # Page suivante seulement si celle-ci a produit des articles
+        yield from self.follow_pagination(response, article_links, new_links)
+
+        for link in new_links:
             yield scrapy.Request(
                 url=link,
                 callback=self.parse_article,
@@ -119,75 +107,21 @@ class SidwayaScraper(BaseMediaScraper):
         """
         self.logger.info(f"Extraction de l'article: {response.url}")
 
-        # Extraire le titre
-        # Plusieurs méthodes possibles
-        title = (
-            response.xpath('//h1[@class="entry-title"]//text()').get() or
-            response.xpath('//meta[@property="og:title"]/@content').get() or
-            response.xpath('//h1//text()').get()
-        )
-
-        # Extraire l'auteur
-        # Structure: <div class="td-post-author-name"><a>Nom Auteur</a>
-        author = response.xpath(
-            '//div[@class="td-post-author-name"]//a/text()'
-        ).get()
-        
-        if not author:
-            # Fallback: meta author
-            author = response.xpath('//meta[@name="author"]/@content').get()
-
-        # Extraire la date de publication
-        # Structure: <time class="entry-date" datetime="2025-10-16T00:34:26+00:00">
-        date_raw = response.xpath(
-            '//time[@class="entry-date updated td-module-date"]/@datetime'
-        ).get()
-        
-        if not date_raw:
-            # Fallback
-            date_raw = response.xpath('//time/@datetime').get()
-        
-        publication_date = self.parse_iso_date(date_raw) if date_raw else ""
-
-        # Extraire le contenu principal
-        # Le contenu est dans <div class="td-post-content"> ou similaire
-        content_paragraphs = response.xpath(
-            '//div[contains(@class, "td-post-content")]//p//text() | '
-            '//div[contains(@class, "td-post-content")]//p/strong//text() | '
-            '//div[contains(@class, "td-post-content")]//p/em//text()'
-        ).getall()
-
-        if not content_paragraphs:
-            # Fallback: article content
-            content_paragraphs = response.xpath(
-                '//article//div[contains(@class, "entry-content")]//p//text()'
-            ).getall()
-
-        # Nettoyer et joindre le contenu
-        content = self.clean_article_content(content_paragraphs)
-
-        # Extraire l'image principale
-        image_url = (
-            response.xpath('//meta[@property="og:image"]/@content').get() or
-            response.xpath('//article//img[@class="entry-thumb"]/@src').get() or
-            response.xpath('//div[contains(@class, "td-post-featured-image")]//img/@src').get()
-        )
-
-        # Extraire les tags/catégories
-        tags = response.xpath(
-            '//ul[@class="td-tags"]//a/text()'
-        ).getall()
+        # Extraction déclarative (scrapers/specs.py), XPath compilées une seule fois
+        fields = SIDWAYA_ARTICLE.extract(response, self)
+        title = fields['title']
+        content = fields['content']
 
         # Préparer les données de l'article
         article_data = {
-            'title': title.strip() if title else "",
-            'author': author.strip() if author else "",
-            'date_publication': publication_date,
+            'title': title,
+            'author': fields['author'],
+            'date_publication': fields['date'],
             'post': content,
             'url': response.url,
-            'image_url': image_url if image_url else "",
+            'image_url': fields['image'],
             'category': response.meta.get('category', ''),
-            'tags': tags,
+            'tags': fields['tags'],
             'comments': [],
             'likes': 0,
             'partages': 0,
@@ -267,12 +201,12 @@ class SidwayaScraper(BaseMediaScraper):
         self.logger.error(f"Raison: {failure.value}")
 
 
-def run_scraper(max_pages=10):
+def run_scraper(max_pages=10, incremental=False):
     """
     Exécute le scraper Sidwaya
     """
     process = CrawlerProcess()
-    process.crawl(SidwayaScraper, max_pages=max_pages)
+    process.crawl(SidwayaScraper, max_pages=max_pages, incremental=incremental)
     process.start()
 
 
@@ -288,6 +222,11 @@ if __name__ == "__main__":
         default=10,
         help='Nombre maximum de pages à scraper par catégorie (défaut: 10)'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Mode incrémental: ignorer les articles déjà collectés'
+    )
 
     args = parser.parse_args()
 
@@ -296,6 +235,6 @@ if __name__ == "__main__":
     print(f"URL de base: https://www.sidwaya.info")
     print(f"Catégories: politique, economie, societe, focus, international, sport, culture, etc.")
 
-    run_scraper(max_pages=args.max_pages)
+    run_scraper(max_pages=args.max_pages, incremental=args.incremental)
 
     print("Scraping terminé!")
\ No newline at end of file
@@ -12,6 +12,7 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 
 from scrapers.base_scraper import BaseMediaScraper
+from scrapers.specs import SIDWAYA_LISTING, SIDWAYA_TRAINING_ARTICLE
 from config.settings import MEDIA_SOURCES, SCRAPING_CONFIG
 from config.label_mapping import normalize_label
 
@@ -120,9 +121,7 @@ class SidwayaTrainingScraper(BaseMediaScraper):
 
         # Extraire les liens d'articles
         # Structure: <h3 class="entry-title td-module-title"><a href="URL">
-        article_links = response.xpath(
-            '//h3[contains(@class, "entry-title") and contains(@class, "td-module-title")]//a/@href'
-        ).getall()
+        article_links = SIDWAYA_LISTING.extract_field(response, 'links')
 
         self.logger.info(f"Trouv� {len(article_links)} articles sur la page {page_num}")
 
@@ -149,76 +148,23 @@ class SidwayaTrainingScraper(BaseMediaScraper):
         rubrique_name = response.meta.get('rubrique_name')
         label = response.meta.get('label')
 
-        # Extraire le titre
-        title = (
-            response.xpath('//h1[@class="entry-title"]//text()').get() or
-            response.xpath('//meta[@property="og:title"]/@content').get() or
-            response.xpath('//h1//text()').get()
-        )
-
-        # Extraire l'auteur
-        # Structure: <div class="td-post-author-name"><a>Nom Auteur</a>
-        author = response.xpath(
-            '//div[@class="td-post-author-name"]//a/text()'
-        ).get()
-
-        if not author:
-            # Fallback: meta author
-            author = response.xpath('//meta[@name="author"]/@content').get()
-
-        # Extraire la date de publication
-        # Structure: <time class="entry-date" datetime="2025-10-16T00:34:26+00:00">
-        date_raw = response.xpath(
-            '//time[@class="entry-date updated td-module-date"]/@datetime'
-        ).get()
-
-        if not date_raw:
-            # Fallback
-            date_raw = response.xpath('//time/@datetime').get()
-
-        publication_date = self.parse_iso_date(date_raw) if date_raw else ""
-
-        # Extraire le contenu principal
-        # Le contenu est dans <div class="td-post-content"> ou similaire
-        content_paragraphs = response.xpath(
-            '//div[contains(@class, "td-post-content")]//p//text() | '
-            '//div[contains(@class, "td-post-content")]//p/strong//text() | '
-            '//div[contains(@class, "td-post-content")]//p/em//text()'
-        ).getall()
-
-        if not content_paragraphs:
-            # Fallback: article content
-            content_paragraphs = response.xpath(
-                '//article//div[contains(@class, "entry-content")]//p//text()'
-            ).getall()
-
-        # Nettoyer et joindre le contenu
-        content = self.clean_content(content_paragraphs)
-
-        # Extraire l'image principale
-        image_url = (
-            response.xpath('//meta[@property="og:image"]/@content').get() or
-            response.xpath('//article//img[@class="entry-thumb"]/@src').get() or
-            response.xpath('//div[contains(@class, "td-post-featured-image")]//img/@src').get()
-        )
-
-        # Extraire les tags/cat�gories
-        tags = response.xpath(
-            '//ul[@class="td-tags"]//a/text()'
-        ).getall()
+        # Extraction déclarative partagée avec SidwayaScraper (scrapers/specs.py)
+        fields = SIDWAYA_TRAINING_ARTICLE.extract(response, self)
+        title = fields['title']
+        content = fields['content']
 
-        # Pr�parer les donn�es d'entra�nement
+        # Préparer les données d'entraînement
         training_data = {
             'text': content,
             'label': label,
-            'title': title.strip() if title else "",
-            'author': author.strip() if author else "Sidwaya",
-            'date': publication_date,
+            'title': title,
+            'author': fields['author'],
+            'date': fields['date'],
             'url': response.url,
             'category_raw': rubrique_name,
             'media': self.media_name,
-            'image_url': image_url if image_url else "",
-            'tags': tags,
+            'image_url': fields['image'],
+            'tags': fields['tags'],
             'scraped_at': datetime.now().isoformat(),
         }
 
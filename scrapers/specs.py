@@ -0,0 +1,309 @@
+"""
+Extraction specs of each media, shared by the collection and the training scrapers
+Compiled once at import; string post-processors are methods of the spider
+"""
+from scrapers.extraction import ExtractionSpec, first, every, strip
+
+
+def strip_ecrit_par(value: str) -> str:
+    """
+    Remove the Joomla "Écrit par" prefix of an author name
+    """
+    return value.replace('Écrit par', '').strip()
+
+
+# ---------------------------------------------------------------------------
+# AIB Media (WordPress, thème Newspaper/tagDiv)
+# ---------------------------------------------------------------------------
+
+AIB_LISTING = ExtractionSpec(
+    'aib_listing',
+    # <h3 class="entry-title td-module-title"><a href="URL">, puis modules td_module_mx4 (sidebar)
+    links=every(
+        '//h3[contains(@class, "entry-title") and contains(@class, "td-module-title")]//a/@href',
+        '//div[contains(@class, "td_module")]//h3[@class="entry-title td-module-title"]//a/@href',
+        default=[],
+    ),
+)
+
+AIB_ARTICLE = ExtractionSpec(
+    'aib_article',
+    title=first(
+        '//h1[@class="entry-title"]//text()',
+        '//h1[contains(@class, "tdb-title-text")]//text()',
+        '//meta[@property="og:title"]/@content',
+        '//title/text()',
+        post=strip,
+    ),
+    author=first(
+        '//div[@class="td-post-author-name"]//a/text() | '
+        '//a[@rel="author"]/text() | '
+        '//span[@class="td-post-author-name"]//text()',
+        '//meta[@name="author"]/@content',
+        post=strip, default="AIB",
+    ),
+    # <time class="entry-date" datetime="2025-11-15T15:47:51+01:00">, sinon le texte de la date
+    date=first(
+        '//time[@class="entry-date updated td-module-date"]/@datetime | '
+        '//time[@class="entry-date"]/@datetime | '
+        '//span[@class="td-post-date"]//time/@datetime',
+        '//time[@class="entry-date"]/text() | '
+        '//span[@class="td-post-date"]//time/text()',
+        post='parse_iso_date',
+    ),
+    content=every(
+        '//div[contains(@class, "td-post-content")]//p//text() | '
+        '//div[@class="td-post-content"]//div[@class="td-paragraph"]//text()',
+        '//article//div[contains(@class, "entry-content")]//p//text() | '
+        '//div[contains(@class, "tdb-block-inner")]//p//text()',
+        post='clean_article_content',
+    ),
+    image=first(
+        '//meta[@property="og:image"]/@content',
+        '//div[@class="td-post-featured-image"]//img/@src',
+        '//article//img[@class="entry-thumb"]/@src',
+        '//div[contains(@class, "td-module-image")]//img/@src',
+    ),
+    category=first('//a[@class="td-post-category"]/text()'),
+    tags=every(
+        '//ul[@class="td-tags"]//a/text() | '
+        '//div[@class="td-post-source-via"]//a/text()',
+        default=[],
+    ),
+)
+
+
+# ---------------------------------------------------------------------------
+# Sidwaya (WordPress, thème tagDiv)
+# ---------------------------------------------------------------------------
+
+SIDWAYA_LISTING = ExtractionSpec(
+    'sidwaya_listing',
+    links=every(
+        '//h3[contains(@class, "entry-title") and contains(@class, "td-module-title")]//a/@href',
+        default=[],
+    ),
+)
+
+SIDWAYA_ARTICLE = ExtractionSpec(
+    'sidwaya_article',
+    title=first(
+        '//h1[@class="entry-title"]//text()',
+        '//meta[@property="og:title"]/@content',
+        '//h1//text()',
+        post=strip,
+    ),
+    author=first(
+        '//div[@class="td-post-author-name"]//a/text()',
+        '//meta[@name="author"]/@content',
+        post=strip,
+    ),
+    date=first(
+        '//time[@class="entry-date updated td-module-date"]/@datetime',
+        '//time/@datetime',
+        post='parse_iso_date',
+    ),
+    content=every(
+        '//div[contains(@class, "td-post-content")]//p//text()',
+        '//article//div[contains(@class, "entry-content")]//p//text()',
+        post='clean_article_content',
+    ),
+    image=first(
+        '//meta[@property="og:image"]/@content',
+        '//article//img[@class="entry-thumb"]/@src',
+        '//div[contains(@class, "td-post-featured-image")]//img/@src',
+    ),
+    tags=every('//ul[@class="td-tags"]//a/text()', default=[]),
+)
+
+SIDWAYA_TRAINING_ARTICLE = SIDWAYA_ARTICLE.override(
+    'sidwaya_training_article',
+    author=first(
+        '//div[@class="td-post-author-name"]//a/text()',
+        '//meta[@name="author"]/@content',
+        post=strip, default="Sidwaya",
+    ),
+    content=every(
+        '//div[contains(@class, "td-post-content")]//p//text()',
+        '//article//div[contains(@class, "entry-content")]//p//text()',
+        post='clean_content',
+    ),
+)
+
+
+# ---------------------------------------------------------------------------
+# Burkina24 (WordPress, thème Jannah)
+# ---------------------------------------------------------------------------
+
+BURKINA24_LISTING = ExtractionSpec(
+    'burkina24_listing',
+    links=every('//li[contains(@class, "post-item")]//h2[@class="post-title"]/a/@href', default=[]),
+)
+
+BURKINA24_ARTICLE = ExtractionSpec(
+    'burkina24_article',
+    title=first(
+        '//h1[@class="post-title entry-title"]//text()',
+        '//h1[contains(@class, "entry-title")]//text()',
+        '//meta[@property="og:title"]/@content',
+        '//title/text()',
+        post=strip,
+    ),
+    author=first(
+        '//span[@class="meta-author"]//a[@class="author-name tie-icon"]/@title | '
+        '//span[@class="meta-author"]//a[@class="author-name tie-icon"]/text() | '
+        '//a[@rel="author"]/text()',
+        '//meta[@name="author"]/@content',
+        post=strip, default="Burkina24",
+    ),
+    # Dates relatives ("il y a X heures") ou ISO
+    date=first(
+        '//span[contains(@class, "date")][@class="meta-item tie-icon"]/text() | '
+        '//time[@class="entry-date published"]/@datetime | '
+        '//meta[@property="article:published_time"]/@content',
+        post='parse_relative_date',
+    ),
+    content=every(
+        '//div[contains(@class, "entry-content")]//p//text()',
+        '//article//div[@class="entry-content"]//p//text()',
+        post='clean_article_content',
+    ),
+    image=first(
+        '//meta[@property="og:image"]/@content',
+        '//div[@class="featured-image-area"]//img/@src',
+        '//article//img[@class="attachment-jannah-image-post size-jannah-image-post wp-post-image"]/@src',
+    ),
+    categories=every(
+        '//span[@class="post-cat-wrap"]//a/text() | '
+        '//div[@class="post-categories"]//a/text()',
+        default=[],
+    ),
+    tags=every(
+        '//div[@class="post-tags"]//a/text() | '
+        '//span[@class="tags-links"]//a/text()',
+        default=[],
+    ),
+)
+
+
+# ---------------------------------------------------------------------------
+# FasoPresse (Joomla 1.5)
+# ---------------------------------------------------------------------------
+
+FASOPRESSE_LISTING = ExtractionSpec(
+    'fasopresse_listing',
+    links=every('//td[@class="contentheading"]//a[@class="contentpagetitle"]/@href', default=[]),
+    more_links=every('//div[@class="blog_more"]//a[@class="blogsection"]/@href', default=[]),
+)
+
+FASOPRESSE_ARTICLE = ExtractionSpec(
+    'fasopresse_article',
+    title=first(
+        '//td[@class="contentheading"]//a[@class="contentpagetitle"]/text()',
+        '//h1/text()',
+        post=strip,
+    ),
+    author=first('//span[@class="small"]/text()', post=strip_ecrit_par),
+    # <td class="createdate">Vendredi, 29 Juin 2018 09:55</td>
+    date=first('//td[@class="createdate"]/text()', post='parse_french_date'),
+    update_date=first('//td[@class="modifydate"]/text()'),
+    # Paragraphes de la cellule de contenu (hors lignes createdate/modifydate)
+    text_nodes=every(
+        '//table[@class="contentpaneopen"]//tr[position()>2]//td[@valign="top"]//p/text() | '
+        '//table[@class="contentpaneopen"]//tr[position()>2]//td[@valign="top"]//p/span/text()',
+        '//table[@class="contentpaneopen"]//td[@valign="top"]//p/text() | '
+        '//table[@class="contentpaneopen"]//td[@valign="top"]//p/span/text()',
+        default=[],
+    ),
+    image=first('//table[@class="contentpaneopen"]//td[@valign="top"]//img/@src'),
+)
+
+
+# ---------------------------------------------------------------------------
+# L'Observateur Paalga (Joomla K2)
+# ---------------------------------------------------------------------------
+
+LOBSERVATEUR_LISTING = ExtractionSpec(
+    'lobservateur_listing',
+    leading=every('//div[@id="itemListLeading"]//article//h1/a/@href', default=[]),
+    primary=every('//div[@id="itemListPrimary"]//article//h1/a/@href', default=[]),
+    secondary=every('//div[@id="itemListSecondary"]//article//h1/a/@href', default=[]),
+    links=every('//div[@id="itemListLinks"]//li/a/@href', default=[]),
+)
+
+LOBSERVATEUR_ARTICLE = ExtractionSpec(
+    'lobservateur_article',
+    title=first(
+        '//h2[@class="itemTitle"]/text()',
+        '//div[@class="itemHeader"]//h2/text()',
+        '//meta[@property="og:title"]/@content',
+        '//title/text()',
+        post=strip,
+    ),
+    # <li class="itemAuthor"> Écrit par <a>Nom</a>
+    author=first(
+        '//li[@class="itemAuthor"]//a[@rel="author"]/text()',
+        '//li[@class="itemAuthor"]/text()',
+        post=strip_ecrit_par, default="L'Observateur",
+    ),
+    date=first(
+        '//li[@class="itemDate"]//time/@datetime',
+        '//li[@class="itemDate"]//time/text()',
+        post='parse_date',
+    ),
+    # Texte complet, sinon texte d'introduction
+    content=every(
+        '//div[@class="itemFullText"]//p//text()',
+        '//div[@class="itemIntroText"]//p//text()',
+        post='clean_article_content',
+    ),
+    image=first(
+        '//div[@class="itemImageBlock"]//a[@class="itemImage"]/img/@src',
+        '//div[@class="itemImageBlock"]//img/@src',
+        '//meta[@property="og:image"]/@content',
+    ),
+    category=first('//li[@class="itemCategory"]/a/text()'),
+    tags=every(
+        '//div[@class="itemTagsBlock"]//a/text() | '
+        '//ul[@class="itemTags"]//a/text()',
+        default=[],
+    ),
+)
+
+
+# ---------------------------------------------------------------------------
+# Lefaso.net (SPIP)
+# ---------------------------------------------------------------------------
+
+LEFASO_LISTING = ExtractionSpec(
+    'lefaso_listing',
+    links=every(
+        '//div[@class="col-xs-12 col-sm-12 col-md-8 col-lg-8"]//a[contains(@href, "spip.php?article")]/@href',
+        default=[],
+    ),
+)
+
+LEFASO_ARTICLE = ExtractionSpec(
+    'lefaso_article',
+    title=first('//title/text()', '//h1//text()'),
+    content=every('//div[contains(@class, "col-md-8")]//p/text()', post='clean_text'),
+    date=first(
+        '//div[contains(@class, "article-meta")]//text()',
+        '//div[contains(@class, "container")]//p[contains(text(), "Publié")]/text()',
+        post='parse_date',
+    ),
+)
+
+LEFASO_TRAINING_ARTICLE = ExtractionSpec(
+    'lefaso_training_article',
+    title=first('//h1[@class="spip"]/text()', '//title/text()', post=strip),
+    author=first('//span[@class="auteur"]/text()', '//div[@class="auteur"]//text()', post=strip, default="Lefaso"),
+    date_parts=every('//p[@class="info-publi"]//text()', default=[]),
+    content=every(
+        '//div[contains(@class, "col-md-8")]//p/text()',
+        '//div[@class="chapo"]//text() | //div[@class="texte"]//text()',
+        post='clean_content',
+    ),
+    image=first('//div[@class="spip_documents"]//img/@src'),
+    tags=every('//div[@class="tags"]//a/text()', default=[]),
+)
@@ -0,0 +1,238 @@
+"""
+WordPress REST API extraction path (wp-json/wp/v2/posts)
+One API page returns up to 100 articles with title, dates, content and categories
+"""
+import html
+import re
+from datetime import datetime
+from typing import List
+from urllib.parse import urlencode, urljoin
+
+import lxml.html
+import scrapy
+
+from config.settings import WP_API_CONFIG, MEDIA_SOURCES
+from scrapers.discovery import parse_lastmod
+
+
+TAG_RE = re.compile(r'<[^>]+>')
+
+
+def html_to_text(fragment: str) -> str:
+    """
+    Convert a short HTML fragment (rendered title, category name) to plain text
+    """
+    return ' '.join(html.unescape(TAG_RE.sub('', fragment or '')).split())
+
+
+def html_to_paragraphs(fragment: str) -> List[str]:
+    """
+    Convert the rendered content of one post to its list of paragraphs
+    The fragment is parsed on its own, so unbalanced tags cannot spill into other posts
+    """
+    root = lxml.html.fragment_fromstring(fragment or '', create_parent='div')
+    for element in root.xpath('.//script | .//style'):
+        element.drop_tree()
+    texts = [p.text_content() for p in root.xpath('.//p')]
+    if not texts:
+        texts = [root.text_content()]
+    return [' '.join(text.split()) for text in texts]
+
+
+class WordPressApiMixin:
+    """
+    Fast path for WordPress media: read articles from the REST API instead of HTML pages
+    Enabled with "wp_api": True in MEDIA_SOURCES; when the API is disabled or does not
+    answer JSON, the spider goes on with its sitemap/feed/listing discovery
+    To be mixed in before BaseMediaScraper
+    """
+
+    POST_FIELDS = 'id,link,date,modified_gmt,title,content,categories,yoast_head_json.author'
+
+    def __init__(self, *args, **kwargs):
+        wp_api = kwargs.pop('wp_api', None)
+        super().__init__(*args, **kwargs)
+
+        if wp_api is None:
+            wp_api = MEDIA_SOURCES.get(self.source_key, {}).get('wp_api', False)
+        self.wp_api = str(wp_api).lower() in ('1', 'true', 'yes', 'oui')
+        self.api_categories = {}
+
+    def start_requests(self):
+        if not self.wp_api:
+            yield from super().start_requests()
+            return
+
+        self.logger.info(f"Starting scraper for {self.media_name} (WordPress REST API)")
+        yield self.api_request('categories', {'per_page': 100, 'page': 1, '_fields': 'id,name'},
+                               self.parse_api_categories)
+
+    def api_request(self, endpoint: str, params, callback) -> scrapy.Request:
+        """
+        Build a request for a wp/v2 endpoint
+        """
+        url = urljoin(self.base_url, f"/wp-json/wp/v2/{endpoint}") + '?' + urlencode(params)
+        return scrapy.Request(
+            url=url,
+            callback=callback,
+            meta={'api_endpoint': endpoint, 'api_page': params['page']},
+            errback=self.handle_api_error,
+            dont_filter=True
+        )
+
+    def api_posts_request(self, page: int) -> scrapy.Request:
+        """
+        Request a page of posts, most recently modified first
+        """
+        params = {
+            'per_page': WP_API_CONFIG['per_page'],
+            'page': page,
+            'orderby': 'modified',
+            'order': 'desc',
+            'modified_after': self._discovery_cutoff().isoformat(timespec='seconds'),
+            '_fields': self.POST_FIELDS,
+        }
+        return self.api_request('posts', params, self.parse_api_posts)
+
+    def parse_api_categories(self, response):
+        """
+        Map category ids to names, then start reading posts
+        """
+        page = response.meta['api_page']
+        categories = self._api_json(response)
+        if categories is None:
+            if page == 1:
+                yield from self._api_fallback(f"invalid JSON from {response.url}")
+            else:
+                yield from self._api_categories_failed(f"invalid JSON from {response.url}")
+            return
+
+        for category in categories:
+            self.api_categories[category.get('id')] = html_to_text(category.get('name', ''))
+
+        total_pages = int(response.headers.get('X-WP-TotalPages', 1))
+        if page < total_pages:
+            yield self.api_request('categories', {'per_page': 100, 'page': page + 1, '_fields': 'id,name'},
+                                   self.parse_api_categories)
+        else:
+            yield self.api_posts_request(1)
+
+    def parse_api_posts(self, response):
+        """
+        Turn a page of posts into articles, each rendered content parsed on its own
+        """
+        page = response.meta['api_page']
+        posts = self._api_json(response)
+        if posts is None:
+            if page == 1:
+                yield from self._api_fallback(f"invalid JSON from {response.url}")
+            else:
+                self.logger.warning(f"Invalid JSON from {response.url}, stopping API pagination")
+            return
+
+        self._inc_stat('wp_api/pages')
+        cutoff = self._discovery_cutoff()
+        selected = []
+        known_ids = []
+        for post in posts:
+            url = post.get('link')
+            if not url:
+                continue
+
+            lastmod = parse_lastmod(f"{post['modified_gmt']}Z") if post.get('modified_gmt') else None
+            if lastmod is not None and lastmod < cutoff:
+                self._inc_stat('discovery/too_old')
+                continue
+
+            article_id = self.generate_article_id(url)
+            if self.incremental and self.seen_index.contains(article_id):
+                if not self.seen_index.is_modified(article_id, lastmod):
+                    known_ids.append(article_id)
+                    continue
+                self._inc_stat('discovery/modified')
+            else:
+                self._inc_stat('discovery/new')
+
+            if lastmod is not None:
+                self.discovered_lastmod[url] = lastmod
+            selected.append(post)
+
+        if self.incremental:
+            self.seen_index.refresh(known_ids)
+            self._inc_stat('incremental/skipped_articles', len(known_ids))
+
+        for post in selected:
+            yield self.api_article(post, html_to_paragraphs(post.get('content', {}).get('rendered', '')))
+
+        total_pages = int(response.headers.get('X-WP-TotalPages', 1))
+        if not selected:
+            self.logger.info(f"No new article on API page {page}, stopping")
+        elif page >= min(total_pages, WP_API_CONFIG['max_pages']):
+            self.logger.info(f"Last API page reached ({page})")
+        else:
+            yield self.api_posts_request(page + 1)
+
+    def api_article(self, post, paragraphs: List[str]):
+        """
+        Build the same article structure as the HTML parse_article
+        """
+        title = html_to_text(post.get('title', {}).get('rendered', ''))
+        category_ids = post.get('categories') or []
+        category = self.api_categories.get(category_ids[0], '') if category_ids else ''
+
+        try:
+            publication_date = datetime.fromisoformat(post['date']).strftime('%Y-%m-%d %H:%M:%S')
+        except (KeyError, TypeError, ValueError):
+            publication_date = ""
+
+        article_data = {
+            'title': title,
+            'author': ((post.get('yoast_head_json') or {}).get('author') or '').strip(),
+            'date_publication': publication_date,
+            'post': self.clean_article_content(paragraphs),
+            'url': post['link'],
+            'category': category,
+            'comments': [],
+            'likes': 0,
+            'partages': 0,
+        }
+
+        self.article_count += 1
+        self._inc_stat('wp_api/articles')
+        return self.format_article(article_data)
+
+    def handle_api_error(self, failure):
+        """
+        API disabled or protected (401/403/404...): go back to the HTML extraction
+        A later page of categories failing only leaves some categories unnamed
+        """
+        meta = failure.request.meta
+        if meta.get('api_page', 1) == 1:
+            yield from self._api_fallback(f"{failure.request.url} ({failure.value})")
+            return
+
+        self.handle_error(failure)
+        if meta.get('api_endpoint') == 'categories':
+            yield from self._api_categories_failed(f"{failure.request.url} ({failure.value})")
+
+    def _api_json(self, response):
+        try:
+            data = response.json()
+        except (AttributeError, ValueError):
+            return None
+        return data if isinstance(data, list) else None
+
+    def _api_categories_failed(self, reason: str):
+        """
+        Read the posts with the categories collected so far
+        """
+        self.logger.warning(f"Categories page unavailable for {self.media_name}: {reason}, "
+                            f"continuing with {len(self.api_categories)} categories")
+        self._inc_stat('wp_api/categories_errors')
+        yield self.api_posts_request(1)
+
+    def _api_fallback(self, reason: str):
+        self.logger.warning(f"WordPress REST API unavailable for {self.media_name}: {reason}")
+        self._inc_stat('wp_api/fallback')
+        self.wp_api = False
+        yield from super().start_requests()
@@ -0,0 +1,97 @@
+"""
+Benchmark de la classification des articles: appels article par article / moteur par lots
+
+Sur les textes de train_data, compare:
+- la fonction classify() du notebook d'analyse: un appel du tokenizer et du modèle par
+  article, sous torch.no_grad()
+- NewsClassifier (analysis/classifier.py): textes triés par longueur, lots à padding
+  dynamique, torch.inference_mode()
+et vérifie que les deux donnent les mêmes catégories.
+
+Usage:
+    python scripts/benchmark_classifier.py
+    python scripts/benchmark_classifier.py --articles 500 --threads 4
+    python scripts/benchmark_classifier.py --model chemin/vers/modele --min-speedup 10
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import BASE_DIR, MODEL_CONFIG
+from analysis.classifier import NewsClassifier
+
+
+def load_texts(train_dir: Path, count: int):
+    texts = []
+    for path in sorted(train_dir.glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.extend(item['text'] for item in json.load(f) if item.get('text'))
+    return [texts[i % len(texts)] for i in range(count)] if texts else []
+
+
+def classify_one_by_one(classifier: NewsClassifier, texts):
+    """
+    classify() of the notebook, one article per call
+    """
+    torch, tokenizer, model = classifier.torch, classifier.tokenizer, classifier.model
+    categories = []
+    for text in texts:
+        inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True,
+                           max_length=classifier.max_length)
+        with torch.no_grad():
+            outputs = model(**inputs)
+        categories.append(classifier.labels[outputs.logits.argmax(dim=-1).item()])
+    return categories
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la classification des articles")
+    parser.add_argument('--model', default=MODEL_CONFIG['news_classifier'],
+                        help='Modèle (Hugging Face ou répertoire local)')
+    parser.add_argument('--train-dir', default=str(BASE_DIR / "train_data"), help='Répertoire des textes')
+    parser.add_argument('--articles', type=int, default=200, help="Nombre d'articles classés")
+    parser.add_argument('--threads', type=int, default=MODEL_CONFIG['inference_threads'],
+                        help='Threads de calcul (défaut: tous les cœurs)')
+    parser.add_argument('--min-speedup', type=float, default=None,
+                        help="Échec (code 1) si le moteur par lots n'est pas au moins ce nombre de fois plus rapide")
+    args = parser.parse_args()
+
+    texts = load_texts(Path(args.train_dir), args.articles)
+    if not texts:
+        print(f"Aucun texte dans {args.train_dir}")
+        sys.exit(1)
+
+    # Per-article calls of the notebook: PyTorch model
+    classifier = NewsClassifier(model_name=args.model, threads=args.threads, backend='torch')
+    print(f"{len(texts)} articles, {args.model}, {classifier.threads} threads\n")
+
+    # Warm-up (allocations, first kernels)
+    classifier.classify(texts[:8])
+    classify_one_by_one(classifier, texts[:8])
+
+    start = time.perf_counter()
+    expected = classify_one_by_one(classifier, texts)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    categories = classifier.classify(texts)
+    batched = time.perf_counter() - start
+
+    print(f"  article par article:  {single:>8.2f}s  {len(texts) / single:>8.1f} articles/s")
+    print(f"  par lots:             {batched:>8.2f}s  {len(texts) / batched:>8.1f} articles/s")
+    print(f"  accélération:         x{single / batched:.1f}")
+
+    same = sum(a == b for a, b in zip(expected, categories))
+    print(f"\nCatégories identiques: {same}/{len(texts)}")
+
+    if args.min_speedup is not None and single / batched < args.min_speedup:
+        print(f"\n✗ Accélération inférieure à x{args.min_speedup}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
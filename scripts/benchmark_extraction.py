@@ -0,0 +1,208 @@
+"""
+Micro-benchmark des specs d'extraction (scrapers/specs.py)
+
+Compare, pour chaque site, le nombre de pages analysées par seconde:
+- avant: chaînes de response.xpath(...).get() or ... (XPath reparsées à chaque page)
+- après: specs compilées une seule fois en objets lxml XPath
+
+Usage:
+    python scripts/benchmark_extraction.py                  # pages synthétiques
+    python scripts/benchmark_extraction.py --pages pages/   # pages réelles: pages/<site>/*.html
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scrapy.http import HtmlResponse
+
+from scrapers.aib_scraper import AIBScraper
+from scrapers.burkina_24_scraper import Burkina24Scraper
+from scrapers.fasopresse_scraper import FasoPresseScraper
+from scrapers.lefaso_scraper import LefasoScraper
+from scrapers.lobservateur_scraper import LObservateurScraper
+from scrapers.sidwaya_scraper import SidwayaScraper
+from scrapers.specs import (
+    AIB_ARTICLE, BURKINA24_ARTICLE, FASOPRESSE_ARTICLE,
+    LEFASO_ARTICLE, LOBSERVATEUR_ARTICLE, SIDWAYA_ARTICLE,
+)
+
+
+SITES = {
+    'aib': (AIBScraper, AIB_ARTICLE),
+    'sidwaya': (SidwayaScraper, SIDWAYA_ARTICLE),
+    'burkina24': (Burkina24Scraper, BURKINA24_ARTICLE),
+    'fasopresse': (FasoPresseScraper, FASOPRESSE_ARTICLE),
+    'lobservateur': (LObservateurScraper, LOBSERVATEUR_ARTICLE),
+    'lefaso': (LefasoScraper, LEFASO_ARTICLE),
+}
+
+PARAGRAPH = (
+    "Le Conseil des ministres s'est tenu ce mercredi à Ouagadougou sous la présidence "
+    "du chef de l'Etat. Plusieurs dossiers ont été examinés, notamment <strong>le budget</strong> "
+    "et la situation <em>sécuritaire</em> dans les régions du Sahel et de l'Est."
+)
+
+# Balisage minimal de chaque site, entouré d'une navigation réaliste
+TEMPLATES = {
+    'aib': (
+        '<h1 class="entry-title">Titre de la dépêche AIB</h1>'
+        '<div class="td-post-author-name"><a>Rédaction AIB</a></div>'
+        '<span class="td-post-date"><time class="entry-date updated td-module-date" '
+        'datetime="2025-11-15T15:47:51+01:00">15 novembre 2025</time></span>'
+        '<a class="td-post-category">Politique</a>'
+        '<div class="td-post-content">{paragraphs}</div>'
+        '<ul class="td-tags"><li><a>Conseil</a></li><li><a>Gouvernement</a></li></ul>'
+    ),
+    'sidwaya': (
+        '<h1 class="entry-title">Titre de l\'article Sidwaya</h1>'
+        '<div class="td-post-author-name"><a>Rédaction Sidwaya</a></div>'
+        '<time class="entry-date updated td-module-date" datetime="2025-10-16T00:34:26+00:00"></time>'
+        '<div class="td-post-content tagdiv-type">{paragraphs}</div>'
+        '<ul class="td-tags"><li><a>Société</a></li></ul>'
+    ),
+    'burkina24': (
+        '<h1 class="post-title entry-title">Titre Burkina24</h1>'
+        '<span class="meta-author"><a class="author-name tie-icon" title="Rédaction">Rédaction</a></span>'
+        '<span class="date meta-item tie-icon">il y a 3 heures</span>'
+        '<span class="post-cat-wrap"><a>Politique</a></span>'
+        '<div class="entry-content entry-content-single">{paragraphs}</div>'
+        '<div class="post-tags"><a>Burkina</a></div>'
+    ),
+    'fasopresse': (
+        '<table class="contentpaneopen"><tr><td class="contentheading">'
+        '<a class="contentpagetitle" href="/politique/1-titre">Titre FasoPresse</a></td></tr>'
+        '<tr><td><span class="small">Écrit par Sidwaya</span></td></tr>'
+        '<tr><td class="createdate">Vendredi, 29 Juin 2018 09:55</td></tr>'
+        '<tr><td valign="top">{paragraphs}<p>Djakaridia SIRIBIE</p></td></tr>'
+        '<tr><td class="modifydate">Mise à jour le Vendredi, 29 Juin 2018 10:05</td></tr></table>'
+    ),
+    'lobservateur': (
+        '<div class="itemHeader"><h2 class="itemTitle">Titre L\'Observateur</h2></div>'
+        '<ul><li class="itemAuthor">Écrit par <a rel="author">Rédaction</a></li>'
+        '<li class="itemDate"><time datetime="2025-09-30T00:00:00+00:00">mardi, 30 septembre 2025</time></li>'
+        '<li class="itemCategory"><a>Politique</a></li></ul>'
+        '<div class="itemFullText">{paragraphs}</div>'
+        '<ul class="itemTags"><li><a>Editorial</a></li></ul>'
+    ),
+    'lefaso': (
+        '<div class="container"><div class="col-xs-12 col-sm-12 col-md-8 col-lg-8">'
+        '<div class="article-meta">Publié le 15/11/2025</div>{paragraphs}</div></div>'
+    ),
+}
+
+
+def synthetic_page(site: str, num_paragraphs: int = 25) -> bytes:
+    paragraphs = ''.join(f'<p>{PARAGRAPH}</p>' for _ in range(num_paragraphs))
+    navigation = ''.join(
+        f'<li class="menu-item"><a href="/category/rubrique-{i}/">Rubrique {i}</a></li>' for i in range(120)
+    )
+    sidebar = ''.join(
+        f'<div class="widget"><h3><a href="/article-{i}/">Article récent {i}</a></h3><p>Résumé {i}</p></div>'
+        for i in range(40)
+    )
+    body = TEMPLATES[site].format(paragraphs=paragraphs)
+    html = (
+        '<html><head><title>Titre de la page</title>'
+        '<meta property="og:title" content="Titre OG"><meta property="og:image" content="/img.jpg">'
+        f'</head><body><nav><ul>{navigation}</ul></nav><article>{body}</article>'
+        f'<aside>{sidebar}</aside></body></html>'
+    )
+    return html.encode('utf-8')
+
+
+def load_pages(site: str, pages_dir, count: int):
+    """
+    Return a list of HtmlResponse for a site (real pages if available, else synthetic)
+    """
+    if pages_dir is not None:
+        files = sorted((Path(pages_dir) / site).glob('*.html'))
+        if files:
+            return [
+                HtmlResponse(url=f'https://{site}.example/{f.stem}', body=f.read_bytes(), encoding='utf-8')
+                for f in files
+            ]
+    body = synthetic_page(site)
+    return [HtmlResponse(url=f'https://{site}.example/article-{i}', body=body, encoding='utf-8')
+            for i in range(count)]
+
+
+def extract_legacy(spec, response, spider):
+    """
+    Previous approach: `response.xpath(sel).get() or response.xpath(next).get()` chains
+    evaluated from the XPath strings on every page
+    """
+    data = {}
+    for name, field in spec.fields.items():
+        value = None
+        for selector in field.selectors:
+            if field.many:
+                value = response.xpath(selector).getall()
+                if value:
+                    break
+            else:
+                value = response.xpath(selector).get()
+                if value:
+                    break
+
+        if not value:
+            data[name] = field.default
+            continue
+        if field.post is not None:
+            post = getattr(spider, field.post) if isinstance(field.post, str) else field.post
+            value = post(value)
+        data[name] = value if value or field.many else field.default
+    return data
+
+
+def extract_compiled(spec, response, spider):
+    return spec.extract(response, spider)
+
+
+def run(extract, spec, pages, spider, rounds: int) -> float:
+    """
+    Pages per second; the parsed document is shared by both approaches (parsed once per response)
+    """
+    for response in pages:
+        response.selector  # parse outside of the timed loop
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for response in pages:
+            extract(spec, response, spider)
+    elapsed = time.perf_counter() - start
+    return rounds * len(pages) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des specs d'extraction compilées")
+    parser.add_argument('--pages', help='Répertoire de pages HTML réelles: <dir>/<site>/*.html')
+    parser.add_argument('--count', type=int, default=50, help='Nombre de pages synthétiques par site')
+    parser.add_argument('--rounds', type=int, default=20, help='Nombre de passes par mesure')
+    parser.add_argument('--site', choices=sorted(SITES), action='append', help='Limiter à certains sites')
+    args = parser.parse_args()
+
+    print(f"{'Site':<14}{'Pages':>7}{'Avant (p/s)':>14}{'Après (p/s)':>14}{'Gain':>8}  Résultats")
+    print("-" * 70)
+
+    for site in args.site or SITES:
+        spider_cls, spec = SITES[site]
+        spider = spider_cls()
+        pages = load_pages(site, args.pages, args.count)
+
+        identical = all(
+            extract_legacy(spec, response, spider) == extract_compiled(spec, response, spider)
+            for response in pages
+        )
+        before = run(extract_legacy, spec, pages, spider, args.rounds)
+        after = run(extract_compiled, spec, pages, spider, args.rounds)
+
+        print(
+            f"{site:<14}{len(pages):>7}{before:>14.0f}{after:>14.0f}{after / before:>7.1f}x  "
+            f"{'identiques' if identical else 'DIFFÉRENTS'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark de l'import des fichiers bruts (data/raw) dans la base SQLite
+
+Importe tous les fichiers dans une base temporaire, pour plusieurs tailles de lot
+(1 = une transaction par article), puis réimporte les mêmes fichiers pour vérifier
+que l'import est idempotent (même nombre de lignes, même contenu) et que les agrégats
+media_daily, tenus à jour par triggers, sont égaux à un recalcul complet. Un dernier
+réimport passe par la déduplication (filtre de Bloom, database/dedup.py), comme
+`python main.py --import`: tous les enregistrements doivent être ignorés.
+
+Usage:
+    python scripts/benchmark_import.py
+    python scripts/benchmark_import.py --raw data/raw --batch-sizes 1 100 500 2000
+"""
+import argparse
+import hashlib
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import RAW_DATA_DIR, MEDIA_SOURCES, INGEST_CONFIG
+from database.db_manager import DatabaseManager, ROLLUP_SELECT
+from database.dedup import ArticleDedup
+from database.ingest import ArticleIngest
+from utils.helpers import iter_raw_files, iter_json_records, batched
+
+
+def import_files(db: DatabaseManager, files, batch_size: int, dedup: ArticleDedup = None) -> int:
+    count = 0
+    for path in files:
+        with ArticleIngest(source=path.name, quarantine_dir=None, dedup=dedup) as ingest:
+            for records in batched(iter_json_records(path), batch_size):
+                count += db.bulk_add_articles(ingest.convert(records))
+    return count
+
+
+def articles_digest(db: DatabaseManager) -> str:
+    rows = db.conn.execute("SELECT * FROM articles ORDER BY id").fetchall()
+    return hashlib.md5(repr([tuple(row) for row in rows]).encode()).hexdigest()
+
+
+def rollups_consistent(db: DatabaseManager) -> bool:
+    stored = db.conn.execute("SELECT * FROM media_daily ORDER BY 1, 2, 3, 4").fetchall()
+    expected = db.conn.execute(f"{ROLLUP_SELECT} ORDER BY 1, 2, 3, 4").fetchall()
+    return [tuple(row) for row in stored] == [tuple(row) for row in expected]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'import vers la base SQLite")
+    parser.add_argument('--raw', default=str(RAW_DATA_DIR), help='Répertoire des fichiers bruts (défaut: data/raw)')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 100, 500, 2000],
+                        help='Tailles de lot à mesurer')
+    args = parser.parse_args()
+
+    files = list(iter_raw_files(Path(args.raw)))
+    if not files:
+        print(f"Aucun fichier dans {args.raw}")
+        sys.exit(1)
+
+    print(f"{len(files)} fichier(s) dans {args.raw}\n")
+    print(f"{'Lot':>6}{'Articles':>10}{'Durée (s)':>12}{'Articles/s':>12}")
+    print("-" * 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for batch_size in args.batch_sizes:
+            with DatabaseManager(Path(tmp) / f"bench-{batch_size}.db") as db:
+                for media_info in MEDIA_SOURCES.values():
+                    db.add_media(nom=media_info['name'], base_url=media_info['base_url'], type_media="web")
+
+                start = time.perf_counter()
+                count = import_files(db, files, batch_size)
+                elapsed = time.perf_counter() - start
+                print(f"{batch_size:>6}{count:>10}{elapsed:>12.2f}{count / elapsed:>12.0f}")
+
+        # Re-import into the last database: nothing may change
+        with DatabaseManager(Path(tmp) / f"bench-{args.batch_sizes[-1]}.db") as db:
+            rows_before = db.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            digest_before = articles_digest(db)
+
+            start = time.perf_counter()
+            count = import_files(db, files, args.batch_sizes[-1])
+            elapsed = time.perf_counter() - start
+
+            rows_after = db.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            identical = digest_before == articles_digest(db)
+            rollups_ok = rollups_consistent(db)
+
+            dedup = ArticleDedup(db, Path(tmp) / "bench.bloom", capacity=INGEST_CONFIG['bloom_capacity'],
+                                 error_rate=INGEST_CONFIG['bloom_error_rate'])
+            start = time.perf_counter()
+            dedup_count = import_files(db, files, args.batch_sizes[-1], dedup)
+            dedup_elapsed = time.perf_counter() - start
+            dedup.close()
+
+    print(f"\nRéimport: {count} articles en {elapsed:.2f}s ({count / elapsed:.0f} articles/s), "
+          f"{rows_before} -> {rows_after} lignes, contenu {'identique' if identical else 'MODIFIÉ'}")
+    print(f"Agrégats media_daily: {'cohérents' if rollups_ok else 'DIFFÉRENTS du recalcul'}")
+    print(f"Réimport dédupliqué: {rows_after - dedup_count} doublons ignorés, "
+          f"{dedup_count} articles réécrits en {dedup_elapsed:.2f}s")
+    if rows_before != rows_after or not identical or not rollups_ok or dedup_count:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
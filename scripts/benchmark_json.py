@@ -0,0 +1,98 @@
+"""
+Benchmark de la lecture des fichiers JSON: json.load contre la lecture en flux (utils/json_stream.py)
+
+Construit des fichiers de test de plusieurs tailles en recopiant les articles d'un fichier
+source (défaut: data/raw/aib_articles.json), puis mesure pour chaque taille:
+- débit (Mo/s, articles/s, meilleure passe sur --rounds)
+- pic de mémoire allouée (tracemalloc, passe séparée)
+
+La lecture en flux doit garder un pic de mémoire constant quand la taille du fichier augmente.
+
+Usage:
+    python scripts/benchmark_json.py
+    python scripts/benchmark_json.py --sizes 10 50 200 --source train_data/sidwaya_training_data.json
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import RAW_DATA_DIR
+from utils.json_stream import DECODER, iter_json, write_json_array
+
+
+def read_json_load(path: Path) -> int:
+    with open(path, 'r', encoding='utf-8') as f:
+        return len(json.load(f))
+
+
+def read_stream(path: Path) -> int:
+    return sum(1 for _ in iter_json(path))
+
+
+def read_stream_mmap(path: Path) -> int:
+    return sum(1 for _ in iter_json(path, use_mmap=True))
+
+
+READERS = {
+    'json.load': read_json_load,
+    'iter_json': read_stream,
+    'iter_json (mmap)': read_stream_mmap,
+}
+
+
+def build_file(path: Path, articles, size_mb: float) -> int:
+    """
+    Write copies of the articles until the file reaches size_mb, returns the number of articles
+    """
+    article_size = len(json.dumps(articles, ensure_ascii=False, indent=2).encode('utf-8')) / len(articles)
+    count = max(1, int(size_mb * 1e6 / article_size))
+    return write_json_array(path, (articles[i % len(articles)] for i in range(count)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la lecture JSON en flux")
+    parser.add_argument('--source', default=str(RAW_DATA_DIR / "aib_articles.json"),
+                        help='Fichier dont les articles sont recopiés')
+    parser.add_argument('--sizes', type=float, nargs='+', default=[5, 20, 80], help='Tailles des fichiers (Mo)')
+    parser.add_argument('--rounds', type=int, default=3, help='Passes par mesure de débit')
+    args = parser.parse_args()
+
+    articles = list(iter_json(Path(args.source)))
+    if not articles:
+        print(f"Aucun article dans {args.source}")
+        sys.exit(1)
+
+    print(f"Décodeur JSON Lines: {DECODER}\n")
+    print(f"{'Taille':>8}  {'Lecture':<18}{'Mo/s':>8}{'Articles/s':>12}{'Pic mémoire (Mo)':>18}")
+    print("-" * 66)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes:
+            path = Path(tmp) / f"articles_{size_mb:g}.json"
+            count = build_file(path, articles, size_mb)
+            file_mb = path.stat().st_size / 1e6
+
+            for name, read in READERS.items():
+                best = float('inf')
+                for _ in range(args.rounds):
+                    start = time.perf_counter()
+                    assert read(path) == count
+                    best = min(best, time.perf_counter() - start)
+
+                tracemalloc.start()
+                read(path)
+                peak = tracemalloc.get_traced_memory()[1] / 1e6
+                tracemalloc.stop()
+
+                print(f"{file_mb:>6.0f}Mo  {name:<18}{file_mb / best:>8.1f}{count / best:>12.0f}{peak:>18.1f}")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark de la classification des textes longs: exactitude / coût
+
+Sur les articles étiquetés de train_data/*.json, classe les textes:
+- tronqués à leurs 256 premiers tokens (comme classify() du notebook), puis à 512
+  (MODEL_CONFIG['max_sequence_length'])
+- entiers par fenêtres glissantes (MODEL_CONFIG['long_documents']) avec plusieurs budgets
+  de tokens par article
+et affiche pour chaque configuration: exactitude (tous les articles et articles longs
+seulement), accord avec la troncature à 256 tokens, tokens traités par article, débit.
+
+Usage:
+    python scripts/benchmark_long_documents.py
+    python scripts/benchmark_long_documents.py --articles 500 --budgets 512 1024 2048
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import BASE_DIR, MODEL_CONFIG
+from analysis.classifier import NewsClassifier
+
+
+def load_labelled(train_dir: Path, count: int):
+    items = []
+    for path in sorted(train_dir.glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            items.extend((item['text'], item['label']) for item in json.load(f) if item.get('text') and item.get('label'))
+    if count and count < len(items):
+        items = random.Random(0).sample(items, count)
+    return items
+
+
+def configure(classifier: NewsClassifier, max_length: int, budget=None):
+    """
+    Truncation to max_length tokens, or windows of max_length tokens within budget tokens per article
+    """
+    classifier.max_length = max_length
+    classifier.long_documents = budget is not None
+    classifier.max_windows = max(1, (budget or max_length) // max_length)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la classification des textes longs")
+    parser.add_argument('--model', default=MODEL_CONFIG['news_classifier'],
+                        help='Modèle (Hugging Face ou répertoire local)')
+    parser.add_argument('--train-dir', default=str(BASE_DIR / "train_data"), help='Articles étiquetés')
+    parser.add_argument('--articles', type=int, default=300, help="Échantillon d'articles")
+    parser.add_argument('--budgets', type=int, nargs='+', default=[512, 1024, 2048],
+                        help='Budgets de tokens par article des fenêtres glissantes')
+    parser.add_argument('--threads', type=int, default=MODEL_CONFIG['inference_threads'],
+                        help='Threads de calcul (défaut: tous les cœurs)')
+    args = parser.parse_args()
+
+    items = load_labelled(Path(args.train_dir), args.articles)
+    if not items:
+        print(f"Aucun article étiqueté dans {args.train_dir}")
+        sys.exit(1)
+    texts = [text for text, _ in items]
+    labels = np.array([label for _, label in items])
+
+    classifier = NewsClassifier(model_name=args.model, threads=args.threads, backend='torch')
+    window = MODEL_CONFIG['inference_max_length']
+    lengths = np.array([len(ids) for ids in classifier.tokenizer(texts, verbose=False)['input_ids']])
+    long = lengths > window
+    print(f"{len(texts)} articles étiquetés, {long.sum()} de plus de {window} tokens "
+          f"(médiane {np.median(lengths):.0f} tokens), {classifier.threads} threads\n")
+
+    longest = MODEL_CONFIG['max_sequence_length']
+    configurations = [(f"troncature {window}", window, None), (f"troncature {longest}", longest, None)]
+    configurations += [(f"fenêtres, budget {budget}", window, budget) for budget in args.budgets]
+
+    configure(classifier, window)
+    classifier.predict_logits(texts[:8])  # warm-up
+    print(f"  {'':<26}{'exactitude':>12}{'(longs)':>9}{'accord':>9}{'tokens/art.':>13}{'articles/s':>12}")
+    baseline = None
+    for name, max_length, budget in configurations:
+        configure(classifier, max_length, budget)
+        classifier.tokens = 0
+        start = time.perf_counter()
+        predicted = np.array(classifier.labels)[classifier.predict_logits(texts).argmax(axis=1)]
+        seconds = time.perf_counter() - start
+        if baseline is None:
+            baseline = predicted
+        accuracy = (predicted == labels).mean()
+        accuracy_long = (predicted[long] == labels[long]).mean() if long.any() else float('nan')
+        print(f"  {name:<26}{accuracy:>12.1%}{accuracy_long:>9.1%}{(predicted == baseline).mean():>9.1%}"
+              f"{classifier.tokens / len(texts):>13.0f}{len(texts) / seconds:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
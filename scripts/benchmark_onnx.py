@@ -0,0 +1,122 @@
+"""
+Parité et débit du classifieur exporté en ONNX (analysis/onnx_export.py) face à PyTorch
+
+Sur les articles étiquetés de train_data/*.json, classe les textes avec:
+- le modèle PyTorch float32 (backend 'torch')
+- l'export ONNX float32 (model.onnx) et sa quantification int8 (model.int8.onnx)
+et affiche pour chaque export: débit (articles/s) et accélération, accord des catégories
+avec PyTorch, écart des logits (max et moyen), exactitude par rapport aux étiquettes de
+chaque fichier.
+
+Usage:
+    python -m analysis.onnx_export
+    python scripts/benchmark_onnx.py
+    python scripts/benchmark_onnx.py --articles 500 --threads 4 --max-accuracy-loss 1
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import BASE_DIR, MODEL_CONFIG
+from analysis.classifier import NewsClassifier
+from analysis.onnx_export import read_metadata
+
+
+def load_labelled(train_dir: Path, count):
+    """
+    (source file, text, label) of the labelled articles, a random sample of `count` of them
+    """
+    items = []
+    for path in sorted(train_dir.glob('*.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            items.extend((path.name, item['text'], item['label']) for item in json.load(f)
+                         if item.get('text') and item.get('label'))
+    if count and count < len(items):
+        items = random.Random(0).sample(items, count)
+    return items
+
+
+def timed_logits(classifier: NewsClassifier, texts):
+    classifier.predict_logits(texts[:8])  # warm-up
+    start = time.perf_counter()
+    logits = classifier.predict_logits(texts)
+    return logits, time.perf_counter() - start
+
+
+def accuracies(items, logits, labels):
+    predicted = [labels[index] for index in logits.argmax(axis=1)]
+    by_file = {}
+    for (source, _, label), category in zip(items, predicted):
+        hits, total = by_file.get(source, (0, 0))
+        by_file[source] = (hits + (category == label), total + 1)
+    overall = sum(hits for hits, _ in by_file.values()) / len(items)
+    return overall, {source: hits / total for source, (hits, total) in sorted(by_file.items())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parité et débit du classifieur ONNX face à PyTorch")
+    parser.add_argument('--dir', default=str(Path(MODEL_CONFIG['onnx_model']).parent),
+                        help="Répertoire de l'export ONNX")
+    parser.add_argument('--train-dir', default=str(BASE_DIR / "train_data"), help='Articles étiquetés')
+    parser.add_argument('--articles', type=int, default=None, help="Échantillon d'articles (défaut: tous)")
+    parser.add_argument('--threads', type=int, default=MODEL_CONFIG['inference_threads'],
+                        help='Threads de calcul (défaut: tous les cœurs)')
+    parser.add_argument('--max-accuracy-loss', type=float, default=None,
+                        help="Échec (code 1) si l'exactitude du modèle int8 perd plus de ce nombre de points")
+    args = parser.parse_args()
+
+    directory = Path(args.dir)
+    metadata = read_metadata(directory)
+    items = load_labelled(Path(args.train_dir), args.articles)
+    if not items:
+        print(f"Aucun article étiqueté dans {args.train_dir}")
+        sys.exit(1)
+    texts = [text for _, text, _ in items]
+    labels = metadata['labels']
+
+    reference = NewsClassifier(model_name=metadata['source'], threads=args.threads, backend='torch',
+                               max_length=metadata['max_length'], labels=labels)
+    if reference.revision != metadata['source_revision']:
+        print(f"⚠ L'export ne correspond pas au modèle {metadata['source']} actuel: relancer python -m analysis.onnx_export")
+    print(f"{len(texts)} articles étiquetés, {metadata['source']}, {reference.threads} threads\n")
+
+    ref_logits, ref_seconds = timed_logits(reference, texts)
+    ref_accuracy, ref_by_file = accuracies(items, ref_logits, labels)
+    results = {'torch float32': (ref_seconds, ref_accuracy, ref_by_file, None)}
+
+    for name in metadata['files']:
+        classifier = NewsClassifier(backend='onnx', onnx_model=directory / name, threads=args.threads,
+                                    max_length=metadata['max_length'], labels=labels)
+        logits, seconds = timed_logits(classifier, texts)
+        drift = np.abs(logits - ref_logits)
+        agreement = float((logits.argmax(axis=1) == ref_logits.argmax(axis=1)).mean())
+        accuracy, by_file = accuracies(items, logits, labels)
+        results[f"onnx {name}"] = (seconds, accuracy, by_file, (agreement, float(drift.max()), float(drift.mean())))
+
+    print(f"  {'':<24}{'articles/s':>12}{'accél.':>9}{'exactitude':>12}{'accord':>9}{'écart max':>11}{'écart moyen':>13}")
+    for name, (seconds, accuracy, _, parity) in results.items():
+        agreement, drift_max, drift_mean = parity or (1.0, 0.0, 0.0)
+        print(f"  {name:<24}{len(texts) / seconds:>12.1f}{ref_seconds / seconds:>8.1f}x{accuracy:>12.1%}"
+              f"{agreement:>9.1%}{drift_max:>11.4f}{drift_mean:>13.4f}")
+
+    print("\nExactitude par fichier:")
+    for source in ref_by_file:
+        print(f"  {source:<44}" + "".join(f"{by_file[source]:>9.1%}" for _, _, by_file, _ in results.values()))
+
+    quantized = results.get('onnx model.int8.onnx')
+    if args.max_accuracy_loss is not None and quantized is not None:
+        loss = (ref_accuracy - quantized[1]) * 100
+        if loss > args.max_accuracy_loss:
+            print(f"\n✗ Le modèle int8 perd {loss:.1f} points d'exactitude (maximum {args.max_accuracy_loss})")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
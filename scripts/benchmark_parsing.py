@@ -0,0 +1,254 @@
+"""
+Benchmark hors ligne du parsing des scrapers
+
+Rejoue les pages enregistrées par `python main.py --scrape --record` (data/fixtures/<spider>.jsonl.gz)
+dans parse_article_list / parse_article / extract_comments de chaque scraper, sans accès réseau, et
+mesure pour chaque callback:
+- pages/s et items/s (meilleure passe sur --rounds)
+- mémoire allouée (pic tracemalloc d'une passe)
+- taux d'extraction de chaque champ (part des items où le champ n'est pas vide)
+
+Avec --baseline, les résultats sont comparés à une exécution précédente (--save) et le script
+se termine en erreur en cas de régression, pour servir de garde-fou avant un merge.
+
+Usage:
+    python scripts/benchmark_parsing.py
+    python scripts/benchmark_parsing.py --save baseline.json
+    python scripts/benchmark_parsing.py --baseline baseline.json --max-slowdown 0.2
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scrapy.http import HtmlResponse, Request
+
+from config.settings import RECORDER_CONFIG
+from scrapers.aib_scraper import AIBScraper
+from scrapers.burkina_24_scraper import Burkina24Scraper
+from scrapers.fasopresse_scraper import FasoPresseScraper
+from scrapers.lefaso_scraper import LefasoScraper
+from scrapers.lobservateur_scraper import LObservateurScraper
+from scrapers.recorder import archive_path, iter_recorded
+from scrapers.sidwaya_scraper import SidwayaScraper
+
+
+SCRAPERS = {
+    cls.name: cls
+    for cls in (LefasoScraper, FasoPresseScraper, SidwayaScraper, LObservateurScraper, AIBScraper, Burkina24Scraper)
+}
+
+# Champs des items qui ne dépendent pas de l'extraction
+IGNORED_FIELDS = {'id', 'media', 'url', 'engagement', 'article_metadata'}
+
+
+def load_records(path: Path):
+    """
+    Group the records of an archive by callback: {callback: [(url, body, meta), ...]}
+    """
+    records = {}
+    for record in iter_recorded(path):
+        records.setdefault(record['callback'], []).append(
+            (record['url'], record['body'].encode('utf-8'), record.get('meta', {}))
+        )
+    return records
+
+
+def build_responses(pages):
+    """
+    Fresh responses (not parsed yet), so that every pass pays for the HTML parsing
+    """
+    return [
+        HtmlResponse(url=url, body=body, encoding='utf-8', request=Request(url, meta=meta))
+        for url, body, meta in pages
+    ]
+
+
+def replay_listing(spider, response):
+    """
+    Article requests yielded by a listing page
+    """
+    outputs = list(spider.parse_article_list(response))
+    return [
+        output for output in outputs
+        if isinstance(output, Request) and output.callback == spider.parse_article
+    ]
+
+
+def replay_article(spider, response):
+    return [output for output in spider.parse_article(response) if isinstance(output, dict)]
+
+
+def replay_comments(spider, response):
+    return spider.extract_comments(response)
+
+
+def callbacks_of(spider, records):
+    """
+    (name, replay function, recorded pages) of the callbacks to benchmark for a spider
+    """
+    callbacks = []
+    if records.get('parse_article_list'):
+        callbacks.append(('parse_article_list', replay_listing, records['parse_article_list']))
+    if records.get('parse_article'):
+        callbacks.append(('parse_article', replay_article, records['parse_article']))
+        if hasattr(spider, 'extract_comments'):
+            callbacks.append(('extract_comments', replay_comments, records['parse_article']))
+    return callbacks
+
+
+def field_success(name, outputs_per_page):
+    """
+    Share of non-empty values of each field
+    Listings: pages with at least one article link; comments: pages with comments
+    """
+    if name == 'parse_article_list':
+        pages = len(outputs_per_page)
+        return {'links': sum(1 for outputs in outputs_per_page if outputs) / pages if pages else 0.0}
+    if name == 'extract_comments':
+        pages = len(outputs_per_page)
+        return {'comments': sum(1 for outputs in outputs_per_page if outputs) / pages if pages else 0.0}
+
+    filled = Counter()
+    items = 0
+    for outputs in outputs_per_page:
+        for item in outputs:
+            items += 1
+            for field, value in item.items():
+                if field not in IGNORED_FIELDS:
+                    filled[field] += 1 if value else 0
+    return {field: count / items for field, count in sorted(filled.items())} if items else {}
+
+
+def benchmark(spider, name, replay, pages, rounds: int):
+    """
+    Throughput (best of `rounds` passes), peak allocated memory and field success of a callback
+    """
+    best = None
+    outputs_per_page = []
+    for _ in range(rounds):
+        responses = build_responses(pages)
+        start = time.perf_counter()
+        outputs_per_page = [replay(spider, response) for response in responses]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Separate pass: tracemalloc slows down the code it traces
+    responses = build_responses(pages)
+    tracemalloc.start()
+    for response in responses:
+        replay(spider, response)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    items = sum(len(outputs) for outputs in outputs_per_page)
+    return {
+        'pages': len(pages),
+        'items': items,
+        'pages_per_sec': len(pages) / best if best else 0.0,
+        'items_per_sec': items / best if best else 0.0,
+        'peak_mib': peak / (1024 * 1024),
+        'fields': field_success(name, outputs_per_page),
+    }
+
+
+def compare(results, baseline, max_slowdown: float, max_memory_growth: float, max_field_drop: float):
+    """
+    Regressions of the current results against a baseline
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+
+        if current['pages_per_sec'] < previous['pages_per_sec'] * (1 - max_slowdown):
+            regressions.append(
+                f"{key}: {current['pages_per_sec']:.0f} pages/s (référence {previous['pages_per_sec']:.0f})"
+            )
+        if current['peak_mib'] > previous['peak_mib'] * (1 + max_memory_growth):
+            regressions.append(
+                f"{key}: {current['peak_mib']:.1f} Mio alloués (référence {previous['peak_mib']:.1f})"
+            )
+        for field, rate in previous['fields'].items():
+            if current['fields'].get(field, 0.0) < rate - max_field_drop:
+                regressions.append(
+                    f"{key}: champ '{field}' extrait à {current['fields'].get(field, 0.0):.0%} "
+                    f"(référence {rate:.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne du parsing des scrapers")
+    parser.add_argument('--fixtures', default=str(RECORDER_CONFIG['dir']),
+                        help='Répertoire des archives <spider>.jsonl.gz (défaut: data/fixtures)')
+    parser.add_argument('--spider', choices=sorted(SCRAPERS), action='append', help='Limiter à certains scrapers')
+    parser.add_argument('--rounds', type=int, default=5, help='Nombre de passes par mesure')
+    parser.add_argument('--save', help='Enregistrer les résultats (JSON) pour servir de référence')
+    parser.add_argument('--baseline', help='Résultats de référence (JSON) à ne pas dégrader')
+    parser.add_argument('--max-slowdown', type=float, default=0.25,
+                        help='Baisse de débit tolérée par rapport à la référence (défaut: 0.25)')
+    parser.add_argument('--max-memory-growth', type=float, default=0.25,
+                        help='Hausse de mémoire allouée tolérée (défaut: 0.25)')
+    parser.add_argument('--max-field-drop', type=float, default=0.01,
+                        help="Baisse tolérée du taux d'extraction d'un champ (défaut: 0.01)")
+    args = parser.parse_args()
+
+    # Logs of the callbacks (one line per page) would dominate the measures
+    logging.disable(logging.INFO)
+
+    results = {}
+    print(f"{'Callback':<40}{'Pages':>7}{'Items':>7}{'Pages/s':>10}{'Items/s':>10}{'Mio':>7}  Champs")
+    print("-" * 100)
+
+    for spider_name in args.spider or SCRAPERS:
+        path = archive_path(spider_name, args.fixtures)
+        if not path.exists():
+            print(f"{spider_name}: pas d'archive ({path}), lancer python main.py --scrape --record")
+            continue
+
+        spider = SCRAPERS[spider_name]()
+        records = load_records(path)
+        for name, replay, pages in callbacks_of(spider, records):
+            key = f"{spider_name}.{name}"
+            result = benchmark(spider, name, replay, pages, args.rounds)
+            results[key] = result
+
+            fields = ' '.join(f"{field}={rate:.0%}" for field, rate in result['fields'].items())
+            print(
+                f"{key:<40}{result['pages']:>7}{result['items']:>7}{result['pages_per_sec']:>10.0f}"
+                f"{result['items_per_sec']:>10.0f}{result['peak_mib']:>7.1f}  {fields}"
+            )
+
+    if not results:
+        print("\nAucune page enregistrée.")
+        sys.exit(1)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"\nRésultats enregistrés dans {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(
+            results, baseline, args.max_slowdown, args.max_memory_growth, args.max_field_drop
+        )
+        if regressions:
+            print(f"\n{len(regressions)} régression(s) par rapport à {args.baseline}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print(f"\nAucune régression par rapport à {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
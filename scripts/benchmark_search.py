@@ -0,0 +1,112 @@
+"""
+Benchmark de la recherche plein texte (index FTS5 de la base SQLite)
+
+Remplit une base temporaire avec N articles (les articles de data/raw recopiés sous
+d'autres identifiants jusqu'à N), puis mesure le temps d'une page de résultats
+(comptage + 10 premiers résultats avec extraits) pour quelques recherches types.
+
+Usage:
+    python scripts/benchmark_search.py
+    python scripts/benchmark_search.py --articles 1000000 --max-ms 100 --db /tmp/search.db
+"""
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import RAW_DATA_DIR, SEARCH_CONFIG
+from database.db_manager import DatabaseManager
+from database.ingest import ArticleIngest
+from utils.helpers import iter_raw_files, iter_json_records
+
+QUERIES = [
+    'sécurité',
+    'securite ouagadougou',
+    '"forces armées"',
+    'secur*',
+    'gouvernement transition',
+    'santé',
+]
+
+
+def load_corpus(raw_dir: Path):
+    with ArticleIngest(quarantine_dir=None) as ingest:
+        return [article for path in iter_raw_files(raw_dir) for article in ingest.convert(iter_json_records(path))]
+
+
+def fill_database(db: DatabaseManager, corpus, count: int, batch_size: int = 5000):
+    """
+    Insert `count` articles: copies of the corpus with new ids and URLs
+    """
+    batch = []
+    for i in range(count):
+        article = dict(corpus[i % len(corpus)])
+        copy = i // len(corpus)
+        if copy:
+            article['id'] = f"{article['id']}-{copy}"
+            article['url'] = f"{article['url']}#{copy}"
+        batch.append(article)
+        if len(batch) == batch_size:
+            db.bulk_add_articles(batch)
+            batch = []
+    if batch:
+        db.bulk_add_articles(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la recherche plein texte")
+    parser.add_argument('--raw', default=str(RAW_DATA_DIR), help='Répertoire des fichiers bruts (défaut: data/raw)')
+    parser.add_argument('--articles', type=int, default=100000, help="Nombre d'articles indexés")
+    parser.add_argument('--db', default=None,
+                        help='Base à conserver entre deux mesures (remplie seulement si elle est vide)')
+    parser.add_argument('--rounds', type=int, default=5, help='Répétitions de chaque recherche')
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='Échec (code 1) si une recherche dépasse ce temps médian')
+    args = parser.parse_args()
+
+    corpus = load_corpus(Path(args.raw))
+    if not corpus:
+        print(f"Aucun article dans {args.raw}")
+        sys.exit(1)
+
+    per_page = SEARCH_CONFIG['results_per_page']
+    slow = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(args.db) if args.db else Path(tmp) / "search.db"
+        with DatabaseManager(db_path) as db:
+            indexed = db.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            if indexed < args.articles:
+                start = time.perf_counter()
+                fill_database(db, corpus, args.articles)
+                elapsed = time.perf_counter() - start
+                print(f"{args.articles} articles indexés en {elapsed:.1f}s "
+                      f"({args.articles / elapsed:.0f} articles/s)")
+            size = sum(f.stat().st_size for f in db_path.parent.glob(db_path.name + '*')) / 1e6
+            print(f"Base: {max(indexed, args.articles)} articles, {size:.0f} Mo\n")
+
+            print(f"{'Recherche':<28}{'Résultats':>11}{'Médiane (ms)':>14}{'Max (ms)':>10}")
+            print("-" * 63)
+            for query in QUERIES:
+                timings = []
+                for _ in range(args.rounds):
+                    start = time.perf_counter()
+                    total = db.count_matches(query)
+                    db.search(query, limit=per_page)
+                    timings.append((time.perf_counter() - start) * 1000)
+                median = statistics.median(timings)
+                print(f"{query:<28}{total:>11}{median:>14.1f}{max(timings):>10.1f}")
+                if args.max_ms is not None and median > args.max_ms:
+                    slow.append(query)
+
+    if slow:
+        print(f"\n✗ Au-dessus de {args.max_ms} ms: {', '.join(slow)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark du démarrage du dashboard: fichier JSON, dataset Parquet, instantané Arrow
+
+Construit un dataset Parquet temporaire de N articles (articles d'un export d'analyse
+recopiés sous d'autres identifiants), son instantané (database/snapshot.py) et le même
+export en JSON, puis mesure pour chaque source le temps jusqu'aux premiers chiffres de la
+page d'accueil: chargement (DataLoader) + statistiques globales + courbe des 30 derniers jours.
+
+Usage:
+    python scripts/benchmark_snapshot.py
+    python scripts/benchmark_snapshot.py --articles 500000 --max-seconds 1
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import PROCESSED_DATA_DIR
+from dashboard.data_loader import DataLoader
+from database.ingest import ArticleIngest
+from database.parquet_store import ParquetArticleStore
+from database.snapshot import write_snapshot
+from utils.json_stream import iter_json, write_json_object
+
+
+def copies(articles, count: int):
+    for i in range(count):
+        article = dict(articles[i % len(articles)])
+        article['id'] = f"{article['id']}-{i}"
+        yield article
+
+
+def first_render(loader: DataLoader, load) -> float:
+    start = time.perf_counter()
+    load()
+    loader.get_global_stats()
+    loader.get_timeline_data(days=30)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage du dashboard")
+    parser.add_argument('--source', default=str(PROCESSED_DATA_DIR / "database2.json"),
+                        help="Export d'analyse dont les articles sont recopiés")
+    parser.add_argument('--articles', type=int, default=100000, help="Nombre d'articles")
+    parser.add_argument('--rounds', type=int, default=3, help='Mesures par source (la meilleure est gardée)')
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help="Échec (code 1) si le démarrage depuis l'instantané dépasse ce temps")
+    args = parser.parse_args()
+
+    records = list(iter_json(Path(args.source), key='articles'))
+    if not records:
+        print(f"Aucun article dans {args.source}")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        write_json_object(tmp / "export.json", [('articles', copies(records, args.articles)), ('medias', [])])
+
+        store = ParquetArticleStore(tmp / "articles")
+        with ArticleIngest(quarantine_dir=None) as ingest:
+            store.write(ingest.convert(copies(records, args.articles)))
+        start = time.perf_counter()
+        write_snapshot(store)
+        print(f"{args.articles} articles, instantané écrit en {time.perf_counter() - start:.1f}s\n")
+
+        sources = {
+            'JSON (load_data)': lambda loader: loader.load_data("export.json"),
+            'Parquet (load_store)': lambda loader: loader.load_store(),
+            'Arrow (load_snapshot)': lambda loader: loader.load_snapshot(),
+        }
+        results = {}
+        for name, load in sources.items():
+            best = float('inf')
+            for _ in range(args.rounds):
+                loader = DataLoader(data_dir=str(tmp), store_dir=str(store.directory))
+                best = min(best, first_render(loader, lambda: load(loader)))
+            results[name] = best
+            print(f"  {name:<24}{best:>8.3f}s")
+
+    if args.max_seconds is not None and results['Arrow (load_snapshot)'] > args.max_seconds:
+        print(f"\n✗ Démarrage depuis l'instantané au-delà de {args.max_seconds}s")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark du stockage froid des textes (database/cold_store.py)
+
+Sur les articles de data/raw:
+- taux de compression zstd des textes (corps et commentaires) sans dictionnaire et avec un
+  dictionnaire entraîné sur 80% des textes, mesuré sur les 20% restants
+- temps de lecture d'un article par id (get_article) avant et après archivage (p50, p99)
+- taille de la base (table articles et index plein texte) avant et après archivage, et du stockage froid
+- recherche: mêmes résultats et mêmes extraits avant et après archivage
+
+Usage:
+    python scripts/benchmark_tiering.py
+    python scripts/benchmark_tiering.py --level 19 --reads 5000
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import zstandard
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import RAW_DATA_DIR, TIERING_CONFIG
+from database.db_manager import DatabaseManager
+from database.ingest import ArticleIngest
+from utils.helpers import iter_raw_files, iter_json_records
+
+QUERIES = ['sécurité', '"forces armées"', 'secur*', 'gouvernement transition', 'santé']
+
+
+def load_corpus(raw_dir: Path):
+    with ArticleIngest(quarantine_dir=None) as ingest:
+        return [article for path in iter_raw_files(raw_dir) for article in ingest.convert(iter_json_records(path))]
+
+
+def compression_ratios(texts, level: int, dictionary_size: int):
+    """
+    (ratio without dictionary, ratio with a dictionary trained on the other texts)
+    """
+    random.Random(0).shuffle(texts)
+    split = len(texts) * 4 // 5
+    train, test = texts[:split], [text.encode('utf-8') for text in texts[split:]]
+    size = sum(len(text) for text in test)
+
+    plain = zstandard.ZstdCompressor(level=level)
+    dictionary = zstandard.train_dictionary(dictionary_size, [text.encode('utf-8') for text in train])
+    trained = zstandard.ZstdCompressor(level=level, dict_data=dictionary)
+    return (size / sum(len(plain.compress(text)) for text in test),
+            size / sum(len(trained.compress(text)) for text in test))
+
+
+def read_latencies(db: DatabaseManager, ids, rounds: int = 1):
+    times = []
+    for _ in range(rounds):
+        for article_id in ids:
+            start = time.perf_counter()
+            db.get_article(article_id)
+            times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.99)]
+
+
+def database_size(conn) -> int:
+    """
+    Size of the pages in use (the file itself lags behind with WAL and keeps the free pages)
+    """
+    pages = conn.execute("PRAGMA page_count").fetchone()[0] - conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return pages * conn.execute("PRAGMA page_size").fetchone()[0]
+
+
+def table_size(conn, pattern: str) -> int:
+    return conn.execute("SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name LIKE ?", (pattern,)).fetchone()[0]
+
+
+def search_results(db: DatabaseManager):
+    return {query: [(hit.id, hit.extrait) for hit in db.search(query)] for query in QUERIES}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du stockage froid des textes")
+    parser.add_argument('--raw', default=str(RAW_DATA_DIR), help='Répertoire des fichiers bruts (défaut: data/raw)')
+    parser.add_argument('--level', type=int, default=TIERING_CONFIG['zstd_level'], help='Niveau de compression zstd')
+    parser.add_argument('--reads', type=int, default=2000, help="Lectures d'articles mesurées")
+    args = parser.parse_args()
+
+    corpus = load_corpus(Path(args.raw))
+    texts = [article['contenu'] for article in corpus if article['contenu']]
+    if len(texts) < 100:
+        print(f"Pas assez d'articles dans {args.raw} ({len(texts)})")
+        sys.exit(1)
+
+    plain, trained = compression_ratios(texts, args.level, TIERING_CONFIG['dictionary_size'])
+    print(f"Compression zstd niveau {args.level} ({len(texts)} textes, 20% mesurés)")
+    print(f"  sans dictionnaire:       ratio {plain:.2f}")
+    print(f"  avec dictionnaire:       ratio {trained:.2f}\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "tiering.db"
+        with DatabaseManager(db_path) as db:
+            db.bulk_add_articles(corpus)
+            hot_size = database_size(db.conn)
+            hot_table = table_size(db.conn, 'articles')
+            ids = [row['id'] for row in db.conn.execute("SELECT id FROM articles")]
+            sample = [random.choice(ids) for _ in range(args.reads)]
+            before = search_results(db)
+            hot = read_latencies(db, sample)
+
+            start = time.perf_counter()
+            report = db.tier_articles(max_age_days=0)
+            elapsed = time.perf_counter() - start
+            # VACUUM renumbers the rowids: the search index is rebuilt after it
+            db.conn.execute("VACUUM")
+            db.rebuild_search_index()
+            cold = read_latencies(db, sample)
+            after = search_results(db)
+            cold_size = database_size(db.cold_store().conn)
+            tiered_size = database_size(db.conn)
+            tiered_table = table_size(db.conn, 'articles')
+            fts_size = table_size(db.conn, 'articles_fts_%')
+
+        print(f"Archivage: {report['articles']} articles en {elapsed:.1f}s, "
+              f"textes {report['size'] / 1e6:.1f} Mo -> {report['compressed'] / 1e6:.1f} Mo "
+              f"(ratio {report['size'] / max(report['compressed'], 1):.2f})")
+        print(f"  base avant:              {hot_size / 1e6:.1f} Mo (table articles {hot_table / 1e6:.1f} Mo)")
+        print(f"  base après:              {tiered_size / 1e6:.1f} Mo (table articles {tiered_table / 1e6:.1f} Mo)")
+        print(f"  dont index plein texte:  {fts_size / 1e6:.1f} Mo (termes seuls, sans copie des textes)")
+        print(f"  stockage froid:          {cold_size / 1e6:.1f} Mo\n")
+
+        print(f"Lecture d'un article par id ({args.reads} lectures)")
+        print(f"  chaud:  p50 {hot[0]:.3f} ms   p99 {hot[1]:.3f} ms")
+        print(f"  froid:  p50 {cold[0]:.3f} ms   p99 {cold[1]:.3f} ms\n")
+
+        same = before == after
+        print(f"Recherche identique avant/après archivage: {'oui' if same else 'NON'}")
+        if not same:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
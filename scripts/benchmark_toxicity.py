@@ -0,0 +1,118 @@
+"""
+Benchmark de l'évaluation de la toxicité: appels texte par texte / lots dédoublonnés
+
+Sur les articles des fichiers bruts (corps, commentaires et réponses), compare:
+- toxicity_analysis() et analyse_comments() du notebook d'analyse: un appel de
+  Detoxify.predict par texte, en parcourant les réponses récursivement
+- score_articles (analysis/toxicity.py): textes de tous les articles à plat, dédoublonnés
+  sur le texte normalisé, évalués par lots de longueurs voisines
+et vérifie que les deux donnent les mêmes textes sensibles.
+
+Usage:
+    python scripts/benchmark_toxicity.py
+    python scripts/benchmark_toxicity.py --raw data/raw --articles 200 --threads 4
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.settings import MODEL_CONFIG, RAW_DATA_DIR
+from analysis.toxicity import ToxicityScorer, score_articles
+from database.comments import comment_rows
+from database.ingest import ArticleIngest
+from utils.helpers import iter_raw_files, iter_json_records
+
+
+def load_articles(raw_dir: Path, count: int):
+    """
+    Articles with their comments and replies flattened in thread order
+    """
+    articles = []
+    with ArticleIngest(quarantine_dir=None) as ingest:
+        for path in iter_raw_files(raw_dir):
+            for article in ingest.convert(iter_json_records(path)):
+                articles.append({
+                    'id': article['id'],
+                    'texte': article['contenu'],
+                    'comments': [{'id': row['id'], 'texte': row['texte']}
+                                 for row in comment_rows(article['id'], article['comments'] or [])],
+                })
+                if len(articles) == count:
+                    return articles
+    return articles
+
+
+def predict_one(scorer: ToxicityScorer, text: str):
+    """
+    Detoxify.predict on one text, as toxicity_analysis() of the notebook
+    """
+    torch = scorer.torch
+    inputs = scorer.tokenizer(text, return_tensors="pt", truncation=True, padding=True,
+                              max_length=scorer.max_length)
+    with torch.no_grad():
+        scores = torch.sigmoid(scorer.model(**inputs).logits)[0].numpy()
+    return float(scores[scorer.toxicity_index]), bool((scores[scorer.sensitive_indices] >= scorer.threshold).any())
+
+
+def score_one_by_one(scorer: ToxicityScorer, articles):
+    results = {}
+    for article in articles:
+        results[article['id']] = predict_one(scorer, article['texte'])
+        for comment in article['comments']:
+            results[comment['id']] = predict_one(scorer, comment['texte'])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'évaluation de la toxicité")
+    parser.add_argument('--raw', default=str(RAW_DATA_DIR), help='Répertoire des fichiers bruts (défaut: data/raw)')
+    parser.add_argument('--articles', type=int, default=200, help="Nombre d'articles")
+    parser.add_argument('--threads', type=int, default=MODEL_CONFIG['inference_threads'],
+                        help='Threads de calcul (défaut: tous les cœurs)')
+    parser.add_argument('--checkpoint', default=None, help='Checkpoint Detoxify local (défaut: téléchargé)')
+    parser.add_argument('--config-path', default=None, help='Configuration et tokenizer du checkpoint local')
+    args = parser.parse_args()
+
+    articles = load_articles(Path(args.raw), args.articles)
+    comments = sum(len(article['comments']) for article in articles)
+    if not comments:
+        print(f"Aucun commentaire dans les articles de {args.raw}")
+        sys.exit(1)
+
+    scorer = ToxicityScorer(threads=args.threads, checkpoint=args.checkpoint,
+                            huggingface_config_path=args.config_path)
+    texts = len(articles) + comments
+    print(f"{len(articles)} articles, {comments} commentaires et réponses, {scorer.threads} threads\n")
+
+    # Warm-up (allocations, first kernels)
+    score_articles(articles[:2], scorer)
+    score_one_by_one(scorer, articles[:2])
+    scorer.texts = scorer.unique = scorer.inferred = 0
+
+    start = time.perf_counter()
+    expected = score_one_by_one(scorer, articles)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = score_articles(articles, scorer)
+    batched = time.perf_counter() - start
+
+    print(f"  texte par texte:        {single:>8.2f}s  {texts / single:>8.1f} textes/s")
+    print(f"  lots dédoublonnés:      {batched:>8.2f}s  {texts / batched:>8.1f} textes/s")
+    print(f"  accélération:           x{single / batched:.1f}")
+    print(f"  textes distincts:       {scorer.unique}/{scorer.texts} ({scorer.dedup_ratio:.0%} d'inférences évitées)")
+
+    scores = {}
+    for article_id, result in results.items():
+        scores[article_id] = (result['toxicite_score'], result['sensible'])
+        scores.update(result['comments'])
+    drift = max(abs(scores[key][0] - score) for key, (score, _) in expected.items())
+    same = sum(scores[key][1] == sensible for key, (_, sensible) in expected.items())
+    print(f"\nTextes sensibles identiques: {same}/{len(expected)}, écart de score max {drift:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,18 @@ Script pour mettre à jour les dates des articles Lefaso.net
 en les récupérant directement depuis leurs URLs
 """
 
-import json
 import requests
 from bs4 import BeautifulSoup
 import time
 from datetime import datetime
 import re
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.json_stream import iter_json, iter_json_members, write_json_object
+
 def extract_date_from_lefaso_article(url):
     """
     Extrait la date de publication d'un article Lefaso.net
@@ -98,63 +102,73 @@ def update_lefaso_dates(input_file, output_file=None):
         input_file: Chemin vers le fichier JSON source
         output_file: Chemin vers le fichier JSON de sortie (si None, écrase l'original)
     """
-    # Charger le fichier
-    print(f"📖 Chargement du fichier {input_file}...")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    articles = data.get('articles', [])
-
-    # Filtrer les articles Lefaso.net
-    lefaso_articles = [a for a in articles if a.get('media') == 'Lefaso.net']
-    print(f"✅ {len(lefaso_articles)} articles Lefaso.net trouvés sur {len(articles)} articles au total")
+    # Compter les articles Lefaso.net (lecture en flux, le fichier n'est pas chargé en entier)
+    print(f"📖 Lecture du fichier {input_file}...")
+    total = 0
+    nb_lefaso = 0
+    for article in iter_json(input_file, key='articles'):
+        total += 1
+        nb_lefaso += article.get('media') == 'Lefaso.net'
+    print(f"✅ {nb_lefaso} articles Lefaso.net trouvés sur {total} articles au total")
 
     # Mettre à jour les dates
-    updated_count = 0
-    failed_count = 0
+    counts = {'lefaso': 0, 'updated': 0, 'failed': 0}
+
+    def update_articles(articles):
+        """
+        Articles du fichier, dates Lefaso.net mises à jour au passage
+        """
+        for article in articles:
+            if article.get('media') != 'Lefaso.net':
+                yield article
+                continue
+
+            counts['lefaso'] += 1
+            url = article.get('url', '')
+            titre = article.get('titre', 'N/A')[:60]
+
+            print(f"[{counts['lefaso']}/{nb_lefaso}] {titre}...")
+            print(f"   URL: {url}")
+
+            if not url:
+                print(f"   ⚠️  Pas d'URL disponible")
+                counts['failed'] += 1
+            else:
+                # Extraire la date
+                new_date = extract_date_from_lefaso_article(url)
+
+                if new_date:
+                    old_date = article.get('date', 'N/A')
+                    article['date'] = new_date
+                    print(f"   ✅ Date mise à jour: {old_date} → {new_date}")
+                    counts['updated'] += 1
+                else:
+                    print(f"   ❌ Échec de la mise à jour")
+                    counts['failed'] += 1
+
+            print()
+            yield article
 
     print("\n🔄 Mise à jour des dates en cours...\n")
 
-    for i, article in enumerate(lefaso_articles, 1):
-        url = article.get('url', '')
-        article_id = article.get('id', 'N/A')
-        titre = article.get('titre', 'N/A')[:60]
-
-        print(f"[{i}/{len(lefaso_articles)}] {titre}...")
-        print(f"   URL: {url}")
-
-        if not url:
-            print(f"   ⚠️  Pas d'URL disponible")
-            failed_count += 1
-            continue
-
-        # Extraire la date
-        new_date = extract_date_from_lefaso_article(url)
-
-        if new_date:
-            old_date = article.get('date', 'N/A')
-            article['date'] = new_date
-            print(f"   ✅ Date mise à jour: {old_date} → {new_date}")
-            updated_count += 1
-        else:
-            print(f"   ❌ Échec de la mise à jour")
-            failed_count += 1
-
-        print()
-
-    # Sauvegarder le fichier
+    # Les articles sont réécrits au fil de la lecture (fichier temporaire renommé à la fin)
     output_path = output_file if output_file else input_file
-    print(f"\n💾 Sauvegarde des modifications dans {output_path}...")
+    members = (
+        (name, update_articles(value) if name == 'articles' else value)
+        for name, value in iter_json_members(input_file)
+    )
+    write_json_object(output_path, members)
+    print(f"\n💾 Modifications sauvegardées dans {output_path}")
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    updated_count = counts['updated']
+    failed_count = counts['failed']
 
     print(f"\n✅ Terminé!")
     print(f"   📊 Statistiques:")
-    print(f"      - Articles Lefaso.net: {len(lefaso_articles)}")
+    print(f"      - Articles Lefaso.net: {nb_lefaso}")
     print(f"      - Dates mises à jour: {updated_count}")
     print(f"      - Échecs: {failed_count}")
-    print(f"      - Taux de succès: {(updated_count/len(lefaso_articles)*100):.1f}%")
+    print(f"      - Taux de succès: {(updated_count/nb_lefaso*100):.1f}%")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,215 @@
+"""
+Shared fixtures: a local stand-in WordPress server and a minimal synchronous crawl driver
+"""
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import scrapy
+from scrapy.responsetypes import responsetypes
+from scrapy.spidermiddlewares.httperror import HttpError
+from scrapy.utils.test import get_crawler
+from twisted.python.failure import Failure
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import INCREMENTAL_CONFIG
+from database.db_manager import DatabaseManager
+from database.ingest import convert_article
+from scrapers.aib_scraper import AIBScraper
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Discovery window of the tests: all the recorded posts and sitemaps but the last post are newer
+CUTOFF = datetime(2024, 5, 15)
+
+
+class WordPressHandler(BaseHTTPRequestHandler):
+    """
+    Serve the recorded wp/v2 JSON pages of fixtures/wp_api (<endpoint>_<page>.json)
+    and, when enabled, the WordPress core sitemaps of fixtures/sitemaps
+    """
+
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        server.requests.append((url.path, query))
+
+        sitemap = FIXTURES_DIR / "sitemaps" / url.path.lstrip('/')
+        if server.sitemaps and url.path.endswith('.xml') and sitemap.is_file():
+            body = sitemap.read_text(encoding='utf-8').replace('{base}', server.url)
+            return self.reply(200, 'application/xml', body.encode())
+        if not url.path.startswith('/wp-json/wp/v2/'):
+            return self.reply(404, 'text/html', b'<html><body>Page introuvable</body></html>')
+        if server.api_status != 200:
+            error = {'code': 'rest_forbidden', 'message': 'Sorry, you are not allowed to do that.',
+                     'data': {'status': server.api_status}}
+            return self.reply(server.api_status, 'application/json', json.dumps(error).encode())
+        if server.api_html:
+            return self.reply(200, 'text/html', b'<html><body><h1>Checking your browser</h1></body></html>')
+
+        endpoint = url.path.rsplit('/', 1)[-1]
+        pages = sorted(server.fixtures.glob(f"{endpoint}_*.json"))
+        page = int(query.get('page', 1))
+        broken = server.broken_pages.get((endpoint, page))
+        if broken == 'html':
+            return self.reply(200, 'text/html', b'<html><body>Erreur</body></html>')
+        if broken:
+            return self.reply(broken, 'text/html', b'<html><body>Erreur</body></html>')
+        if not 1 <= page <= len(pages):
+            error = {'code': 'rest_post_invalid_page_number', 'data': {'status': 400}}
+            return self.reply(400, 'application/json', json.dumps(error).encode())
+
+        items = json.loads(pages[page - 1].read_text(encoding='utf-8'))
+        if server.honour_modified_after and 'modified_after' in query:
+            items = [item for item in items if item['modified_gmt'] > query['modified_after']]
+        headers = {'X-WP-Total': str(len(items)), 'X-WP-TotalPages': str(len(pages))}
+        self.reply(200, 'application/json; charset=UTF-8', json.dumps(items).encode(), headers)
+
+    def reply(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def wp_server():
+    """
+    Stand-in WordPress site on localhost
+    Set api_status (401, 403, 404...) or api_html to break the REST API,
+    honour_modified_after=False to mimic WordPress versions ignoring the parameter,
+    sitemaps=True to serve wp-sitemap.xml,
+    broken_pages[(endpoint, page)] = status or 'html' to break a single API page
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), WordPressHandler)
+    server.fixtures = FIXTURES_DIR / "wp_api"
+    server.requests = []
+    server.api_status = 200
+    server.api_html = False
+    server.honour_modified_after = True
+    server.sitemaps = False
+    server.broken_pages = {}
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_spider(wp_server):
+    """
+    Build AIB spiders (WordPress media) pointed at the stand-in server, with the test window
+    Keyword arguments are the spider arguments (wp_api defaults to true)
+    """
+    def make(**kwargs):
+        kwargs.setdefault('wp_api', 'true')
+        spider = get_crawler(AIBScraper)._create_spider(**kwargs)
+        spider.base_url = wp_server.url
+        spider._discovery_cutoff = lambda: CUTOFF
+        return spider
+    return make
+
+
+@pytest.fixture(autouse=True)
+def seen_index_path(tmp_path, monkeypatch):
+    """
+    Keep the seen-article index of the spiders out of data/state
+    """
+    path = tmp_path / "seen_articles.db"
+    monkeypatch.setitem(INCREMENTAL_CONFIG, 'index_path', path)
+    return path
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Empty media-scan database (and cold tier) in tmp_path
+    """
+    with DatabaseManager(tmp_path / "media_scan.db") as manager:
+        yield manager
+
+
+def raw_article(**fields):
+    """
+    Raw article record, as written by the scrapers; keyword arguments replace its fields
+    """
+    record = {
+        'id': 'a1',
+        'media': "AIB Media",
+        'titre': "Conseil des ministres",
+        'url': "https://www.aib.media/conseil-des-ministres/",
+        'date': "2024-06-13 10:00:00",
+        'contenu': "Le Conseil des ministres s'est tenu à Ouagadougou.",
+        'engagement': {'commentaires': 0, 'replies': 0, 'likes': 0, 'partages': 0},
+        'comments': [],
+        'article_metadata': {'scraped_at': "2024-06-13T12:00:00"},
+    }
+    record.update(fields)
+    return record
+
+
+def typed_article(**fields):
+    return convert_article(raw_article(**fields))
+
+
+def fetch(request: scrapy.Request):
+    """
+    Download a request with urllib and build the Scrapy response
+    """
+    try:
+        with urllib.request.urlopen(request.url, timeout=10) as answer:
+            status, headers, body = answer.status, dict(answer.headers), answer.read()
+    except urllib.error.HTTPError as error:
+        status, headers, body = error.code, dict(error.headers), error.read()
+
+    cls = responsetypes.from_args(headers=headers, url=request.url, body=body)
+    return cls(url=request.url, status=status, headers=headers, body=body, request=request)
+
+
+def crawl(spider, max_requests: int = 100):
+    """
+    Run a spider synchronously: requests are downloaded one at a time, HTTP errors go to
+    the errbacks as HttpError failures, as with Scrapy's HttpErrorMiddleware
+    Returns the items and the requests made
+    """
+    queue = list(spider.start_requests())
+    items, requests = [], []
+    while queue:
+        request = queue.pop(0)
+        requests.append(request)
+        assert len(requests) <= max_requests, "crawl did not stop"
+
+        response = fetch(request)
+        if response.status >= 400:
+            failure = Failure(HttpError(response, 'Ignoring non-200 response'))
+            failure.request = request
+            results = request.errback(failure)
+        else:
+            results = request.callback(response)
+
+        for result in results or []:
+            if isinstance(result, scrapy.Request):
+                queue.append(result)
+            else:
+                items.append(result)
+
+    spider.closed('finished')
+    return items, requests
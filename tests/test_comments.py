@@ -0,0 +1,112 @@
+"""
+Comments table and comment refresh deltas (database/comments.py, DatabaseManager.add_comment_deltas)
+"""
+import json
+
+from conftest import typed_article
+from database.db_manager import ROLLUP_SELECT
+from scrapers.comments import comment_key
+
+THREAD = [
+    {'key': 'c1', 'date': "12 juin 2024 à 10:15", 'text': "Premier commentaire",
+     'replies': [{'key': 'r1', 'date': "12 juin 2024 à 11:00", 'text': "Première réponse"}]},
+    {'key': 'c2', 'date': "12 juin 2024 à 12:00", 'text': "Deuxième commentaire", 'replies': []},
+]
+
+
+def delta(*comments, refreshed_at="2024-06-15T08:00:00"):
+    return {'article_id': 'a1', 'new_comments': list(comments), 'refreshed_at': refreshed_at}
+
+
+def comment(key, text, parent_key=None):
+    return {'key': key, 'parent_key': parent_key, 'date': "14 juin 2024 à 09:00", 'text': text}
+
+
+def thread_order(db):
+    return [(row.id, row.parent_id) for row in db.get_comments('a1')]
+
+
+def rollups(db):
+    return sorted(tuple(row) for row in db.conn.execute("SELECT * FROM media_daily"))
+
+
+def expected_rollups(db):
+    return sorted(tuple(row) for row in db.conn.execute(ROLLUP_SELECT))
+
+
+def test_delta_joins_the_thread_of_its_article(db):
+    db.bulk_add_articles([typed_article(comments=THREAD, engagement={'commentaires': 2, 'replies': 1})])
+
+    added = db.add_comment_deltas([delta(
+        comment('r2', "Réponse tardive à la sécurité", parent_key='c1'),
+        comment('c3', "Troisième commentaire"),
+        comment('r3', "Réponse au troisième", parent_key='c3'),
+    )])
+
+    assert added == 3
+    assert thread_order(db) == [
+        ('c1', None), ('r1', 'c1'), ('r2', 'c1'), ('c2', None), ('c3', None), ('r3', 'c3'),
+    ]
+    assert [row.position for row in db.get_comments('a1')] == list(range(6))
+
+    row = db.conn.execute("SELECT * FROM articles WHERE id = 'a1'").fetchone()
+    assert (row['nb_commentaires'], row['nb_replies'], row['engagement_total']) == (3, 3, 6)
+    assert row['scraped_at'] == "2024-06-15T08:00:00"
+    thread = json.loads(row['comments'])
+    assert [item['text'] for item in thread[0]['replies']] == ["Première réponse", "Réponse tardive à la sécurité"]
+
+    assert [hit.id for hit in db.search('securite')] == ['a1']
+    assert rollups(db) == expected_rollups(db)
+
+
+def test_delta_imported_twice_adds_nothing(db):
+    db.bulk_add_articles([typed_article(comments=THREAD)])
+    deltas = [delta(comment('c3', "Troisième commentaire"))]
+
+    assert db.add_comment_deltas(deltas) == 1
+    assert db.add_comment_deltas(deltas) == 0
+    assert len(db.get_comments('a1')) == 4
+    assert rollups(db) == expected_rollups(db)
+
+
+def test_delta_recognizes_comments_stored_without_key(db):
+    legacy = [{'date': item['date'], 'text': item['text']} for item in THREAD]
+    db.bulk_add_articles([typed_article(comments=legacy)])
+    key = comment_key('a1', THREAD[0]['date'], THREAD[0]['text'])
+
+    assert db.add_comment_deltas([delta(comment(key, THREAD[0]['text']), comment('r2', "Réponse", key))]) == 1
+    assert [parent for _, parent in thread_order(db)] == [None, key, None]
+    assert thread_order(db)[1] == ('r2', key)
+
+
+def test_delta_on_a_tiered_article(db):
+    db.bulk_add_articles([typed_article(comments=THREAD)])
+    db.tier_articles(max_age_days=0)
+
+    db.add_comment_deltas([delta(comment('c3', "Commentaire sur la sécurité"))])
+
+    article = db.get_article('a1')
+    assert article.contenu.startswith("Le Conseil des ministres")
+    assert [item['key'] for item in json.loads(article.comments)] == ['c1', 'c2', 'c3']
+    # Body still in the cold tier, thread back in the database, both searchable
+    assert [hit.id for hit in db.search('ouagadougou securite')] == ['a1']
+
+    with db.conn:
+        db.conn.execute("DELETE FROM articles WHERE id = 'a1'")
+    assert db.count_matches('ouagadougou') == 0
+    assert db.count_matches('premier') == 0
+
+
+def test_delta_of_an_unknown_article_is_skipped(db):
+    assert db.add_comment_deltas([delta(comment('c3', "Commentaire"))]) == 0
+    assert db.conn.execute("SELECT COUNT(*) FROM comments").fetchone()[0] == 0
+
+
+def test_older_scrape_keeps_the_refreshed_thread(db):
+    db.bulk_add_articles([typed_article(comments=THREAD)])
+    db.add_comment_deltas([delta(comment('c3', "Troisième commentaire"))])
+
+    # The raw file of the first scrape imported again
+    db.bulk_add_articles([typed_article(comments=THREAD)])
+
+    assert [item['key'] for item in json.loads(db.get_article('a1').comments)] == ['c1', 'c2', 'c3']
@@ -0,0 +1,110 @@
+"""
+Deduplication of the article records at ingest (database/dedup.py)
+"""
+import pytest
+
+from conftest import typed_article
+from database.dedup import ArticleDedup, BloomFilter, content_hash, fingerprint
+
+
+def keys(count, prefix='a'):
+    return [fingerprint(f"{prefix}{number}", 'hash') for number in range(count)]
+
+
+def test_bloom_filter_persists_across_reopen(tmp_path):
+    path = tmp_path / "articles.bloom"
+    bloom = BloomFilter(path, capacity=1000)
+    assert bloom.created
+    bloom.add_many(keys(500))
+    bloom.close()
+
+    bloom = BloomFilter(path, capacity=1000)
+    assert not bloom.created
+    assert bloom.count == 500
+    assert bloom.contains_many(keys(500)).all()
+    # 1% expected at capacity, well below at half of it
+    assert bloom.contains_many(keys(1000, prefix='b')).mean() < 0.02
+    assert 0 < bloom.error_rate < 0.01
+    bloom.close()
+
+
+def test_bloom_filter_rejects_another_file(tmp_path):
+    path = tmp_path / "articles.bloom"
+    path.write_bytes(b'\0' * 64)
+
+    with pytest.raises(ValueError):
+        BloomFilter(path, capacity=1000)
+
+
+def test_content_hash_ignores_the_volatile_fields():
+    article = typed_article()
+
+    assert content_hash(typed_article(article_metadata={'scraped_at': "2025-01-01T00:00:00",
+                                                        'rubrique_name': "Depeches"})) == content_hash(article)
+    assert content_hash(typed_article(titre="Titre corrigé")) != content_hash(article)
+    assert content_hash(typed_article(engagement={'likes': 4})) != content_hash(article)
+
+
+@pytest.fixture
+def dedup(db, tmp_path):
+    dedup = ArticleDedup(db, tmp_path / "articles.bloom", capacity=1000)
+    yield dedup
+    dedup.close()
+
+
+def test_drops_the_versions_already_imported(db, dedup):
+    batch = [typed_article(), typed_article(id='a2', url="https://www.aib.media/a2/"), typed_article()]
+    kept, duplicates = dedup.split(batch)
+    # Same record twice in a batch
+    assert [article['id'] for article in kept] == ['a1', 'a2']
+    assert duplicates == 1
+    db.bulk_add_articles(kept)
+
+    # Listed again under another rubric, and a corrected version of a2
+    kept, duplicates = dedup.split([
+        typed_article(article_metadata={'rubrique_name': "Politique"}),
+        typed_article(id='a2', url="https://www.aib.media/a2/", titre="Titre corrigé"),
+    ])
+    assert [article['titre'] for article in kept] == ["Titre corrigé"]
+    assert duplicates == 1
+    assert dedup.confirmed == 1
+
+
+def test_false_positive_goes_to_the_exact_check(db, dedup):
+    db.bulk_add_articles([typed_article()])
+    # Every bit set: the filter answers "maybe seen" for any record
+    dedup.bloom._array[:] = 0xFF
+
+    kept, duplicates = dedup.split([
+        typed_article(),
+        typed_article(id='a2', url="https://www.aib.media/a2/"),
+        typed_article(contenu="Texte modifié"),
+    ])
+
+    assert [(article['id'], article['contenu']) for article in kept] == [
+        ('a2', typed_article()['contenu']), ('a1', "Texte modifié"),
+    ]
+    assert duplicates == 1
+    assert (dedup.checked, dedup.confirmed) == (3, 1)
+
+
+def test_new_filter_is_filled_from_the_database(db, tmp_path):
+    db.bulk_add_articles([typed_article()])
+
+    dedup = ArticleDedup(db, tmp_path / "articles.bloom", capacity=1000)
+    assert dedup.bloom.count == 1
+    assert dedup.split([typed_article()]) == ([], 1)
+    dedup.close()
+
+
+def test_filter_of_a_deleted_database_is_reset(db, tmp_path):
+    path = tmp_path / "articles.bloom"
+    bloom = BloomFilter(path, capacity=1000)
+    bloom.add_many([fingerprint('a1', content_hash(typed_article()))])
+    bloom.close()
+
+    dedup = ArticleDedup(db, path, capacity=1000)
+    assert dedup.bloom.count == 0
+    kept, _ = dedup.split([typed_article()])
+    assert len(kept) == 1 and dedup.checked == 0
+    dedup.close()
@@ -0,0 +1,31 @@
+"""
+Sitemap discovery (scrapers/base_scraper.py, scrapers/discovery.py) against the local stand-in server
+"""
+from datetime import datetime
+
+from conftest import crawl
+from config.settings import DISCOVERY_CONFIG
+from scrapers.discovery import DiscoveredUrl, newest_undated
+
+
+def test_newest_undated_orders_by_sitemap_number():
+    children = [DiscoveredUrl(f"https://www.aib.media/wp-sitemap-posts-post-{n}.xml") for n in (1, 2, 10, 3)]
+    dated = DiscoveredUrl("https://www.aib.media/post-sitemap.xml", datetime(2024, 6, 1))
+
+    assert [child.url[-6:] for child in newest_undated(children + [dated], 2)] == ['10.xml', '-3.xml']
+    assert newest_undated(children, 0) == []
+
+
+def test_undated_sitemaps_are_bounded(wp_server, make_spider, monkeypatch):
+    monkeypatch.setitem(DISCOVERY_CONFIG, 'max_undated_sitemaps', 1)
+    monkeypatch.setitem(DISCOVERY_CONFIG, 'max_undated', 3)
+    wp_server.sitemaps = True
+    spider = make_spider(wp_api='false', discovery='sitemap')
+    crawl(spider)
+
+    paths = [path for path, _ in wp_server.requests]
+    # Only the newest post sitemap, then its last (newest) entries within the budget
+    assert paths == ['/wp-sitemap.xml', '/wp-sitemap-posts-post-3.xml',
+                     '/article-14/', '/article-13/', '/article-12/']
+    assert spider.crawler.stats.get_value('discovery/skipped_sitemaps') == 2
+    assert spider.crawler.stats.get_value('discovery/undated_skipped') == 1
@@ -0,0 +1,165 @@
+"""
+Typed ingest of the article records (database/ingest.py)
+"""
+import json
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from conftest import raw_article
+from database.ingest import (
+    ArticleIngest, InvalidRecord, convert_article, to_bool, to_date, to_int, to_list, to_mapping, to_score,
+)
+
+
+@pytest.mark.parametrize('value, expected', [
+    (3, 3), ("12", 12), ("1 234", 1234), ("1 234", 1234), (4.0, 4), ("", 0), (None, 0), (math.nan, 0),
+])
+def test_to_int(value, expected):
+    assert to_int(value) == expected
+
+
+@pytest.mark.parametrize('value', [-1, 2.5, "beaucoup"])
+def test_to_int_rejects(value):
+    with pytest.raises(ValueError):
+        to_int(value)
+
+
+@pytest.mark.parametrize('value, expected', [
+    (True, True), (np.bool_(False), False), (1, True), (0.0, False),
+    ("False", False), (" oui ", True), ("", False), (None, None), (math.nan, None),
+])
+def test_to_bool(value, expected):
+    assert to_bool(value) is expected
+
+
+@pytest.mark.parametrize('value', [2, "peut-être"])
+def test_to_bool_rejects(value):
+    with pytest.raises(ValueError):
+        to_bool(value)
+
+
+def test_to_score():
+    assert to_score("0.75") == 0.75
+    assert to_score(1) == 1.0
+    assert to_score("") is None
+    assert to_score("nan") is None
+    with pytest.raises(ValueError):
+        to_score(1.5)
+
+
+@pytest.mark.parametrize('value, expected', [
+    ("2025-11-16", datetime(2025, 11, 16)),
+    ("2025-11-15 06:34:47", datetime(2025, 11, 15, 6, 34, 47)),
+    # Offsets are converted to naive UTC
+    ("2025-11-15T06:34:47+01:00", datetime(2025, 11, 15, 5, 34, 47)),
+    ("2025-11-15T06:34:47Z", datetime(2025, 11, 15, 6, 34, 47)),
+    ("", None),
+    (None, None),
+])
+def test_to_date(value, expected):
+    assert to_date(value) == expected
+
+
+def test_literals_written_as_strings():
+    assert to_list("[]") == []
+    assert to_list("[{'text': 'Bravo'}]") == [{'text': 'Bravo'}]
+    assert to_list("None") is None
+    assert to_mapping("{'likes': 3, 'partages': 1}") == {'likes': 3, 'partages': 1}
+    assert to_mapping(None) == {}
+    with pytest.raises(TypeError):
+        to_list("{'likes': 3}")
+    with pytest.raises(TypeError):
+        to_mapping("[1, 2]")
+
+
+def test_scraper_record():
+    article = convert_article(raw_article(
+        engagement={'commentaires': 2, 'replies': 1, 'likes': 0, 'partages': 0},
+        comments=[{'text': "Bravo"}],
+        article_metadata={'rubrique_name': "Politique", 'scraped_at': "2024-06-13T12:00:00"},
+    ))
+
+    assert article['id'] == 'a1'
+    assert article['date'] == datetime(2024, 6, 13, 10)
+    assert (article['commentaires'], article['replies'], article['likes']) == (2, 1, 0)
+    assert article['comments'] == [{'text': "Bravo"}]
+    assert article['rubrique'] == "Politique"
+    assert article['scraped_at'] == "2024-06-13T12:00:00"
+    # Not analyzed yet
+    assert article['sensible'] is None and article['toxicite_score'] is None and article['categorie'] is None
+
+
+def test_analysis_export_record():
+    record = raw_article(
+        engagement="{'likes': '5', 'partages': 1, 'commentaires': 0, 'replies': 0}",
+        sensible="False", toxicite_score="0.12", categorie="Sécurité",
+        comments="[]", comments_sensibles="[]", date="2025-11-15T06:34:47+00:00",
+    )
+    del record['article_metadata']
+    record['rubrique'] = "Actualité"
+
+    article = convert_article(record)
+
+    assert (article['likes'], article['partages']) == (5, 1)
+    assert article['sensible'] is False
+    assert article['toxicite_score'] == 0.12
+    assert article['comments'] == [] and article['comments_sensibles'] == []
+    assert article['date'] == datetime(2025, 11, 15, 6, 34, 47)
+    assert article['rubrique'] == "Actualité" and article['scraped_at'] is None
+
+
+def test_flat_engagement_columns():
+    record = raw_article(likes="7", partages=2)
+    del record['engagement']
+
+    assert convert_article(record)['likes'] == 7
+    assert convert_article(record)['partages'] == 2
+
+
+def test_malformed_record_lists_every_faulty_field():
+    with pytest.raises(InvalidRecord) as error:
+        convert_article(raw_article(id='', date="hier", engagement={'likes': -2}))
+
+    message = str(error.value)
+    assert "id: champ obligatoire vide" in message
+    assert message.count(';') == 2
+    assert "date:" in message and "engagement:" in message
+
+
+def test_non_dict_record():
+    with pytest.raises(InvalidRecord, match="objet attendu: list"):
+        convert_article(['a1'])
+
+
+def test_malformed_records_go_to_quarantine(tmp_path):
+    records = [raw_article(), raw_article(id='a2', toxicite_score=3), "pas un article", raw_article(id='a3')]
+
+    with ArticleIngest(source="aib_articles.json", quarantine_dir=tmp_path) as ingest:
+        articles = ingest.convert(records)
+
+    assert [article['id'] for article in articles] == ['a1', 'a3']
+    assert (ingest.converted, ingest.rejected) == (2, 2)
+    assert ingest.rate > 0
+    assert ingest.quarantine_path.parent == tmp_path
+    assert ingest.quarantine_path.name.startswith("aib_articles_")
+
+    lines = [json.loads(line) for line in ingest.quarantine_path.read_text(encoding='utf-8').splitlines()]
+    assert [line['source'] for line in lines] == ["aib_articles.json"] * 2
+    assert lines[0]['record']['id'] == 'a2'
+    assert lines[0]['reason'].startswith("toxicite_score: score hors de [0, 1]")
+    assert lines[1] == {'source': "aib_articles.json", 'reason': "objet attendu: str", 'record': "pas un article"}
+
+
+def test_no_quarantine_file_without_rejects_or_directory(tmp_path):
+    with ArticleIngest(quarantine_dir=tmp_path) as ingest:
+        ingest.convert([raw_article()])
+    assert ingest.quarantine_path is None
+    assert list(tmp_path.iterdir()) == []
+
+    with ArticleIngest(quarantine_dir=None) as ingest:
+        assert ingest.convert([{'id': 'a1'}]) == []
+    assert ingest.rejected == 1
+    assert ingest.quarantine_path is None
@@ -0,0 +1,175 @@
+"""
+Streaming JSON reader and writer (utils/json_stream.py), checked against json.load
+with chunks small enough to cut every token
+"""
+import json
+from collections.abc import Iterator
+
+import pytest
+
+from utils.json_stream import iter_json, iter_json_members, write_json_array, write_json_object
+
+ARTICLES = [
+    {'id': 'a1', 'titre': "Sécurité : l’armée à Djibo 🇧🇫", 'likes': 12345, 'toxicite_score': 0.875,
+     'sensible': True, 'categorie': None, 'comments': [], 'engagement': {}},
+    {'id': 'a2', 'titre': 'Citation "entre guillemets" \\ et é', 'likes': -0, 'toxicite_score': 1.5e-3,
+     'scores': [1e10, -2.25E+2, 0, 10, 1234567890123456789], 'sensible': False, 'comments': [{'text': "Bravo ✊"}]},
+    [],
+    {},
+    "chaîne seule",
+    3.25,
+]
+
+MEDIAS = [{'nom': "AIB Media", 'score': 0.5}, {'nom': "Lefaso", 'score': 12}]
+
+READERS = [
+    pytest.param(False, id='read'),
+    pytest.param(True, id='mmap'),
+]
+# 1 and 2 cut every token and every multibyte character (mmap: bytes, read: characters)
+CHUNK_SIZES = [1, 2, 3, 7, 64]
+
+
+def write(tmp_path, text, encoding='utf-8', name="data.json"):
+    path = tmp_path / name
+    path.write_text(text, encoding=encoding)
+    return path
+
+
+@pytest.fixture(params=READERS)
+def use_mmap(request):
+    return request.param
+
+
+@pytest.fixture(params=CHUNK_SIZES)
+def chunk_size(request):
+    return request.param
+
+
+def test_array_matches_json_load(tmp_path, use_mmap, chunk_size):
+    for text in (json.dumps(ARTICLES, ensure_ascii=False, indent=2), json.dumps(ARTICLES), '[]', '[ ]'):
+        path = write(tmp_path, text)
+        with open(path, encoding='utf-8') as f:
+            expected = json.load(f)
+
+        assert list(iter_json(path, use_mmap=use_mmap, chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize('number', ['0', '-0', '7', '1234567890', '12.5', '-3.25', '1e10', '2.5E-3', '-1.75e+2'])
+def test_numbers_cut_at_a_chunk_edge(tmp_path, use_mmap, chunk_size, number):
+    value = json.loads(number)
+    for text, expected in ((f'[{number}]', [value]), (f'[{number},{number}]', [value, value]),
+                           (number, [value]), (f'[ {number} ]\n', [value])):
+        path = write(tmp_path, text)
+
+        assert list(iter_json(path, use_mmap=use_mmap, chunk_size=chunk_size)) == expected
+
+
+def test_number_at_every_offset(tmp_path, use_mmap):
+    # The number starts and ends at every position of a chunk
+    for padding in range(8):
+        path = write(tmp_path, '[' + ' ' * padding + '-12.375e+1, 0.5]')
+        assert list(iter_json(path, use_mmap=use_mmap, chunk_size=4)) == [-123.75, 0.5]
+
+
+def test_multibyte_characters_split_between_chunks(tmp_path, use_mmap, chunk_size):
+    titles = ["é", "àéîõü", "’", "€", "🇧🇫", "𝄞 clé"]
+    path = write(tmp_path, json.dumps([{'titre': title} for title in titles], ensure_ascii=False))
+
+    assert [item['titre'] for item in iter_json(path, use_mmap=use_mmap, chunk_size=chunk_size)] == titles
+
+
+def test_byte_order_mark(tmp_path, use_mmap, chunk_size):
+    path = write(tmp_path, json.dumps(ARTICLES, ensure_ascii=False), encoding='utf-8-sig')
+    assert path.read_bytes().startswith(b'\xef\xbb\xbf')
+
+    assert list(iter_json(path, use_mmap=use_mmap, chunk_size=chunk_size)) == ARTICLES
+
+
+def test_several_arrays_in_one_file(tmp_path, use_mmap, chunk_size):
+    # Files appended to by the scraper feeds (overwrite=False)
+    first, second = ARTICLES[:2], ARTICLES[2:]
+    for separator in ('', '\n', '\n\n', ',', ' ,\n'):
+        path = write(tmp_path, json.dumps(first, ensure_ascii=False) + separator + json.dumps(second))
+
+        assert list(iter_json(path, use_mmap=use_mmap, chunk_size=chunk_size)) == first + second
+
+
+def test_top_level_objects(tmp_path, use_mmap, chunk_size):
+    path = write(tmp_path, json.dumps(ARTICLES[0]) + '\n' + json.dumps(ARTICLES[:2]))
+
+    assert list(iter_json(path, use_mmap=use_mmap, chunk_size=chunk_size)) == [ARTICLES[0]] + ARTICLES[:2]
+
+
+def test_key_extracts_the_array_of_an_object(tmp_path, use_mmap, chunk_size):
+    document = {'version': 2, 'medias': MEDIAS, 'articles': ARTICLES[:2], 'total': 2}
+    path = write(tmp_path, json.dumps(document, ensure_ascii=False, indent=2))
+
+    assert list(iter_json(path, key='articles', use_mmap=use_mmap, chunk_size=chunk_size)) == ARTICLES[:2]
+    # Objects without the array are yielded as is
+    assert list(iter_json(path, key='absent', use_mmap=use_mmap, chunk_size=chunk_size)) == [document]
+    assert list(iter_json(path, use_mmap=use_mmap, chunk_size=chunk_size)) == [document]
+
+
+def test_members_in_file_order(tmp_path, use_mmap, chunk_size):
+    document = {'articles': ARTICLES, 'medias': MEDIAS, 'total': 6, 'source': "export"}
+    path = write(tmp_path, json.dumps(document, ensure_ascii=False, indent=2))
+
+    members = []
+    for name, value in iter_json_members(path, use_mmap=use_mmap, chunk_size=chunk_size):
+        if isinstance(value, Iterator):
+            value = list(value)
+        members.append((name, value))
+
+    assert members == list(document.items())
+
+
+def test_members_not_consumed_are_skipped(tmp_path, use_mmap, chunk_size):
+    path = write(tmp_path, json.dumps({'articles': ARTICLES, 'medias': MEDIAS, 'empty': []}))
+
+    names = []
+    for name, value in iter_json_members(path, use_mmap=use_mmap, chunk_size=chunk_size):
+        names.append(name)
+        if name == 'articles':
+            assert next(value) == ARTICLES[0]
+
+    assert names == ['articles', 'medias', 'empty']
+
+
+def test_members_after_the_object_are_an_error(tmp_path, use_mmap):
+    path = write(tmp_path, '{"a": 1} [2]')
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_members(path, use_mmap=use_mmap, chunk_size=2))
+
+
+@pytest.mark.parametrize('text', ['[1, 2', '[1 2]', '[{"a": 1}, {"a" 2}]', '{"a": 1,}'])
+def test_malformed_documents(tmp_path, use_mmap, text):
+    path = write(tmp_path, text)
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json(path, key='a', use_mmap=use_mmap, chunk_size=2))
+
+
+def test_empty_file(tmp_path, use_mmap):
+    for text in ('', '\n  \n'):
+        assert list(iter_json(write(tmp_path, text), use_mmap=use_mmap, chunk_size=2)) == []
+
+
+def test_json_lines(tmp_path, capsys):
+    path = write(tmp_path, '{"id": "a1"}\n\n[{"id": "a2"}]\n{"articles": [{"id": "a3"}]}\nnon json\n',
+                 name="data.jsonl")
+
+    assert list(iter_json(path, key='articles')) == [{'id': 'a1'}, {'id': 'a2'}, {'id': 'a3'}]
+    assert "Invalid line 5" in capsys.readouterr().out
+
+
+def test_written_files_match_json_dump(tmp_path):
+    path = tmp_path / "articles.json"
+    assert write_json_array(path, iter(ARTICLES)) == len(ARTICLES)
+    assert path.read_text(encoding='utf-8') == json.dumps(ARTICLES, ensure_ascii=False, indent=2)
+
+    write_json_object(path, [('articles', iter(ARTICLES)), ('medias', MEDIAS), ('vide', iter([]))])
+    assert path.read_text(encoding='utf-8') == json.dumps(
+        {'articles': ARTICLES, 'medias': MEDIAS, 'vide': []}, ensure_ascii=False, indent=2
+    )
@@ -0,0 +1,53 @@
+"""
+HTTP cache revalidation counters (scrapers/middlewares.py)
+"""
+import pytest
+from scrapy.http import HtmlResponse, Request, Response
+from scrapy.utils.test import get_crawler
+
+from scrapers.aib_scraper import AIBScraper
+from scrapers.middlewares import ConditionalHttpCacheMiddleware
+
+URL = "https://www.aib.media/category/politique/"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    crawler = get_crawler(AIBScraper, {'HTTPCACHE_DIR': str(tmp_path / "http")})
+    crawler.spider = crawler._create_spider()
+    middleware = ConditionalHttpCacheMiddleware.from_crawler(crawler)
+    middleware.spider_opened(crawler.spider)
+    yield middleware, crawler.spider, crawler.stats
+    middleware.spider_closed(crawler.spider)
+
+
+def revalidate(cache, status, body=b''):
+    middleware, spider, _ = cache
+    cached = HtmlResponse(URL, body=b'<html>' + b'x' * 2048 + b'</html>', headers={'ETag': '"v1"'})
+    request = Request(URL, meta={'cached_response': cached})
+    result = middleware.process_response(request, Response(URL, status=status, body=body), spider)
+    return result is cached
+
+
+def test_304_is_a_hit(cache):
+    assert revalidate(cache, 304)
+    stats = cache[2]
+    assert stats.get_value('httpcache/not_modified') == 1
+    assert stats.get_value('httpcache/bytes_saved') == 2061
+    assert stats.get_value('httpcache/stale_on_error') is None
+
+
+def test_server_error_serves_the_stale_copy_without_counting_a_hit(cache):
+    assert revalidate(cache, 503, b'<html>Service Unavailable</html>')
+    stats = cache[2]
+    assert stats.get_value('httpcache/stale_on_error') == 1
+    assert stats.get_value('httpcache/not_modified') is None
+    assert stats.get_value('httpcache/bytes_saved') is None
+    assert stats.get_value('httpcache/bytes_downloaded') == 32
+
+
+def test_changed_page_is_a_miss(cache):
+    assert not revalidate(cache, 200, b'<html>nouvelle version</html>')
+    stats = cache[2]
+    assert stats.get_value('httpcache/invalidate') == 1
+    assert stats.get_value('httpcache/not_modified') is None
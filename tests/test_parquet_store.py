@@ -0,0 +1,84 @@
+"""
+Upserts of the Parquet article store (database/parquet_store.py)
+"""
+import pyarrow.parquet as pq
+import pytest
+
+from database.parquet_store import SCHEMA, ParquetArticleStore
+
+
+def article(date, scraped_at=None, **fields):
+    return {
+        'id': 'a1', 'media': "AIB Media", 'titre': "Titre", 'date': date, 'url': 'https://aib.media/a1/',
+        'contenu': "Texte", 'categorie': None, 'sensible': None, 'toxicite_score': None,
+        'likes': 0, 'partages': 0, 'commentaires': 0, 'replies': 0,
+        'comments': [], 'comments_sensibles': [], 'scraped_at': scraped_at,
+        **fields,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ParquetArticleStore(tmp_path / "articles")
+
+
+def partition_files(store):
+    return sorted(str(file.relative_to(store.directory)) for file in store.directory.glob('media=*/month=*/*.parquet'))
+
+
+def test_redated_article_moves_to_its_new_partition(store):
+    store.write([article('2025-01-05', '2025-01-05T10:00:00', categorie='Politique', sensible=True)])
+    # Re-scraped with a corrected date, without analysis results (raw import)
+    store.write([article('2025-02-07', '2025-02-08T10:00:00')])
+
+    df = store.read()
+    assert df['id'].tolist() == ['a1']
+    assert df.loc[0, 'date'].strftime('%Y-%m-%d') == '2025-02-07'
+    assert df.loc[0, 'categorie'] == 'Politique'
+    assert bool(df.loc[0, 'sensible'])
+    assert partition_files(store) == [
+        'media=aib-media/month=2025-02/articles.parquet',
+        'media=aib-media/month=2025-02/daily.parquet',
+    ]
+    assert store.read_daily()['nb_articles'].sum() == 1
+
+
+def test_move_keeps_the_other_articles_of_the_partition(store):
+    store.write([article('2025-01-05'), article('2025-01-06', id='a2', url='https://aib.media/a2/')])
+    # A new store instance rebuilds the id -> partition index from the files
+    ParquetArticleStore(store.directory).write([article('2025-02-07')])
+
+    df = store.read(columns=['id', 'date'])
+    assert sorted(zip(df['id'], df['date'].dt.strftime('%Y-%m'))) == [('a1', '2025-02'), ('a2', '2025-01')]
+
+
+def test_older_scrape_does_not_replace_a_newer_one(store):
+    store.write([article('2025-02-07', '2025-02-08T10:00:00', titre="Titre corrigé")])
+    store.write([article('2025-01-05', '2025-01-05T10:00:00')])
+    store.write([article('2025-02-07', '2025-01-05T10:00:00', titre="Ancien titre")])
+
+    df = store.read(columns=['id', 'titre', 'date', 'scraped_at'])
+    assert df.to_dict('records') == [{
+        'id': 'a1', 'titre': "Titre corrigé", 'date': df.loc[0, 'date'], 'scraped_at': '2025-02-08T10:00:00',
+    }]
+    assert df.loc[0, 'date'].strftime('%Y-%m-%d') == '2025-02-07'
+
+
+def test_latest_scrape_of_a_batch_wins(store):
+    store.write([
+        article('2025-02-07', '2025-02-08T10:00:00', titre="Récent"),
+        article('2025-01-05', '2025-01-05T10:00:00', titre="Ancien"),
+    ])
+
+    assert store.read(columns=['titre'])['titre'].tolist() == ["Récent"]
+
+
+def test_reads_partitions_written_without_scraped_at(store):
+    store.write([article('2025-01-05')])
+    file = store.directory / 'media=aib-media' / 'month=2025-01' / 'articles.parquet'
+    pq.write_table(pq.read_table(file).drop(['scraped_at']), file)
+
+    assert store.read(columns=['id', 'scraped_at']).to_dict('records') == [{'id': 'a1', 'scraped_at': None}]
+    store.write([article('2025-01-05', '2025-01-05T10:00:00', titre="Nouveau")])
+    assert pq.read_schema(file) == SCHEMA
+    assert store.read(columns=['titre'])['titre'].tolist() == ["Nouveau"]
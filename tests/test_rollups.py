@@ -0,0 +1,146 @@
+"""
+media_daily rollups kept by the triggers of ROLLUP_SCHEMA (database/db_manager.py),
+checked against their full recomputation and the Parquet rollups (database/rollups.py)
+"""
+import pandas as pd
+import pytest
+
+from conftest import typed_article
+from database.db_manager import ROLLUP_SELECT
+from database.rollups import daily_rollup
+
+
+def article(article_id, media="AIB Media", date="2024-06-13 10:00:00", likes=0, **fields):
+    return typed_article(id=article_id, media=media, date=date, url=f"https://{media.lower()}.bf/{article_id}/",
+                         engagement={'likes': likes, 'partages': 1, 'commentaires': 2, 'replies': 1}, **fields)
+
+
+def maintained(db):
+    return sorted(tuple(row) for row in db.conn.execute("SELECT * FROM media_daily"))
+
+
+def recomputed(db):
+    return sorted(tuple(row) for row in db.conn.execute(ROLLUP_SELECT))
+
+
+def as_keys(df):
+    """
+    Rollup rows as comparable tuples: unknown day or category as '', no toxicity as None
+    """
+    return sorted(
+        (row.media, '' if pd.isna(row.date) else row.date.strftime('%Y-%m-%d'),
+         '' if pd.isna(row.categorie) else row.categorie,
+         int(row.nb_articles), int(row.likes), int(row.partages), int(row.commentaires), int(row.replies),
+         int(row.nb_sensibles), None if pd.isna(row.toxicite_max) else round(float(row.toxicite_max), 6))
+        for row in df.itertuples()
+    )
+
+
+def parquet_rollup(db):
+    """
+    daily_rollup of the stored articles, as the Parquet store computes it
+    """
+    articles = pd.read_sql_query(
+        "SELECT a.id, m.nom AS media, a.date_publication AS date, a.categorie, a.sensible, a.toxicite_score, "
+        "a.likes, a.partages, a.nb_commentaires AS commentaires, a.nb_replies AS replies "
+        "FROM articles a JOIN medias m ON m.id = a.media_id", db.conn
+    )
+    articles['sensible'] = articles['sensible'].astype('boolean')
+    return as_keys(daily_rollup(articles))
+
+
+def sqlite_rollup(db):
+    """
+    media_daily summed over the rubrics (the Parquet rollups have no rubric)
+    """
+    return as_keys(pd.read_sql_query(
+        "SELECT m.nom AS media, NULLIF(d.jour, '') AS date, NULLIF(d.categorie, '') AS categorie, "
+        "SUM(d.nb_articles) AS nb_articles, SUM(d.likes) AS likes, SUM(d.partages) AS partages, "
+        "SUM(d.nb_commentaires) AS commentaires, SUM(d.nb_replies) AS replies, "
+        "SUM(d.nb_sensibles) AS nb_sensibles, MAX(d.toxicite_max) AS toxicite_max "
+        "FROM media_daily d JOIN medias m ON m.id = d.media_id GROUP BY 1, 2, 3",
+        db.conn, parse_dates=['date']
+    ))
+
+
+def check(db):
+    assert maintained(db) == recomputed(db)
+    assert sqlite_rollup(db) == parquet_rollup(db)
+
+
+@pytest.fixture
+def stored(db):
+    db.bulk_add_articles([
+        article('a1', likes=3, article_metadata={'rubrique_name': "Politique"}),
+        article('a2', likes=5),
+        article('a3', date="2024-06-14 08:00:00"),
+        article('a4', media="Lefaso", likes=1),
+        article('a5', date=None),
+    ])
+    db.set_categories({'a1': "Politique", 'a2': "Politique", 'a4': "Économie"})
+    db.set_toxicity({'a1': (0.9, True), 'a2': (0.4, False), 'a4': (0.2, False)}, {})
+    check(db)
+    return db
+
+
+def test_insert_groups_by_media_day_category_and_rubric(stored):
+    groups = {(row['jour'], row['categorie'], row['rubrique']): row['nb_articles']
+              for row in stored.conn.execute("SELECT * FROM media_daily")}
+
+    assert groups == {
+        ('2024-06-13', 'Politique', 'Politique'): 1,
+        ('2024-06-13', 'Politique', ''): 1,
+        ('2024-06-14', '', ''): 1,
+        ('2024-06-13', 'Économie', ''): 1,
+        ('', '', ''): 1,
+    }
+    assert tuple(stored.conn.execute("SELECT SUM(likes), SUM(nb_sensibles) FROM media_daily").fetchone()) == (9, 1)
+
+
+def test_rescoring_the_most_toxic_article_recomputes_the_maximum(stored):
+    stored.set_toxicity({'a1': (0.1, False)}, {})
+    check(stored)
+
+    stored.set_toxicity({'a2': (0.05, False)}, {})
+    check(stored)
+    assert stored.conn.execute(
+        "SELECT toxicite_max FROM media_daily WHERE categorie = 'Politique' AND rubrique = ''"
+    ).fetchone()[0] == pytest.approx(0.05)
+
+
+def test_reimport_moves_the_article_to_its_new_group(stored):
+    stored.bulk_add_articles([
+        article('a2', date="2024-06-15 09:00:00", likes=8, article_metadata={'scraped_at': "2024-06-16T00:00:00"}),
+        article('a5', date="2024-06-14 12:00:00", article_metadata={'scraped_at': "2024-06-16T00:00:00"}),
+        # Unchanged article: no rollup update
+        article('a3', date="2024-06-14 08:00:00"),
+    ])
+    check(stored)
+    assert stored.conn.execute("SELECT COUNT(*) FROM media_daily WHERE jour = ''").fetchone()[0] == 0
+
+
+def test_recategorized_article_changes_group(stored):
+    stored.set_categories({'a1': "Sécurité", 'a3': "Sécurité"})
+    check(stored)
+
+
+def test_delete_removes_empty_groups_and_recomputes_the_maximum(stored):
+    with stored.conn:
+        stored.conn.execute("DELETE FROM articles WHERE id IN ('a1', 'a5')")
+    check(stored)
+    assert stored.conn.execute(
+        "SELECT toxicite_max FROM media_daily WHERE categorie = 'Politique'"
+    ).fetchone()[0] == pytest.approx(0.4)
+
+    with stored.conn:
+        stored.conn.execute("DELETE FROM articles")
+    assert maintained(stored) == []
+
+
+def test_rebuild_matches_the_triggers(stored):
+    stored.set_toxicity({'a1': (0.3, False)}, {})
+    before = maintained(stored)
+
+    stored.rebuild_rollups()
+
+    assert maintained(stored) == before
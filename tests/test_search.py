@@ -0,0 +1,163 @@
+"""
+Full-text search of the articles (database/search.py, DatabaseManager.search)
+"""
+import pytest
+
+from conftest import typed_article
+from database.db_manager import DatabaseManager
+from database.search import Term, excerpt, fold, fts_query, parse_query
+
+
+def found(db, text):
+    return [hit.id for hit in db.search(text)]
+
+
+def test_index_keeps_no_copy_of_the_texts(db):
+    db.bulk_add_articles([typed_article()])
+
+    assert found(db, 'ouagadougou') == ['a1']
+    assert tuple(db.conn.execute("SELECT titre, contenu FROM articles_fts").fetchone()) == (None, None)
+
+
+def test_reimported_tiered_article_is_indexed_again(db):
+    db.bulk_add_articles([typed_article(comments=[{'text': "Bravo au gouvernement"}])])
+    assert db.tier_articles(max_age_days=0)['articles'] == 1
+    # Tiered texts stay searchable
+    assert found(db, 'ouagadougou') == ['a1']
+    assert found(db, 'gouvernement') == ['a1']
+
+    db.bulk_add_articles([typed_article(contenu="La session s'est tenue à Bobo-Dioulasso.",
+                                        article_metadata={'scraped_at': "2024-06-14T12:00:00"})])
+
+    assert found(db, 'ouagadougou') == []
+    assert found(db, 'gouvernement') == []
+    assert found(db, 'bobo') == ['a1']
+
+
+def test_deleted_tiered_article_leaves_the_index(db):
+    db.bulk_add_articles([typed_article(), typed_article(id='a2', url="https://www.aib.media/a2/")])
+    db.tier_articles(max_age_days=0)
+
+    with db.conn:
+        db.conn.execute("DELETE FROM articles WHERE id = 'a1'")
+
+    assert found(db, 'ouagadougou') == ['a2']
+    assert db.count_matches('ouagadougou') == 1
+
+
+def test_index_with_a_copy_of_the_texts_is_replaced(tmp_path):
+    path = tmp_path / "media_scan.db"
+    with DatabaseManager(path) as db:
+        db.bulk_add_articles([typed_article()])
+        # Index of a database created before the contentless one
+        with db.conn:
+            for trigger in ('insert', 'update', 'delete'):
+                db.conn.execute(f"DROP TRIGGER articles_fts_{trigger}")
+            db.conn.execute("DROP TABLE articles_fts")
+            db.conn.execute("CREATE VIRTUAL TABLE articles_fts USING fts5(titre, contenu, commentaires)")
+
+    with DatabaseManager(path) as db:
+        sql = db.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'articles_fts'").fetchone()[0]
+        assert "content = ''" in sql
+        assert found(db, 'ouagadougou') == ['a1']
+
+
+def test_parse_query():
+    assert parse_query('sécurité "forces armées" secur* l\'armée') == [
+        Term(('sécurité',)), Term(('forces', 'armées')), Term(('secur',), prefix=True), Term(('l', 'armée')),
+    ]
+    assert parse_query('  "" * ') == []
+
+
+def test_fts_query_quotes_every_word():
+    assert fts_query('sécurité "forces armées" secur*') == '"sécurité" "forces armées" "secur"*'
+    # FTS5 operators and syntax typed by the user are plain words
+    assert fts_query('armée NOT djibo') == '"armée" "NOT" "djibo"'
+    assert fts_query('titre:(armée') == '"titre armée"'
+    assert fts_query('') == ''
+
+
+def test_fold():
+    assert fold("Sécurité") == "securite"
+    assert fold("ÉCOLE") == "ecole"
+    assert fold("Ouagadougou") == "ouagadougou"
+
+
+def test_excerpt():
+    text = ("Le gouvernement a annoncé hier de nouvelles mesures. La sécurité des écoles de la région "
+            "du Centre-Nord sera renforcée avant la rentrée, selon le ministre de la Sécurité.")
+
+    assert excerpt([text], parse_query('securite ecoles'), size=6) == \
+        "…mesures. La **sécurité** des **écoles** de…"
+    assert excerpt([text], parse_query('secur*'), size=30).count('**') == 4
+    assert excerpt([text], parse_query('"la sécurité"'), size=4) == "…nouvelles mesures. **La** **sécurité**…"
+
+
+def test_excerpt_takes_the_first_best_text():
+    body = "Le Conseil des ministres s'est tenu à Ouagadougou."
+    comments = "Bravo au gouvernement"
+    title = "Conseil des ministres"
+
+    assert excerpt([body, comments, title], parse_query('gouvernement')) == "Bravo au **gouvernement**"
+    assert excerpt([body, comments, title], parse_query('conseil')) == \
+        "Le **Conseil** des ministres s'est tenu à Ouagadougou."
+    assert excerpt([body], parse_query('absent')) == ''
+
+
+@pytest.fixture
+def corpus(db):
+    db.bulk_add_articles([
+        typed_article(id='a1', url="https://aib.media/a1/", titre="Sécurité: le point de la semaine",
+                      contenu="Les forces armées ont sécurisé la route de Djibo."),
+        typed_article(id='a2', url="https://aib.media/a2/", titre="Rentrée scolaire",
+                      contenu="La sécurité des écoles sera renforcée.",
+                      comments=[{'text': "Il faut plus de SECURITE", 'replies': [{'text': "Bien dit"}]}]),
+        typed_article(id='a3', url="https://aib.media/a3/", titre="Campagne agricole",
+                      contenu="Les semences sont arrivées à Bobo-Dioulasso."),
+    ])
+    return db
+
+
+def test_matching_ignores_case_and_accents(corpus):
+    for query in ('securite', 'SÉCURITÉ', 'Sécurite'):
+        assert sorted(found(corpus, query)) == ['a1', 'a2']
+    assert found(corpus, 'ecoles renforcee') == ['a2']
+    assert found(corpus, 'bobo dioulasso') == ['a3']
+
+
+def test_title_matches_rank_first(corpus):
+    assert found(corpus, 'securite') == ['a1', 'a2']
+    hits = corpus.search('securite')
+    assert hits[0].score > hits[1].score > 0
+
+
+def test_phrases_prefixes_and_replies(corpus):
+    assert found(corpus, '"forces armées"') == ['a1']
+    assert found(corpus, '"armées forces"') == []
+    assert sorted(found(corpus, 'secur*')) == ['a1', 'a2']
+    assert found(corpus, 'bien dit') == ['a2']
+
+
+def test_hits_carry_their_excerpt(corpus):
+    hit = corpus.search('djibo')[0]
+
+    assert (hit.id, hit.media, hit.url) == ('a1', "AIB Media", "https://aib.media/a1/")
+    # Two words before the first found word
+    assert hit.extrait == "…route de **Djibo**."
+
+
+def test_pages_and_count(corpus):
+    assert corpus.count_matches('secur*') == 2
+    assert [hit.id for hit in corpus.search('secur*', limit=1, offset=1)] == ['a2']
+    assert corpus.search('"" *') == []
+    assert corpus.count_matches('') == 0
+
+
+def test_index_rows_without_their_article_are_skipped(corpus):
+    # As after a VACUUM that renumbered the articles before the index was rebuilt
+    with corpus.conn:
+        corpus.conn.execute(
+            "INSERT INTO articles_fts (rowid, titre, contenu, commentaires) VALUES (999, 'Sécurité', '', '')"
+        )
+
+    assert sorted(found(corpus, 'securite')) == ['a1', 'a2']
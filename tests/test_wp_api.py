@@ -0,0 +1,168 @@
+"""
+WordPress REST API extraction path (scrapers/wp_api.py) against the local stand-in server
+"""
+import pytest
+
+from conftest import crawl
+from scrapers.wp_api import html_to_paragraphs
+
+
+def api_requests(server, endpoint):
+    return [query for path, query in server.requests if path == f"/wp-json/wp/v2/{endpoint}"]
+
+
+def test_reads_all_pages(wp_server, make_spider):
+    spider = make_spider()
+    items, _ = crawl(spider)
+
+    assert [query['page'] for query in api_requests(wp_server, 'categories')] == ['1', '2']
+    assert [query['page'] for query in api_requests(wp_server, 'posts')] == ['1', '2']
+    assert [item['url'].rsplit('/', 2)[-2] for item in items] == [
+        'conseil-des-ministres-du-13-juin',
+        'campagne-agricole-2024-2025',
+        'rentree-scolaire-kaya',
+        'coupe-du-faso-finale',
+    ]
+    assert spider.crawler.stats.get_value('wp_api/pages') == 2
+    assert spider.crawler.stats.get_value('wp_api/articles') == 4
+
+
+def test_articles_have_the_html_path_structure(make_spider):
+    spider = make_spider()
+    items, _ = crawl(spider)
+    article = items[1]
+
+    assert article['id'] == spider.generate_article_id(article['url'])
+    assert article['media'] == "AIB Media"
+    assert article['titre'] == "Campagne agricole 2024-2025 : lancement officiel à Bobo-Dioulasso"
+    assert article['date'] == "2024-06-13 17:45:03"
+    # Scripts and share buttons removed by the spider's clean_article_content
+    assert article['contenu'] == (
+        "La campagne agricole a été lancée ce jeudi à Bobo-Dioulasso.\n\n"
+        "Les semences améliorées seront distribuées dans les régions."
+    )
+    assert article['engagement'] == {'commentaires': 0, 'replies': 0, 'likes': 0, 'partages': 0}
+    assert article['comments'] == []
+    assert items[0]['titre'] == "Conseil des ministres du 13 juin : les principales décisions"
+    assert items[0]['article_metadata']['scraped_at']
+
+
+def test_reads_all_category_pages(make_spider):
+    spider = make_spider()
+    crawl(spider)
+
+    assert spider.api_categories == {3: 'Politique', 5: 'Économie', 7: 'Société'}
+
+
+def test_unbalanced_html_stays_in_its_post(make_spider):
+    items, _ = crawl(make_spider())
+    contents = {item['url'].rsplit('/', 2)[-2]: item['contenu'] for item in items}
+
+    # Unclosed <div> in the first post, stray </div> in the first post of page 2
+    assert contents['conseil-des-ministres-du-13-juin'] == (
+        "Le Conseil des ministres s’est tenu le jeudi 13 juin 2024.\n\n"
+        "Plusieurs décrets ont été adoptés au titre du ministère de l'Économie."
+    )
+    assert contents['campagne-agricole-2024-2025'].startswith("La campagne agricole")
+    assert contents['coupe-du-faso-finale'] == (
+        "L'EFO a remporté la finale de la Coupe du Faso.\n\n"
+        "Le match s'est joué au stade du 4-Août."
+    )
+
+
+def test_html_to_paragraphs():
+    assert html_to_paragraphs('<p>A1</p><div class=x><p>A2</p>') == ['A1', 'A2']
+    assert html_to_paragraphs('<p>A1</p></div><p>A2</p>') == ['A1', 'A2']
+    assert html_to_paragraphs('<p>Texte</p><script>var x = 1;</script>') == ['Texte']
+    assert html_to_paragraphs('Texte sans paragraphe') == ['Texte sans paragraphe']
+    assert html_to_paragraphs('') == ['']
+
+
+def test_sends_modified_after(wp_server, make_spider):
+    crawl(make_spider())
+
+    for query in api_requests(wp_server, 'posts'):
+        assert query['modified_after'] == '2024-05-15T00:00:00'
+        assert query['orderby'] == 'modified'
+        assert query['order'] == 'desc'
+        assert query['per_page'] == '100'
+
+
+def test_drops_old_posts_when_modified_after_is_ignored(wp_server, make_spider):
+    wp_server.honour_modified_after = False
+    spider = make_spider()
+    items, _ = crawl(spider)
+
+    assert 'festival-des-masques-dedougou' not in ' '.join(item['url'] for item in items)
+    assert len(items) == 4
+    assert spider.crawler.stats.get_value('discovery/too_old') == 1
+
+
+def test_incremental_skips_known_posts_and_stops(wp_server, make_spider):
+    # Articles are recorded by a run without --incremental too
+    crawl(make_spider())
+    wp_server.requests.clear()
+
+    spider = make_spider(incremental='true')
+    items, _ = crawl(spider)
+
+    assert items == []
+    assert [query['page'] for query in api_requests(wp_server, 'posts')] == ['1']
+    assert spider.crawler.stats.get_value('incremental/skipped_articles') == 3
+
+
+def test_full_run_collects_known_posts_again(make_spider, seen_index_path):
+    crawl(make_spider())
+    items, _ = crawl(make_spider())
+
+    assert len(items) == 4
+    assert seen_index_path.exists()
+
+
+@pytest.mark.parametrize('status', [401, 403, 404])
+def test_falls_back_to_discovery_on_http_error(wp_server, make_spider, status):
+    wp_server.api_status = status
+    spider = make_spider()
+    items, _ = crawl(spider)
+
+    assert items == []
+    assert not spider.wp_api
+    assert spider.crawler.stats.get_value('wp_api/fallback') == 1
+    assert api_requests(wp_server, 'posts') == []
+    # Sitemap discovery of MEDIA_SOURCES, then the listing pages when no sitemap answers
+    paths = [path for path, _ in wp_server.requests]
+    assert paths[1:3] == ['/wp-sitemap.xml', '/sitemap_index.xml']
+    assert '/category/politique/' in paths
+
+
+def test_falls_back_to_discovery_on_non_json(wp_server, make_spider):
+    wp_server.api_html = True
+    spider = make_spider()
+    items, _ = crawl(spider)
+
+    assert items == []
+    assert spider.crawler.stats.get_value('wp_api/fallback') == 1
+    assert '/wp-sitemap.xml' in [path for path, _ in wp_server.requests]
+
+
+@pytest.mark.parametrize('broken', [500, 404, 'html'])
+def test_later_categories_page_failing_goes_on_with_posts(wp_server, make_spider, broken):
+    wp_server.broken_pages[('categories', 2)] = broken
+    spider = make_spider()
+    items, _ = crawl(spider)
+
+    assert spider.wp_api
+    assert spider.api_categories == {3: 'Politique', 5: 'Économie'}
+    assert len(items) == 4
+    assert spider.crawler.stats.get_value('wp_api/categories_errors') == 1
+    assert spider.crawler.stats.get_value('wp_api/fallback') is None
+
+
+def test_html_path_when_api_disabled(wp_server, make_spider):
+    spider = make_spider()
+    spider.wp_api = False
+    crawl(spider)
+
+    assert api_requests(wp_server, 'categories') == []
+    assert spider.crawler.stats.get_value('wp_api/fallback') is None
+    assert wp_server.requests[0][0] == '/wp-sitemap.xml'
@@ -4,9 +4,11 @@ Utility functions for MÉDIA-SCAN project
 import re
 import json
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional
 from pathlib import Path
 
+from utils.json_stream import iter_json
+
 
 def clean_text(text: str) -> str:
     """
@@ -70,20 +72,48 @@ def parse_french_date(date_string: str) -> str:
 
 def load_json_file(file_path: Path) -> List[Dict]:
     """
-    Load articles from JSON file
+    Load articles from JSON or JSON Lines file
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        if isinstance(data, dict):
-            return [data]
-        return data
+        return list(iter_json_records(file_path))
     except Exception as e:
         print(f"Error loading {file_path}: {e}")
         return []
 
 
+def iter_json_records(file_path: Path, key: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Iterate over the articles of a file one at a time, without loading the file
+    JSON Lines files (.jsonl) are read line by line; JSON files are streamed element by
+    element and may contain several arrays written one after the other (overwrite=False)
+    With `key`, documents such as {"articles": [...]} are replaced by the elements of key
+    """
+    return iter_json(file_path, key=key)
+
+
+def iter_raw_files(raw_dir: Path) -> List[Path]:
+    """
+    List the scraped files: JSON Lines shards (<media>/<date>/*.jsonl), then legacy *.json files
+    Files still being written (.part) are ignored
+    """
+    raw_dir = Path(raw_dir)
+    return sorted(raw_dir.glob("*/*/*.jsonl")) + sorted(raw_dir.glob("*.json"))
+
+
+def batched(records: Iterable, size: int) -> Iterator[List]:
+    """
+    Group an iterable into lists of at most `size` items
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
 def save_json_file(data: List[Dict], file_path: Path):
     """
     Save data to JSON file
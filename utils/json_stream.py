@@ -0,0 +1,327 @@
+"""
+Streaming JSON reader and writer for the raw and processed files
+
+The scrapers append to their files (overwrite=False: several arrays one after the
+other), the analysis exports are {"articles": [...], "medias": [...]} documents and
+the training files are large arrays. Reading them with json.load keeps the whole text
+and the whole decoded document in memory; the functions below only keep a buffer of
+about CHUNK_SIZE characters plus the element being decoded:
+
+    iter_json(path)                       elements of the top-level arrays, top-level objects
+    iter_json(path, key='articles')       elements of document['articles'] (other objects as is)
+    iter_json_members(path)               (name, value) of a top-level object, arrays as lazy iterators
+    write_json_array(path, items)         same output as json.dump(list(items), indent=2)
+    write_json_object(path, members)      same output as json.dump(dict(members), indent=2)
+
+Elements are decoded by the C scanner of the json module (raw_decode); JSON Lines
+files are decoded line by line with orjson when it is installed.
+
+Compare with json.load: python scripts/benchmark_json.py
+"""
+import codecs
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters read at once: small enough for the buffer to stay in the CPU caches
+# (1M-character chunks were about 2x slower in scripts/benchmark_json.py)
+CHUNK_SIZE = 1 << 16
+
+WHITESPACE = ' \t\r\n'
+
+# Characters that can continue a number ("12." + "5", "1e" + "-3")
+NUMBER_CHARS = frozenset('0123456789.eE+-')
+
+DECODER = 'orjson' if orjson is not None else 'json'
+
+
+def loads(text: str) -> Any:
+    """
+    Decode one JSON document (orjson when available)
+    """
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+def _chunks(path: Path, chunk_size: int, use_mmap: bool) -> Iterator[str]:
+    """
+    Text of a file, chunk by chunk (read() calls or slices of a memory map)
+    """
+    if not use_mmap:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # A UTF-8 character can be cut between two slices: incremental decoder
+            decoder = codecs.getincrementaldecoder('utf-8-sig')()
+            for start in range(0, len(mapped), chunk_size):
+                chunk = decoder.decode(mapped[start:start + chunk_size])
+                if chunk:
+                    yield chunk
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+
+
+class _Reader:
+    """
+    Buffer over the chunks of a file, decoding one value at a time
+    """
+
+    def __init__(self, path: Path, chunk_size: int = CHUNK_SIZE, use_mmap: bool = False):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._chunks = _chunks(path, chunk_size, use_mmap)
+        self._decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """
+        Append at least one chunk to the buffer, False at the end of the file
+        """
+        if self.eof:
+            return False
+        # Drop what was consumed: the buffer holds the current element, not the file
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        # Elements larger than a chunk: grow geometrically, so decoding stays linear
+        wanted = max(self.chunk_size, len(self.buffer))
+        parts = [self.buffer]
+        size = 0
+        for chunk in self._chunks:
+            parts.append(chunk)
+            size += len(chunk)
+            if size >= wanted:
+                break
+        else:
+            self.eof = True
+        self.buffer = ''.join(parts)
+        return size > 0
+
+    def peek(self, skip: str = WHITESPACE) -> str:
+        """
+        Next character that is not in `skip` ('' at the end of the file), not consumed
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in skip:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"'{char}' attendu", self.buffer, self.pos)
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """
+        Decode the value at the current position, reading more of the file when it is cut
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk, also when
+            # the buffer ends on its decimal point or exponent ("12." is decoded as 12)
+            if (type(value) in (int, float) and all(char in NUMBER_CHARS for char in self.buffer[end:])
+                    and self._fill()):
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self) -> Iterator[Any]:
+        """
+        Elements of the array at the current position, one at a time
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.decode()
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError("',' ou ']' attendu", self.buffer, self.pos - 1)
+
+    def iter_members(self) -> Iterator[Tuple[str, Any]]:
+        """
+        (name, value) of the object at the current position, array values as lazy iterators
+        An array not (fully) consumed by the caller is skipped when the next member is read
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            name = self.decode()
+            self.expect(':')
+            if self.peek() == '[':
+                elements = self.iter_array()
+                yield name, elements
+                for _ in elements:
+                    pass
+            else:
+                yield name, self.decode()
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError("',' ou '}' attendu", self.buffer, self.pos - 1)
+
+
+def _object_records(reader: _Reader, key: str) -> Iterator[Any]:
+    """
+    Elements of the array `key` of the object at the current position,
+    the whole object when it has no such array
+    """
+    members = {}
+    found = False
+    for name, value in reader.iter_members():
+        if name == key and isinstance(value, Iterator):
+            found = True
+            yield from value
+        elif not found:
+            members[name] = list(value) if isinstance(value, Iterator) else value
+    if not found:
+        yield members
+
+
+def _iter_json_lines(path: Path, key: Optional[str]) -> Iterator[Any]:
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        for line_num, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                document = loads(line)
+            except ValueError as e:
+                print(f"Invalid line {line_num} in {path}: {e}")
+                continue
+            if isinstance(document, list):
+                yield from document
+            elif key and isinstance(document, dict) and isinstance(document.get(key), list):
+                yield from document[key]
+            else:
+                yield document
+
+
+def iter_json(path: Path, key: Optional[str] = None, use_mmap: bool = False,
+              chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Iterate over the records of a JSON or JSON Lines (.jsonl) file without loading it
+
+    Top-level arrays (one or several written one after the other) are iterated element by
+    element. A top-level object is yielded as is, or, given `key`, replaced by the elements
+    of its `key` array ({"articles": [...], "medias": [...]} -> the articles).
+    use_mmap reads the file through a memory map instead of read() calls.
+    """
+    path = Path(path)
+    if path.suffix == '.jsonl':
+        yield from _iter_json_lines(path, key)
+        return
+
+    reader = _Reader(path, chunk_size, use_mmap)
+    while True:
+        # Separators between concatenated documents
+        char = reader.peek(WHITESPACE + ',')
+        if not char:
+            return
+        if char == '[':
+            yield from reader.iter_array()
+        elif char == '{' and key:
+            yield from _object_records(reader, key)
+        else:
+            yield reader.decode()
+
+
+def iter_json_members(path: Path, use_mmap: bool = False,
+                      chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """
+    (name, value) of the members of a JSON object file, in file order
+
+    Array values are iterators over their elements, to consume before moving to the next
+    member (e.g. the articles of an analysis export are converted one by one, the media
+    table after them).
+    """
+    reader = _Reader(Path(path), chunk_size, use_mmap)
+    yield from reader.iter_members()
+    if reader.peek():
+        raise json.JSONDecodeError("fin du fichier attendue", reader.buffer, reader.pos)
+
+
+def _dumps(value: Any, indent: int, level: int) -> str:
+    """
+    Value as written by json.dump(indent=indent) at nesting `level`
+    """
+    text = json.dumps(value, ensure_ascii=False, indent=indent)
+    return text.replace('\n', '\n' + ' ' * (indent * level))
+
+
+def _write_array(f, items: Iterable[Any], indent: int, level: int) -> int:
+    count = 0
+    padding = '\n' + ' ' * (indent * (level + 1))
+    for item in items:
+        f.write(('[' if count == 0 else ',') + padding + _dumps(item, indent, level + 1))
+        count += 1
+    f.write('\n' + ' ' * (indent * level) + ']' if count else '[]')
+    return count
+
+
+def write_json_array(path: Path, items: Iterable[Any], indent: int = 2) -> int:
+    """
+    Write the items as a JSON array, one at a time, returns the number of items
+    The file is written next to its destination then renamed (the source may be the destination)
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + '.part')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        count = _write_array(f, items, indent, 0)
+    os.replace(tmp, path)
+    return count
+
+
+def write_json_object(path: Path, members: Iterable[Tuple[str, Any]], indent: int = 2):
+    """
+    Write (name, value) pairs as a JSON object; values that are iterators
+    (e.g. from iter_json_members) are written as arrays, one element at a time
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + '.part')
+    padding = '\n' + ' ' * indent
+    with open(tmp, 'w', encoding='utf-8') as f:
+        count = 0
+        for name, value in members:
+            f.write(('{' if count == 0 else ',') + padding + json.dumps(name, ensure_ascii=False) + ': ')
+            if isinstance(value, Iterator):
+                _write_array(f, value, indent, 1)
+            else:
+                f.write(_dumps(value, indent, 1))
+            count += 1
+        f.write('\n}' if count else '{}')
+    os.replace(tmp, path)